@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+"""M32-10: Multi-strategy / multi-account tick fan-out.
+
+`run_commander_runtime` ticks one state (one account, one policy). The fan-out runner
+takes N profiles, runs each profile's graph tick in a process pool, and applies ONE
+`apply_portfolio_budget_guard` call over the merged intents at the commander boundary
+(M27-3), so strategy budgets and symbol caps are enforced across all profiles.
+
+Profile (dict):
+  - profile_id (required, unique), strategy_id, account_id (optional)
+  - state: per-profile overrides (policy, candidates, readers, ...)
+
+Shared market data (`shared`, read-only) is shipped once per worker process through
+the pool initializer, not once per task. Each tick state is `deepcopy(shared) | state`.
+
+Merge order is the profile input order (never completion order): intents are stamped
+with `profile_id` / `strategy_id` / `account_id` and concatenated in that order, so the
+guard input (and therefore its output) is reproducible. Only intents of profiles
+whose tick decision is `approve` reach the guard.
+
+Modes: `process` (default), `thread`, `inline`. Env `COMMANDER_FANOUT_MODE`,
+`COMMANDER_FANOUT_MAX_WORKERS` (default: CPU count).
+"""
+
+import copy
+import importlib
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from libs.runtime.portfolio_budget_guard import apply_portfolio_budget_guard
+
+
+TickFn = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+DEFAULT_TICK_FN = "graphs.trading_graph:run_trading_graph"
+_MODES = ("process", "thread", "inline")
+
+# per worker process: set by the pool initializer
+_SHARED: Dict[str, Any] = {}
+
+
+def _init_worker(shared: Dict[str, Any]) -> None:
+    global _SHARED
+    _SHARED = shared
+
+
+def _resolve_tick_fn(tick_fn: Union[str, TickFn]) -> TickFn:
+    if callable(tick_fn):
+        return tick_fn
+    mod, _, attr = str(tick_fn).partition(":")
+    if not mod or not attr:
+        raise ValueError(f"tick_fn must be 'module:function', got {tick_fn!r}")
+    return getattr(importlib.import_module(mod), attr)
+
+
+def _normalize_mode(value: Any) -> str:
+    v = str(value or "").strip().lower()
+    return v if v in _MODES else "process"
+
+
+def _max_workers(value: Optional[int], n: int) -> int:
+    if value is None:
+        raw = os.getenv("COMMANDER_FANOUT_MAX_WORKERS", "").strip()
+        try:
+            value = int(raw) if raw else (os.cpu_count() or 1)
+        except ValueError:
+            value = os.cpu_count() or 1
+    return max(1, min(int(value), max(1, n)))
+
+
+def _profile_result(profile: Dict[str, Any], out: Dict[str, Any], elapsed_ms: float) -> Dict[str, Any]:
+    decision = str(out.get("decision") or "noop").lower()
+    intents = out.get("intents") if isinstance(out.get("intents"), list) else []
+    return {
+        "profile_id": profile["profile_id"],
+        "strategy_id": str(profile.get("strategy_id") or ""),
+        "account_id": str(profile.get("account_id") or ""),
+        "ok": True,
+        "decision": decision,
+        "decision_reason": str(out.get("decision_reason") or ""),
+        "intents": intents if decision == "approve" else [],
+        "selected": out.get("selected"),
+        "elapsed_ms": round(elapsed_ms, 3),
+    }
+
+
+def _run_profile(profile: Dict[str, Any], tick_fn: Union[str, TickFn], shared: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Run one profile tick. Never raises: failures are returned as `ok=False`."""
+    t0 = time.perf_counter()
+    try:
+        base = copy.deepcopy(_SHARED if shared is None else shared)
+        state = {**base, **copy.deepcopy(profile.get("state") or {})}
+        if profile.get("strategy_id"):
+            state.setdefault("strategy_id", str(profile["strategy_id"]))
+        if profile.get("account_id"):
+            state.setdefault("account_id", str(profile["account_id"]))
+        state.setdefault("run_id", f"fanout-{profile['profile_id']}")
+        out = _resolve_tick_fn(tick_fn)(state)
+        return _profile_result(profile, out, (time.perf_counter() - t0) * 1000.0)
+    except Exception as e:
+        return {
+            "profile_id": profile.get("profile_id"),
+            "strategy_id": str(profile.get("strategy_id") or ""),
+            "account_id": str(profile.get("account_id") or ""),
+            "ok": False,
+            "decision": "error",
+            "error_type": type(e).__name__,
+            "error": str(e)[:300],
+            "intents": [],
+            "selected": None,
+            "elapsed_ms": round((time.perf_counter() - t0) * 1000.0, 3),
+        }
+
+
+def merge_profile_intents(results: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Concatenate intents in profile order, stamping profile/strategy/account ids."""
+    merged: List[Dict[str, Any]] = []
+    for r in results:
+        for intent in r.get("intents") or []:
+            if not isinstance(intent, dict):
+                continue
+            row = dict(intent)
+            row.setdefault("profile_id", r.get("profile_id"))
+            if r.get("strategy_id"):
+                row.setdefault("strategy_id", r["strategy_id"])
+            if r.get("account_id"):
+                row.setdefault("account_id", r["account_id"])
+            merged.append(row)
+    return merged
+
+
+def _make_executor(mode: str, workers: int, shared: Dict[str, Any]) -> Executor:
+    if mode == "process":
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared,))
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="commander-fanout")
+
+
+def _validate_profiles(profiles: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    seen = set()
+    for p in profiles:
+        if not isinstance(p, dict) or not str(p.get("profile_id") or "").strip():
+            raise ValueError("each profile needs a non-empty profile_id")
+        pid = str(p["profile_id"]).strip()
+        if pid in seen:
+            raise ValueError(f"duplicate profile_id: {pid}")
+        seen.add(pid)
+        out.append({**p, "profile_id": pid})
+    return out
+
+
+def run_commander_fanout(
+    profiles: Sequence[Dict[str, Any]],
+    *,
+    shared: Optional[Dict[str, Any]] = None,
+    tick_fn: Union[str, TickFn] = DEFAULT_TICK_FN,
+    mode: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    allocation_result: Optional[Dict[str, Any]] = None,
+    strategy_budget_map: Optional[Dict[str, Any]] = None,
+    default_symbol_max_notional: float = 0.0,
+    symbol_max_notional_map: Optional[Dict[str, float]] = None,
+    market_prices: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    """Run one tick for every profile, then one portfolio budget guard over all intents.
+
+    `tick_fn` is a `module:function` path (or a module-level callable) so it can be
+    imported by worker processes. `executor` overrides the pool (it must have been
+    created with `_init_worker(shared)` as initializer for process pools).
+    """
+    items = _validate_profiles(profiles)
+    shared = dict(shared or {})
+    mode = _normalize_mode(mode or os.getenv("COMMANDER_FANOUT_MODE", "process"))
+    workers = _max_workers(max_workers, len(items))
+
+    t0 = time.perf_counter()
+    if mode == "inline" or not items:
+        results = [_run_profile(p, tick_fn, shared) for p in items]
+    else:
+        own = executor is None
+        pool = executor or _make_executor(mode, workers, shared)
+        try:
+            # process workers read `shared` from their initializer; threads get it per call
+            arg = None if mode == "process" else shared
+            futures = [pool.submit(_run_profile, p, tick_fn, arg) for p in items]
+            results = [f.result() for f in futures]  # profile order, not completion order
+        finally:
+            if own:
+                pool.shutdown(wait=True)
+    tick_ms = (time.perf_counter() - t0) * 1000.0
+
+    merged = merge_profile_intents(results)
+    guard = apply_portfolio_budget_guard(
+        merged,
+        allocation_result=allocation_result,
+        strategy_budget_map=strategy_budget_map,
+        default_symbol_max_notional=default_symbol_max_notional,
+        symbol_max_notional_map=symbol_max_notional_map,
+        market_prices=market_prices if market_prices is not None else shared.get("market_prices"),
+    )
+    approved_rows = guard.get("approved") if isinstance(guard.get("approved"), list) else []
+    approved = [row.get("intent") for row in approved_rows if isinstance(row, dict) and isinstance(row.get("intent"), dict)]
+
+    return {
+        "mode": mode,
+        "workers": 1 if mode == "inline" else workers,
+        "profile_total": len(items),
+        "profile_errors": sum(1 for r in results if not r.get("ok")),
+        "profiles": results,
+        "intents": merged,
+        "approved_intents": approved,
+        "blocked_intents": guard.get("blocked") if isinstance(guard.get("blocked"), list) else [],
+        "portfolio_guard": guard,
+        "tick_wall_ms": round(tick_ms, 3),
+        "tick_sum_ms": round(sum(float(r.get("elapsed_ms") or 0.0) for r in results), 3),
+        "wall_ms": round((time.perf_counter() - t0) * 1000.0, 3),
+    }
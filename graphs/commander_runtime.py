@@ -24,6 +24,7 @@ from graphs.trading_graph import run_trading_graph
 from graphs.nodes.decide_trade import decide_trade
 from graphs.nodes.execute_from_packet import execute_from_packet
 from libs.runtime.resilience_state import ensure_runtime_resilience_state
+from libs.runtime.span_tracer import begin_trace, current_tracer, end_trace
 
 
 RuntimeMode = Literal["graph_spine", "decision_packet", "integrated_chain"]
@@ -338,16 +339,22 @@ def _run_integrated_chain(
     from graphs.nodes.monitor_node import monitor_node
     from graphs.nodes.decision_node import decision_node
 
-    state = strategist_node(state)
-    state = scanner_node(state)
-    state = monitor_node(state)
-    state = decision_node(state)
+    tracer = current_tracer(state)
+    for name, node in (
+        ("strategist", strategist_node),
+        ("scanner", scanner_node),
+        ("monitor", monitor_node),
+        ("decision", decision_node),
+    ):
+        with tracer.span(name):
+            state = node(state)
 
     decision = str(state.get("decision") or "").strip().lower()
     if decision == "approve":
         intent = _intent_from_monitor_state(state)
         state["decision_packet"] = _build_packet_from_state(state, intent=intent)
-        state = execute_fn(state)
+        with tracer.span("execute"):
+            state = execute_fn(state)
 
     state["path"] = "integrated_chain"
     return state
@@ -459,49 +466,36 @@ def run_commander_runtime(
     execute = execute or execute_from_packet
     integrated_runner = integrated_runner or (lambda s: _run_integrated_chain(s, execute_fn=execute))
 
+    tracer, owned_trace = begin_trace(state, "commander_runtime")
     try:
-        if selected == "decision_packet":
-            state = decide(state)
-            state = execute(state)
-            _log_commander_event(
-                state,
-                "end",
-                {
-                    "mode": selected,
-                    "status": state.get("runtime_status", "ok"),
-                    "path": "decision_packet",
-                    **_portfolio_guard_event_summary(state),
-                },
-            )
-            return state
-
-        if selected == "integrated_chain":
-            state = integrated_runner(state)
-            _log_commander_event(
-                state,
-                "end",
-                {
-                    "mode": selected,
-                    "status": state.get("runtime_status", "ok"),
-                    "path": "integrated_chain",
-                    **_portfolio_guard_event_summary(state),
-                },
-            )
-            return state
-
-        state = graph_runner(state)
+        with tracer.span("commander_runtime", mode=selected):
+            if selected == "decision_packet":
+                with tracer.span("decide"):
+                    state = decide(state)
+                with tracer.span("execute"):
+                    state = execute(state)
+            elif selected == "integrated_chain":
+                with tracer.span("integrated_chain"):
+                    state = integrated_runner(state)
+            else:
+                with tracer.span("graph_spine"):
+                    state = graph_runner(state)
+        if owned_trace:
+            end_trace(state, tracer)
         _log_commander_event(
             state,
             "end",
             {
                 "mode": selected,
                 "status": state.get("runtime_status", "ok"),
-                "path": "graph_spine",
+                "path": selected,
                 **_portfolio_guard_event_summary(state),
             },
         )
         return state
     except Exception as e:
+        if owned_trace:
+            end_trace(state, tracer)
         incident_payload = _register_commander_incident(state, error_type=type(e).__name__)
         state["runtime_status"] = "error"
         _log_commander_event(
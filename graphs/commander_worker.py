@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+"""M32-6: Long-lived warm commander runtime worker.
+
+`run_commander_runtime` and `execute_from_packet` rebuild their heavy components on
+every call: `ApiCatalog.load` over the catalog JSONL, a `Supervisor`, an executor, and
+(when hydration is enabled) a `CompositeSkillRunner` that re-reads the catalog, every
+`config/skills/*.yaml` and `Settings.from_env()`.
+
+The worker builds these once, injects them into each tick's state, and hot-reloads
+them when a watched config file changes (mtime/size). On every build the `.env` file is
+re-read and edited keys replace the values it loaded earlier (`load_env_file` alone never
+overrides a set key); keys set outside the file still win. Each tick records setup time
+(reload check / rebuild) separately from decision time (the runtime call itself).
+
+Injected state keys (never overwrite caller-provided ones):
+  - settings, api_catalog, supervisor, executor
+  - skill_runner_factory (lazy; hydration still only runs when requested)
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from graphs.commander_runtime import run_commander_runtime
+
+
+_INJECTED_KEYS = ("settings", "api_catalog", "supervisor", "executor", "skill_runner_factory")
+
+FileStamp = Tuple[str, int, int]
+
+
+def _stamp(path: Path) -> Optional[FileStamp]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (str(path), int(st.st_mtime_ns), int(st.st_size))
+
+
+def _default_catalog_path() -> str:
+    from graphs.nodes.execute_from_packet import _catalog_path_from_env
+
+    return _catalog_path_from_env()
+
+
+class WarmRuntimeComponents:
+    """Process-lifetime cache of catalog/settings/supervisor/executor/skill runner."""
+
+    def __init__(
+        self,
+        *,
+        catalog_path: Optional[str] = None,
+        skills_dir: Optional[str] = None,
+        env_path: str = ".env",
+        builders: Optional[Dict[str, Callable[..., Any]]] = None,
+    ):
+        self.catalog_path = str(catalog_path or _default_catalog_path())
+        self.skills_dir = str(skills_dir or os.getenv("SKILLS_DIR", "config/skills"))
+        self.env_path = str(env_path)
+        self._builders = dict(builders or {})
+        self.settings: Any = None
+        self.api_catalog: Any = None
+        self.supervisor: Any = None
+        self.executor: Any = None
+        self._skill_runner: Any = None
+        self._stamps: Tuple[Optional[FileStamp], ...] = ()
+        self._env_values: Dict[str, str] = {}
+        self._issued: Dict[str, Any] = {}
+        self._runner_factory = self._skill_runner_factory
+        self.build_count = 0
+        self.reload_count = 0
+        self.last_build_ms = 0.0
+
+    # ---- building -------------------------------------------------------
+
+    def _build(self, name: str, default: Callable[[], Any]) -> Any:
+        fn = self._builders.get(name)
+        return fn(self) if fn is not None else default()
+
+    def _apply_env_file(self) -> None:
+        # `load_env_file` never overrides a set key, so a reload would keep the old values.
+        # Keys whose process value still equals the previously read file value belong to the
+        # file and follow its edits (removed keys are unset); other process values still win.
+        from libs.core.settings import parse_env_file
+
+        values = parse_env_file(self.env_path)
+        for k, old in self._env_values.items():
+            if k not in values and os.environ.get(k) == old:
+                os.environ.pop(k, None)
+        for k, v in values.items():
+            if k not in os.environ or os.environ[k] == self._env_values.get(k, v):
+                os.environ[k] = v
+        self._env_values = values
+
+    def _build_settings(self) -> Any:
+        from libs.core.settings import Settings
+
+        return Settings.from_env(self.env_path)
+
+    def _build_catalog(self) -> Any:
+        from libs.catalog.api_catalog import ApiCatalog
+
+        return ApiCatalog.load(self.catalog_path)
+
+    def _build_supervisor(self) -> Any:
+        from libs.risk.supervisor import Supervisor
+
+        return Supervisor(settings=self.settings)
+
+    def _build_executor(self) -> Any:
+        from libs.execution.executors.factory import get_executor
+
+        return get_executor(settings=self.settings, catalog=self.api_catalog)
+
+    def _build_skill_runner(self) -> Any:
+        from libs.skills.runner import CompositeSkillRunner
+
+        return CompositeSkillRunner.from_env(settings=self.settings, catalog_path=self.catalog_path, skills_dir=self.skills_dir)
+
+    def watched_files(self) -> List[Path]:
+        files = [Path(self.catalog_path), Path(self.env_path)]
+        skills = Path(self.skills_dir)
+        if skills.is_dir():
+            files.extend(sorted(skills.glob("*.yaml")))
+        return files
+
+    def _current_stamps(self) -> Tuple[Optional[FileStamp], ...]:
+        return tuple(_stamp(p) for p in self.watched_files())
+
+    def build(self) -> float:
+        """(Re)build every component; returns build time in ms."""
+        t0 = time.perf_counter()
+        stamps = self._current_stamps()
+        self._apply_env_file()
+        self.settings = self._build("settings", self._build_settings)
+        self.api_catalog = self._build("api_catalog", self._build_catalog)
+        self.supervisor = self._build("supervisor", self._build_supervisor)
+        self.executor = self._build("executor", self._build_executor)
+        self._skill_runner = None
+        self._stamps = stamps
+        self.build_count += 1
+        self.last_build_ms = (time.perf_counter() - t0) * 1000.0
+        return self.last_build_ms
+
+    def refresh(self) -> bool:
+        """Rebuild when never built or a watched file changed. Returns True if rebuilt."""
+        if self.build_count == 0:
+            self.build()
+            return True
+        if self._current_stamps() == self._stamps:
+            return False
+        self.build()
+        self.reload_count += 1
+        return True
+
+    @property
+    def skill_runner(self) -> Any:
+        if self._skill_runner is None:
+            self._skill_runner = self._build("skill_runner", self._build_skill_runner)
+        return self._skill_runner
+
+    # ---- state injection -------------------------------------------------
+
+    def inject(self, state: Dict[str, Any]) -> List[str]:
+        """Inject components into `state`. Returns injected keys.
+
+        Caller-provided keys win; values injected earlier by this cache (long-lived loop
+        state) are replaced so a hot reload reaches them.
+        """
+        values = {
+            "settings": self.settings,
+            "api_catalog": self.api_catalog,
+            "supervisor": self.supervisor,
+            "executor": self.executor,
+            "skill_runner_factory": self._runner_factory,
+        }
+        injected: List[str] = []
+        for key in _INJECTED_KEYS:
+            current = state.get(key)
+            if values[key] is None:
+                continue
+            if current is None or (key in self._issued and current is self._issued[key]):
+                state[key] = values[key]
+                self._issued[key] = values[key]
+                injected.append(key)
+        return injected
+
+    def _skill_runner_factory(self, _state: Any = None) -> Any:
+        return self.skill_runner
+
+
+class CommanderRuntimeWorker:
+    """Runs commander ticks against one set of warm components."""
+
+    def __init__(
+        self,
+        components: Optional[WarmRuntimeComponents] = None,
+        *,
+        runtime: Callable[..., Dict[str, Any]] = run_commander_runtime,
+        runtime_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        self.components = components or WarmRuntimeComponents()
+        self.runtime = runtime
+        self.runtime_kwargs = dict(runtime_kwargs or {})
+        self.ticks = 0
+        self.cold_setup_ms = 0.0
+        self.history: List[Dict[str, Any]] = []
+
+    def start(self) -> float:
+        if self.components.build_count == 0:
+            self.cold_setup_ms = self.components.build()
+        return self.cold_setup_ms
+
+    def tick(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        self.start()
+        t0 = time.perf_counter()
+        reloaded = self.components.refresh()
+        injected = self.components.inject(state)
+        t1 = time.perf_counter()
+        try:
+            state = self.runtime(state, **self.runtime_kwargs)
+        finally:
+            t2 = time.perf_counter()
+            # keep per-tick state serializable; components live on the worker
+            for key in injected:
+                state.pop(key, None)
+            if state.get("skill_runner") is self.components._skill_runner:
+                state.pop("skill_runner", None)
+        self.ticks += 1
+        rec = {
+            "tick": self.ticks,
+            "setup_ms": round((t1 - t0) * 1000.0, 3),
+            "decision_ms": round((t2 - t1) * 1000.0, 3),
+            "reloaded": bool(reloaded),
+            "cold_setup_ms": round(self.cold_setup_ms, 3),
+        }
+        self.history.append(rec)
+        state["runtime_worker"] = rec
+        return state
+
+    def run(
+        self,
+        make_state: Callable[[int], Dict[str, Any]],
+        *,
+        ticks: int,
+        sleep_sec: float = 0.0,
+    ) -> List[Dict[str, Any]]:
+        outs: List[Dict[str, Any]] = []
+        for i in range(max(0, int(ticks))):
+            outs.append(self.tick(make_state(i)))
+            if sleep_sec > 0 and i + 1 < ticks:
+                time.sleep(float(sleep_sec))
+        return outs
+
+    def summary(self) -> Dict[str, Any]:
+        setup = [float(h["setup_ms"]) for h in self.history]
+        decision = [float(h["decision_ms"]) for h in self.history]
+        n = len(self.history)
+        return {
+            "ticks": n,
+            "cold_setup_ms": round(self.cold_setup_ms, 3),
+            "mean_setup_ms": round(sum(setup) / n, 3) if n else 0.0,
+            "mean_decision_ms": round(sum(decision) / n, 3) if n else 0.0,
+            "reloads": int(self.components.reload_count),
+            # what per-tick cold setup would have cost minus what the warm worker paid
+            "setup_saved_ms": round(max(0.0, self.cold_setup_ms * n - self.cold_setup_ms - sum(setup)), 3),
+        }
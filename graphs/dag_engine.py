@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+"""M32-8: Small DAG executor for graph nodes with declared state keys.
+
+Nodes declare the top-level state keys they read and write. Node B depends on an
+earlier-declared node A when their key sets conflict (A writes what B reads or
+writes, or B writes what A reads) or when B lists A in `after`. Nodes are grouped
+into levels (longest dependency path); a level with several nodes runs on a thread
+pool, each node on a shallow copy of the state, and their writes are merged back in
+declaration order so the result does not depend on completion order. In that copy
+the node's declared `reads` holding plain data (dicts / lists of scalars) are deep
+copies; undeclared keys and live objects (readers, clients) are shared with sibling
+nodes, so those must not be mutated in place and must be thread-safe themselves.
+
+Single-node levels run directly on the live state (no copy), so a fully dependent
+chain behaves exactly like calling the node functions one after another.
+
+Conditional steps use `when(state) -> bool` (checked when the level starts);
+`repeat_while(graph, predicate)` turns a sub-DAG into a loop node (retry_scan).
+
+M32-9: nodes marked `memo=True` in a graph built with `memo=True` are memoized. The
+cache key is a fingerprint of the node's declared `reads`; a rerun with the same
+inputs restores the cached declared writes instead of calling the node. The cache
+lives on the graph instance (one run of a preset graph) and hits show up in the
+node span as `cache="hit"`. A memoized node whose writes overlap its reads
+(portfolio_guard re-reads `intents`) must be idempotent: its output is also cached
+under the fingerprint of its own result, so the next pass hits. Memoization is opt-in
+(`memo_enabled`): live objects are fingerprinted by identity, so a node that does I/O
+through one must not be marked `memo=True`.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, is_dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from libs.runtime.span_tracer import current_tracer
+
+
+NodeFn = Callable[[Dict[str, Any]], Dict[str, Any]]
+AttrsFn = Callable[[str, Dict[str, Any]], Dict[str, Any]]
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class DagNode:
+    name: str
+    fn: NodeFn
+    reads: Tuple[str, ...] = ()
+    writes: Tuple[str, ...] = ()
+    after: Tuple[str, ...] = ()
+    when: Optional[Callable[[Dict[str, Any]], bool]] = None
+    memo: bool = False
+
+
+def _is_trueish(v: Any) -> bool:
+    if isinstance(v, bool):
+        return v
+    return str(v or "").strip().lower() in ("1", "true", "yes", "y", "on")
+
+
+def memo_enabled(state: Dict[str, Any]) -> bool:
+    """`state["graph_memo"]` wins; otherwise env `GRAPH_MEMO_ENABLED` (default off)."""
+    if "graph_memo" in state:
+        return _is_trueish(state.get("graph_memo"))
+    return _is_trueish(os.getenv("GRAPH_MEMO_ENABLED", "false"))
+
+
+def _fp_default(o: Any) -> Any:
+    if is_dataclass(o) and not isinstance(o, type):
+        return asdict(o)
+    if isinstance(o, (set, frozenset)):
+        return sorted(repr(x) for x in o)
+    # live objects (runners, readers): identity within the process; objects whose
+    # content changes underneath (streaming tables) expose an int `version`
+    version = getattr(o, "version", None)
+    if isinstance(version, int):
+        return f"<{type(o).__qualname__}@{id(o)}#{version}>"
+    return f"<{type(o).__qualname__}@{id(o)}>"
+
+
+def fingerprint(state: Dict[str, Any], keys: Sequence[str]) -> str:
+    """Stable hash of the values of `keys` (missing keys hash differently from None)."""
+    picked = {k: state[k] if k in state else "<missing>" for k in keys}
+    try:
+        raw = json.dumps(picked, sort_keys=True, default=_fp_default, ensure_ascii=False)
+    except (TypeError, ValueError):
+        raw = repr(sorted((k, repr(v)) for k, v in picked.items()))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _is_plain(v: Any, depth: int = 0) -> bool:
+    if v is None or isinstance(v, (str, int, float, bool)):
+        return True
+    if depth > 32:
+        return False
+    if isinstance(v, dict):
+        return all(isinstance(k, str) and _is_plain(x, depth + 1) for k, x in v.items())
+    if isinstance(v, (list, tuple)):
+        return all(_is_plain(x, depth + 1) for x in v)
+    return False
+
+
+def _snapshot(v: Any) -> Any:
+    # plain data is copied so later in-place edits cannot leak into the cache;
+    # live objects are kept by reference
+    return copy.deepcopy(v) if isinstance(v, (dict, list)) and _is_plain(v) else v
+
+
+@dataclass
+class DagGraph:
+    nodes: Sequence[DagNode]
+    name: str = "dag"
+    max_workers: int = 4
+    # extra span attributes after each node (e.g. candidate counts)
+    span_attrs: Optional[AttrsFn] = None
+    # memoize nodes declared with memo=True (cache lives on this instance)
+    memo: bool = False
+    _levels: List[List[DagNode]] = field(init=False, repr=False)
+    # last run summary (levels, skipped nodes, undeclared writes); not stored in state
+    last_report: Dict[str, Any] = field(init=False, repr=False, default_factory=dict)
+    _cache: Dict[Tuple[str, str], Dict[str, Any]] = field(init=False, repr=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        names = [n.name for n in self.nodes]
+        if len(set(names)) != len(names):
+            raise ValueError(f"duplicate DAG node names in {self.name}: {names}")
+        self._levels = self._build_levels()
+
+    @staticmethod
+    def _conflicts(a: DagNode, b: DagNode) -> bool:
+        wa, wb = set(a.writes), set(b.writes)
+        return bool(wa & set(b.reads) or wa & wb or wb & set(a.reads))
+
+    def _build_levels(self) -> List[List[DagNode]]:
+        index = {n.name: i for i, n in enumerate(self.nodes)}
+        level_of: List[int] = []
+        for j, node in enumerate(self.nodes):
+            lvl = 0
+            for dep in node.after:
+                if dep not in index:
+                    raise ValueError(f"unknown dependency {dep!r} for node {node.name!r}")
+                if index[dep] >= j:
+                    raise ValueError(f"node {node.name!r} must be declared after {dep!r}")
+                lvl = max(lvl, level_of[index[dep]] + 1)
+            for i in range(j):
+                if self._conflicts(self.nodes[i], node):
+                    lvl = max(lvl, level_of[i] + 1)
+            level_of.append(lvl)
+        levels: List[List[DagNode]] = [[] for _ in range(max(level_of, default=-1) + 1)]
+        for node, lvl in zip(self.nodes, level_of):
+            levels[lvl].append(node)
+        return levels
+
+    def levels(self) -> List[List[str]]:
+        return [[n.name for n in lvl] for lvl in self._levels]
+
+    def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        return self.run(state)
+
+    # ---- execution --------------------------------------------------------
+
+    def _attrs_after(self, node: DagNode, out: Dict[str, Any], base: Dict[str, Any]) -> Dict[str, Any]:
+        attrs = dict(base)
+        if self.span_attrs is not None:
+            try:
+                attrs.update(self.span_attrs(node.name, out))
+            except Exception:
+                pass
+        return attrs
+
+    def _call(self, node: DagNode, state: Dict[str, Any], use_memo: bool) -> Tuple[Dict[str, Any], str]:
+        """Run (or restore) one node. Returns `(state, cache)` with cache "", "hit" or "miss"."""
+        if not (use_memo and node.memo):
+            return node.fn(state), ""
+        key = (node.name, fingerprint(state, node.reads))
+        cached = self._cache.get(key)
+        if cached is not None:
+            for k, v in cached.items():
+                if v is _MISSING:
+                    state.pop(k, None)
+                else:
+                    state[k] = _snapshot(v)
+            return state, "hit"
+        out = node.fn(state)
+        entry = {k: _snapshot(out[k]) if k in out else _MISSING for k in node.writes}
+        self._cache[key] = entry
+        if set(node.reads) & set(node.writes):
+            self._cache[(node.name, fingerprint(out, node.reads))] = entry
+        return out, "miss"
+
+    def _run_single(
+        self, node: DagNode, state: Dict[str, Any], tracer: Any, attrs: Dict[str, Any], use_memo: bool
+    ) -> Tuple[Dict[str, Any], str]:
+        with tracer.span(node.name, **attrs) as span_attrs:
+            out, cache = self._call(node, state, use_memo)
+            if tracer.enabled:
+                span_attrs.update(self._attrs_after(node, out, {"cache": cache} if cache else {}))
+        return out, cache
+
+    def _run_parallel(
+        self, level: List[DagNode], state: Dict[str, Any], tracer: Any, attrs: Dict[str, Any], use_memo: bool
+    ) -> Tuple[Dict[str, Any], List[str], List[str]]:
+        def call(node: DagNode) -> Tuple[Dict[str, Any], Dict[str, Any], int, int, str]:
+            view = dict(state)
+            # declared plain-data reads are deep-copied so an in-place edit of a nested
+            # value cannot race a sibling node; live objects stay shared (see module doc)
+            for key in node.reads:
+                if key in view:
+                    view[key] = _snapshot(view[key])
+            before = dict(view)
+            t0 = time.perf_counter_ns()
+            out, cache = self._call(node, view, use_memo)
+            return out, before, t0, time.perf_counter_ns() - t0, cache
+
+        workers = max(1, min(int(self.max_workers), len(level)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"dag-{self.name}") as pool:
+            futures = [pool.submit(call, node) for node in level]
+            results = [f.result() for f in futures]  # re-raises the first failure in declaration order
+
+        undeclared: List[str] = []
+        hits: List[str] = []
+        for node, (out, before, t0, dur, cache) in zip(level, results):
+            if cache == "hit":
+                hits.append(node.name)
+            declared = set(node.writes)
+            for key in node.writes:
+                val = out.get(key, _MISSING)
+                if val is _MISSING:
+                    if key in before:
+                        state.pop(key, None)
+                else:
+                    state[key] = val
+            # undeclared top-level writes are still merged (declaration order) but reported
+            for key, val in out.items():
+                if key in declared:
+                    continue
+                if before.get(key, _MISSING) is not val:
+                    state[key] = val
+                    undeclared.append(f"{node.name}:{key}")
+            extra = {**attrs, "parallel": len(level), **({"cache": cache} if cache else {})}
+            tracer.record(node.name, t0, dur, **self._attrs_after(node, out, extra))
+        return state, undeclared, hits
+
+    def run(self, state: Dict[str, Any], *, attrs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        tracer = current_tracer(state)
+        base = dict(attrs or {})
+        use_memo = self.memo and memo_enabled(state)
+        report: Dict[str, Any] = {"levels": self.levels(), "skipped": [], "undeclared_writes": [], "cache_hits": []}
+        for level in self._levels:
+            active = [n for n in level if n.when is None or bool(n.when(state))]
+            report["skipped"].extend(n.name for n in level if n not in active)
+            if not active:
+                continue
+            if len(active) == 1:
+                state, cache = self._run_single(active[0], state, tracer, base, use_memo)
+                if cache == "hit":
+                    report["cache_hits"].append(active[0].name)
+                continue
+            state, undeclared, hits = self._run_parallel(active, state, tracer, base, use_memo)
+            report["undeclared_writes"].extend(undeclared)
+            report["cache_hits"].extend(hits)
+        self.last_report = report
+        return state
+
+
+def union_keys(nodes: Sequence[DagNode]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """(reads, writes) of a node group, for declaring a sub-DAG as one node."""
+    reads: List[str] = []
+    writes: List[str] = []
+    for n in nodes:
+        reads.extend(k for k in n.reads if k not in reads)
+        writes.extend(k for k in n.writes if k not in writes)
+    return tuple(reads), tuple(writes)
+
+
+class RepeatWhile:
+    """Loop node: run `graph` once, then again while `predicate(state)` holds.
+
+    Each pass gets span attribute `attempt` (0-based); `last_attempt` keeps the final
+    attempt index of the latest call (retry count).
+    """
+
+    def __init__(self, graph: DagGraph, predicate: Callable[[Dict[str, Any]], bool]):
+        self.graph = graph
+        self.predicate = predicate
+        self.last_attempt = 0
+
+    def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        attempt = 0
+        state = self.graph.run(state, attrs={"attempt": attempt})
+        while self.predicate(state):
+            attempt += 1
+            state = self.graph.run(state, attrs={"attempt": attempt})
+        self.last_attempt = attempt
+        return state
+
+
+def repeat_while(graph: DagGraph, predicate: Callable[[Dict[str, Any]], bool]) -> RepeatWhile:
+    return RepeatWhile(graph, predicate)
@@ -1,9 +1,38 @@
 from __future__ import annotations
 
+from graphs.dag_engine import DagGraph, DagNode
 from graphs.nodes.build_market_snapshot import build_market_snapshot
 from graphs.nodes.build_portfolio_snapshot import build_portfolio_snapshot
 
 
+def _market(state: dict) -> dict:
+    return build_market_snapshot(state)
+
+
+def _portfolio(state: dict) -> dict:
+    return build_portfolio_snapshot(state)
+
+
+def _combine(state: dict) -> dict:
+    state["snapshots"] = {
+        "market": state.get("market_snapshot"),
+        "portfolio": state.get("portfolio_snapshot"),
+    }
+    return state
+
+
+# M32-8: the two reads are independent (price vs account) and run concurrently.
+SNAPSHOTS_DAG = DagGraph(
+    [
+        DagNode("market_snapshot", _market, reads=("symbol", "price_reader"), writes=("market_snapshot",)),
+        DagNode("portfolio_snapshot", _portfolio, reads=("portfolio_reader",), writes=("portfolio_snapshot",)),
+        DagNode("snapshots", _combine, reads=("market_snapshot", "portfolio_snapshot"), writes=("snapshots",)),
+    ],
+    name="build_snapshots",
+    max_workers=2,
+)
+
+
 def build_snapshots(state: dict) -> dict:
     """M9-4 node: build both market_snapshot and portfolio_snapshot.
 
@@ -15,12 +44,7 @@ def build_snapshots(state: dict) -> dict:
       - state['market_snapshot']
       - state['portfolio_snapshot']
       - state['snapshots'] = {'market': ..., 'portfolio': ...}
-    """
-    state = build_market_snapshot(state)
-    state = build_portfolio_snapshot(state)
 
-    state["snapshots"] = {
-        "market": state.get("market_snapshot"),
-        "portfolio": state.get("portfolio_snapshot"),
-    }
-    return state
+    M32-8: market and portfolio snapshots are fetched in parallel (SNAPSHOTS_DAG).
+    """
+    return SNAPSHOTS_DAG.run(state)
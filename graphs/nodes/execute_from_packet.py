@@ -363,6 +363,7 @@ def execute_from_packet(state: dict) -> dict:
     Expects:
       - state['decision_packet']  # dict form
       - state['catalog_path'] optional (fallback: env KIWOOM_API_CATALOG_PATH)
+      - optional: state['api_catalog'] preloaded catalog (M32-6 warm worker; skips reload)
       - state['run_id'] optional (auto-generate if missing)
       - optional: state['executor'] injected for tests
       - optional: state['supervisor'] injected for tests
@@ -385,8 +386,10 @@ def execute_from_packet(state: dict) -> dict:
     try:
         packet: Dict[str, Any] = state["decision_packet"]
 
-        catalog_path = state.get("catalog_path") or _catalog_path_from_env()
-        catalog = ApiCatalog.load(catalog_path)
+        catalog = state.get("api_catalog")
+        if catalog is None:
+            catalog_path = state.get("catalog_path") or _catalog_path_from_env()
+            catalog = ApiCatalog.load(catalog_path)
 
         supervisor = state.get("supervisor")
         if supervisor is None:
@@ -156,11 +156,25 @@ def _fetch_market_quotes(
     *,
     run_id: str,
     symbols: List[str],
+    quote_table: Any = None,
 ) -> Tuple[Any, Dict[str, Any]]:
     ready_map: Dict[str, Dict[str, Any]] = {}
     errors: List[str] = []
     attempted = 0
+    streamed = 0
+    if quote_table is not None and hasattr(quote_table, "snapshot"):
+        # M32-23: symbols with a fresh streamed trade price need no market.quote call
+        if hasattr(quote_table, "watch"):
+            quote_table.watch(symbols)
+        fresh = quote_table.snapshot(symbols=symbols)
+        for sym in symbols:
+            row = fresh.get(_norm_symbol(sym))
+            if row is not None and row.get("price"):
+                ready_map[sym] = dict(row)
+        streamed = len(ready_map)
     for sym in symbols:
+        if sym in ready_map:
+            continue
         attempted += 1
         raw = runner.run(run_id=run_id, skill="market.quote", args={"symbol": sym})
         rec = _skill_output_to_record(raw)
@@ -186,7 +200,8 @@ def _fetch_market_quotes(
 
     meta = {
         "attempted": attempted,
-        "ready": len(ready_map),
+        "ready": len(ready_map) - streamed,
+        "streamed": streamed,
         "errors": errors,
     }
     return value, meta
@@ -229,6 +244,52 @@ def _fetch_order_status(
     return rec, {"attempted": 1, "ready": 0 if reason else 1, "errors": ([f"order.status:{reason}"] if reason else [])}
 
 
+def _poll_order_tracker(
+    state: Dict[str, Any],
+    tracker: Any,
+    runner: Any,
+    *,
+    run_id: str,
+    order_ref: Dict[str, Any] | None,
+) -> Tuple[Any, Dict[str, Any], Any]:
+    """M32-20: account.orders through the tracker (one call per poll interval, none when idle).
+
+    Returns (account.orders value, fetch meta, order.status value for `order_ref` or None).
+    """
+    ref = dict(order_ref or {})
+    if ref.get("ord_no"):
+        tracker.track(ref.get("ord_no"), symbol=ref.get("symbol"), order_qty=ref.get("order_qty"))
+
+    fetched: Dict[str, Any] = {}
+
+    def _fetch() -> Any:
+        rec, meta = _fetch_account_orders(runner, run_id=run_id)
+        fetched["rec"], fetched["meta"] = rec, meta
+        return rec
+
+    events = tracker.poll(fetch_fn=_fetch, force=tracker.last_value is None and tracker.last_error is None)
+    state["order_events"] = events
+    state["order_lifecycles"] = tracker.lifecycles()
+
+    order_status_value = None
+    if ref.get("ord_no"):
+        # terminal orders are remembered by the tracker, so a later tick still sees the final state
+        life = tracker.status(ref.get("ord_no"))
+        if life is not None:
+            order_status_value = {
+                "ord_no": life.get("ord_no"),
+                "symbol": life.get("symbol"),
+                "status": life.get("status_raw") or life.get("stage"),
+                "filled_qty": life.get("filled_qty"),
+                "order_qty": life.get("order_qty"),
+            }
+
+    if "rec" in fetched:
+        return fetched["rec"], fetched["meta"], order_status_value
+    # not due: reuse the last account.orders result, no upstream call
+    return tracker.last_value, {"attempted": 0, "ready": 0, "errors": []}, order_status_value
+
+
 def hydrate_skill_results_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """Fetch skill outputs and store them in canonical `state["skill_results"]`.
 
@@ -238,6 +299,11 @@ def hydrate_skill_results_node(state: Dict[str, Any]) -> Dict[str, Any]:
       - `candidates`: scanner candidates (for market.quote fan-out)
       - `order_ref`: {ord_no, symbol, ord_dt, qry_tp} for order.status
       - `run_id`: existing run id
+      - `order_tracker`: `OrderStatusTracker` (M32-20); account.orders is then fetched only
+        when the tracker is due, `order_ref` is answered from it (no order.status call),
+        and `order_events` / `order_lifecycles` are written
+      - `quote_table`: `QuoteTable` (M32-23); candidates are watched (streamed), and those
+        with a fresh streamed quote skip the market.quote call
     """
     runner, runner_source, runner_errors = _resolve_runner(state)
     if runner is None or not hasattr(runner, "run"):
@@ -264,13 +330,23 @@ def hydrate_skill_results_node(state: Dict[str, Any]) -> Dict[str, Any]:
     symbols = _unique_symbols(candidates, limit=candidate_k)
     order_ref = state.get("order_ref") if isinstance(state.get("order_ref"), dict) else None
 
-    market_quote_value, mq = _fetch_market_quotes(runner, run_id=run_id, symbols=symbols)
-    account_orders_value, ao = _fetch_account_orders(runner, run_id=run_id)
-    order_status_value, os = _fetch_order_status(runner, run_id=run_id, order_ref=order_ref)
+    market_quote_value, mq = _fetch_market_quotes(
+        runner, run_id=run_id, symbols=symbols, quote_table=state.get("quote_table")
+    )
+    tracker = state.get("order_tracker")
+    if tracker is not None and hasattr(tracker, "poll"):
+        account_orders_value, ao, order_status_value = _poll_order_tracker(
+            state, tracker, runner, run_id=run_id, order_ref=order_ref
+        )
+        os = {"attempted": 0, "ready": 0, "errors": []}
+    else:
+        account_orders_value, ao = _fetch_account_orders(runner, run_id=run_id)
+        order_status_value, os = _fetch_order_status(runner, run_id=run_id, order_ref=order_ref)
 
     skill_results = dict(state.get("skill_results") or {}) if isinstance(state.get("skill_results"), dict) else {}
     skill_results["market.quote"] = market_quote_value
-    skill_results["account.orders"] = account_orders_value
+    if account_orders_value is not None:
+        skill_results["account.orders"] = account_orders_value
     if order_status_value is not None:
         skill_results["order.status"] = order_status_value
     state["skill_results"] = skill_results
@@ -290,6 +366,7 @@ def hydrate_skill_results_node(state: Dict[str, Any]) -> Dict[str, Any]:
             "account.orders": int(ao.get("ready") or 0),
             "order.status": int(os.get("ready") or 0),
         },
+        "streamed": {"market.quote": int(mq.get("streamed") or 0)},
         "errors_total": len(errors),
         "errors": errors,
     }
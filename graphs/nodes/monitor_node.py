@@ -2,15 +2,19 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 from graphs.nodes.skill_contracts import (
     CONTRACT_VERSION as SKILL_CONTRACT_VERSION,
     extract_market_quotes,
     extract_order_status,
 )
-from libs.runtime.exit_policy import evaluate_exit_policy
-from libs.runtime.position_sizing import evaluate_position_size
+from libs.execution.order_status_tracker import derive_order_lifecycle as _derive_order_lifecycle
+from libs.runtime.exit_policy import evaluate_exit_policy, evaluate_exit_policy_batch, exit_policy_row
+from libs.runtime.position_sizing import evaluate_position_size, evaluate_position_size_batch, position_size_row
+
+# M32-18: entry intents per tick when `monitor_max_entry_intents` is not set (0 = no limit)
+DEFAULT_MAX_ENTRY_INTENTS = 5
 
 
 def _to_int(v: Any) -> int:
@@ -20,10 +24,6 @@ def _to_int(v: Any) -> int:
         return 0
 
 
-def _normalize_status(v: Any) -> str:
-    return str(v or "").strip().upper()
-
-
 def _to_float(v: Any) -> float:
     try:
         return float(v)
@@ -101,7 +101,12 @@ def _position_by_symbol(state: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
     return out
 
 
-def _resolve_price(state: Dict[str, Any], symbol: str, selected: Dict[str, Any] | None) -> float | None:
+def _resolve_price(
+    state: Dict[str, Any],
+    symbol: str,
+    selected: Dict[str, Any] | None,
+    quotes: Optional[Dict[str, Any]] = None,
+) -> float | None:
     sym = _norm_symbol(symbol)
     if not sym:
         return None
@@ -129,7 +134,8 @@ def _resolve_price(state: Dict[str, Any], symbol: str, selected: Dict[str, Any]
             if p > 0.0:
                 return p
 
-    quotes, _meta = extract_market_quotes(state)
+    if quotes is None:
+        quotes, _meta = extract_market_quotes(state)
     q = quotes.get(sym)
     if isinstance(q, dict):
         for k in ("price", "cur"):
@@ -140,54 +146,193 @@ def _resolve_price(state: Dict[str, Any], symbol: str, selected: Dict[str, Any]
     return None
 
 
-def _derive_order_lifecycle(order_status: Dict[str, Any] | None) -> Dict[str, Any] | None:
-    if not isinstance(order_status, dict):
-        return None
+def _symbol_thresholds(policy: Dict[str, Any], symbol: str, key: str) -> Any:
+    by_symbol = policy.get("exit_thresholds_by_symbol")
+    if isinstance(by_symbol, dict):
+        row = by_symbol.get(symbol)
+        if isinstance(row, dict):
+            return row.get(key)
+    return None
+
 
-    status = _normalize_status(order_status.get("status"))
-    filled_qty = max(0, _to_int(order_status.get("filled_qty")))
-    order_qty = max(0, _to_int(order_status.get("order_qty")))
-
-    if order_qty > 0:
-        progress = min(1.0, float(filled_qty) / float(order_qty))
-    else:
-        progress = 0.0
-
-    cancelled_keys = ("CANCEL", "CANCELED", "CANCELLED")
-    rejected_keys = ("REJECT", "DENY", "BLOCK")
-    filled_keys = ("FILLED", "DONE")
-    partial_keys = ("PARTIAL", "WORKING_PARTIAL")
-
-    stage = "working"
-    terminal = False
-
-    if any(k in status for k in cancelled_keys):
-        stage = "cancelled"
-        terminal = True
-    elif any(k in status for k in rejected_keys):
-        stage = "rejected"
-        terminal = True
-    elif (order_qty > 0 and filled_qty >= order_qty) or any(k in status for k in filled_keys):
-        stage = "filled"
-        terminal = True
-        progress = 1.0
-    elif (filled_qty > 0 and order_qty > 0 and filled_qty < order_qty) or any(k in status for k in partial_keys):
-        stage = "partial_fill"
-        terminal = False
-    elif not status:
-        stage = "unknown"
-        terminal = False
-
-    return {
-        "ord_no": order_status.get("ord_no"),
-        "symbol": order_status.get("symbol"),
-        "status_raw": order_status.get("status"),
-        "stage": stage,
-        "terminal": terminal,
-        "filled_qty": filled_qty,
-        "order_qty": order_qty,
-        "progress": float(progress),
+def _monitor_book(
+    state: Dict[str, Any],
+    *,
+    policy: Dict[str, Any],
+    plan: Dict[str, Any],
+    selected: Any,
+    use_exit_policy: bool,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """M32-18 multi-intent pass: batch exit checks for every position, sizing for every survivor.
+
+    Entries are sized in scan order against the cash left after the earlier entries'
+    notional, and capped at `monitor_max_entry_intents` (default DEFAULT_MAX_ENTRY_INTENTS).
+    Per-symbol thresholds come from `policy.exit_thresholds_by_symbol[SYMBOL]`
+    (`stop_loss_pct` / `take_profit_pct`); they feed both the exit check and the sizing stop distance.
+    Exit (SELL) intents come first; a symbol that exits gets no entry intent in the same tick.
+    """
+    quotes, _meta = extract_market_quotes(state)
+    thesis = str(plan.get("thesis") or "")
+    scan_rows: List[Dict[str, Any]] = []
+    seen = set()
+    raw_rows = state.get("scan_results") if isinstance(state.get("scan_results"), list) else []
+    if not raw_rows and isinstance(selected, dict):
+        raw_rows = [selected]
+    for row in raw_rows:
+        if isinstance(row, dict) and _norm_symbol(row.get("symbol")) and _norm_symbol(row.get("symbol")) not in seen:
+            seen.add(_norm_symbol(row.get("symbol")))
+            scan_rows.append(row)
+    scan_by_symbol = {_norm_symbol(r.get("symbol")): r for r in scan_rows}
+
+    intents: List[Dict[str, Any]] = []
+    exits: List[Dict[str, Any]] = []
+    exit_info: Dict[str, Any] = {
+        "enabled": bool(use_exit_policy),
+        "evaluated": False,
+        "triggered": False,
+        "reason": "",
+        "symbol": None,
+        "qty": 0,
+        "pnl_ratio": None,
+        "price": None,
+        "avg_price": None,
     }
+    exiting = set()
+    if use_exit_policy:
+        exit_policy = policy.get("exit_policy") if isinstance(policy.get("exit_policy"), dict) else policy
+        held = list(_position_by_symbol(state).items())
+        symbols = [sym for sym, _ in held]
+        qtys = [max(0, _to_int(pos.get("qty"))) for _, pos in held]
+        avgs = [_to_float(pos.get("avg_price")) for _, pos in held]
+        prices = [_resolve_price(state, sym, scan_by_symbol.get(sym), quotes=quotes) for sym in symbols]
+        batch = evaluate_exit_policy_batch(
+            prices=prices,
+            avg_prices=[a if a > 0.0 else None for a in avgs],
+            qtys=qtys,
+            policy=exit_policy,
+            stop_loss_pcts=[_symbol_thresholds(policy, sym, "stop_loss_pct") for sym in symbols],
+            take_profit_pcts=[_symbol_thresholds(policy, sym, "take_profit_pct") for sym in symbols],
+        )
+        for i, sym in enumerate(symbols):
+            decision = exit_policy_row(batch, i)
+            avg_price = avgs[i] if avgs[i] > 0.0 else None
+            row = {
+                "symbol": sym,
+                "qty": int(qtys[i]),
+                "triggered": bool(decision["triggered"]),
+                "reason": str(decision["reason"]),
+                "pnl_ratio": decision["pnl_ratio"],
+                "price": prices[i],
+                "avg_price": avg_price,
+                "thresholds": decision["thresholds"],
+            }
+            exits.append(row)
+            if not decision["triggered"] or qtys[i] <= 0:
+                continue
+            exiting.add(sym)
+            intents.append(
+                {
+                    "symbol": sym,
+                    "side": "SELL",
+                    "qty": int(qtys[i]),
+                    "thesis": thesis,
+                    "meta": {
+                        "exit_reason": str(decision["reason"]),
+                        "pnl_ratio": decision["pnl_ratio"],
+                        "avg_price": avg_price,
+                        "price": prices[i],
+                        "source": "monitor_exit_policy",
+                    },
+                }
+            )
+        focus = next((r for r in exits if r["triggered"]), None) or next(
+            (r for r in exits if isinstance(selected, dict) and r["symbol"] == _norm_symbol(selected.get("symbol"))), None
+        )
+        if focus is not None:
+            exit_info = {"enabled": True, "evaluated": True, **focus}
+
+    raw_max = policy.get("monitor_max_entry_intents")
+    max_entries = DEFAULT_MAX_ENTRY_INTENTS if raw_max is None else max(0, _to_int(raw_max))
+    entry_rows = [r for r in scan_rows if _norm_symbol(r.get("symbol")) not in exiting]
+    if max_entries > 0:
+        entry_rows = entry_rows[:max_entries]
+    use_position_sizing = _is_trueish(state.get("use_position_sizing")) or _is_trueish(policy.get("use_position_sizing"))
+    sizing_rows: List[Dict[str, Any]] = []
+    if use_position_sizing and entry_rows:
+        # Entries share one cash balance: each row is sized against the cash left after the
+        # notional committed by the entries before it, so the book never exceeds the cash.
+        sizing_policy = policy.get("position_sizing") if isinstance(policy.get("position_sizing"), dict) else policy
+        risk_context = state.get("risk_context") if isinstance(state.get("risk_context"), dict) else {}
+        entry_syms = [_norm_symbol(r.get("symbol")) for r in entry_rows]
+        batch = evaluate_position_size_batch(
+            prices=[_resolve_price(state, sym, r, quotes=quotes) for sym, r in zip(entry_syms, entry_rows)],
+            cash=_resolve_cash(state),
+            policy=sizing_policy,
+            risk_context=risk_context,
+            stop_loss_pcts=[_symbol_thresholds(policy, sym, "stop_loss_pct") for sym in entry_syms],
+            sequential_cash=True,
+        )
+        sizing_rows = [position_size_row(batch, i) for i in range(len(entry_rows))]
+
+    entries: List[Dict[str, Any]] = []
+    sizing_info: Dict[str, Any] = {
+        "enabled": bool(use_position_sizing),
+        "evaluated": False,
+        "qty": 1 if not use_position_sizing else 0,
+        "reason": "disabled" if not use_position_sizing else "",
+        "price": None,
+        "cash": None,
+        "inputs": {},
+    }
+    selected_symbol = _norm_symbol(selected.get("symbol")) if isinstance(selected, dict) else ""
+    for i, row in enumerate(entry_rows):
+        symbol = str(row.get("symbol"))
+        qty = 1
+        sizing: Optional[Dict[str, Any]] = None
+        if sizing_rows:
+            sz = sizing_rows[i]
+            qty = max(0, _to_int(sz.get("qty")))
+            sizing = {
+                "enabled": True,
+                "evaluated": bool(sz.get("evaluated")),
+                "qty": int(qty),
+                "reason": str(sz.get("reason") or ""),
+                "price": sz.get("price"),
+                "cash": sz.get("cash"),
+                "inputs": sz.get("inputs") if isinstance(sz.get("inputs"), dict) else {},
+            }
+            if i == 0 or _norm_symbol(symbol) == selected_symbol:
+                sizing_info = sizing
+        entries.append({"symbol": symbol, "qty": int(qty), "reason": sizing["reason"] if sizing else "disabled"})
+        if qty <= 0:
+            continue
+        intent = {
+            "symbol": symbol,
+            "side": "BUY",
+            "qty": int(qty),
+            "thesis": thesis,
+            "meta": {
+                "score": row.get("score"),
+                "risk_score": row.get("risk_score"),
+                "confidence": row.get("confidence"),
+            },
+        }
+        if sizing is not None:
+            intent["meta"]["sizing"] = {
+                "reason": sizing["reason"],
+                "price": sizing["price"],
+                "cash": sizing["cash"],
+                "inputs": sizing["inputs"],
+            }
+        intents.append(intent)
+
+    book = {
+        "entries": entries,
+        "exits": exits,
+        "entry_intent_count": sum(1 for x in intents if x["side"] == "BUY"),
+        "exit_intent_count": sum(1 for x in intents if x["side"] == "SELL"),
+    }
+    return intents, sizing_info, exit_info, book
 
 
 def monitor_node(state: Dict[str, Any]) -> Dict[str, Any]:
@@ -196,6 +341,9 @@ def monitor_node(state: Dict[str, Any]) -> Dict[str, Any]:
     Responsibility:
       - emit at most one intent from selected candidate
       - attach optional order status/lifecycle observation from skill DTOs
+
+    M32-18: with `monitor_multi_intent` (state or policy) the node sizes every scan survivor and
+    runs exit checks for the whole book in one batch pass, emitting multiple intents.
     """
     selected = state.get("selected")
     plan = state.get("plan") or {}
@@ -212,7 +360,8 @@ def monitor_node(state: Dict[str, Any]) -> Dict[str, Any]:
         "cash": None,
         "inputs": {},
     }
-    if isinstance(selected, dict) and selected.get("symbol"):
+    multi_intent = _is_trueish(state.get("monitor_multi_intent")) or _is_trueish(policy.get("monitor_multi_intent"))
+    if not multi_intent and isinstance(selected, dict) and selected.get("symbol"):
         symbol = str(selected.get("symbol"))
         qty = 1
         use_position_sizing = _is_trueish(state.get("use_position_sizing")) or _is_trueish(policy.get("use_position_sizing"))
@@ -282,7 +431,7 @@ def monitor_node(state: Dict[str, Any]) -> Dict[str, Any]:
         "price": None,
         "avg_price": None,
     }
-    if use_exit_policy and isinstance(selected, dict) and selected.get("symbol"):
+    if use_exit_policy and not multi_intent and isinstance(selected, dict) and selected.get("symbol"):
         symbol = _norm_symbol(selected.get("symbol"))
         pos_map = _position_by_symbol(state)
         pos = pos_map.get(symbol, {})
@@ -324,9 +473,17 @@ def monitor_node(state: Dict[str, Any]) -> Dict[str, Any]:
                 }
             ]
 
+    book: Dict[str, Any] = {}
+    if multi_intent:
+        intents, sizing_info, exit_info, book = _monitor_book(
+            state, policy=policy, plan=plan, selected=selected, use_exit_policy=use_exit_policy
+        )
+
     order_status, order_status_meta = extract_order_status(state)
     order_lifecycle = _derive_order_lifecycle(order_status)
     fallback_reasons = list(order_status_meta.get("errors") or [])
+    tracked_orders = state.get("order_lifecycles") if isinstance(state.get("order_lifecycles"), list) else None
+    order_events = state.get("order_events") if isinstance(state.get("order_events"), list) else []
 
     state["intents"] = intents
     state["monitor"] = {
@@ -342,6 +499,10 @@ def monitor_node(state: Dict[str, Any]) -> Dict[str, Any]:
         "order_status_error_count": len(fallback_reasons),
         "order_lifecycle_loaded": bool(order_lifecycle),
         "order_lifecycle": order_lifecycle,
+        "order_tracker_loaded": tracked_orders is not None,
+        "open_order_count": len(tracked_orders or []),
+        "order_event_count": len(order_events),
+        "order_fill_event_count": sum(1 for e in order_events if isinstance(e, dict) and int(e.get("fill_delta") or 0) > 0),
         "exit_policy_enabled": bool(exit_info.get("enabled")),
         "exit_evaluated": bool(exit_info.get("evaluated")),
         "exit_triggered": bool(exit_info.get("triggered")),
@@ -353,7 +514,12 @@ def monitor_node(state: Dict[str, Any]) -> Dict[str, Any]:
         "position_sizing_evaluated": bool(sizing_info.get("evaluated")),
         "position_sizing_qty": int(sizing_info.get("qty") or 0),
         "position_sizing_reason": str(sizing_info.get("reason") or ""),
+        "multi_intent": bool(multi_intent),
+        "entry_intent_count": int(book.get("entry_intent_count") or 0),
+        "exit_intent_count": int(book.get("exit_intent_count") or 0),
     }
+    if multi_intent:
+        state["monitor_book"] = book
     state["monitor_exit"] = exit_info
     state["monitor_sizing"] = sizing_info
     _log_monitor_summary(
@@ -170,6 +170,29 @@ def _extract_feature_engine_map(state: Dict[str, Any]) -> Tuple[Dict[str, Dict[s
         except Exception as e:
             errors.append(f"feature_engine:error:{type(e).__name__}")
 
+    # Priority 4 (M32-23): bars built incrementally by the streaming quote table;
+    # M32-24: a market bus reader carries features published by the ingest process.
+    table = state.get("quote_table")
+    if table is not None and hasattr(table, "features"):
+        try:
+            published = table.features()
+            if published:
+                return {_norm_symbol(k): dict(v) for k, v in published.items() if _norm_symbol(k)}, "state.quote_table.features", errors
+        except Exception as e:
+            errors.append(f"feature_engine:error:{type(e).__name__}")
+    if table is not None and hasattr(table, "ohlcv_by_symbol"):
+        try:
+            policy = state.get("policy") if isinstance(state.get("policy"), dict) else {}
+            built = build_feature_map(
+                table.ohlcv_by_symbol(),
+                trend_gap_threshold=float(policy.get("feature_trend_gap_threshold", 0.01)),
+                high_vol_threshold=float(policy.get("feature_high_vol_threshold", 0.03)),
+            )
+            if built:
+                return {_norm_symbol(k): v for k, v in built.items() if _norm_symbol(k)}, "state.quote_table.bars", errors
+        except Exception as e:
+            errors.append(f"feature_engine:error:{type(e).__name__}")
+
     return {}, "none", errors
 
 
@@ -127,6 +127,15 @@ def extract_market_quotes(state: Dict[str, Any]) -> Tuple[Dict[str, Dict[str, An
 
     if present and not out and not errors:
         errors.append("market.quote:contract_violation")
+
+    # M32-23: fresh rows of a streaming quote table win over polled skill quotes
+    # (only rows with a trade price; None fields never overwrite polled ones)
+    table = state.get("quote_table")
+    if table is not None and hasattr(table, "snapshot"):
+        for sym, row in table.snapshot().items():
+            if not row.get("price"):
+                continue
+            _save(sym, {**out.get(norm_symbol(sym), {}), **{k: v for k, v in row.items() if v is not None}})
     return out, _meta(present=present, used=bool(out), errors=errors)
 
 
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Tuple
 
 from libs.market.global_sentiment import compute_global_sentiment
 from libs.news.news_pipeline import collect_news_items, score_news_sentiment
@@ -28,6 +31,9 @@ def _default_policy(user_policy: Dict[str, Any] | None) -> Dict[str, Any]:
     p.setdefault("candidate_risk_off_threshold", -0.5)
     p.setdefault("candidate_risk_on_threshold", 0.5)
     p.setdefault("candidate_max_count_risk_off", 3)
+    # signal collection stage (M32-5); opt-in: the parallel path degrades branch errors to defaults
+    p.setdefault("strategist_parallel", False)
+    p.setdefault("strategist_branch_timeout_sec", 10.0)
     return p
 
 
@@ -53,47 +59,202 @@ def _candidates_from_state(state: Dict[str, Any], k: int) -> List[Dict[str, str]
     return []
 
 
-def strategist_node(state: Dict[str, Any]) -> Dict[str, Any]:
-    policy = _default_policy(state.get("policy"))
-    k = int(policy.get("candidate_k", 5))
+_FALLBACK_UNIVERSE = ["005930", "000660", "035420", "051910", "068270"]
 
-    # 1) candidates (injected or generated)
-    candidates = _candidates_from_state(state, k)
 
-    if not candidates:
-        source = str(policy.get("candidate_source") or "top_picks")
-        if source == "market_rank":
-            gen = MarketRankCandidateGenerator()
-            # tolerate signature differences
+def _generate_candidates(state: Dict[str, Any], policy: Dict[str, Any], k: int) -> List[Dict[str, str]]:
+    source = str(policy.get("candidate_source") or "top_picks")
+    if source == "market_rank":
+        gen = MarketRankCandidateGenerator()
+        # tolerate signature differences
+        try:
+            symbols = gen.generate(state=state, policy=policy, k=k)
+        except TypeError:
             try:
-                symbols = gen.generate(state=state, policy=policy, k=k)
+                symbols = gen.generate(state=state, k=k)
             except TypeError:
-                try:
-                    symbols = gen.generate(state=state, k=k)
-                except TypeError:
-                    symbols = gen.generate(state=state)
-            candidates = [{"symbol": str(s), "why": "market_rank"} for s in symbols[:k]]
+                symbols = gen.generate(state=state)
+        return [{"symbol": str(s), "why": "market_rank"} for s in symbols[:k]]
+    # top_picks (M18-2): generator signature is generate(state)
+    gen = TopPicksCandidateGenerator(
+        rank_mode=str(policy.get("candidate_rank_mode") or "value"),
+        rank_topn=int(policy.get("candidate_rank_topn") or 30),
+        topk=int(policy.get("candidate_topk") or k),
+    )
+    symbols = gen.generate(state=state)
+    return [{"symbol": str(s), "why": "top_picks"} for s in symbols[:k]]
+
+
+def _fallback_candidates(k: int) -> List[Dict[str, str]]:
+    return [{"symbol": s, "why": "fallback"} for s in _FALLBACK_UNIVERSE[:k]]
+
+
+def _global_sentiment(state: Dict[str, Any], policy: Dict[str, Any]) -> float:
+    if not bool(policy.get("use_global_sentiment", True)):
+        return 0.0
+    return float(compute_global_sentiment(state=state, policy=policy))
+
+
+def _news_signals(
+    state: Dict[str, Any], policy: Dict[str, Any], symbols: List[str]
+) -> Tuple[Dict[str, List[Any]], Dict[str, float]]:
+    # Tests often inject mock_news_sentiment directly; honor it regardless of use_news_analysis.
+    news_items_by_symbol: Dict[str, List[Any]] = {s: [] for s in symbols}
+    if "mock_news_items" in state and state.get("mock_news_items") is not None:
+        news_items_by_symbol = collect_news_items(symbols, state=state, policy=policy)
+
+    # Prefer injected mock scores (no provider call) for deterministic tests.
+    if "mock_news_sentiment" in state and state.get("mock_news_sentiment") is not None:
+        ms = dict(state.get("mock_news_sentiment") or {})
+        return news_items_by_symbol, {s: float(ms.get(s, 0.0)) for s in symbols}
+
+    news_sent = {s: 0.0 for s in symbols}
+    if bool(policy.get("use_news_analysis", False)):
+        news_items_by_symbol = collect_news_items(symbols, state=state, policy=policy)
+        flat_items = [it for arr in news_items_by_symbol.values() for it in arr]
+        news_sent = score_news_sentiment(flat_items, symbols, state=state, policy=policy)
+        news_sent = {s: float(news_sent.get(s, 0.0)) for s in symbols}
+    return news_items_by_symbol, news_sent
+
+
+def _branch_timeout(policy: Dict[str, Any], name: str) -> float:
+    raw = policy.get(f"strategist_timeout_{name}_sec", policy.get("strategist_branch_timeout_sec", 10.0))
+    try:
+        return max(0.0, float(raw))
+    except Exception:
+        return 10.0
+
+
+def _await_branch(
+    fut: "Future[Any]",
+    *,
+    name: str,
+    started: float,
+    timeout_sec: float,
+    default: Callable[[], Any],
+    stage: Dict[str, Any],
+) -> Any:
+    """Wait for one branch until `started + timeout_sec`; fall back to `default()` on timeout/error."""
+    remaining = max(0.0, started + timeout_sec - time.perf_counter())
+    status, error = "ok", ""
+    try:
+        value = fut.result(timeout=remaining)
+    except FutureTimeoutError:
+        fut.cancel()
+        status, value = "timeout", default()
+    except Exception as e:
+        status, error, value = "error", e.__class__.__name__, default()
+    rec: Dict[str, Any] = {
+        "status": status,
+        "latency_ms": int((time.perf_counter() - started) * 1000),
+        "timeout_sec": float(timeout_sec),
+    }
+    if error:
+        rec["error_type"] = error
+    stage["branches"][name] = rec
+    return value
+
+
+def _collect_signals(
+    state: Dict[str, Any], policy: Dict[str, Any], k: int
+) -> Tuple[List[Dict[str, str]], float, Dict[str, List[Any]], Dict[str, float], Dict[str, Any]]:
+    """Fan-out/fan-in of the I/O-bound signal branches.
+
+    `global_sentiment` runs alongside `candidates`; `news` needs the candidate symbols, so it
+    starts as soon as candidates resolve. Wall time ~= max(candidates + news, global_sentiment).
+    Each branch has its own timeout and falls back to its safe default (fallback universe,
+    0.0 sentiment, empty news). A timed-out worker is abandoned, not killed.
+    """
+    t0 = time.perf_counter()
+    stage: Dict[str, Any] = {"mode": "parallel", "branches": {}}
+    # branches get a snapshot so late (abandoned) workers never see policy updates below
+    branch_policy = dict(policy)
+    injected = _candidates_from_state(state, k)
+
+    pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="strategist")
+    try:
+        gs_started = time.perf_counter()
+        gs_fut = pool.submit(_global_sentiment, state, branch_policy)
+
+        if injected:
+            candidates = injected
+            stage["branches"]["candidates"] = {"status": "injected", "latency_ms": 0, "timeout_sec": 0.0}
         else:
-            # top_picks (M18-2): generator signature is generate(state)
-            gen = TopPicksCandidateGenerator(
-                rank_mode=str(policy.get("candidate_rank_mode") or "value"),
-                rank_topn=int(policy.get("candidate_rank_topn") or 30),
-                topk=int(policy.get("candidate_topk") or k),
+            cand_started = time.perf_counter()
+            candidates = _await_branch(
+                pool.submit(_generate_candidates, state, branch_policy, k),
+                name="candidates",
+                started=cand_started,
+                timeout_sec=_branch_timeout(policy, "candidates"),
+                default=list,
+                stage=stage,
             )
-            symbols = gen.generate(state=state)
-            candidates = [{"symbol": str(s), "why": "top_picks"} for s in symbols[:k]]
+        # absolute fallback: never return empty in DRY_RUN tests
+        if not candidates:
+            candidates = _fallback_candidates(k)
+        symbols = [c["symbol"] for c in candidates]
 
-    # absolute fallback: never return empty in DRY_RUN tests
-    if not candidates:
-        fallback = ["005930", "000660", "035420", "051910", "068270"][:k]
-        candidates = [{"symbol": s, "why": "fallback"} for s in fallback]
+        news_started = time.perf_counter()
+        news_items_by_symbol, news_sent = _await_branch(
+            pool.submit(_news_signals, state, branch_policy, symbols),
+            name="news",
+            started=news_started,
+            timeout_sec=_branch_timeout(policy, "news"),
+            default=lambda: ({s: [] for s in symbols}, {s: 0.0 for s in symbols}),
+            stage=stage,
+        )
+        gs = float(
+            _await_branch(
+                gs_fut,
+                name="global_sentiment",
+                started=gs_started,
+                timeout_sec=_branch_timeout(policy, "global_sentiment"),
+                default=float,
+                stage=stage,
+            )
+        )
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    stage["wall_ms"] = int((time.perf_counter() - t0) * 1000)
+    return candidates, gs, news_items_by_symbol, news_sent, stage
+
+
+def _collect_signals_sequential(
+    state: Dict[str, Any], policy: Dict[str, Any], k: int
+) -> Tuple[List[Dict[str, str]], float, Dict[str, List[Any]], Dict[str, float], Dict[str, Any]]:
+    t0 = time.perf_counter()
+    stage: Dict[str, Any] = {"mode": "sequential", "branches": {}}
+
+    def timed(name: str, fn: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        value = fn()
+        stage["branches"][name] = {"status": "ok", "latency_ms": int((time.perf_counter() - started) * 1000)}
+        return value
 
+    candidates = _candidates_from_state(state, k)
+    if not candidates:
+        candidates = timed("candidates", lambda: _generate_candidates(state, policy, k))
+    if not candidates:
+        candidates = _fallback_candidates(k)
     symbols = [c["symbol"] for c in candidates]
+    gs = timed("global_sentiment", lambda: _global_sentiment(state, policy))
+    news_items_by_symbol, news_sent = timed("news", lambda: _news_signals(state, policy, symbols))
+    stage["wall_ms"] = int((time.perf_counter() - t0) * 1000)
+    return candidates, float(gs), news_items_by_symbol, news_sent, stage
+
+
+def strategist_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    policy = _default_policy(state.get("policy"))
+    k = int(policy.get("candidate_k", 5))
+
+    # 1-3) candidates (injected or generated), global sentiment, news analysis
+    if bool(policy.get("strategist_parallel", False)):
+        candidates, gs, news_items_by_symbol, news_sent, stage = _collect_signals(state, policy, k)
+    else:
+        candidates, gs, news_items_by_symbol, news_sent, stage = _collect_signals_sequential(state, policy, k)
+    state["strategist_stage"] = stage
 
-    # 2) Global sentiment (store in policy for transparency + tests)
-    gs = 0.0
-    if bool(policy.get("use_global_sentiment", True)):
-        gs = float(compute_global_sentiment(state=state, policy=policy))
+    # Global sentiment (store in policy for transparency + tests)
     policy["global_sentiment"] = float(gs)
     # Keep a canonical state-level shape for downstream nodes.
     state["global_sentiment"] = {"score": float(gs)}
@@ -116,24 +277,6 @@ def strategist_node(state: Dict[str, Any]) -> Dict[str, Any]:
         policy["max_risk"] = base_max_risk
         policy["min_confidence"] = base_min_conf
 
-    # 3) News analysis
-    # Tests often inject mock_news_sentiment directly; honor it regardless of use_news_analysis.
-    news_items_by_symbol = {s: [] for s in symbols}
-    if "mock_news_items" in state and state.get("mock_news_items") is not None:
-        news_items_by_symbol = collect_news_items(symbols, state=state, policy=policy)
-
-    # Prefer injected mock scores (no provider call) for deterministic tests.
-    if "mock_news_sentiment" in state and state.get("mock_news_sentiment") is not None:
-        ms = dict(state.get("mock_news_sentiment") or {})
-        news_sent = {s: float(ms.get(s, 0.0)) for s in symbols}
-    else:
-        news_sent = {s: 0.0 for s in symbols}
-        if bool(policy.get("use_news_analysis", False)):
-            news_items_by_symbol = collect_news_items(symbols, state=state, policy=policy)
-            flat_items = [it for arr in news_items_by_symbol.values() for it in arr]
-            news_sent = score_news_sentiment(flat_items, symbols, state=state, policy=policy)
-            news_sent = {s: float(news_sent.get(s, 0.0)) for s in symbols}
-
     state["policy"] = policy
     state["candidates"] = candidates
     # store per-symbol news items (dict)
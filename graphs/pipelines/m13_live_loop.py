@@ -6,6 +6,16 @@ from typing import Any, Callable, Dict, Optional
 # Type aliases for dependency injection (keeps this pipeline unit-testable).
 NodeFn = Callable[[Dict[str, Any]], Dict[str, Any]]
 
+def _install_prefetch(state: Dict[str, Any]) -> Any:
+    """M32-25: wrap the tick readers with the background prefetcher (opt-in)."""
+    from libs.runtime.tick_prefetch import install_prefetch_readers, prefetcher_for  # lazy import
+
+    prefetcher = prefetcher_for(state)
+    if prefetcher is not None:
+        install_prefetch_readers(state, prefetcher)
+    return prefetcher
+
+
 def run_m13_once(
     state: Dict[str, Any],
     *,
@@ -24,6 +34,11 @@ def run_m13_once(
       - graphs.nodes.save_state.save_state
 
     The goal is to make a minimal, deterministic 'one loop' unit you can call from CLI.
+
+    M32-25: with `state["tick_prefetcher"]` (or env M13_PREFETCH_ENABLED) the price /
+    portfolio / rank readers are wrapped once so that each read is re-staged in the
+    background for the next tick (libs.runtime.tick_prefetch). A tick that placed an
+    order invalidates the staged account read, which is refetched after the fill.
     """
     if load_state_fn is None:
         from graphs.nodes.load_state import load_state as load_state_fn  # lazy import
@@ -36,8 +51,14 @@ def run_m13_once(
 
     # Load persisted state first (state_store_path is read from env by node)
     state = load_state_fn(state)
+    prefetcher = _install_prefetch(state)
     # One tick (runs M10 only if market open)
     state = tick_fn(state, dt=dt)  # type: ignore[arg-type]
+    if prefetcher is not None:
+        ex = state.get("execution") or {}
+        if not state.get("tick_skipped") and bool(ex.get("ok", ex.get("allowed", False))):
+            prefetcher.invalidate("portfolio")
+        state["tick_prefetch"] = prefetcher.summary()
     # End-of-day report trigger (runs only after close, once per day)
     state = eod_fn(state, dt=dt)  # type: ignore[arg-type]
     # Persist state at end
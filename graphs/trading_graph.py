@@ -10,9 +10,22 @@ Contract:
   - Input/Output is a mutable dict-like `state`.
   - Nodes are pure-ish functions: node(state) -> state (may mutate).
   - Branching happens at `decision_node`.
+
+M32-8: the flow is a preset `DagGraph` (see `trading_graph_dag`) whose nodes declare
+the state keys they read and write. The spine is a dependency chain, so it runs in
+order exactly as before; independent nodes added later run concurrently.
+
+M32-9: with `state["graph_memo"]=True` or env `GRAPH_MEMO_ENABLED=true` (default off),
+the built-in scanner/monitor/portfolio_guard nodes are memoized within one run, so a
+`retry_scan` pass with unchanged inputs reuses their outputs. hydrate (broker / skill
+I/O through a live runner), decide and injected node functions always rerun.
+
+M32-24: with env MARKET_BUS_PATH set, a shared-memory bus reader filled by a separate
+ingest process is injected as `state["quote_table"]` (see `libs/market/snapshot_bus.py`).
 """
 
-from typing import Any, Dict, Callable, Optional, Literal
+import os
+from typing import Any, Dict, Callable, Optional, Literal, Tuple
 
 from graphs.nodes.strategist_node import strategist_node
 from graphs.nodes.scanner_node import scanner_node
@@ -21,21 +34,145 @@ from graphs.nodes.decision_node import decision_node
 from graphs.nodes.executor_node import executor_node
 from graphs.nodes.hydrate_skill_results_node import hydrate_skill_results_node
 from graphs.nodes.portfolio_guard_node import portfolio_guard_node
+from graphs.dag_engine import DagGraph, DagNode, RepeatWhile, repeat_while, union_keys
+from libs.runtime.span_tracer import begin_trace, end_trace
 
 
 Decision = Literal["approve", "reject", "noop", "retry_scan"]
 
 
+NodeFn = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+# Declared top-level state keys per node (curated from the node implementations).
+NODE_KEYS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "strategist": {
+        "reads": ("candidates", "universe", "candidate_symbols", "policy", "mock_candidates", "mock_news_items"),
+        "writes": ("candidates", "policy", "global_sentiment", "news_items", "news_sentiment", "strategist_stage"),
+    },
+    "hydrate": {
+        "reads": (
+            "candidates", "policy", "skill_runner", "skill_runner_factory", "auto_skill_runner",
+            "skill_results", "order_ref", "run_id", "use_skill_hydration", "order_tracker",
+            "quote_table",
+        ),
+        "writes": ("skill_results", "skill_fetch", "skill_runner", "order_events", "order_lifecycles"),
+    },
+    "scanner": {
+        "reads": (
+            "candidates", "policy", "global_sentiment", "mock_global_sentiment", "news_sentiment",
+            "mock_news_sentiment", "mock_scan_results", "scanner_features", "feature_engine",
+            "ohlcv_by_symbol", "skill_results", "skill_data", "skills", "market_quote", "account_orders",
+            "quote_table",
+        ),
+        "writes": ("scan_results", "selected", "risk", "scanner_feature", "scanner_skill"),
+    },
+    "monitor": {
+        "reads": (
+            "selected", "plan", "policy", "portfolio_snapshot", "snapshots", "market_snapshot",
+            "risk_context", "use_position_sizing", "use_exit_policy",
+            "skill_results", "skill_data", "skills", "order_status",
+            "scan_results", "monitor_multi_intent", "order_lifecycles", "order_events",
+            "quote_table",
+        ),
+        "writes": ("intents", "monitor", "monitor_sizing", "monitor_exit", "monitor_book"),
+    },
+    "portfolio_guard": {
+        "reads": (
+            "intents", "policy", "selected", "market_prices", "strategy_budget_map",
+            "portfolio_allocation_result", "allocation_result", "symbol_max_notional_map",
+            "default_symbol_max_notional", "use_portfolio_budget_guard",
+        ),
+        "writes": ("intents", "portfolio_guard", "blocked_intents", "selected"),
+    },
+    "decide": {
+        "reads": ("policy", "intents", "selected", "risk", "retry_count_scan"),
+        "writes": ("decision", "decision_reason", "decision_detail", "risk", "retry_count_scan"),
+    },
+    "executor": {
+        "reads": ("decision", "intents", "selected"),
+        "writes": ("execution_pending",),
+    },
+}
+
+
+# built-in pure nodes whose NODE_KEYS reads are complete (safe to memoize); hydrate is
+# excluded: its runner / tracker are fingerprinted by identity, so a hit would replay stale I/O
+_MEMO_SAFE = (scanner_node, monitor_node, portfolio_guard_node)
+
+
+def _decision(s: Dict[str, Any]) -> str:
+    return str(s.get("decision") or "").lower()
+
+
+def _should_hydrate(s: Dict[str, Any]) -> bool:
+    if bool(s.get("use_skill_hydration")):
+        return True
+    return bool(s.get("skill_runner"))
+
+
+def _span_attrs(name: str, s: Dict[str, Any]) -> Dict[str, Any]:
+    attrs: Dict[str, Any] = {}
+    cands = s.get("candidates")
+    if isinstance(cands, list):
+        attrs["candidates"] = len(cands)
+    if name == "decide":
+        attrs["decision"] = str(s.get("decision") or "")
+    return attrs
+
+
+def _node(name: str, fn: NodeFn, *, memo: bool = False, **kw: Any) -> DagNode:
+    keys = NODE_KEYS[name]
+    memo = memo and any(fn is safe for safe in _MEMO_SAFE)
+    return DagNode(name, fn, reads=keys["reads"], writes=keys["writes"], memo=memo, **kw)
+
+
+def trading_graph_dag(
+    *,
+    strategist: NodeFn,
+    hydrate: NodeFn,
+    scanner: NodeFn,
+    monitor: NodeFn,
+    portfolio_guard: NodeFn,
+    decide: NodeFn,
+    executor: NodeFn,
+) -> Tuple[DagGraph, RepeatWhile]:
+    """Build the preset graph: strategist -> scan_loop(retry_scan) -> executor(approve).
+
+    Returns `(graph, scan_loop)`; `scan_loop.last_attempt` is the retry count.
+    """
+    scan_nodes = [
+        _node("hydrate", hydrate, when=_should_hydrate, memo=True),
+        _node("scanner", scanner, memo=True),
+        _node("monitor", monitor, memo=True),
+        _node("portfolio_guard", portfolio_guard, memo=True),
+        _node("decide", decide),
+    ]
+    scan_pass = DagGraph(scan_nodes, name="scan_pass", span_attrs=_span_attrs, memo=True)
+    scan_loop = repeat_while(scan_pass, lambda s: _decision(s) == "retry_scan")
+    loop_reads, loop_writes = union_keys(scan_nodes)
+    graph = DagGraph(
+        [
+            _node("strategist", strategist),
+            DagNode("scan_loop", scan_loop, reads=loop_reads, writes=loop_writes),
+            _node("executor", executor, when=lambda s: (_decision(s) or "noop") == "approve"),
+        ],
+        name="run_trading_graph",
+        span_attrs=_span_attrs,
+    )
+    return graph, scan_loop
+
+
 def run_trading_graph(
     state: Dict[str, Any],
     *,
-    strategist: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
-    hydrate: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
-    scanner: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
-    monitor: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
-    portfolio_guard: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
-    decide: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
-    executor: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    strategist: Optional[NodeFn] = None,
+    hydrate: Optional[NodeFn] = None,
+    scanner: Optional[NodeFn] = None,
+    monitor: Optional[NodeFn] = None,
+    portfolio_guard: Optional[NodeFn] = None,
+    decide: Optional[NodeFn] = None,
+    executor: Optional[NodeFn] = None,
 ) -> Dict[str, Any]:
     """Run the M17 baseline graph.
 
@@ -49,40 +186,28 @@ def run_trading_graph(
     Injection points exist for tests/experiments.
     """
 
-    strategist = strategist or strategist_node
-    hydrate = hydrate or hydrate_skill_results_node
-    scanner = scanner or scanner_node
-    monitor = monitor or monitor_node
-    portfolio_guard = portfolio_guard or portfolio_guard_node
-    decide = decide or decision_node
-    executor = executor or executor_node
-
-    def _should_hydrate(s: Dict[str, Any]) -> bool:
-        if bool(s.get("use_skill_hydration")):
-            return True
-        return bool(s.get("skill_runner"))
-
-    state = strategist(state)
-
-    # Initial pass
-    if _should_hydrate(state):
-        state = hydrate(state)
-    state = scanner(state)
-    state = monitor(state)
-    state = portfolio_guard(state)
-    state = decide(state)
-
-    # Retry loop (scanner-only)
-    while str(state.get("decision") or "").lower() == "retry_scan":
-        if _should_hydrate(state):
-            state = hydrate(state)
-        state = scanner(state)
-        state = monitor(state)
-        state = portfolio_guard(state)
-        state = decide(state)
-
-    decision: str = str(state.get("decision") or "noop").lower()
-    if decision == "approve":
-        state = executor(state)
+    graph, scan_loop = trading_graph_dag(
+        strategist=strategist or strategist_node,
+        hydrate=hydrate or hydrate_skill_results_node,
+        scanner=scanner or scanner_node,
+        monitor=monitor or monitor_node,
+        portfolio_guard=portfolio_guard or portfolio_guard_node,
+        decide=decide or decision_node,
+        executor=executor or executor_node,
+    )
+
+    if os.getenv("MARKET_BUS_PATH"):
+        from libs.market.snapshot_bus import attach_market_bus  # numpy loads only when the bus is on
+
+        state = attach_market_bus(state)
+    tracer, owned = begin_trace(state, "run_trading_graph")
+    try:
+        with tracer.span("run_trading_graph") as root:
+            state = graph.run(state)
+            root["retry_scan"] = scan_loop.last_attempt
+            root["decision"] = _decision(state) or "noop"
+    finally:
+        if owned:
+            end_trace(state, tracer)
 
     return state
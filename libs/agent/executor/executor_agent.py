@@ -14,6 +14,7 @@ from libs.approval.service import ApprovalService
 
 import os
 from libs.execution.executors.base import ExecutionDisabledError
+from libs.execution.order_dispatch import shared_dispatcher
 
 
 def _new_run_id() -> str:
@@ -76,7 +77,11 @@ class ExecutorAgent:
         return rows
 
     def _last_row(self) -> Optional[Dict[str, Any]]:
-        rows = self._load_all_rows()
+        if Path(self.intent_store.path) == self.intent_store_path:
+            # M32-12: indexed tail read
+            rows = self.intent_store.tail_rows(1)
+        else:
+            rows = self._load_all_rows()
         return rows[-1] if rows else None
 
     def last_intent(self) -> Optional[Dict[str, Any]]:
@@ -142,9 +147,9 @@ class ExecutorAgent:
 
         return {"decision": decision_dict}
 
-    def execute_order(self, *, intent: Dict[str, Any]) -> Dict[str, Any]:
+    def check_order_guards(self, intent: Dict[str, Any]) -> None:
+        """MAX_ORDER_QTY / MAX_ORDER_NOTIONAL safety guards. Raises ExecutionDisabledError."""
         intent = _unwrap_intent(intent) or {}
-        action = str(intent.get("action") or "").upper()
         # ---------- Safety: MAX_ORDER_QTY / MAX_ORDER_NOTIONAL ----------
         def _as_int_env(name: str) -> int:
             raw = (os.getenv(name, "") or "").strip()
@@ -178,6 +183,11 @@ class ExecutorAgent:
                 # if price is not numeric, be conservative: block
                 raise ExecutionDisabledError(f"Invalid price '{price}' for notional guard (symbol={sym})")
 
+    def execute_order(self, *, intent: Dict[str, Any]) -> Dict[str, Any]:
+        intent = _unwrap_intent(intent) or {}
+        action = str(intent.get("action") or "").upper()
+        self.check_order_guards(intent)
+
         skill_args = {
             "side": "buy" if action == "BUY" else "sell",
             "symbol": intent.get("symbol"),
@@ -210,6 +220,30 @@ class ExecutorAgent:
             execute_fn=lambda it: self.execute_order(intent=it),
         )
 
+    def approve_many(
+        self,
+        *,
+        intent_ids: List[str],
+        execution_enabled: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """Bulk approve; with ORDER_DISPATCH_WORKERS > 1 orders are submitted concurrently (M32-19).
+
+        The dispatcher runs `check_order_guards` before taking a rate-limit token, and
+        `execute_order` still applies every guard on submission.
+        """
+        if execution_enabled is None:
+            v = (os.getenv("EXECUTION_ENABLED", "false") or "false").strip().lower()
+            execution_enabled = v in ("1", "true", "yes", "y", "on")
+
+        # one process-wide dispatcher: per-API pacing and idempotency keys span every call
+        return self.approvals.approve_many(
+            intent_ids=intent_ids,
+            execution_enabled=bool(execution_enabled),
+            execute_fn=lambda it: self.execute_order(intent=it),
+            dispatcher=shared_dispatcher() if execution_enabled else None,
+            guard_fn=self.check_order_guards,
+        )
+
     def preview(self, *, intent_id: Optional[str] = None) -> Dict[str, Any]:
         return self.approvals.preview(intent_id=intent_id)
 
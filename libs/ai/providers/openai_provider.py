@@ -3,8 +3,19 @@ from __future__ import annotations
 import json
 import os
 import time
-from dataclasses import dataclass, field
-from typing import Any, Dict, Optional, Tuple
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from libs.llm.hedging import (
+    HedgeCancelled,
+    HedgePolicy,
+    check_hedge_cancelled,
+    hedge_sleep,
+    record_model_outcome,
+    run_hedged,
+)
+from libs.llm.streaming import find_first_json_object
+from libs.runtime.shared_circuit_store import circuit_key, shared_circuit_store_from_env
 
 DEFAULT_PROMPT_VERSION = "m20-6"
 DEFAULT_SCHEMA_VERSION = "intent.v1"
@@ -14,17 +25,33 @@ DEFAULT_CB_COOLDOWN_SEC = 60.0
 # NOTE: tests monkeypatch this symbol
 def _post_json(url: str, headers: Dict[str, str], payload: Dict[str, Any], timeout: float = 15.0) -> Dict[str, Any]:
     """Very small HTTP helper. Kept minimal on purpose.
-    In production you can swap to requests/httpx. In tests we monkeypatch this.
+    Uses the shared keep-alive pool (M32-2); LLM_HTTP_KEEPALIVE=false restores one urlopen per call.
+    In tests we monkeypatch this.
     """
-    import urllib.request
+    from libs.llm.http_pool import post_json
 
-    req = urllib.request.Request(url, method="POST")
-    for k, v in (headers or {}).items():
-        req.add_header(k, v)
-    data = json.dumps(payload).encode("utf-8")
-    with urllib.request.urlopen(req, data=data, timeout=timeout) as resp:
-        body = resp.read().decode("utf-8")
-        return json.loads(body) if body else {}
+    return post_json(url, headers, payload, timeout=timeout)
+
+
+# NOTE: tests monkeypatch this symbol
+def _post_json_stream(
+    url: str,
+    headers: Dict[str, str],
+    payload: Dict[str, Any],
+    timeout: float = 15.0,
+    accept: Optional[Callable[[Dict[str, Any]], bool]] = None,
+) -> Dict[str, Any]:
+    """Streaming (SSE) chat-completions request (M32-3).
+    Returns a non-streamed response shape; stops reading once `accept(obj)` is true.
+    """
+    from libs.llm.http_pool import post_json_stream
+    from libs.llm.streaming import collect_chat_stream
+
+    lines = post_json_stream(url, headers, payload, timeout=timeout)
+    try:
+        return collect_chat_stream(lines, accept=accept)
+    finally:
+        lines.close()
 
 
 def _looks_like_chat_completions_endpoint(url: str) -> bool:
@@ -61,18 +88,8 @@ def _extract_json_object(text: str) -> Optional[Dict[str, Any]]:
     except Exception:
         pass
 
-    # 2) best-effort: find first decodable JSON object in free text
-    dec = json.JSONDecoder()
-    for i, ch in enumerate(s):
-        if ch != "{":
-            continue
-        try:
-            obj, _end = dec.raw_decode(s[i:])
-            if isinstance(obj, dict):
-                return obj
-        except Exception:
-            continue
-    return None
+    # 2) best-effort: first decodable JSON object in free text (single linear scan, M32-3)
+    return find_first_json_object(s)
 
 
 def _extract_chat_content(resp: Dict[str, Any]) -> str:
@@ -234,6 +251,11 @@ class OpenAIStrategist:
       - AI_STRATEGIST_ENDPOINT
       - AI_STRATEGIST_MODEL (optional)
       - AI_STRATEGIST_TIMEOUT_SEC (optional)
+      - AI_STRATEGIST_HEDGE_MODEL (optional, M32-1 secondary model for hedged requests)
+      - AI_STRATEGIST_HEDGE_PERCENTILE / _HEDGE_DELAY_SEC / _HEDGE_MIN_DELAY_SEC /
+        _HEDGE_MAX_DELAY_SEC / _HEDGE_MIN_SAMPLES (optional hedge budget tuning)
+      - AI_STRATEGIST_STREAM (optional, M32-3 SSE streaming with early JSON termination)
+      - CIRCUIT_STORE_DB_PATH (optional, M32-4 circuit breaker state shared across processes)
     """
 
     _CB_STATE: Dict[str, Dict[str, float]] = {}
@@ -255,6 +277,9 @@ class OpenAIStrategist:
         cb_fail_threshold: int = DEFAULT_CB_FAIL_THRESHOLD,
         cb_cooldown_sec: float = DEFAULT_CB_COOLDOWN_SEC,
         json_response_format: bool = True,
+        hedge_model: str = "",
+        hedge_policy: Optional[HedgePolicy] = None,
+        stream: bool = False,
     ):
         self.api_key = api_key
         self.endpoint = endpoint
@@ -270,6 +295,9 @@ class OpenAIStrategist:
         self.cb_fail_threshold = max(0, int(cb_fail_threshold))
         self.cb_cooldown_sec = max(0.0, float(cb_cooldown_sec))
         self.json_response_format = bool(json_response_format)
+        self.hedge_model = str(hedge_model or "").strip()
+        self.stream = bool(stream)
+        self.hedge_policy = hedge_policy or HedgePolicy(max_delay_sec=max(0.0, float(timeout_sec)))
 
     def _effective_model(self) -> str:
         model = str(self.model or "").strip()
@@ -284,6 +312,12 @@ class OpenAIStrategist:
                     model = env_model
         return model or "gpt-4.1-mini"
 
+    def _effective_hedge_model(self, model: str) -> str:
+        hedge_model = str(self.hedge_model or "").strip()
+        if not hedge_model or hedge_model == model:
+            return ""
+        return hedge_model
+
     @classmethod
     def from_env(cls) -> "OpenAIStrategist":
         api_key = (
@@ -352,6 +386,12 @@ class OpenAIStrategist:
             cb_cooldown_sec = max(0.0, float(raw_cb_cooldown_sec))
         except Exception:
             cb_cooldown_sec = DEFAULT_CB_COOLDOWN_SEC
+        hedge_model = (os.getenv("AI_STRATEGIST_HEDGE_MODEL") or "").strip()
+        hedge_policy = HedgePolicy.from_env("AI_STRATEGIST_")
+        raw_stream = (os.getenv("AI_STRATEGIST_STREAM") or "false").strip().lower()
+        stream = raw_stream in ("1", "true", "yes", "on")
+        if not (os.getenv("AI_STRATEGIST_HEDGE_MAX_DELAY_SEC") or "").strip():
+            hedge_policy = replace(hedge_policy, max_delay_sec=max(0.0, timeout_sec))
 
         return cls(
             api_key=api_key,
@@ -368,6 +408,9 @@ class OpenAIStrategist:
             cb_fail_threshold=cb_fail_threshold,
             cb_cooldown_sec=cb_cooldown_sec,
             json_response_format=json_response_format,
+            hedge_model=hedge_model,
+            hedge_policy=hedge_policy,
+            stream=stream,
         )
 
     @staticmethod
@@ -391,6 +434,10 @@ class OpenAIStrategist:
     def _cb_key(self, model: str) -> str:
         return f"{self.endpoint}|{model}"
 
+    @staticmethod
+    def _cb_shared_key(key: str) -> str:
+        return circuit_key("strategist_llm", key)
+
     @classmethod
     def _cb_state_for_key(cls, key: str) -> Dict[str, float]:
         st = cls._CB_STATE.get(key)
@@ -407,6 +454,48 @@ class OpenAIStrategist:
             st["open_until_epoch"] = 0.0
         return st
 
+    def _cb_gate(self, key: str, now_epoch: float, claims: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """Return circuit meta when the request is blocked, else None.
+
+        With CIRCUIT_STORE_DB_PATH set (M32-4) the state is shared across worker
+        processes and only one process probes a recovering model (half-open). A probe
+        claim taken here is noted in `claims` (key -> owner) so it can be released if
+        the attempt ends without an outcome.
+        """
+        if not self._cb_enabled():
+            return None
+        store = shared_circuit_store_from_env()
+        if store is not None:
+            gated = store.gate(self._cb_shared_key(key), now_epoch=now_epoch)
+            if gated["allowed"]:
+                if claims is not None and gated["reason"] == "circuit_half_open":
+                    claims[key] = str(gated["probe_owner"])
+                return None
+            return {
+                "circuit_state": str(gated["circuit_state"]),
+                "circuit_reason": str(gated["reason"]),
+                "circuit_fail_count": int(gated["fail_count"]),
+                "circuit_open_until_epoch": int(gated["open_until_epoch"]),
+            }
+        if not self._cb_is_open(key, now_epoch):
+            return None
+        st = self._cb_state_for_key(key)
+        return {
+            "circuit_state": "open",
+            "circuit_fail_count": int(float(st.get("fail_count") or 0.0)),
+            "circuit_open_until_epoch": int(float(st.get("open_until_epoch") or 0.0)),
+        }
+
+    def _cb_release_probes(self, claims: Dict[str, str], outcomes: Dict[str, bool]) -> None:
+        """Release half-open probe claims of models whose attempt recorded no outcome (cancelled)."""
+        store = shared_circuit_store_from_env() if claims else None
+        if store is None:
+            return
+        settled = {self._cb_key(m) for m in outcomes}
+        for key, owner in claims.items():
+            if key not in settled:
+                store.release_probe(self._cb_shared_key(key), owner=owner)
+
     def _cb_is_open(self, key: str, now_epoch: float) -> bool:
         if not self._cb_enabled():
             return False
@@ -416,6 +505,9 @@ class OpenAIStrategist:
     def _cb_on_success(self, key: str) -> None:
         if not self._cb_enabled():
             return
+        store = shared_circuit_store_from_env()
+        if store is not None:
+            store.record_success(self._cb_shared_key(key))
         st = self._cb_state_for_key(key)
         st["fail_count"] = 0.0
         st["open_until_epoch"] = 0.0
@@ -423,6 +515,17 @@ class OpenAIStrategist:
     def _cb_on_failure(self, key: str, now_epoch: float) -> Dict[str, float]:
         if not self._cb_enabled():
             return {"fail_count": 0.0, "open_until_epoch": 0.0}
+        store = shared_circuit_store_from_env()
+        if store is not None:
+            rec = store.record_failure(
+                self._cb_shared_key(key),
+                error_type="strategist_error",
+                fail_threshold=self.cb_fail_threshold,
+                cooldown_sec=self.cb_cooldown_sec,
+                now_epoch=now_epoch,
+            )
+            open_until = float(rec.get("open_until_epoch") or 0.0) if rec.get("state") == "open" else 0.0
+            return {"fail_count": float(rec.get("fail_count") or 0.0), "open_until_epoch": open_until}
         st = self._cb_maybe_reset_after_cooldown(key, now_epoch)
         fail_count = float(st.get("fail_count") or 0.0) + 1.0
         st["fail_count"] = fail_count
@@ -477,19 +580,23 @@ class OpenAIStrategist:
         headers: Dict[str, str],
         payload: Dict[str, Any],
         timeout: float,
+        accept: Optional[Callable[[Dict[str, Any]], bool]] = None,
     ) -> Tuple[Dict[str, Any], int]:
         max_attempts = max(1, int(self.retry_max) + 1)
         attempts = 0
         while True:
+            check_hedge_cancelled()  # a hedged branch that lost stops before the next attempt
             attempts += 1
             try:
+                if accept is not None:
+                    return _post_json_stream(url, headers, payload, timeout=timeout, accept=accept) or {}, attempts
                 return _post_json(url, headers, payload, timeout=timeout) or {}, attempts
             except Exception as e:
                 if attempts >= max_attempts or not self._is_retryable_error(e):
                     raise
                 backoff = float(self.retry_backoff_sec) * (2 ** (attempts - 1))
                 if backoff > 0:
-                    time.sleep(backoff)
+                    hedge_sleep(backoff)
 
     @staticmethod
     def _normalize_intent(raw: Dict[str, Any], x: StrategyInput) -> Dict[str, Any]:
@@ -508,11 +615,284 @@ class OpenAIStrategist:
         )
         return dict(norm)
 
+    def _stream_enabled(self) -> bool:
+        return self.stream and _looks_like_chat_completions_endpoint(self.endpoint)
+
+    def _stream_accept(self) -> Callable[[Dict[str, Any]], bool]:
+        def accept(obj: Dict[str, Any]) -> bool:
+            try:
+                self._intent_from_object(obj)
+            except Exception:
+                return False
+            return True
+
+        return accept
+
+    @staticmethod
+    def _intent_from_object(obj: Dict[str, Any]) -> Tuple[Dict[str, Any], str, Dict[str, Any]]:
+        """Map one decoded model JSON object to (intent, rationale, meta). Raises if unusable."""
+        intent: Dict[str, Any] = {}
+        rationale = ""
+        meta: Dict[str, Any] = {}
+        if isinstance(obj.get("intent"), dict):
+            intent = dict(obj.get("intent") or {})
+            rationale = str(obj.get("rationale") or intent.get("rationale") or "")
+            if isinstance(obj.get("meta"), dict):
+                meta = dict(obj.get("meta") or {})
+        elif obj.get("action") is not None:
+            # Allow direct intent object response.
+            intent = dict(obj)
+            rationale = str(obj.get("rationale") or "")
+        elif obj.get("decision") is not None:
+            # Common alias in some models.
+            intent = {
+                "action": obj.get("decision"),
+                "symbol": obj.get("symbol"),
+                "qty": obj.get("qty"),
+                "price": obj.get("price"),
+                "order_type": obj.get("order_type"),
+                "order_api_id": obj.get("order_api_id"),
+                "reason": obj.get("reason"),
+            }
+            rationale = str(obj.get("rationale") or obj.get("reason") or "")
+        elif obj.get("signal") is not None:
+            # Another common alias.
+            intent = {
+                "action": obj.get("signal"),
+                "symbol": obj.get("symbol"),
+                "qty": obj.get("qty"),
+                "price": obj.get("price"),
+                "order_type": obj.get("order_type"),
+                "order_api_id": obj.get("order_api_id"),
+                "reason": obj.get("reason"),
+            }
+            rationale = str(obj.get("rationale") or obj.get("reason") or "")
+        else:
+            raise ValueError("Invalid response JSON: missing intent/action")
+        return intent, rationale, meta
+
+    def _build_payload(self, x: StrategyInput, model: str) -> Dict[str, Any]:
+        if _looks_like_chat_completions_endpoint(self.endpoint):
+            system_prompt = (
+                "You are a trading strategist. "
+                "Return JSON only. "
+                f"Prompt-Version: {self.prompt_version}. "
+                f"Schema-Version: {self.schema_version}. "
+                "Schema: {\"intent\": {\"action\":\"BUY|SELL|NOOP\", \"symbol\": string|null, "
+                "\"qty\": int, \"price\": number|null, \"order_type\":\"limit|market\", "
+                "\"order_api_id\":\"ORDER_SUBMIT\"}, \"rationale\": string, \"meta\": object}."
+            )
+            user_payload = {
+                "symbol": x.symbol,
+                "market_snapshot": x.market_snapshot,
+                "portfolio_snapshot": x.portfolio_snapshot,
+                "risk_context": x.risk_context,
+            }
+            payload = {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": json.dumps(user_payload, ensure_ascii=False)},
+                ],
+                "temperature": 0.1,
+            }
+            if self.json_response_format:
+                payload["response_format"] = {"type": "json_object"}
+        else:
+            # Legacy/custom strategist endpoint contract.
+            payload = {
+                "model": model,
+                "ts": int(time.time()),
+                "input": {
+                    "symbol": x.symbol,
+                    "market_snapshot": x.market_snapshot,
+                    "portfolio_snapshot": x.portfolio_snapshot,
+                    "risk_context": x.risk_context,
+                },
+            }
+        if self.max_tokens is not None:
+            payload["max_tokens"] = int(self.max_tokens)
+        return payload
+
+    def _request_decision(
+        self,
+        x: StrategyInput,
+        model: str,
+        headers: Dict[str, str],
+        progress: Dict[str, int],
+    ) -> Tuple[Dict[str, Any], str, Dict[str, Any]]:
+        """Request and parse one decision from `model`. Raises on invalid responses."""
+        payload = self._build_payload(x, model)
+        accept = self._stream_accept() if self._stream_enabled() else None
+        if accept is not None:
+            payload["stream"] = True
+            payload["stream_options"] = {"include_usage": True}
+        attempts = 0
+        try:
+            resp, attempts = self._post_with_retry(
+                self.endpoint,
+                headers,
+                payload,
+                timeout=self.timeout_sec,
+                accept=accept,
+            )
+        except Exception as e:
+            # Some providers ignore or reject response_format; retry once without it.
+            if (
+                _looks_like_chat_completions_endpoint(self.endpoint)
+                and self.json_response_format
+                and self._is_response_format_error(e)
+                and "response_format" in payload
+            ):
+                payload = dict(payload)
+                payload.pop("response_format", None)
+                resp, attempts = self._post_with_retry(
+                    self.endpoint,
+                    headers,
+                    payload,
+                    timeout=self.timeout_sec,
+                    accept=accept,
+                )
+            else:
+                raise
+        progress["attempts"] = int(attempts or 0)
+
+        if _looks_like_chat_completions_endpoint(self.endpoint) and _chat_output_truncated_without_final_answer(resp):
+            retry_payload = dict(payload)
+            base_max = _to_nonneg_int(retry_payload.get("max_tokens"))
+            if base_max is None:
+                base_max = _to_nonneg_int(self.max_tokens) or 256
+            retry_payload["max_tokens"] = int(min(max(base_max * 2, 512), 2048))
+            msgs = retry_payload.get("messages")
+            if isinstance(msgs, list):
+                retry_payload["messages"] = list(msgs) + [
+                    {
+                        "role": "user",
+                        "content": "Return only one JSON object for the schema. No explanation.",
+                    }
+                ]
+            resp2, retry_attempts = self._post_with_retry(
+                self.endpoint,
+                headers,
+                retry_payload,
+                timeout=self.timeout_sec,
+                accept=accept,
+            )
+            resp = resp2
+            attempts = int(attempts or 0) + int(retry_attempts or 0)
+            progress["attempts"] = int(attempts or 0)
+
+        intent: Dict[str, Any] = {}
+        rationale = ""
+        meta = dict(resp.get("meta") or {})
+        usage = _extract_usage(resp)
+
+        # 1) Native/custom contract: {"intent": {...}, ...}
+        raw_intent = resp.get("intent")
+        if raw_intent is not None:
+            if isinstance(raw_intent, dict):
+                intent = dict(raw_intent)
+                rationale = str(resp.get("rationale") or intent.get("rationale") or "")
+            else:
+                raise ValueError("Invalid response: 'intent' must be an object")
+        else:
+            # 2) OpenRouter/OpenAI-style chat completions:
+            #    parse JSON in assistant content and adapt to {"intent": ...}.
+            content = _extract_chat_content(resp)
+            obj = _extract_json_object(content)
+            if obj is None:
+                obj = _extract_chat_structured_object(resp)
+            if obj is None:
+                preview = str(content or "").strip().replace("\r", " ").replace("\n", " ")
+                if not preview:
+                    try:
+                        choices = resp.get("choices")
+                        first_choice = choices[0] if isinstance(choices, list) and choices else {}
+                        preview = json.dumps(first_choice, ensure_ascii=False)
+                    except Exception:
+                        preview = ""
+                if len(preview) > 240:
+                    preview = preview[:240] + "..."
+                raise ValueError(
+                    "Invalid response: no JSON object in model content"
+                    + (f" (preview={preview})" if preview else "")
+                )
+
+            intent, rationale, obj_meta = self._intent_from_object(obj)
+            meta.update(obj_meta)
+
+        intent = self._normalize_intent(intent, x)
+        if not intent:
+            intent = {"action": "NOOP", "reason": "empty_intent"}
+        if str(intent.get("action") or "").upper() == "NOOP":
+            if not str(intent.get("reason") or "").strip():
+                intent["reason"] = "model_no_signal"
+        meta.setdefault("model", model)
+        meta.setdefault(
+            "endpoint_type",
+            "chat_completions" if _looks_like_chat_completions_endpoint(self.endpoint) else "custom",
+        )
+        meta.setdefault("prompt_version", self.prompt_version)
+        meta.setdefault("schema_version", self.schema_version)
+        if usage.get("prompt_tokens") is not None:
+            meta.setdefault("prompt_tokens", int(usage["prompt_tokens"]))
+        if usage.get("completion_tokens") is not None:
+            meta.setdefault("completion_tokens", int(usage["completion_tokens"]))
+        if usage.get("total_tokens") is not None:
+            meta.setdefault("total_tokens", int(usage["total_tokens"]))
+        estimated_cost_usd = self._estimate_cost_usd(
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
+        )
+        if estimated_cost_usd is not None:
+            meta.setdefault("estimated_cost_usd", float(estimated_cost_usd))
+        stream_info = resp.get("stream")
+        if isinstance(stream_info, dict):
+            meta["stream"] = True
+            meta["stream_early_stop"] = bool(stream_info.get("early_stop"))
+            meta["stream_chunks"] = int(stream_info.get("chunks") or 0)
+        return intent, rationale, meta
+
+    def _timed_decision(
+        self,
+        x: StrategyInput,
+        model: str,
+        headers: Dict[str, str],
+        progress: Dict[str, int],
+        outcomes: Dict[str, bool],
+    ) -> Tuple[Dict[str, Any], str, Dict[str, Any]]:
+        """`_request_decision` plus its latency sample and per-model outcome (M32-1)."""
+        t0 = time.perf_counter()
+        try:
+            out = self._request_decision(x, model, headers, progress)
+        except HedgeCancelled:
+            raise
+        except Exception as e:
+            record_model_outcome(model, time.perf_counter() - t0, e)
+            outcomes[model] = False
+            raise
+        record_model_outcome(model, time.perf_counter() - t0)
+        outcomes[model] = True
+        return out
+
+    def _cb_record_outcomes(self, outcomes: Dict[str, bool], winner: str, now_epoch: float) -> None:
+        """Breaker bookkeeping per model: branches that answered succeeded, branches that failed count as failures."""
+        for m, ok in list(outcomes.items()):
+            if m == winner:
+                continue
+            if ok:
+                self._cb_on_success(self._cb_key(m))
+            else:
+                self._cb_on_failure(self._cb_key(m), now_epoch)
+        self._cb_on_success(self._cb_key(winner))
+
     def decide(self, x: StrategyInput) -> StrategyDecision:
         """Never raise. On any error, returns NOOP with error reason."""
-        attempts = 0
+        progress: Dict[str, int] = {"attempts": 0}
         model = self._effective_model()
         cb_key = self._cb_key(model)
+        outcomes: Dict[str, bool] = {}
+        claims: Dict[str, str] = {}
         try:
             if not self.api_key or not self.endpoint:
                 return StrategyDecision(
@@ -525,9 +905,15 @@ class OpenAIStrategist:
                     },
                 )
             now_epoch = float(time.time())
-            if self._cb_is_open(cb_key, now_epoch):
-                st = self._cb_state_for_key(cb_key)
-                open_until = int(float(st.get("open_until_epoch") or 0.0))
+            hedge_model = self._effective_hedge_model(model)
+            bypassed = ""
+            # each model is gated on its own breaker (M32-1 / M32-4)
+            blocked = self._cb_gate(cb_key, now_epoch, claims)
+            if blocked is not None and hedge_model and self._cb_gate(self._cb_key(hedge_model), now_epoch, claims) is None:
+                # primary circuit open: go straight to the hedge model
+                bypassed, model, hedge_model, blocked = model, hedge_model, "", None
+                cb_key = self._cb_key(model)
+            if blocked is not None:
                 return StrategyDecision(
                     intent={"action": "NOOP", "reason": "circuit_open"},
                     rationale="Strategist circuit breaker is open",
@@ -537,9 +923,7 @@ class OpenAIStrategist:
                         "attempts": 0,
                         "prompt_version": self.prompt_version,
                         "schema_version": self.schema_version,
-                        "circuit_state": "open",
-                        "circuit_fail_count": int(float(st.get("fail_count") or 0.0)),
-                        "circuit_open_until_epoch": open_until,
+                        **blocked,
                     },
                 )
 
@@ -548,198 +932,45 @@ class OpenAIStrategist:
                 "Authorization": f"Bearer {self.api_key}",
             }
 
-            if _looks_like_chat_completions_endpoint(self.endpoint):
-                system_prompt = (
-                    "You are a trading strategist. "
-                    "Return JSON only. "
-                    f"Prompt-Version: {self.prompt_version}. "
-                    f"Schema-Version: {self.schema_version}. "
-                    "Schema: {\"intent\": {\"action\":\"BUY|SELL|NOOP\", \"symbol\": string|null, "
-                    "\"qty\": int, \"price\": number|null, \"order_type\":\"limit|market\", "
-                    "\"order_api_id\":\"ORDER_SUBMIT\"}, \"rationale\": string, \"meta\": object}."
-                )
-                user_payload = {
-                    "symbol": x.symbol,
-                    "market_snapshot": x.market_snapshot,
-                    "portfolio_snapshot": x.portfolio_snapshot,
-                    "risk_context": x.risk_context,
-                }
-                payload = {
-                    "model": model,
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": json.dumps(user_payload, ensure_ascii=False)},
-                    ],
-                    "temperature": 0.1,
-                }
-                if self.json_response_format:
-                    payload["response_format"] = {"type": "json_object"}
-            else:
-                # Legacy/custom strategist endpoint contract.
-                payload = {
-                    "model": model,
-                    "ts": int(time.time()),
-                    "input": {
-                        "symbol": x.symbol,
-                        "market_snapshot": x.market_snapshot,
-                        "portfolio_snapshot": x.portfolio_snapshot,
-                        "risk_context": x.risk_context,
-                    },
-                }
-            if self.max_tokens is not None:
-                payload["max_tokens"] = int(self.max_tokens)
+            if hedge_model:
+                # M32-1: hedge the primary model with a secondary one after a latency budget.
+                hedge_progress: Dict[str, int] = {"attempts": 0}
 
-            try:
-                resp, attempts = self._post_with_retry(
-                    self.endpoint,
-                    headers,
-                    payload,
-                    timeout=self.timeout_sec,
-                )
-            except Exception as e:
-                # Some providers ignore or reject response_format; retry once without it.
-                if (
-                    _looks_like_chat_completions_endpoint(self.endpoint)
-                    and self.json_response_format
-                    and self._is_response_format_error(e)
-                    and "response_format" in payload
-                ):
-                    payload = dict(payload)
-                    payload.pop("response_format", None)
-                    resp, attempts = self._post_with_retry(
-                        self.endpoint,
-                        headers,
-                        payload,
-                        timeout=self.timeout_sec,
-                    )
-                else:
-                    raise
+                def _hedge() -> Tuple[Dict[str, Any], str, Dict[str, Any]]:
+                    # gated only when the hedge actually fires, so an unused hedge claims no probe
+                    if self._cb_gate(self._cb_key(hedge_model), float(time.time()), claims) is not None:
+                        raise RuntimeError(f"circuit_open: {hedge_model}")
+                    return self._timed_decision(x, hedge_model, headers, hedge_progress, outcomes)
 
-            if _looks_like_chat_completions_endpoint(self.endpoint) and _chat_output_truncated_without_final_answer(resp):
-                retry_payload = dict(payload)
-                base_max = _to_nonneg_int(retry_payload.get("max_tokens"))
-                if base_max is None:
-                    base_max = _to_nonneg_int(self.max_tokens) or 256
-                retry_payload["max_tokens"] = int(min(max(base_max * 2, 512), 2048))
-                msgs = retry_payload.get("messages")
-                if isinstance(msgs, list):
-                    retry_payload["messages"] = list(msgs) + [
-                        {
-                            "role": "user",
-                            "content": "Return only one JSON object for the schema. No explanation.",
-                        }
-                    ]
-                resp2, retry_attempts = self._post_with_retry(
-                    self.endpoint,
-                    headers,
-                    retry_payload,
-                    timeout=self.timeout_sec,
+                result = run_hedged(
+                    lambda: self._timed_decision(x, model, headers, progress, outcomes),
+                    _hedge,
+                    hedge_delay_sec=self.hedge_policy.delay_for(model),
                 )
-                resp = resp2
-                attempts = int(attempts or 0) + int(retry_attempts or 0)
-
-            intent: Dict[str, Any] = {}
-            rationale = ""
-            meta = dict(resp.get("meta") or {})
-            usage = _extract_usage(resp)
-
-            # 1) Native/custom contract: {"intent": {...}, ...}
-            raw_intent = resp.get("intent")
-            if raw_intent is not None:
-                if isinstance(raw_intent, dict):
-                    intent = dict(raw_intent)
-                    rationale = str(resp.get("rationale") or intent.get("rationale") or "")
-                else:
-                    raise ValueError("Invalid response: 'intent' must be an object")
+                intent, rationale, meta = result.value
+                winner = model
+                if result.winner == "secondary":
+                    progress = hedge_progress
+                    winner = hedge_model
+                meta["hedged"] = bool(result.hedged)
+                meta["hedge_winner"] = result.winner
+                meta["hedge_model"] = hedge_model
+                meta["hedge_delay_sec"] = round(float(result.hedge_delay_sec), 3)
             else:
-                # 2) OpenRouter/OpenAI-style chat completions:
-                #    parse JSON in assistant content and adapt to {"intent": ...}.
-                content = _extract_chat_content(resp)
-                obj = _extract_json_object(content)
-                if obj is None:
-                    obj = _extract_chat_structured_object(resp)
-                if obj is None:
-                    preview = str(content or "").strip().replace("\r", " ").replace("\n", " ")
-                    if not preview:
-                        try:
-                            choices = resp.get("choices")
-                            first_choice = choices[0] if isinstance(choices, list) and choices else {}
-                            preview = json.dumps(first_choice, ensure_ascii=False)
-                        except Exception:
-                            preview = ""
-                    if len(preview) > 240:
-                        preview = preview[:240] + "..."
-                    raise ValueError(
-                        "Invalid response: no JSON object in model content"
-                        + (f" (preview={preview})" if preview else "")
-                    )
-
-                if isinstance(obj.get("intent"), dict):
-                    intent = dict(obj.get("intent") or {})
-                    rationale = str(obj.get("rationale") or intent.get("rationale") or "")
-                    if isinstance(obj.get("meta"), dict):
-                        meta.update(dict(obj.get("meta") or {}))
-                elif obj.get("action") is not None:
-                    # Allow direct intent object response.
-                    intent = dict(obj)
-                    rationale = str(obj.get("rationale") or "")
-                elif obj.get("decision") is not None:
-                    # Common alias in some models.
-                    intent = {
-                        "action": obj.get("decision"),
-                        "symbol": obj.get("symbol"),
-                        "qty": obj.get("qty"),
-                        "price": obj.get("price"),
-                        "order_type": obj.get("order_type"),
-                        "order_api_id": obj.get("order_api_id"),
-                        "reason": obj.get("reason"),
-                    }
-                    rationale = str(obj.get("rationale") or obj.get("reason") or "")
-                elif obj.get("signal") is not None:
-                    # Another common alias.
-                    intent = {
-                        "action": obj.get("signal"),
-                        "symbol": obj.get("symbol"),
-                        "qty": obj.get("qty"),
-                        "price": obj.get("price"),
-                        "order_type": obj.get("order_type"),
-                        "order_api_id": obj.get("order_api_id"),
-                        "reason": obj.get("reason"),
-                    }
-                    rationale = str(obj.get("rationale") or obj.get("reason") or "")
-                else:
-                    raise ValueError("Invalid response JSON: missing intent/action")
-
-            intent = self._normalize_intent(intent, x)
-            if not intent:
-                intent = {"action": "NOOP", "reason": "empty_intent"}
-            if str(intent.get("action") or "").upper() == "NOOP":
-                if not str(intent.get("reason") or "").strip():
-                    intent["reason"] = "model_no_signal"
-            meta.setdefault("model", model)
-            meta.setdefault(
-                "endpoint_type",
-                "chat_completions" if _looks_like_chat_completions_endpoint(self.endpoint) else "custom",
-            )
-            meta.setdefault("prompt_version", self.prompt_version)
-            meta.setdefault("schema_version", self.schema_version)
-            if usage.get("prompt_tokens") is not None:
-                meta.setdefault("prompt_tokens", int(usage["prompt_tokens"]))
-            if usage.get("completion_tokens") is not None:
-                meta.setdefault("completion_tokens", int(usage["completion_tokens"]))
-            if usage.get("total_tokens") is not None:
-                meta.setdefault("total_tokens", int(usage["total_tokens"]))
-            estimated_cost_usd = self._estimate_cost_usd(
-                prompt_tokens=usage.get("prompt_tokens"),
-                completion_tokens=usage.get("completion_tokens"),
-            )
-            if estimated_cost_usd is not None:
-                meta.setdefault("estimated_cost_usd", float(estimated_cost_usd))
-            meta["attempts"] = int(attempts or 1)
-            self._cb_on_success(cb_key)
+                intent, rationale, meta = self._timed_decision(x, model, headers, progress, outcomes)
+                winner = model
+
+            meta["attempts"] = int(progress.get("attempts") or 1)
+            if bypassed:
+                meta["circuit_bypassed_model"] = bypassed
+            # the breaker success belongs to the model that answered, not always the primary
+            self._cb_record_outcomes(outcomes, winner, float(time.time()))
             return StrategyDecision(intent=intent, rationale=rationale, meta=meta)
         except Exception as e:
             now_epoch = float(time.time())
+            for m, ok in list(outcomes.items()):
+                if not ok and m != model:
+                    self._cb_on_failure(self._cb_key(m), now_epoch)
             st = self._cb_on_failure(cb_key, now_epoch)
             open_until_epoch = float(st.get("open_until_epoch") or 0.0)
             circuit_state = "open" if open_until_epoch > now_epoch else "closed"
@@ -749,7 +980,7 @@ class OpenAIStrategist:
                 meta={
                     "error": str(e),
                     "error_type": e.__class__.__name__,
-                    "attempts": int(attempts or 1),
+                    "attempts": int(progress.get("attempts") or 1),
                     "prompt_version": self.prompt_version,
                     "schema_version": self.schema_version,
                     "circuit_state": circuit_state,
@@ -757,3 +988,6 @@ class OpenAIStrategist:
                     "circuit_open_until_epoch": int(open_until_epoch) if open_until_epoch > 0.0 else 0,
                 },
             )
+        finally:
+            # a cancelled (losing) branch must not keep its half-open probe until the claim TTL
+            self._cb_release_probes(claims, outcomes)
@@ -5,7 +5,7 @@ import os
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from libs.supervisor.intent_store import IntentStore
 from libs.supervisor.intent_state_store import (
@@ -17,6 +17,7 @@ from libs.supervisor.intent_state_store import (
     INTENT_STATE_REJECTED,
     SQLiteIntentStateStore,
 )
+from libs.execution.order_dispatch import OrderDispatcher, idempotency_key
 
 
 def _unwrap_intent(row: Any) -> Optional[Dict[str, Any]]:
@@ -39,6 +40,70 @@ class ApprovalResult:
     note: Optional[str] = None
 
 
+def _reject_blocked(iid: str, status: str) -> Optional[Dict[str, Any]]:
+    if status == "executed":
+        return {"ok": False, "intent_id": iid, "message": "Already executed. Reject is not allowed."}
+    if status == "approved":
+        return {"ok": False, "intent_id": iid, "message": "Already approved. Reject is not allowed."}
+    if status == "executing":
+        return {"ok": False, "intent_id": iid, "message": "Execution in progress. Reject is not allowed."}
+    if status == "failed":
+        return {"ok": False, "intent_id": iid, "message": "Failed intent cannot be rejected."}
+    if status == "rejected":
+        return {"ok": False, "intent_id": iid, "message": "Already rejected."}
+    return None
+
+
+def _approve_precheck(
+    iid: str, status: str, latest: Optional[Dict[str, Any]], execution_enabled: bool
+) -> Optional[Dict[str, Any]]:
+    """Final answer for intents approve must not touch (terminal / in-flight), else None."""
+    latest = latest or {}
+    if status == "rejected":
+        return {"ok": False, "intent_id": iid, "message": "Intent is rejected.", "reason": latest.get("reason")}
+    if status == "executed":
+        return {
+            "ok": True,
+            "intent_id": iid,
+            "status": "executed",
+            "execution": latest.get("execution"),
+            "note": "Already executed. Returned cached execution.",
+        }
+    if status == "failed":
+        return {
+            "ok": False,
+            "intent_id": iid,
+            "message": "Intent previously failed. Create a new intent for retry.",
+            "reason": latest.get("reason"),
+        }
+    if status == "executing":
+        return {"ok": False, "intent_id": iid, "message": "Intent is executing."}
+    if status == "approved" and not execution_enabled:
+        return {"ok": True, "intent_id": iid, "status": "approved", "note": "Already approved. Execution is still disabled."}
+    return None
+
+
+def _claim_lost(iid: str, current: str, latest: Optional[Dict[str, Any]], state_err: str) -> Dict[str, Any]:
+    """M24-3: result for an intent whose approved -> executing claim did not apply."""
+    if current == INTENT_STATE_EXECUTING:
+        return {"ok": False, "intent_id": iid, "message": "Intent is executing."}
+    if current == INTENT_STATE_EXECUTED:
+        return {
+            "ok": True,
+            "intent_id": iid,
+            "status": "executed",
+            "execution": latest.get("execution") if latest else None,
+            "note": "Already executed. Returned cached execution.",
+        }
+    if current == INTENT_STATE_FAILED:
+        return {
+            "ok": False,
+            "intent_id": iid,
+            "message": "Intent previously failed. Create a new intent for retry.",
+        }
+    return {"ok": False, "intent_id": iid, "message": state_err}
+
+
 class ApprovalService:
     """
     M16: Formal approval API (programmatic service).
@@ -46,6 +111,7 @@ class ApprovalService:
     - preview(intent_id)
     - approve(intent_id): marks approved; executes only if execution_enabled=True
     - reject(intent_id)
+    - approve_many(intent_ids) / reject_many(intent_ids): bulk variants (M32-13)
     - list_intents()
 
     Key invariants:
@@ -120,15 +186,15 @@ class ApprovalService:
             return ""
         return str(row.get("state") or "").strip().lower()
 
-    def _append_marker(
-        self,
+    @staticmethod
+    def _marker(
         *,
         intent_id: str,
         status: str,
         reason: Optional[str],
         intent: Dict[str, Any],
         execution: Optional[Dict[str, Any]] = None,
-    ) -> None:
+    ) -> Dict[str, Any]:
         row: Dict[str, Any] = {
             "ts": int(time.time()),
             "intent_id": intent_id,
@@ -138,19 +204,24 @@ class ApprovalService:
         }
         if execution is not None:
             row["execution"] = execution
-        self.store.append_row(row)
+        return row
+
+    def _append_marker(
+        self,
+        *,
+        intent_id: str,
+        status: str,
+        reason: Optional[str],
+        intent: Dict[str, Any],
+        execution: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.store.append_row(
+            self._marker(intent_id=intent_id, status=status, reason=reason, intent=intent, execution=execution)
+        )
 
     def _latest_row(self, intent_id: str) -> Optional[Dict[str, Any]]:
-        rows = self.store.load_all_rows()
-        latest: Optional[Dict[str, Any]] = None
-        for r in rows:
-            rid = r.get("intent_id") or (_unwrap_intent(r) or {}).get("intent_id")
-            if str(rid) != str(intent_id):
-                continue
-            ts = int(r.get("ts") or 0)
-            if (latest is None) or (ts >= int(latest.get("ts") or 0)):
-                latest = r
-        return latest
+        # M32-12: indexed lookup (no journal scan)
+        return self.store.latest_row(intent_id)
 
     def _resolve_intent(self, intent_id: Optional[str]) -> Tuple[Optional[str], Optional[Dict[str, Any]], Optional[str]]:
         if not intent_id:
@@ -179,15 +250,7 @@ class ApprovalService:
     # ---------- public API ----------
 
     def last_intent(self) -> Optional[Dict[str, Any]]:
-        rows = self.store.load_all_rows()
-        best: Optional[Dict[str, Any]] = None
-        for r in rows:
-            intent = _unwrap_intent(r) or {}
-            ts = int(r.get("ts") or 0)
-            if not intent.get("intent_id"):
-                continue
-            if (best is None) or (ts >= int(best.get("ts") or 0)):
-                best = {"ts": ts, "intent": intent, **r}
+        best = self.store.last_intent_row()
         return _unwrap_intent(best) if best else None
 
     def preview(self, *, intent_id: Optional[str] = None) -> Dict[str, Any]:
@@ -213,17 +276,9 @@ class ApprovalService:
         latest = self._latest_row(iid)
         latest_status = str((latest.get("status") or "")).lower() if latest else ""
         state_status = self._state_status(iid)
-        effective_status = state_status or latest_status
-        if effective_status == "executed":
-            return {"ok": False, "intent_id": iid, "message": "Already executed. Reject is not allowed."}
-        if effective_status == "approved":
-            return {"ok": False, "intent_id": iid, "message": "Already approved. Reject is not allowed."}
-        if effective_status == "executing":
-            return {"ok": False, "intent_id": iid, "message": "Execution in progress. Reject is not allowed."}
-        if effective_status == "failed":
-            return {"ok": False, "intent_id": iid, "message": "Failed intent cannot be rejected."}
-        if effective_status == "rejected":
-            return {"ok": False, "intent_id": iid, "message": "Already rejected."}
+        blocked = _reject_blocked(iid, state_status or latest_status)
+        if blocked:
+            return blocked
 
         state_err = self._safe_state_transition(
             intent_id=iid,
@@ -254,42 +309,9 @@ class ApprovalService:
         state_status = self._state_status(iid)
         effective_status = state_status or latest_status
 
-        if effective_status:
-            if effective_status == "rejected":
-                return {
-                    "ok": False,
-                    "intent_id": iid,
-                    "message": "Intent is rejected.",
-                    "reason": latest.get("reason"),
-                }
-            if effective_status == "executed":
-                return {
-                    "ok": True,
-                    "intent_id": iid,
-                    "status": "executed",
-                    "execution": latest.get("execution"),
-                    "note": "Already executed. Returned cached execution.",
-                }
-            if effective_status == "failed":
-                return {
-                    "ok": False,
-                    "intent_id": iid,
-                    "message": "Intent previously failed. Create a new intent for retry.",
-                    "reason": latest.get("reason"),
-                }
-            if effective_status == "executing":
-                return {
-                    "ok": False,
-                    "intent_id": iid,
-                    "message": "Intent is executing.",
-                }
-            if effective_status == "approved" and not execution_enabled:
-                return {
-                    "ok": True,
-                    "intent_id": iid,
-                    "status": "approved",
-                    "note": "Already approved. Execution is still disabled.",
-                }
+        early = _approve_precheck(iid, effective_status, latest, execution_enabled)
+        if early:
+            return early
 
         if effective_status != "approved":
             state_err = self._safe_state_transition(
@@ -320,24 +342,7 @@ class ApprovalService:
             meta={"source": "approval_service", "op": "execute_start"},
         )
         if state_err:
-            current = self._state_status(iid)
-            if current == INTENT_STATE_EXECUTING:
-                return {"ok": False, "intent_id": iid, "message": "Intent is executing."}
-            if current == INTENT_STATE_EXECUTED:
-                return {
-                    "ok": True,
-                    "intent_id": iid,
-                    "status": "executed",
-                    "execution": latest.get("execution") if latest else None,
-                    "note": "Already executed. Returned cached execution.",
-                }
-            if current == INTENT_STATE_FAILED:
-                return {
-                    "ok": False,
-                    "intent_id": iid,
-                    "message": "Intent previously failed. Create a new intent for retry.",
-                }
-            return {"ok": False, "intent_id": iid, "message": state_err}
+            return _claim_lost(iid, self._state_status(iid), latest, state_err)
         self._append_marker(intent_id=iid, status="executing", reason="execution started", intent=intent)
 
         try:
@@ -366,21 +371,290 @@ class ApprovalService:
         self._append_marker(intent_id=iid, status="executed", reason=None, intent=intent, execution=exec_res)
         return {"ok": True, "intent_id": iid, "status": "executed", "execution": exec_res}
 
-    def list_intents(self, limit: int = 10) -> Dict[str, Any]:
-        rows = self.store.load_all_rows()
+    # ---------- bulk API (M32-13) ----------
 
-        latest_by_id: Dict[str, Dict[str, Any]] = {}
-        for r in rows:
-            intent = _unwrap_intent(r) or {}
-            iid = intent.get("intent_id") or r.get("intent_id")
-            if not iid:
+    def _safe_state_transition_many(self, items: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """All transitions in ONE transaction; per-item error text (None = applied)."""
+        return [err for err, _ in self._state_transition_many_versions(items)]
+
+    def _state_transition_many_versions(self, items: List[Dict[str, Any]]) -> List[Tuple[Optional[str], Optional[int]]]:
+        """Like `_safe_state_transition_many`, plus the resulting state version of applied items."""
+        if self.state_store is None or not items:
+            return [(None, None)] * len(items)
+        try:
+            out = self.state_store.transition_many(items)
+        except Exception as e:
+            return [(f"intent state transition failed: {e}", None)] * len(items)
+        return [
+            (None, r.get("version"))
+            if r.get("ok")
+            else (f"intent state transition failed ({it['to_state']}): {r.get('error')}", None)
+            for it, r in zip(items, out)
+        ]
+
+    def _state_statuses(self, intent_ids: List[str]) -> Dict[str, str]:
+        if self.state_store is None or not intent_ids:
+            return {}
+        try:
+            rows = self.state_store.get_states(intent_ids)
+        except Exception:
+            return {}
+        return {iid: str(row.get("state") or "").strip().lower() for iid, row in rows.items()}
+
+    def _resolve_many(
+        self, intent_ids: Sequence[str]
+    ) -> Tuple[List[str], Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """One indexed pass over the journal for all ids.
+
+        Returns (ids in input order without duplicates, intents, latest rows, results for
+        ids that could not be resolved).
+        """
+        ids = [iid for iid in dict.fromkeys(str(i or "").strip() for i in intent_ids) if iid]
+        loaded = self.store.load_many(ids)
+        latest = self.store.latest_rows_for(ids)
+        intents: Dict[str, Dict[str, Any]] = {}
+        results: Dict[str, Dict[str, Any]] = {}
+        for iid in ids:
+            intent = _unwrap_intent(loaded.get(iid)) or _unwrap_intent(latest.get(iid))
+            if intent:
+                intents[iid] = intent
+            else:
+                results[iid] = {"ok": False, "intent_id": iid, "message": f"intent_id not found: {iid}"}
+        if self.state_store is not None and intents:
+            try:
+                self.state_store.ensure_many(list(intents))
+            except Exception as e:
+                for iid in intents:
+                    results[iid] = {"ok": False, "intent_id": iid, "message": f"intent state ensure failed: {e}"}
+                intents = {}
+        return ids, intents, latest, results
+
+    def _effective_statuses(self, intents: Dict[str, Dict[str, Any]], latest: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+        states = self._state_statuses(list(intents))
+        return {iid: states.get(iid) or str((latest.get(iid) or {}).get("status") or "").lower() for iid in intents}
+
+    @staticmethod
+    def _bulk_summary(ids: List[str], results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        items = [results[iid] for iid in ids if iid in results]
+        ok_count = sum(1 for r in items if r.get("ok"))
+        return {
+            "ok": ok_count == len(items),
+            "count": len(items),
+            "ok_count": ok_count,
+            "error_count": len(items) - ok_count,
+            "results": items,
+        }
+
+    def reject_many(self, *, intent_ids: Sequence[str], reason: str = "rejected") -> Dict[str, Any]:
+        """Reject several intents: one journal lookup pass, one state transaction, one marker write.
+
+        Per-intent results match `reject`; ids that are not pending are reported, not rejected.
+        """
+        ids, intents, latest, results = self._resolve_many(intent_ids)
+        if not ids:
+            return {"ok": False, "message": "No intent_ids given."}
+
+        statuses = self._effective_statuses(intents, latest)
+        todo: List[str] = []
+        for iid in intents:
+            blocked = _reject_blocked(iid, statuses[iid])
+            if blocked:
+                results[iid] = blocked
+            else:
+                todo.append(iid)
+
+        errs = self._safe_state_transition_many(
+            [
+                {
+                    "intent_id": iid,
+                    "to_state": INTENT_STATE_REJECTED,
+                    "expected_from_state": INTENT_STATE_PENDING,
+                    "reason": reason,
+                    "meta": {"source": "approval_service", "op": "reject", "bulk": True},
+                }
+                for iid in todo
+            ]
+        )
+        markers: List[Dict[str, Any]] = []
+        for iid, err in zip(todo, errs):
+            if err:
+                results[iid] = {"ok": False, "intent_id": iid, "message": err}
                 continue
-            ts = int(r.get("ts") or 0)
-            prev = latest_by_id.get(str(iid))
-            if (prev is None) or (ts >= int(prev.get("ts") or 0)):
-                latest_by_id[str(iid)] = {**r, "intent": intent, "ts": ts, "intent_id": str(iid)}
+            markers.append(self._marker(intent_id=iid, status="rejected", reason=reason, intent=intents[iid]))
+            results[iid] = {"ok": True, "intent_id": iid, "status": "rejected", "reason": reason}
+        self.store.append_rows(markers)
+        return self._bulk_summary(ids, results)
 
-        items = sorted(latest_by_id.values(), key=lambda x: int(x.get("ts") or 0), reverse=True)[: max(1, int(limit))]
+    def approve_many(
+        self,
+        *,
+        intent_ids: Sequence[str],
+        execution_enabled: bool,
+        execute_fn: Callable[[Dict[str, Any]], Dict[str, Any]],
+        dispatcher: Optional[OrderDispatcher] = None,
+        guard_fn: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> Dict[str, Any]:
+        """Approve several intents: one journal lookup pass, one state transaction and one marker write for the approvals.
+
+        The pending -> approved transitions and, with execution enabled, the
+        approved -> executing claims (M24-3 CAS) of the whole batch are applied in a
+        single `transition_many` call. An intent whose claim does not apply (already
+        claimed by another worker, executed, failed) is reported exactly like `approve`
+        does and is never executed; so is one whose pending -> approved did not apply
+        (the claim is skipped). Claimed intents then run one by one, and each executed /
+        failed outcome is recorded (state + marker) right after its execution, as in
+        `approve`. Unlike `approve`, an `execute_fn` exception marks that intent failed
+        and the batch continues.
+
+        With a `dispatcher` (M32-19) the claimed intents are submitted concurrently under
+        its per-API rate limiter. Each submission carries an `idempotency_key` derived
+        from the version of its executing claim; the key is passed to `execute_fn` in
+        the intent and recorded in the done/failed journal meta and the result. `guard_fn`
+        runs per submission before its rate token (the dispatcher's own guard when None).
+        """
+        ids, intents, latest, results = self._resolve_many(intent_ids)
+        if not ids:
+            return {"ok": False, "message": "No intent_ids given."}
+
+        statuses = self._effective_statuses(intents, latest)
+        items: List[Dict[str, Any]] = []
+        for iid in intents:
+            early = _approve_precheck(iid, statuses[iid], latest.get(iid), execution_enabled)
+            if early:
+                results[iid] = early
+                continue
+            if statuses[iid] != INTENT_STATE_APPROVED:
+                items.append(
+                    {
+                        "intent_id": iid,
+                        "to_state": INTENT_STATE_APPROVED,
+                        "expected_from_state": INTENT_STATE_PENDING,
+                        "reason": "manual approve",
+                        "meta": {"source": "approval_service", "op": "approve", "bulk": True},
+                    }
+                )
+            if execution_enabled:
+                items.append(
+                    {
+                        "intent_id": iid,
+                        "to_state": INTENT_STATE_EXECUTING,
+                        "expected_from_state": INTENT_STATE_APPROVED,
+                        "reason": "execution started",
+                        "meta": {"source": "approval_service", "op": "execute_start", "bulk": True},
+                        # as in `approve`: no claim when this call's pending -> approved did not apply
+                        "requires_previous": statuses[iid] != INTENT_STATE_APPROVED,
+                    }
+                )
+
+        errs: Dict[Tuple[str, str], Optional[str]] = {}
+        claim_versions: Dict[str, Optional[int]] = {}
+        for it, (err, version) in zip(items, self._state_transition_many_versions(items)):
+            errs[(it["intent_id"], it["to_state"])] = err
+            if it["to_state"] == INTENT_STATE_EXECUTING:
+                claim_versions[it["intent_id"]] = version
+
+        markers: List[Dict[str, Any]] = []
+        claimed: List[str] = []
+        lost: Dict[str, str] = {}
+        for iid in intents:
+            if iid in results:
+                continue
+            approve_err = errs.get((iid, INTENT_STATE_APPROVED))
+            if approve_err:
+                results[iid] = {"ok": False, "intent_id": iid, "message": approve_err}
+                continue
+            if (iid, INTENT_STATE_APPROVED) in errs:
+                markers.append(self._marker(intent_id=iid, status="approved", reason="manual approve", intent=intents[iid]))
+            if not execution_enabled:
+                results[iid] = {
+                    "ok": True,
+                    "intent_id": iid,
+                    "status": "approved",
+                    "note": "Execution is disabled (EXECUTION_ENABLED=false).",
+                }
+                continue
+            claim_err = errs.get((iid, INTENT_STATE_EXECUTING))
+            if claim_err:
+                lost[iid] = claim_err
+                continue
+            markers.append(self._marker(intent_id=iid, status="executing", reason="execution started", intent=intents[iid]))
+            claimed.append(iid)
+        self.store.append_rows(markers)
+
+        if lost:
+            current = self._state_statuses(list(lost))
+            for iid, claim_err in lost.items():
+                results[iid] = _claim_lost(iid, current.get(iid, ""), latest.get(iid), claim_err)
+
+        if not claimed:
+            return self._bulk_summary(ids, results)
+
+        keys: Dict[str, str] = {}
+        if dispatcher is None:
+            # each outcome is recorded (state + marker) as soon as its execution returns
+            for iid in claimed:
+                try:
+                    exec_res, fail_reason = execute_fn(intents[iid]), None
+                except Exception as e:
+                    exec_res, fail_reason = None, str(e)
+                results[iid] = self._record_execution(iid, intents[iid], exec_res, fail_reason)
+        else:
+            jobs = []
+            for iid in claimed:
+                keys[iid] = idempotency_key(iid, claim_versions.get(iid))
+                jobs.append(({**intents[iid], "intent_id": iid, "idempotency_key": keys[iid]}, keys[iid]))
+            # acks are recorded in completion order as they arrive: a slow order holds back no
+            # other intent's transition / marker, and a crash loses none that already returned
+            futures = [dispatcher.dispatch(execute_fn, intent, key=key, guard_fn=guard_fn) for intent, key in jobs]
+            for o in dispatcher.collect(dict.fromkeys(futures)):
+                results[o.intent_id] = self._record_execution(
+                    o.intent_id, intents[o.intent_id], o.execution, o.error, key=keys[o.intent_id]
+                )
+        return self._bulk_summary(ids, results)
+
+    def _record_execution(
+        self,
+        iid: str,
+        intent: Dict[str, Any],
+        exec_res: Optional[Dict[str, Any]],
+        fail_reason: Optional[str],
+        *,
+        key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Executed / failed transition + marker of one claimed intent; its bulk result."""
+        meta: Dict[str, Any] = {"source": "approval_service", "bulk": True}
+        if key is not None:
+            meta["idempotency_key"] = key
+        if fail_reason is not None:
+            self._safe_state_transition(
+                intent_id=iid, to_state=INTENT_STATE_FAILED, reason=fail_reason, meta={**meta, "op": "execute_fail"}
+            )
+            # same as `approve`: the failed marker is written even if the state update failed
+            self._append_marker(intent_id=iid, status="failed", reason=fail_reason, intent=intent)
+            result: Dict[str, Any] = {"ok": False, "intent_id": iid, "status": "failed", "message": fail_reason}
+        else:
+            err = self._safe_state_transition(
+                intent_id=iid,
+                to_state=INTENT_STATE_EXECUTED,
+                reason="execution done",
+                meta={**meta, "op": "execute_done"},
+                execution=exec_res,
+            )
+            if err:
+                result = {"ok": False, "intent_id": iid, "message": err}
+            else:
+                self._append_marker(intent_id=iid, status="executed", reason=None, intent=intent, execution=exec_res)
+                result = {"ok": True, "intent_id": iid, "status": "executed", "execution": exec_res}
+        if key is not None:
+            result["idempotency_key"] = key
+        return result
+
+    def list_intents(self, limit: int = 10) -> Dict[str, Any]:
+        items: List[Dict[str, Any]] = []
+        for r in self.store.latest_rows(limit=max(1, int(limit))):
+            intent = _unwrap_intent(r) or {}
+            iid = intent.get("intent_id") or r.get("intent_id")
+            items.append({**r, "intent": intent, "ts": int(r.get("ts") or 0), "intent_id": str(iid)})
         # compact output
         out: List[Dict[str, Any]] = []
         for it in items:
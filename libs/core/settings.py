@@ -6,12 +6,13 @@ from typing import Optional, Dict
 import os
 
 
-def load_env_file(path: str | Path = ".env") -> Dict[str, str]:
+def parse_env_file(path: str | Path = ".env") -> Dict[str, str]:
+    """KEY=value pairs of a .env file (no side effects); {} when the file is missing."""
     p = Path(path)
     if not p.exists():
         return {}
 
-    loaded: Dict[str, str] = {}
+    values: Dict[str, str] = {}
     for raw in p.read_text(encoding="utf-8").splitlines():
         line = raw.strip()
         if not line or line.startswith("#"):
@@ -28,7 +29,15 @@ def load_env_file(path: str | Path = ".env") -> Dict[str, str]:
 
         if (len(v) >= 2) and ((v[0] == v[-1]) and v[0] in ("'", '"')):
             v = v[1:-1]
-        if k and (k not in os.environ):
+        if k:
+            values.setdefault(k, v)  # first occurrence wins, as when loading into os.environ
+    return values
+
+
+def load_env_file(path: str | Path = ".env") -> Dict[str, str]:
+    loaded: Dict[str, str] = {}
+    for k, v in parse_env_file(path).items():
+        if k not in os.environ:
             os.environ[k] = v
             loaded[k] = v
     return loaded
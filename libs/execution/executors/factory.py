@@ -6,6 +6,7 @@ from typing import Optional, Any
 
 from libs.execution.executors.mock_executor import MockExecutor
 from libs.execution.executors.real_executor import RealExecutor
+from libs.execution.sim_exchange import shared_exchange
 from libs.core.settings import Settings
 
 
@@ -28,4 +29,9 @@ def get_executor(settings: Optional[Settings] = None, *, catalog: Any = None, **
         return RealExecutor(**init_kwargs)
 
     # Mock executor doesn't need catalog; it only needs base_url.
-    return MockExecutor(base_url=s.base_url)
+    # M32-21: MOCK_EXCHANGE=sim answers orders / order status from a simulated matching engine,
+    # shared by every executor in the process so orders and status queries see the same books.
+    exchange = kwargs.get("exchange")
+    if exchange is None and (os.getenv("MOCK_EXCHANGE", "") or "").strip().lower() == "sim":
+        exchange = shared_exchange()
+    return MockExecutor(base_url=s.base_url, exchange=exchange)
@@ -5,15 +5,21 @@ from typing import Any, Dict, Optional
 from libs.core.api_response import ApiResponse
 from libs.catalog.api_request_builder import PreparedRequest
 from libs.execution.executors.base import ExecutionResult
+from libs.execution.sim_exchange import SimExchange
 
 
 class MockExecutor:
     """Mock executor: never calls network, never trades.
     Returns ApiResponse(ok=True) with the would-be request payload.
+
+    M32-21: with a `SimExchange`, order (kt10000/kt10001/kt10003) and order-detail
+    (kt00007/kt00009) requests are answered by the simulated matching engine; its
+    response fields are merged into the payload.
     """
 
-    def __init__(self, base_url: str = ""):
+    def __init__(self, base_url: str = "", *, exchange: Optional[SimExchange] = None):
         self.base_url = base_url.rstrip("/")
+        self.exchange = exchange
 
     def execute(self, req: PreparedRequest, *, auth_token: Optional[str] = None) -> ExecutionResult:
         url = f"{self.base_url}{req.path}" if self.base_url else req.path
@@ -30,12 +36,21 @@ class MockExecutor:
         else:
             payload["headers"]["Authorization"] = "Bearer <token>"
 
+        meta: Dict[str, Any] = {"executor": "mock"}
+        ok = True
+        if self.exchange is not None:
+            sim = self.exchange.handle(req.api_id, dict(req.body or {}))
+            if sim is not None:
+                payload.update(sim)
+                ok = sim.get("return_code") in (0, "0")
+                meta["exchange"] = "sim"
+
         resp = ApiResponse(
             status_code=0,
-            ok=True,
+            ok=ok,
             payload=payload,
             error_code=None,
             error_message=None,
             raw_text="",
         )
-        return ExecutionResult(response=resp, meta={"executor": "mock"})
+        return ExecutionResult(response=resp, meta=meta)
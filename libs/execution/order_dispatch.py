@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+"""M32-19: Concurrent order dispatch with idempotency keys and per-API pacing.
+
+`OrderDispatcher` submits already-claimed intents on a thread pool. Each submission:
+  1. runs the optional `guard_fn` (raises -> failed outcome, no rate token spent),
+  2. waits for a token of its order API (`OrderRateLimiter`, kt10000 buy / kt10001 sell),
+  3. calls the submit function (the existing execute path, with its own guards).
+
+Idempotency: the caller derives the key from the SQLite approved -> executing claim
+(`idempotency_key(intent_id, claim_version)`); the CAS claim already guarantees one
+owner across processes, and a dispatcher never submits the same key twice (a repeated key
+returns the first future). Outcomes are collected in completion order (`collect`), so acks
+are recorded as they arrive, not in submission order.
+
+`shared_dispatcher()` returns one dispatcher per process and env config, so the per-API
+pacing and the remembered keys span every bulk approval, not just one call. Callers pass
+their own `guard_fn` per dispatch and never close it.
+
+Env:
+  - ORDER_DISPATCH_WORKERS: pool size; <= 1 keeps the serial path (default 1)
+  - ORDER_RATE_LIMIT_PER_SEC: default orders/sec per API (default 5, <= 0 = unlimited)
+  - ORDER_RATE_LIMIT_BURST: bucket size (default 1)
+  - ORDER_RATE_LIMITS: per-API overrides, e.g. "kt10000:5,kt10001:3"
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+SubmitFn = Callable[[Dict[str, Any]], Dict[str, Any]]
+GuardFn = Callable[[Dict[str, Any]], Any]
+
+ORDER_API_BUY = "kt10000"
+ORDER_API_SELL = "kt10001"
+
+_DEFAULT_RATE_PER_SEC = 5.0
+_MAX_REMEMBERED_KEYS = 4096
+
+_SHARED: Dict[tuple, "OrderDispatcher"] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.getenv(name, "") or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = (os.getenv(name, "") or "").strip()
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+def parse_rate_map(raw: Any) -> Dict[str, float]:
+    """"kt10000:5,kt10001:3" (or a dict) -> {api_id: rate}; invalid entries are dropped."""
+    items: Iterable[Any]
+    if isinstance(raw, dict):
+        items = raw.items()
+    else:
+        items = (part.partition(":")[::2] for part in str(raw or "").split(",") if ":" in part)
+    out: Dict[str, float] = {}
+    for api_id, rate in items:
+        key = str(api_id or "").strip()
+        try:
+            out[key] = float(rate)
+        except (TypeError, ValueError):
+            continue
+    out.pop("", None)
+    return out
+
+
+def order_api_id(intent: Dict[str, Any]) -> str:
+    """Order API of an intent (same switch as the order.place skill: sell -> kt10001)."""
+    side = str(intent.get("action") or intent.get("side") or "").strip().upper()
+    return ORDER_API_SELL if side == "SELL" else ORDER_API_BUY
+
+
+def idempotency_key(intent_id: str, claim_version: Optional[int]) -> str:
+    """Key of one execution attempt: the intent id + the state version its claim produced."""
+    return f"{intent_id}:v{int(claim_version)}" if claim_version is not None else f"{intent_id}:local"
+
+
+class OrderRateLimiter:
+    """Thread-safe token bucket per API id.
+
+    `acquire` reserves a token under the lock and sleeps outside it, so concurrent
+    callers are paced in arrival order without holding the lock while waiting.
+    """
+
+    def __init__(
+        self,
+        rate_per_sec: float = _DEFAULT_RATE_PER_SEC,
+        *,
+        burst: int = 1,
+        per_api: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate_per_sec = float(rate_per_sec)
+        self.burst = max(1, int(burst))
+        self.per_api = dict(per_api or {})
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, List[float]] = {}  # api_id -> [tokens, last_ts]
+
+    @classmethod
+    def from_env(cls) -> "OrderRateLimiter":
+        return cls(
+            _env_float("ORDER_RATE_LIMIT_PER_SEC", _DEFAULT_RATE_PER_SEC),
+            burst=_env_int("ORDER_RATE_LIMIT_BURST", 1),
+            per_api=parse_rate_map(os.getenv("ORDER_RATE_LIMITS", "")),
+        )
+
+    def rate_for(self, api_id: str) -> float:
+        return float(self.per_api.get(api_id, self.rate_per_sec))
+
+    def acquire(self, api_id: str) -> float:
+        """Take one token of `api_id`, sleeping if needed. Returns the wait in seconds."""
+        rate = self.rate_for(api_id)
+        if rate <= 0.0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            bucket = self._buckets.get(api_id)
+            if bucket is None:
+                bucket = self._buckets[api_id] = [float(self.burst), now]
+            tokens = min(float(self.burst), bucket[0] + (now - bucket[1]) * rate)
+            tokens -= 1.0
+            bucket[0], bucket[1] = tokens, now
+            delay = -tokens / rate if tokens < 0.0 else 0.0
+        if delay > 0.0:
+            self._sleep(delay)
+        return delay
+
+
+@dataclass(frozen=True)
+class DispatchOutcome:
+    intent_id: str
+    idempotency_key: str
+    api_id: str
+    ok: bool
+    execution: Optional[Dict[str, Any]]
+    error: Optional[str]
+    wait_ms: float
+    latency_ms: float
+
+
+class OrderDispatcher:
+    """Concurrent order submission (see module docstring)."""
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 4,
+        rate_limiter: Optional[OrderRateLimiter] = None,
+        guard_fn: Optional[GuardFn] = None,
+    ):
+        self.max_workers = max(1, int(max_workers))
+        self.rate_limiter = rate_limiter
+        self.guard_fn = guard_fn
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="order-dispatch")
+        self._lock = threading.Lock()
+        self._futures: "OrderedDict[str, Future]" = OrderedDict()
+
+    @classmethod
+    def from_env(cls, *, guard_fn: Optional[GuardFn] = None) -> Optional["OrderDispatcher"]:
+        """Dispatcher configured from env, or None when ORDER_DISPATCH_WORKERS <= 1 (serial)."""
+        workers = _env_int("ORDER_DISPATCH_WORKERS", 1)
+        if workers <= 1:
+            return None
+        return cls(max_workers=workers, rate_limiter=OrderRateLimiter.from_env(), guard_fn=guard_fn)
+
+    def __enter__(self) -> "OrderDispatcher":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def _run(
+        self, submit_fn: SubmitFn, guard_fn: Optional[GuardFn], intent: Dict[str, Any], iid: str, key: str, api_id: str
+    ) -> DispatchOutcome:
+        t0 = time.perf_counter()
+        waited = 0.0
+        try:
+            if guard_fn is not None:
+                guard_fn(intent)
+            if self.rate_limiter is not None:
+                waited = self.rate_limiter.acquire(api_id)
+            execution, error = submit_fn(intent), None
+        except Exception as e:
+            execution, error = None, str(e)
+        return DispatchOutcome(
+            intent_id=iid,
+            idempotency_key=key,
+            api_id=api_id,
+            ok=error is None,
+            execution=execution,
+            error=error,
+            wait_ms=round(waited * 1000.0, 3),
+            latency_ms=round((time.perf_counter() - t0) * 1000.0, 3),
+        )
+
+    def dispatch(
+        self, submit_fn: SubmitFn, intent: Dict[str, Any], *, key: str, guard_fn: Optional[GuardFn] = None
+    ) -> "Future[DispatchOutcome]":
+        """Schedule one submission; a key seen before returns its original future.
+
+        `guard_fn` (default: the dispatcher's own) runs before the rate token is taken.
+        """
+        guard = guard_fn if guard_fn is not None else self.guard_fn
+        with self._lock:
+            fut = self._futures.get(key)
+            if fut is not None:
+                return fut
+            iid = str(intent.get("intent_id") or key.rpartition(":")[0])
+            fut = self._pool.submit(self._run, submit_fn, guard, intent, iid, key, order_api_id(intent))
+            self._futures[key] = fut
+            while len(self._futures) > _MAX_REMEMBERED_KEYS:
+                oldest_key, oldest = next(iter(self._futures.items()))
+                if not oldest.done():
+                    break
+                del self._futures[oldest_key]
+            return fut
+
+    @staticmethod
+    def collect(futures: Iterable["Future[DispatchOutcome]"], *, timeout: Optional[float] = None) -> Iterator[DispatchOutcome]:
+        """Yield outcomes in completion order. Raises TimeoutError if `timeout` elapses first."""
+        pending = set(futures)
+        deadline = None if timeout is None else time.monotonic() + float(timeout)
+        while pending:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                raise TimeoutError(f"{len(pending)} order submissions still pending")
+            for fut in done:
+                yield fut.result()
+
+    def run_many(
+        self,
+        submit_fn: SubmitFn,
+        jobs: Iterable[tuple],
+        *,
+        timeout: Optional[float] = None,
+        guard_fn: Optional[GuardFn] = None,
+    ) -> List[DispatchOutcome]:
+        """Dispatch (intent, key) pairs and gather all outcomes in completion order."""
+        futures = [self.dispatch(submit_fn, intent, key=key, guard_fn=guard_fn) for intent, key in jobs]
+        return list(self.collect(dict.fromkeys(futures), timeout=timeout))
+
+
+def shared_dispatcher() -> Optional[OrderDispatcher]:
+    """One `OrderDispatcher.from_env()` per process and env config (None when serial).
+
+    The rate limiter's buckets and the remembered keys persist across calls; callers must
+    not close it.
+    """
+    key = tuple(
+        (os.getenv(k, "") or "").strip()
+        for k in ("ORDER_DISPATCH_WORKERS", "ORDER_RATE_LIMIT_PER_SEC", "ORDER_RATE_LIMIT_BURST", "ORDER_RATE_LIMITS")
+    )
+    with _SHARED_LOCK:
+        d = _SHARED.get(key)
+        if d is None:
+            d = OrderDispatcher.from_env()
+            if d is None:
+                return None
+            _SHARED[key] = d
+        return d
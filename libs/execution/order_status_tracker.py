@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+"""M32-20: Batched order-status tracking with adaptive polling.
+
+`OrderStatusTracker` keeps the set of open orders and refreshes all of them with ONE
+account-level order-detail query (`account.orders`, kt00007) per interval, instead of
+one `order.status` call per `ord_no`. Each poll is diffed against the last known
+lifecycle of every tracked order and yields lifecycle events (stage change or new fill).
+
+Interval policy:
+  - nothing open: no polling at all (`due()` is False)
+  - `track()` (right after a submission): next poll within `min_interval_sec`
+  - a poll with events: stay at `min_interval_sec`
+  - a quiet poll or a fetch error: interval *= `backoff`, capped at `max_interval_sec`
+
+Terminal orders leave the open set but are remembered (the last `max_closed` of them):
+`track()` refuses them, so a stale `order_ref` cannot re-open a filled order and replay
+its fills, and `status()` keeps answering with the final lifecycle.
+
+Env: ORDER_STATUS_POLL_MIN_SEC (1), ORDER_STATUS_POLL_MAX_SEC (30), ORDER_STATUS_POLL_BACKOFF (2).
+"""
+
+import os
+import time
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+FetchFn = Callable[[], Any]
+
+STAGE_SUBMITTED = "submitted"
+
+_CANCELLED_KEYS = ("CANCEL", "CANCELED", "CANCELLED")
+_REJECTED_KEYS = ("REJECT", "DENY", "BLOCK")
+_FILLED_KEYS = ("FILLED", "DONE")
+_PARTIAL_KEYS = ("PARTIAL", "WORKING_PARTIAL")
+
+
+def _to_int(v: Any) -> int:
+    try:
+        return int(float(v))
+    except Exception:
+        return 0
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.getenv(name, "") or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def _norm_symbol(v: Any) -> str:
+    s = str(v or "").strip()
+    if s.startswith("A") and len(s) > 1 and s[1:].isdigit():
+        return s[1:]
+    return s
+
+
+def derive_order_lifecycle(order_status: Dict[str, Any] | None) -> Dict[str, Any] | None:
+    """Order status summary (`status`, `filled_qty`, `order_qty`, ...) -> lifecycle stage."""
+    if not isinstance(order_status, dict):
+        return None
+
+    status = str(order_status.get("status") or "").strip().upper()
+    filled_qty = max(0, _to_int(order_status.get("filled_qty")))
+    order_qty = max(0, _to_int(order_status.get("order_qty")))
+
+    if order_qty > 0:
+        progress = min(1.0, float(filled_qty) / float(order_qty))
+    else:
+        progress = 0.0
+
+    stage = "working"
+    terminal = False
+
+    if any(k in status for k in _CANCELLED_KEYS):
+        stage = "cancelled"
+        terminal = True
+    elif any(k in status for k in _REJECTED_KEYS):
+        stage = "rejected"
+        terminal = True
+    elif (order_qty > 0 and filled_qty >= order_qty) or any(k in status for k in _FILLED_KEYS):
+        stage = "filled"
+        terminal = True
+        progress = 1.0
+    elif (filled_qty > 0 and order_qty > 0 and filled_qty < order_qty) or any(k in status for k in _PARTIAL_KEYS):
+        stage = "partial_fill"
+        terminal = False
+    elif not status:
+        stage = "unknown"
+        terminal = False
+
+    return {
+        "ord_no": order_status.get("ord_no"),
+        "symbol": order_status.get("symbol"),
+        "status_raw": order_status.get("status"),
+        "stage": stage,
+        "terminal": terminal,
+        "filled_qty": filled_qty,
+        "order_qty": order_qty,
+        "progress": float(progress),
+    }
+
+
+def order_status_from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """kt00007 detail row (or an already normalized row) -> order status summary."""
+    return {
+        "ord_no": str(row.get("ord_no") or "").strip(),
+        "symbol": _norm_symbol(row.get("symbol") or row.get("stk_cd")) or None,
+        "status": row.get("status") or row.get("acpt_tp"),
+        "filled_qty": row.get("filled_qty") or row.get("cntr_qty"),
+        "order_qty": row.get("order_qty") or row.get("ord_qty"),
+        "filled_price": row.get("filled_price") or row.get("cntr_uv"),
+        "order_price": row.get("order_price") or row.get("ord_uv"),
+    }
+
+
+def rows_from_account_orders(value: Any) -> List[Dict[str, Any]]:
+    """Rows of an account.orders result: list, DTO, `{rows|acnt_ord_cntr_prps_dtl|items}` or a skill record.
+
+    A skill record / run result that is not `ready` raises ValueError.
+    """
+    if is_dataclass(value) and not isinstance(value, type):
+        value = asdict(value)
+    if isinstance(value, dict):
+        result = value.get("result") if isinstance(value.get("result"), dict) else None
+        if result is None and "action" in value and "data" in value:
+            result = value
+        if result is not None:
+            action = str(result.get("action") or "").strip().lower()
+            if action and action != "ready":
+                meta = result.get("meta") if isinstance(result.get("meta"), dict) else {}
+                raise ValueError(f"account.orders:{action}:{meta.get('error_type') or 'skill_not_ready'}")
+            value = result.get("data")
+        if is_dataclass(value) and not isinstance(value, type):
+            value = asdict(value)
+    if isinstance(value, dict):
+        for key in ("rows", "acnt_ord_cntr_prps_dtl", "items"):
+            if isinstance(value.get(key), list):
+                value = value[key]
+                break
+        else:
+            return []
+    if not isinstance(value, list):
+        return []
+    return [r for r in value if isinstance(r, dict)]
+
+
+class OrderStatusTracker:
+    """Open-order set refreshed by one account-level query per interval (see module docstring)."""
+
+    def __init__(
+        self,
+        fetch_fn: Optional[FetchFn] = None,
+        *,
+        min_interval_sec: float = 1.0,
+        max_interval_sec: float = 30.0,
+        backoff: float = 2.0,
+        max_closed: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.fetch_fn = fetch_fn
+        self.min_interval_sec = max(0.0, float(min_interval_sec))
+        self.max_interval_sec = max(self.min_interval_sec, float(max_interval_sec))
+        self.backoff = max(1.0, float(backoff))
+        self._clock = clock
+        self.interval_sec = self.max_interval_sec
+        self.next_poll_at = 0.0
+        self.last_value: Any = None
+        self.last_error: Optional[str] = None
+        self._open: Dict[str, Dict[str, Any]] = {}
+        self._closed: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.max_closed = max(1, int(max_closed))
+        self.stats = {"polls": 0, "fetch_errors": 0, "events": 0}
+
+    @classmethod
+    def from_env(cls, fetch_fn: Optional[FetchFn] = None) -> "OrderStatusTracker":
+        return cls(
+            fetch_fn,
+            min_interval_sec=_env_float("ORDER_STATUS_POLL_MIN_SEC", 1.0),
+            max_interval_sec=_env_float("ORDER_STATUS_POLL_MAX_SEC", 30.0),
+            backoff=_env_float("ORDER_STATUS_POLL_BACKOFF", 2.0),
+        )
+
+    @property
+    def open_count(self) -> int:
+        return len(self._open)
+
+    def track(
+        self,
+        ord_no: Any,
+        *,
+        symbol: Any = None,
+        order_qty: Any = None,
+        intent_id: Any = None,
+        now: Optional[float] = None,
+    ) -> bool:
+        """Start tracking a submitted order and tighten the poll interval.
+
+        False if already tracked, already terminal or no ord_no.
+        """
+        key = str(ord_no or "").strip()
+        if not key or key in self._open or key in self._closed:
+            return False
+        now = self._clock() if now is None else float(now)
+        self._open[key] = {
+            "ord_no": key,
+            "symbol": _norm_symbol(symbol) or None,
+            "intent_id": intent_id,
+            "stage": STAGE_SUBMITTED,
+            "terminal": False,
+            "filled_qty": 0,
+            "order_qty": max(0, _to_int(order_qty)),
+            "progress": 0.0,
+            "status_raw": None,
+            "tracked_at": now,
+        }
+        self.interval_sec = self.min_interval_sec
+        soon = now + self.min_interval_sec
+        # first open order: the schedule was idle; otherwise only ever pull the next poll closer
+        self.next_poll_at = soon if len(self._open) == 1 else min(self.next_poll_at, soon)
+        return True
+
+    def due(self, now: Optional[float] = None) -> bool:
+        now = self._clock() if now is None else float(now)
+        return bool(self._open) and now >= self.next_poll_at
+
+    def status(self, ord_no: Any) -> Optional[Dict[str, Any]]:
+        key = str(ord_no or "").strip()
+        row = self._open.get(key) or self._closed.get(key)
+        return dict(row) if row is not None else None
+
+    def lifecycles(self) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self._open.values()]
+
+    def _close(self, row: Dict[str, Any]) -> None:
+        del self._open[row["ord_no"]]
+        self._closed[row["ord_no"]] = row
+        while len(self._closed) > self.max_closed:
+            self._closed.popitem(last=False)
+
+    def _reschedule(self, now: float, *, active: bool) -> None:
+        if not self._open:
+            self.interval_sec = self.max_interval_sec
+        elif active:
+            self.interval_sec = self.min_interval_sec
+        else:
+            self.interval_sec = min(self.max_interval_sec, max(self.min_interval_sec, self.interval_sec) * self.backoff)
+        self.next_poll_at = now + self.interval_sec
+
+    def poll(
+        self, *, now: Optional[float] = None, force: bool = False, fetch_fn: Optional[FetchFn] = None
+    ) -> List[Dict[str, Any]]:
+        """One account-level query when due (or `force`), diffed into lifecycle events."""
+        now = self._clock() if now is None else float(now)
+        if not force and not self.due(now):
+            return []
+        fn = fetch_fn or self.fetch_fn
+        if fn is None:
+            raise ValueError("OrderStatusTracker.poll requires a fetch_fn")
+        self.stats["polls"] += 1
+        try:
+            value = fn()
+            rows = rows_from_account_orders(value)
+        except Exception as e:
+            self.stats["fetch_errors"] += 1
+            self.last_error = str(e)
+            self._reschedule(now, active=False)
+            return []
+        self.last_value = value
+        self.last_error = None
+        return self.ingest(rows, now=now)
+
+    def ingest(self, rows: List[Dict[str, Any]], *, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Diff account-level rows against the open set; terminal orders leave the set."""
+        now = self._clock() if now is None else float(now)
+        events: List[Dict[str, Any]] = []
+        if self._open:
+            for row in rows:
+                status = order_status_from_row(row)
+                cur = self._open.get(status["ord_no"])
+                if cur is None:
+                    continue
+                if not status["order_qty"] and cur["order_qty"]:
+                    status["order_qty"] = cur["order_qty"]
+                life = derive_order_lifecycle(status) or {}
+                fill_delta = int(life["filled_qty"]) - int(cur["filled_qty"])
+                if life["stage"] == cur["stage"] and fill_delta <= 0:
+                    continue
+                events.append(
+                    {
+                        "ord_no": cur["ord_no"],
+                        "intent_id": cur.get("intent_id"),
+                        "symbol": life.get("symbol") or cur.get("symbol"),
+                        "prev_stage": cur["stage"],
+                        "stage": life["stage"],
+                        "terminal": life["terminal"],
+                        "filled_qty": life["filled_qty"],
+                        "fill_delta": max(0, fill_delta),
+                        "filled_price": status.get("filled_price"),
+                        "order_qty": life["order_qty"],
+                        "ts": now,
+                    }
+                )
+                cur.update({k: life[k] for k in ("stage", "terminal", "filled_qty", "order_qty", "progress", "status_raw")})
+                if life.get("symbol"):
+                    cur["symbol"] = life["symbol"]
+                if life["terminal"]:
+                    self._close(cur)
+        self.stats["events"] += len(events)
+        self._reschedule(now, active=bool(events))
+        return events
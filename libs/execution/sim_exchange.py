@@ -0,0 +1,516 @@
+from __future__ import annotations
+
+"""M32-21: Order-book-aware simulated exchange for MockExecutor.
+
+`SimExchange` keeps, per symbol, the external top of book (from
+`microstructure/top_of_book.jsonl` quotes or minute bars) and a book of resting
+simulated orders, and matches with price-time priority:
+
+  1. an arriving order first crosses resting simulated orders on the other side
+     (best price first, then arrival sequence; trades at the resting price),
+  2. then takes the external quote (ask for buys, bid for sells) up to the quote size,
+  3. any remainder rests: limit orders in the price-time book, market orders in a FIFO
+     that has priority over limits when new liquidity arrives.
+
+New quotes refresh the external size and sweep resting orders; minute bars fill resting
+orders whose limit the bar traded through, up to `bar_participation * volume`.
+
+Time is event time (market data timestamps, epoch seconds), so replays are deterministic.
+Latency injection: an order becomes active `latency_ms (+ gaussian jitter)` after
+submission and is matched when the clock reaches that point.
+
+`handle(api_id, body)` answers Kiwoom-shaped requests: kt10000 / kt10001 (order),
+kt10003 (cancel), kt00007 / kt00009 (account order detail rows).
+
+Live use (`MOCK_EXCHANGE=sim`): `shared_exchange()` returns one exchange per process and
+config, so every executor (skill runner, execute_from_packet, execute_order) sees the same
+books. It runs with `wall_clock`: after the replayed events, `handle` moves event time
+forward by the wall time elapsed since the previous request, so latency-delayed orders
+become active.
+
+Env (via `from_env`): MOCK_EXCHANGE_LATENCY_MS, MOCK_EXCHANGE_LATENCY_JITTER_MS,
+MOCK_EXCHANGE_TOP_QTY, MOCK_EXCHANGE_BAR_PARTICIPATION, MOCK_EXCHANGE_DATASET (dataset root to preload).
+"""
+
+import csv
+import heapq
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+BUY = "BUY"
+SELL = "SELL"
+
+ORDER_APIS = {"kt10000": BUY, "kt10001": SELL}
+CANCEL_API = "kt10003"
+STATUS_APIS = ("kt00007", "kt00009")
+
+# kt00007 `acpt_tp` values; terminal non-fill states use the words `derive_order_lifecycle` maps
+_ACPT_TP = {
+    "pending": "접수",
+    "working": "접수",
+    "partial": "체결",
+    "filled": "체결",
+    "cancelled": "CANCELLED",
+    "rejected": "REJECTED",
+}
+
+
+def _to_float(v: Any) -> Optional[float]:
+    try:
+        x = float(str(v).replace(",", "").strip()) if isinstance(v, str) else float(v)
+    except (TypeError, ValueError):
+        return None
+    return x if x == x else None
+
+
+def _to_ts(v: Any) -> Optional[float]:
+    if v is None or v == "":
+        return None
+    x = _to_float(v)
+    if x is not None:
+        return x
+    try:
+        return datetime.fromisoformat(str(v).strip().replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.getenv(name, "") or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def _norm_symbol(v: Any) -> str:
+    s = str(v or "").strip()
+    if s.startswith("A") and len(s) > 1 and s[1:].isdigit():
+        return s[1:]
+    return s
+
+
+@dataclass(eq=False)
+class SimOrder:
+    ord_no: str
+    symbol: str
+    side: str
+    qty: int
+    price: Optional[float]  # None = market
+    seq: int
+    submitted_at: float
+    arrive_at: float
+    ref_mid: Optional[float] = None
+    filled_qty: int = 0
+    filled_notional: float = 0.0
+    status: str = "pending"  # pending | working | partial | filled | cancelled | rejected
+    reason: str = ""
+
+    @property
+    def remaining(self) -> int:
+        return self.qty - self.filled_qty if self.status in ("pending", "working", "partial") else 0
+
+    @property
+    def avg_price(self) -> float:
+        return self.filled_notional / self.filled_qty if self.filled_qty else 0.0
+
+
+@dataclass
+class _SymbolBook:
+    bid: Optional[float] = None
+    ask: Optional[float] = None
+    bid_avail: int = 0
+    ask_avail: int = 0
+    # heap keys: bids (-price, seq), asks (price, seq)
+    bids: List[Tuple[float, int, SimOrder]] = field(default_factory=list)
+    asks: List[Tuple[float, int, SimOrder]] = field(default_factory=list)
+    market_buys: Deque[SimOrder] = field(default_factory=deque)
+    market_sells: Deque[SimOrder] = field(default_factory=deque)
+
+    def mid(self) -> Optional[float]:
+        if self.bid is not None and self.ask is not None:
+            return (self.bid + self.ask) / 2.0
+        return self.ask if self.ask is not None else self.bid
+
+
+class SimExchange:
+    """Simulated matching engine (see module docstring)."""
+
+    def __init__(
+        self,
+        *,
+        latency_ms: float = 0.0,
+        latency_jitter_ms: float = 0.0,
+        top_qty: int = 1000,
+        bar_participation: float = 0.1,
+        seed: int = 7,
+        wall_clock: Optional[Callable[[], float]] = None,
+    ):
+        self.latency_ms = max(0.0, float(latency_ms))
+        self.latency_jitter_ms = max(0.0, float(latency_jitter_ms))
+        self.top_qty = max(1, int(top_qty))
+        self.bar_participation = max(0.0, float(bar_participation))
+        self.now = 0.0
+        self.orders: Dict[str, SimOrder] = {}
+        self.fills: List[Dict[str, Any]] = []
+        self._books: Dict[str, _SymbolBook] = {}
+        self._arrivals: List[Tuple[float, int, SimOrder]] = []
+        self._seq = 0
+        self._rng = random.Random(seed)
+        self._wall_clock = wall_clock
+        self._wall_last: Optional[float] = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_env(cls, *, wall_clock: Optional[Callable[[], float]] = None) -> "SimExchange":
+        ex = cls(
+            latency_ms=_env_float("MOCK_EXCHANGE_LATENCY_MS", 0.0),
+            latency_jitter_ms=_env_float("MOCK_EXCHANGE_LATENCY_JITTER_MS", 0.0),
+            top_qty=int(_env_float("MOCK_EXCHANGE_TOP_QTY", 1000)),
+            bar_participation=_env_float("MOCK_EXCHANGE_BAR_PARTICIPATION", 0.1),
+            wall_clock=wall_clock,
+        )
+        root = (os.getenv("MOCK_EXCHANGE_DATASET", "") or "").strip()
+        if root:
+            ex.replay(load_market_events(root))
+        return ex
+
+    # ---------- market data ----------
+
+    def _book(self, symbol: str) -> _SymbolBook:
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _SymbolBook()
+        return book
+
+    def advance(self, ts: Optional[float]) -> None:
+        """Move the clock forward and activate orders whose latency has elapsed."""
+        if ts is not None and ts > self.now:
+            self.now = float(ts)
+        while self._arrivals and self._arrivals[0][0] <= self.now:
+            _, _, order = heapq.heappop(self._arrivals)
+            if order.status == "pending":
+                order.status = "working"
+                self._match_incoming(order)
+
+    def on_quote(
+        self,
+        symbol: Any,
+        bid: Any,
+        ask: Any,
+        *,
+        ts: Any = None,
+        bid_qty: Any = None,
+        ask_qty: Any = None,
+    ) -> None:
+        self.advance(_to_ts(ts))
+        sym = _norm_symbol(symbol)
+        book = self._book(sym)
+        book.bid, book.ask = _to_float(bid), _to_float(ask)
+        bq, aq = _to_float(bid_qty), _to_float(ask_qty)
+        book.bid_avail = int(bq) if bq is not None else self.top_qty
+        book.ask_avail = int(aq) if aq is not None else self.top_qty
+        if book.ask is not None:
+            book.ask_avail = self._sweep(sym, book, BUY, book.ask, book.ask_avail, "quote")
+        if book.bid is not None:
+            book.bid_avail = self._sweep(sym, book, SELL, book.bid, book.bid_avail, "quote")
+
+    def on_bar(self, symbol: Any, open_: Any, high: Any, low: Any, close: Any, volume: Any, *, ts: Any = None) -> None:
+        """Fill resting orders the bar traded through (limit at the better of limit/open; market at open)."""
+        self.advance(_to_ts(ts))
+        sym = _norm_symbol(symbol)
+        book = self._book(sym)
+        o, h, lo = _to_float(open_), _to_float(high), _to_float(low)
+        vol = _to_float(volume) or 0.0
+        if o is None or h is None or lo is None:
+            return
+        budget = int(vol * self.bar_participation)
+        self._sweep(sym, book, BUY, lo, budget, "bar", fill_px=o)
+        self._sweep(sym, book, SELL, h, budget, "bar", fill_px=o)
+
+    def replay(self, events: Iterable[Dict[str, Any]]) -> int:
+        """Feed `load_market_events` rows (kind quote|bar) in order. Returns the event count."""
+        n = 0
+        for ev in events:
+            if ev.get("kind") == "bar":
+                self.on_bar(ev["symbol"], ev["open"], ev["high"], ev["low"], ev["close"], ev["volume"], ts=ev["ts"])
+            else:
+                self.on_quote(ev["symbol"], ev.get("bid"), ev.get("ask"), ts=ev["ts"], bid_qty=ev.get("bid_qty"), ask_qty=ev.get("ask_qty"))
+            n += 1
+        return n
+
+    # ---------- orders ----------
+
+    def submit(
+        self,
+        *,
+        side: str,
+        symbol: Any,
+        qty: Any,
+        price: Any = None,
+        order_type: str = "limit",
+        ts: Any = None,
+    ) -> SimOrder:
+        self.advance(_to_ts(ts))
+        self._seq += 1
+        sym = _norm_symbol(symbol)
+        market = str(order_type or "").strip().lower() == "market"
+        px = None if market else _to_float(price)
+        q = int(_to_float(qty) or 0)
+        latency = self.latency_ms
+        if self.latency_jitter_ms:
+            latency = max(0.0, self._rng.gauss(self.latency_ms, self.latency_jitter_ms))
+        order = SimOrder(
+            ord_no=f"{self._seq:07d}",
+            symbol=sym,
+            side=BUY if str(side).strip().upper() in (BUY, "B", "BID") else SELL,
+            qty=q,
+            price=px,
+            seq=self._seq,
+            submitted_at=self.now,
+            arrive_at=self.now + latency / 1000.0,
+            ref_mid=self._book(sym).mid(),
+        )
+        self.orders[order.ord_no] = order
+        if q <= 0 or not sym or (not market and (px is None or px <= 0)):
+            order.status, order.reason = "rejected", "invalid order"
+            return order
+        heapq.heappush(self._arrivals, (order.arrive_at, order.seq, order))
+        self.advance(None)
+        return order
+
+    def cancel(self, ord_no: Any, *, ts: Any = None) -> Optional[SimOrder]:
+        self.advance(_to_ts(ts))
+        order = self.orders.get(str(ord_no or "").strip())
+        if order is None or order.remaining <= 0:
+            return order
+        order.status = "cancelled"  # lazy removal from heaps / FIFOs
+        return order
+
+    def _fill(self, order: SimOrder, qty: int, price: float, liquidity: str) -> None:
+        order.filled_qty += qty
+        order.filled_notional += qty * price
+        order.status = "filled" if order.filled_qty >= order.qty else "partial"
+        slip = None
+        if order.ref_mid:
+            sign = 1.0 if order.side == BUY else -1.0
+            slip = round(sign * (price - order.ref_mid) / order.ref_mid * 1e4, 4)
+        self.fills.append(
+            {
+                "ord_no": order.ord_no,
+                "symbol": order.symbol,
+                "side": order.side,
+                "qty": qty,
+                "price": price,
+                "ts": self.now,
+                "liquidity": liquidity,
+                "latency_sec": round(self.now - order.submitted_at, 6),
+                "slippage_bps": slip,
+            }
+        )
+
+    def _match_incoming(self, order: SimOrder) -> None:
+        book = self._book(order.symbol)
+        buy = order.side == BUY
+        resting = book.asks if buy else book.bids
+        # 1) resting simulated limit orders, price-time priority, at the resting price
+        while order.remaining and resting:
+            key, _, other = resting[0]
+            if other.remaining <= 0:
+                heapq.heappop(resting)
+                continue
+            px = key if buy else -key
+            if order.price is not None and (px > order.price if buy else px < order.price):
+                break
+            qty = min(order.remaining, other.remaining)
+            self._fill(order, qty, px, "internal")
+            self._fill(other, qty, px, "internal")
+            if other.remaining <= 0:
+                heapq.heappop(resting)
+        # 2) external top of book
+        quote = book.ask if buy else book.bid
+        avail = book.ask_avail if buy else book.bid_avail
+        if order.remaining and quote is not None and avail > 0:
+            if order.price is None or (quote <= order.price if buy else quote >= order.price):
+                qty = min(order.remaining, avail)
+                self._fill(order, qty, quote, "quote")
+                if buy:
+                    book.ask_avail -= qty
+                else:
+                    book.bid_avail -= qty
+        # 3) rest
+        if order.remaining:
+            if order.price is None:
+                (book.market_buys if buy else book.market_sells).append(order)
+            else:
+                heapq.heappush(book.bids if buy else book.asks, ((-order.price if buy else order.price), order.seq, order))
+
+    def _sweep(
+        self,
+        symbol: str,
+        book: _SymbolBook,
+        side: str,
+        level: float,
+        avail: int,
+        liquidity: str,
+        *,
+        fill_px: Optional[float] = None,
+    ) -> int:
+        """Fill resting `side` orders against `avail` external size at `level`. Returns the size left."""
+        buy = side == BUY
+        fifo = book.market_buys if buy else book.market_sells
+        while avail > 0 and fifo:
+            order = fifo[0]
+            if order.remaining <= 0:
+                fifo.popleft()
+                continue
+            qty = min(order.remaining, avail)
+            self._fill(order, qty, fill_px if fill_px is not None else level, liquidity)
+            avail -= qty
+            if order.remaining <= 0:
+                fifo.popleft()
+        heap = book.bids if buy else book.asks
+        while avail > 0 and heap:
+            key, _, order = heap[0]
+            if order.remaining <= 0:
+                heapq.heappop(heap)
+                continue
+            limit = -key if buy else key
+            if (limit < level) if buy else (limit > level):
+                break
+            px = level
+            if fill_px is not None:
+                px = min(limit, fill_px) if buy else max(limit, fill_px)
+            qty = min(order.remaining, avail)
+            self._fill(order, qty, px, liquidity)
+            avail -= qty
+            if order.remaining <= 0:
+                heapq.heappop(heap)
+        return avail
+
+    # ---------- Kiwoom-shaped queries ----------
+
+    def order_rows(self, *, symbol: Any = None) -> List[Dict[str, Any]]:
+        """kt00007 `acnt_ord_cntr_prps_dtl` rows (newest first)."""
+        sym = _norm_symbol(symbol)
+        rows: List[Dict[str, Any]] = []
+        for order in reversed(list(self.orders.values())):
+            if sym and order.symbol != sym:
+                continue
+            rows.append(
+                {
+                    "ord_no": order.ord_no,
+                    "stk_cd": order.symbol,
+                    "io_tp_nm": "매수" if order.side == BUY else "매도",
+                    "ord_qty": str(order.qty),
+                    "ord_uv": str(int(order.price)) if order.price is not None else "0",
+                    "cntr_qty": str(order.filled_qty),
+                    "cntr_uv": str(int(round(order.avg_price))),
+                    "oso_qty": str(max(0, order.remaining)),
+                    "acpt_tp": _ACPT_TP.get(order.status, order.status),
+                }
+            )
+        return rows
+
+    def handle(self, api_id: str, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Kiwoom-shaped response payload, or None for APIs the exchange does not simulate."""
+        with self._lock:
+            self._tick_wall_clock()
+            return self._handle(api_id, body or {})
+
+    def _tick_wall_clock(self) -> None:
+        if self._wall_clock is None:
+            return
+        t = float(self._wall_clock())
+        if self._wall_last is not None and t > self._wall_last:
+            self.advance(self.now + (t - self._wall_last))
+        self._wall_last = t
+
+    def _handle(self, api_id: str, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if api_id in ORDER_APIS:
+            trde_tp = str(body.get("trde_tp") or "").strip()
+            order = self.submit(
+                side=ORDER_APIS[api_id],
+                symbol=body.get("stk_cd"),
+                qty=body.get("ord_qty"),
+                price=body.get("ord_uv"),
+                order_type="market" if trde_tp == "3" or not str(body.get("ord_uv") or "").strip() else "limit",
+            )
+            if order.status == "rejected":
+                return {"return_code": 1, "return_msg": f"[SIM] rejected: {order.reason}"}
+            return {"ord_no": order.ord_no, "return_code": 0, "return_msg": "[SIM] order accepted"}
+        if api_id == CANCEL_API:
+            order = self.cancel(body.get("orig_ord_no"))
+            if order is None or order.status != "cancelled":
+                return {"return_code": 1, "return_msg": "[SIM] nothing to cancel"}
+            return {"ord_no": order.ord_no, "base_orig_ord_no": order.ord_no, "cncl_qty": str(order.qty - order.filled_qty), "return_code": 0}
+        if api_id in STATUS_APIS:
+            self.advance(None)
+            return {"acnt_ord_cntr_prps_dtl": self.order_rows(symbol=body.get("stk_cd")), "return_code": 0}
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        by_status: Dict[str, int] = {}
+        for order in self.orders.values():
+            by_status[order.status] = by_status.get(order.status, 0) + 1
+        slips = [f["slippage_bps"] for f in self.fills if f["slippage_bps"] is not None]
+        return {
+            "orders": len(self.orders),
+            "fills": len(self.fills),
+            "by_status": by_status,
+            "avg_slippage_bps": round(sum(slips) / len(slips), 4) if slips else None,
+        }
+
+
+def load_market_events(root: Any) -> List[Dict[str, Any]]:
+    """Quotes (`microstructure/top_of_book.jsonl`) + minute bars (`market/ohlcv_1m.csv`) in time order."""
+    base = Path(root)
+    events: List[Dict[str, Any]] = []
+    tob = base / "microstructure" / "top_of_book.jsonl"
+    if tob.exists():
+        for line in tob.read_text(encoding="utf-8").splitlines():
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            events.append({**row, "kind": "quote", "ts": _to_ts(row.get("ts")) or 0.0})
+    bars = base / "market" / "ohlcv_1m.csv"
+    if bars.exists():
+        with bars.open(encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                # a bar is known at its close: stamp it at the end of the minute
+                events.append({**row, "kind": "bar", "ts": (_to_ts(row.get("ts")) or 0.0) + 60.0})
+    events.sort(key=lambda e: e["ts"])
+    return events
+
+
+_SHARED: Dict[Tuple[str, ...], SimExchange] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_exchange() -> SimExchange:
+    """One wall-clocked `SimExchange.from_env()` per process and env config (dataset loaded once)."""
+    key = tuple(
+        (os.getenv(k, "") or "").strip()
+        for k in (
+            "MOCK_EXCHANGE_LATENCY_MS",
+            "MOCK_EXCHANGE_LATENCY_JITTER_MS",
+            "MOCK_EXCHANGE_TOP_QTY",
+            "MOCK_EXCHANGE_BAR_PARTICIPATION",
+            "MOCK_EXCHANGE_DATASET",
+        )
+    )
+    with _SHARED_LOCK:
+        ex = _SHARED.get(key)
+        if ex is None:
+            ex = _SHARED[key] = SimExchange.from_env(wall_clock=time.monotonic)
+        return ex
@@ -46,6 +46,17 @@ class KiwoomTokenClient:
             )
 
         margin = int(self.s.kiwoom_token_refresh_margin_sec)
+        hit = self._cache_hit(margin)
+        if hit is not None:
+            return hit
+        # one refresh per cache file at a time: a concurrent caller waits and reuses it
+        with self.cache.lock:
+            hit = self._cache_hit(margin)
+            if hit is not None:
+                return hit
+            return self._refresh()
+
+    def _cache_hit(self, margin: int) -> EnsureTokenResult | None:
         cached = self.cache.load()
         if cached and (not cached.will_expire_within(margin)):
             return EnsureTokenResult(
@@ -54,7 +65,9 @@ class KiwoomTokenClient:
                 expires_at_epoch=cached.expires_at_epoch,
                 reason="Valid cached token",
             )
+        return None
 
+    def _refresh(self) -> EnsureTokenResult:
         endpoint = self._token_endpoint()
         body = self._token_request_body()
         url, resp = self.http.request(
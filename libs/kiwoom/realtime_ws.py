@@ -0,0 +1,469 @@
+from __future__ import annotations
+
+"""M32-23: Kiwoom realtime WebSocket feed -> `QuoteTable`.
+
+`KiwoomRealtimeClient` keeps one WebSocket to Kiwoom's realtime endpoint on a background
+thread and writes every realtime print into a `QuoteTable`:
+
+  - connect -> `{"trnm": "LOGIN", "token": ...}` -> `REG` for every subscribed symbol
+    (chunks of `REG_CHUNK`), so a reconnect always resubscribes the full set
+  - `REAL` messages: type `0B` (trade: 10 price, 15 trade qty, 13 cumulative volume,
+    27 / 28 best ask / bid) and `0C` (best quote: 27 / 28); Kiwoom signs prices relative
+    to the previous close, so the absolute value is used
+  - `PING` messages are echoed back (Kiwoom's keep-alive); protocol-level pings are answered
+  - on any error / close: reconnect with exponential backoff
+    (`reconnect_min_sec` .. `reconnect_max_sec`, reset after a successful login)
+
+The WebSocket codec is a minimal RFC 6455 client/server framing on the standard library
+(no extra dependency), shared with the local stand-in feed (`libs/kiwoom/standin_feed.py`).
+
+Env (via `from_env`): KIWOOM_WS_URL_MOCK / KIWOOM_WS_URL_REAL (by KIWOOM_MODE),
+QUOTE_STREAM_TYPES (0B), QUOTE_STREAM_RECONNECT_MIN_SEC (0.5), QUOTE_STREAM_RECONNECT_MAX_SEC (30).
+"""
+
+import base64
+import hashlib
+import json
+import os
+import select
+import socket
+import ssl
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from libs.market.quote_table import QuoteTable
+
+DEFAULT_WS_URL_MOCK = "wss://mockapi.kiwoom.com:10000/api/dostk/websocket"
+DEFAULT_WS_URL_REAL = "wss://api.kiwoom.com:10000/api/dostk/websocket"
+
+REG_CHUNK = 100  # symbols per REG / REMOVE message
+
+OP_CONT, OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x0, 0x1, 0x2, 0x8, 0x9, 0xA
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class WebSocketError(ConnectionError):
+    pass
+
+
+class WebSocketClosed(WebSocketError):
+    pass
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.getenv(name, "") or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def ws_accept_key(key: str) -> str:
+    return base64.b64encode(hashlib.sha1((key + _WS_GUID).encode("ascii")).digest()).decode("ascii")
+
+
+def _apply_mask(data: bytes, key: bytes) -> bytes:
+    n = len(data)
+    if not n:
+        return data
+    k = (key * (n // 4 + 1))[:n]
+    return (int.from_bytes(data, "big") ^ int.from_bytes(k, "big")).to_bytes(n, "big")
+
+
+def encode_frame(opcode: int, payload: bytes, *, mask: bool) -> bytes:
+    head = bytearray([0x80 | (opcode & 0x0F)])
+    n = len(payload)
+    mbit = 0x80 if mask else 0x00
+    if n < 126:
+        head.append(mbit | n)
+    elif n < 65536:
+        head.append(mbit | 126)
+        head += struct.pack("!H", n)
+    else:
+        head.append(mbit | 127)
+        head += struct.pack("!Q", n)
+    if mask:
+        key = os.urandom(4)
+        head += key
+        payload = _apply_mask(payload, key)
+    return bytes(head) + payload
+
+
+class FrameSocket:
+    """Framed reads / writes over a connected socket (clients mask, servers do not)."""
+
+    def __init__(self, sock: socket.socket, *, mask: bool, buffered: bytes = b""):
+        self.sock = sock
+        self.mask = mask
+        self._buf = bytearray(buffered)
+        self._send_lock = threading.Lock()
+        self.closed = False
+
+    def _read_exact(self, n: int) -> bytes:
+        while len(self._buf) < n:
+            chunk = self.sock.recv(max(65536, n - len(self._buf)))
+            if not chunk:
+                raise WebSocketClosed("connection closed by peer")
+            self._buf += chunk
+        out = bytes(self._buf[:n])
+        del self._buf[:n]
+        return out
+
+    def readable(self, timeout: float) -> bool:
+        if self._buf:
+            return True
+        pending = getattr(self.sock, "pending", None)
+        if pending is not None and pending():
+            return True
+        r, _, _ = select.select([self.sock], [], [], max(0.0, timeout))
+        return bool(r)
+
+    def read_frame(self) -> Tuple[bool, int, bytes]:
+        b0, b1 = self._read_exact(2)
+        fin, opcode = bool(b0 & 0x80), b0 & 0x0F
+        n = b1 & 0x7F
+        if n == 126:
+            (n,) = struct.unpack("!H", self._read_exact(2))
+        elif n == 127:
+            (n,) = struct.unpack("!Q", self._read_exact(8))
+        key = self._read_exact(4) if b1 & 0x80 else b""
+        payload = self._read_exact(n) if n else b""
+        if key:
+            payload = _apply_mask(payload, key)
+        return fin, opcode, payload
+
+    def recv_message(self, timeout: Optional[float] = None) -> Optional[Tuple[int, bytes]]:
+        """Next data message `(opcode, payload)`; None on timeout. Answers pings; close raises."""
+        if timeout is not None and not self.readable(timeout):
+            return None
+        parts: List[bytes] = []
+        op = OP_TEXT
+        while True:
+            fin, opcode, payload = self.read_frame()
+            if opcode == OP_PING:
+                self.send(OP_PONG, payload)
+                continue
+            if opcode == OP_PONG:
+                continue
+            if opcode == OP_CLOSE:
+                self.close(payload[:2] if len(payload) >= 2 else b"")
+                raise WebSocketClosed("close frame received")
+            if opcode != OP_CONT:
+                op = opcode
+            parts.append(payload)
+            if fin:
+                return op, b"".join(parts)
+
+    def recv_text(self, timeout: Optional[float] = None) -> Optional[str]:
+        msg = self.recv_message(timeout)
+        return None if msg is None else msg[1].decode("utf-8")
+
+    def send(self, opcode: int, payload: bytes) -> None:
+        frame = encode_frame(opcode, payload, mask=self.mask)
+        with self._send_lock:
+            if self.closed:
+                raise WebSocketClosed("send on closed socket")
+            self.sock.sendall(frame)
+
+    def send_text(self, text: str) -> None:
+        self.send(OP_TEXT, text.encode("utf-8"))
+
+    def send_json(self, obj: Any) -> None:
+        self.send_text(json.dumps(obj, ensure_ascii=False))
+
+    def close(self, code: bytes = b"\x03\xe8") -> None:
+        with self._send_lock:
+            if self.closed:
+                return
+            self.closed = True
+            try:
+                self.sock.sendall(encode_frame(OP_CLOSE, code, mask=self.mask))
+            except OSError:
+                pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+def ws_connect(url: str, *, timeout: float = 10.0, headers: Optional[Dict[str, str]] = None) -> FrameSocket:
+    """Open a client WebSocket (`ws://` or `wss://`) and complete the upgrade handshake."""
+    u = urlsplit(url)
+    secure = u.scheme == "wss"
+    host = u.hostname or "127.0.0.1"
+    port = u.port or (443 if secure else 80)
+    sock = socket.create_connection((host, port), timeout=timeout)
+    try:
+        if secure:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        path = (u.path or "/") + (f"?{u.query}" if u.query else "")
+        lines = [
+            f"GET {path} HTTP/1.1",
+            f"Host: {u.netloc}",
+            "Upgrade: websocket",
+            "Connection: Upgrade",
+            f"Sec-WebSocket-Key: {key}",
+            "Sec-WebSocket-Version: 13",
+        ]
+        lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        sock.sendall(("\r\n".join(lines) + "\r\n\r\n").encode("ascii"))
+        raw = b""
+        while b"\r\n\r\n" not in raw:
+            chunk = sock.recv(4096)
+            if not chunk:
+                raise WebSocketClosed("connection closed during handshake")
+            raw += chunk
+            if len(raw) > 65536:
+                raise WebSocketError("handshake response too large")
+        head, rest = raw.split(b"\r\n\r\n", 1)
+        status, *hdr_lines = head.decode("latin-1").split("\r\n")
+        parts = status.split()
+        if len(parts) < 2 or parts[1] != "101":
+            raise WebSocketError(f"handshake failed: {status}")
+        hdrs = {k.strip().lower(): v.strip() for k, v in (h.split(":", 1) for h in hdr_lines if ":" in h)}
+        if hdrs.get("sec-websocket-accept") != ws_accept_key(key):
+            raise WebSocketError("handshake failed: bad Sec-WebSocket-Accept")
+        return FrameSocket(sock, mask=True, buffered=rest)
+    except BaseException:
+        sock.close()
+        raise
+
+
+def _abs_num(v: Any) -> Optional[float]:
+    s = str(v or "").replace(",", "").strip().lstrip("+-")
+    if not s:
+        return None
+    try:
+        return float(s)
+    except ValueError:
+        return None
+
+
+def _chunks(items: List[str], n: int) -> Iterable[List[str]]:
+    for i in range(0, len(items), n):
+        yield items[i : i + n]
+
+
+class KiwoomRealtimeClient:
+    """Background realtime feed into a `QuoteTable` (see module docstring)."""
+
+    def __init__(
+        self,
+        url: str,
+        table: QuoteTable,
+        *,
+        token_fn: Callable[[], str],
+        connect_fn: Callable[..., FrameSocket] = ws_connect,
+        types: Iterable[str] = ("0B",),
+        reconnect_min_sec: float = 0.5,
+        reconnect_max_sec: float = 30.0,
+        recv_timeout_sec: float = 0.25,
+    ):
+        self.url = url
+        self.table = table
+        self.token_fn = token_fn
+        self.connect_fn = connect_fn
+        self.types = [str(t).strip() for t in types if str(t).strip()] or ["0B"]
+        self.reconnect_min_sec = max(0.0, float(reconnect_min_sec))
+        self.reconnect_max_sec = max(self.reconnect_min_sec, float(reconnect_max_sec))
+        self.recv_timeout_sec = max(0.01, float(recv_timeout_sec))
+        self._lock = threading.Lock()
+        self._symbols: Dict[str, None] = {}
+        self._conn: Optional[FrameSocket] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._failures = 0
+        self.last_error: Optional[str] = None
+        self.stats = {"connects": 0, "logins": 0, "disconnects": 0, "messages": 0, "quotes": 0, "pings": 0, "reg_sent": 0}
+        table.add_watch_listener(self.subscribe)
+
+    @classmethod
+    def from_env(cls, table: Optional[QuoteTable] = None, *, token_fn: Optional[Callable[[], str]] = None) -> "KiwoomRealtimeClient":
+        from libs.core.http_client import HttpClient
+        from libs.core.settings import Settings
+        from libs.kiwoom.kiwoom_token_client import KiwoomTokenClient
+
+        s = Settings.from_env()
+        mock = (s.kiwoom_mode or "mock").lower() == "mock"
+        url = (os.getenv("KIWOOM_WS_URL_MOCK" if mock else "KIWOOM_WS_URL_REAL", "") or "").strip()
+        url = url or (DEFAULT_WS_URL_MOCK if mock else DEFAULT_WS_URL_REAL)
+        if token_fn is None:
+            tokens = KiwoomTokenClient(s, HttpClient(s.base_url, timeout_sec=s.kiwoom_http_timeout_sec, retry_max=s.kiwoom_retry_max))
+            token_fn = lambda: tokens.ensure_token(dry_run=False).token  # noqa: E731
+        return cls(
+            url,
+            table if table is not None else QuoteTable.from_env(),
+            token_fn=token_fn,
+            types=(os.getenv("QUOTE_STREAM_TYPES", "0B") or "0B").split(","),
+            reconnect_min_sec=_env_float("QUOTE_STREAM_RECONNECT_MIN_SEC", 0.5),
+            reconnect_max_sec=_env_float("QUOTE_STREAM_RECONNECT_MAX_SEC", 30.0),
+        )
+
+    # ---------- subscriptions ----------
+
+    @property
+    def connected(self) -> bool:
+        conn = self._conn
+        return conn is not None and not conn.closed
+
+    def subscribed(self) -> List[str]:
+        with self._lock:
+            return list(self._symbols)
+
+    def _reg(self, conn: FrameSocket, trnm: str, symbols: List[str]) -> None:
+        for chunk in _chunks(symbols, REG_CHUNK):
+            conn.send_json({"trnm": trnm, "grp_no": "1", "refresh": "1", "data": [{"item": chunk, "type": list(self.types)}]})
+            self.stats["reg_sent"] += 1
+
+    def subscribe(self, symbols: Iterable[Any]) -> List[str]:
+        """Add symbols; sent right away when connected, otherwise on the next (re)connect."""
+        with self._lock:
+            new = []
+            for s in symbols:
+                sym = str(s or "").strip()
+                if sym and sym not in self._symbols:
+                    self._symbols[sym] = None
+                    new.append(sym)
+        conn = self._conn
+        if new and conn is not None and not conn.closed:
+            try:
+                self._reg(conn, "REG", new)
+            except OSError as e:
+                self.last_error = f"subscribe:{type(e).__name__}"
+        return new
+
+    def unsubscribe(self, symbols: Iterable[Any]) -> None:
+        with self._lock:
+            gone = [s for s in (str(x or "").strip() for x in symbols) if s in self._symbols]
+            for s in gone:
+                del self._symbols[s]
+        conn = self._conn
+        if gone and conn is not None and not conn.closed:
+            try:
+                self._reg(conn, "REMOVE", gone)
+            except OSError as e:
+                self.last_error = f"unsubscribe:{type(e).__name__}"
+
+    # ---------- connection ----------
+
+    def connect(self) -> FrameSocket:
+        """Connect, LOGIN and resubscribe everything (raises on failure)."""
+        conn = self.connect_fn(self.url)
+        self.stats["connects"] += 1
+        try:
+            conn.send_json({"trnm": "LOGIN", "token": self.token_fn()})
+            deadline = time.monotonic() + 10.0
+            while True:
+                text = conn.recv_text(timeout=max(0.0, deadline - time.monotonic()))
+                if text is None:
+                    raise WebSocketError("login timed out")
+                msg = json.loads(text)
+                if msg.get("trnm") == "LOGIN":
+                    if str(msg.get("return_code", "0")) not in ("0", ""):
+                        raise WebSocketError(f"login rejected: {msg.get('return_msg') or msg.get('return_code')}")
+                    break
+                self.handle_message(msg, conn)
+            self.stats["logins"] += 1
+            sent = self.subscribed()
+            self._reg(conn, "REG", sent)
+        except BaseException:
+            conn.close()
+            raise
+        self._conn = conn
+        # symbols subscribed while the login was in flight were not in `sent`
+        late = [s for s in self.subscribed() if s not in set(sent)]
+        if late:
+            self._reg(conn, "REG", late)
+        self._failures = 0
+        return conn
+
+    def handle_message(self, msg: Dict[str, Any], conn: Optional[FrameSocket] = None) -> int:
+        """Apply one decoded message. Returns the number of quote updates."""
+        self.stats["messages"] += 1
+        trnm = msg.get("trnm")
+        if trnm == "PING":
+            self.stats["pings"] += 1
+            target = conn or self._conn
+            if target is not None:
+                target.send_json(msg)
+            return 0
+        if trnm != "REAL":
+            return 0
+        n = 0
+        for item in msg.get("data") or []:
+            if not isinstance(item, dict):
+                continue
+            vals = item.get("values") if isinstance(item.get("values"), dict) else {}
+            kind = str(item.get("type") or "")
+            if kind == "0B":
+                ok = self.table.update(
+                    item.get("item"),
+                    price=_abs_num(vals.get("10")),
+                    qty=_abs_num(vals.get("15")),
+                    cum_volume=_abs_num(vals.get("13")),
+                    ask=_abs_num(vals.get("27")),
+                    bid=_abs_num(vals.get("28")),
+                )
+            elif kind == "0C":
+                ok = self.table.update(item.get("item"), ask=_abs_num(vals.get("27")), bid=_abs_num(vals.get("28")))
+            else:
+                ok = False
+            n += int(ok)
+        self.stats["quotes"] += n
+        return n
+
+    def _backoff_sec(self) -> float:
+        return min(self.reconnect_max_sec, self.reconnect_min_sec * (2 ** max(0, self._failures - 1)))
+
+    def run(self) -> None:
+        """Receive loop with reconnect; returns when `stop()` is called."""
+        while not self._stop.is_set():
+            conn = self._conn
+            try:
+                if conn is None or conn.closed:
+                    conn = self.connect()
+                text = conn.recv_text(timeout=self.recv_timeout_sec)
+                if text is not None:
+                    self.handle_message(json.loads(text), conn)
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                if conn is not None:
+                    if not conn.closed:
+                        conn.close()
+                    self.stats["disconnects"] += 1
+                self._conn = None
+                self._failures += 1
+                if not self._stop.is_set():
+                    self._stop.wait(self._backoff_sec())
+        conn = self._conn
+        if conn is not None:
+            conn.close()
+        self._conn = None
+
+    def start(self) -> "KiwoomRealtimeClient":
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="kiwoom-realtime", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> "KiwoomRealtimeClient":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
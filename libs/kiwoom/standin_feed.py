@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+"""M32-23: Local stand-in for Kiwoom's realtime WebSocket feed (tests / offline load).
+
+`KiwoomStandinFeed` accepts WebSocket clients on localhost and speaks the subset of the
+realtime protocol `KiwoomRealtimeClient` uses: `LOGIN` (optional token check), `REG` /
+`REMOVE` per connection, `PING` echo. `publish()` pushes a `REAL` `0B` trade print to every
+connection subscribed to the symbol; `replay()` turns M26 `top_of_book` / bar events
+(`load_market_events`) into prints; `drop_connections()` cuts every socket without a close
+frame, to exercise reconnect / resubscribe.
+"""
+
+import json
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from libs.kiwoom.realtime_ws import FrameSocket, WebSocketError, ws_accept_key
+
+WS_PATH = "/api/dostk/websocket"
+
+
+def _kiwoom_signed(v: float) -> str:
+    return f"{v:+.0f}"
+
+
+class _Conn:
+    def __init__(self, fs: FrameSocket) -> None:
+        self.fs = fs
+        self.logged_in = False
+        self.symbols: Set[str] = set()
+
+
+class KiwoomStandinFeed:
+    """Localhost realtime feed stand-in (see module docstring)."""
+
+    def __init__(self, *, token_check: Optional[Callable[[str], bool]] = None):
+        self.token_check = token_check
+        self._lock = threading.Lock()
+        self._conns: List[_Conn] = []
+        self._srv: Optional[socket.socket] = None
+        self._stop = threading.Event()
+        self._cum: Dict[str, float] = {}
+        self.stats = {"connections": 0, "logins": 0, "login_rejected": 0, "reg": 0, "remove": 0, "pings": 0, "sent": 0}
+
+    # ---------- server ----------
+
+    @property
+    def url(self) -> str:
+        if self._srv is None:
+            raise RuntimeError("KiwoomStandinFeed is not started")
+        host, port = self._srv.getsockname()[:2]
+        return f"ws://{host}:{port}{WS_PATH}"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> "KiwoomStandinFeed":
+        if self._srv is not None:
+            return self
+        srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        srv.bind((host, int(port)))
+        srv.listen(16)
+        srv.settimeout(0.2)
+        self._srv = srv
+        self._stop.clear()
+        threading.Thread(target=self._accept_loop, name="standin-feed-accept", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.drop_connections(graceful=True)
+        if self._srv is not None:
+            self._srv.close()
+            self._srv = None
+
+    def __enter__(self) -> "KiwoomStandinFeed":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _accept_loop(self) -> None:
+        srv = self._srv
+        while not self._stop.is_set() and srv is not None:
+            try:
+                sock, _ = srv.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(sock,), name="standin-feed-conn", daemon=True).start()
+
+    def _handshake(self, sock: socket.socket) -> FrameSocket:
+        raw = b""
+        while b"\r\n\r\n" not in raw:
+            chunk = sock.recv(4096)
+            if not chunk:
+                raise WebSocketError("client closed during handshake")
+            raw += chunk
+        head, rest = raw.split(b"\r\n\r\n", 1)
+        lines = head.decode("latin-1").split("\r\n")
+        hdrs = {k.strip().lower(): v.strip() for k, v in (h.split(":", 1) for h in lines[1:] if ":" in h)}
+        key = hdrs.get("sec-websocket-key", "")
+        if not key or hdrs.get("upgrade", "").lower() != "websocket":
+            sock.sendall(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+            raise WebSocketError("not a websocket upgrade")
+        sock.sendall(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {ws_accept_key(key)}\r\n\r\n"
+            ).encode("ascii")
+        )
+        return FrameSocket(sock, mask=False, buffered=rest)
+
+    def _serve(self, sock: socket.socket) -> None:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            fs = self._handshake(sock)
+        except (OSError, WebSocketError):
+            sock.close()
+            return
+        conn = _Conn(fs)
+        with self._lock:
+            self._conns.append(conn)
+            self.stats["connections"] += 1
+        try:
+            while not self._stop.is_set():
+                text = fs.recv_text(timeout=0.2)
+                if text is not None:
+                    self._on_message(conn, json.loads(text))
+        except (OSError, ValueError, WebSocketError):
+            pass
+        finally:
+            fs.close()
+            with self._lock:
+                if conn in self._conns:
+                    self._conns.remove(conn)
+
+    def _on_message(self, conn: _Conn, msg: Dict[str, Any]) -> None:
+        trnm = msg.get("trnm")
+        if trnm == "LOGIN":
+            ok = self.token_check is None or bool(self.token_check(str(msg.get("token") or "")))
+            with self._lock:
+                self.stats["logins" if ok else "login_rejected"] += 1
+            conn.logged_in = ok
+            conn.fs.send_json({"trnm": "LOGIN", "return_code": 0 if ok else 1, "return_msg": "" if ok else "invalid token"})
+            if not ok:
+                conn.fs.close()
+            return
+        if trnm == "PING":
+            with self._lock:
+                self.stats["pings"] += 1
+            return
+        if trnm in ("REG", "REMOVE") and conn.logged_in:
+            items: List[str] = []
+            for d in msg.get("data") or []:
+                if isinstance(d, dict):
+                    items.extend(str(x) for x in d.get("item") or [])
+            with self._lock:
+                if trnm == "REG":
+                    conn.symbols.update(items)
+                    self.stats["reg"] += 1
+                else:
+                    conn.symbols.difference_update(items)
+                    self.stats["remove"] += 1
+            conn.fs.send_json({"trnm": trnm, "return_code": 0, "return_msg": ""})
+
+    # ---------- control / publishing ----------
+
+    def subscriptions(self) -> Set[str]:
+        with self._lock:
+            out: Set[str] = set()
+            for c in self._conns:
+                out |= c.symbols
+            return out
+
+    def connection_count(self) -> int:
+        with self._lock:
+            return len(self._conns)
+
+    def wait_for(self, predicate: Callable[[], bool], timeout: float = 5.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.005)
+        return predicate()
+
+    def send_ping(self) -> int:
+        """Kiwoom-style application PING to every logged-in connection; clients echo it back."""
+        return self._broadcast(None, {"trnm": "PING"})
+
+    def drop_connections(self, *, graceful: bool = False) -> int:
+        with self._lock:
+            conns = list(self._conns)
+        for c in conns:
+            if graceful:
+                c.fs.close()
+            else:
+                try:
+                    c.fs.sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        return len(conns)
+
+    def publish(
+        self,
+        symbol: str,
+        price: float,
+        *,
+        qty: float = 1.0,
+        bid: Optional[float] = None,
+        ask: Optional[float] = None,
+        ts: Optional[float] = None,
+    ) -> int:
+        """One `0B` trade print to the connections subscribed to `symbol`. Returns deliveries."""
+        sym = str(symbol)
+        with self._lock:
+            self._cum[sym] = self._cum.get(sym, 0.0) + float(qty)
+            cum = self._cum[sym]
+        hhmmss = datetime.fromtimestamp(time.time() if ts is None else ts, tz=timezone.utc).strftime("%H%M%S")
+        values = {"20": hhmmss, "10": _kiwoom_signed(price), "15": _kiwoom_signed(qty), "13": f"{cum:.0f}"}
+        if ask is not None:
+            values["27"] = _kiwoom_signed(ask)
+        if bid is not None:
+            values["28"] = _kiwoom_signed(bid)
+        msg = {"trnm": "REAL", "data": [{"type": "0B", "name": "주식체결", "item": sym, "values": values}]}
+        return self._broadcast(sym, msg)
+
+    def replay(self, events: Iterable[Dict[str, Any]], *, qty: float = 1.0) -> int:
+        """M26 events (`load_market_events`): quotes publish the mid with bid / ask, bars their close."""
+        n = 0
+        for ev in events:
+            if ev.get("kind") == "bar":
+                n += self.publish(str(ev["symbol"]), float(ev["close"]), qty=float(ev.get("volume") or qty))
+            elif ev.get("bid") is not None and ev.get("ask") is not None:
+                bid, ask = float(ev["bid"]), float(ev["ask"])
+                n += self.publish(str(ev["symbol"]), (bid + ask) / 2.0, qty=qty, bid=bid, ask=ask)
+        return n
+
+    def _broadcast(self, symbol: Optional[str], msg: Dict[str, Any]) -> int:
+        data = json.dumps(msg, ensure_ascii=False)
+        with self._lock:
+            targets = [c for c in self._conns if c.logged_in and (symbol is None or symbol in c.symbols)]
+        sent = 0
+        for c in targets:
+            try:
+                c.fs.send_text(data)
+                sent += 1
+            except OSError:
+                continue
+        with self._lock:
+            self.stats["sent"] += sent
+        return sent
@@ -0,0 +1,553 @@
+from __future__ import annotations
+
+"""M32-22: Local Kiwoom REST stand-in server for offline load / latency testing.
+
+`KiwoomStandinServer` answers Kiwoom-shaped REST calls on localhost, routed by the
+paths and api-ids of `data/specs/api_catalog.jsonl` (`api-id` request header, or the
+path's default api when the header is missing):
+
+  - `/oauth2/token` (au10001): issues `standin-<n>` tokens with a TTL; other endpoints
+    answer 401 without a live Bearer token (`require_auth`)
+  - `/api/dostk/stkinfo` (ka10001): deterministic quote payload (`cur_prc`, ...)
+  - `/api/dostk/rkinfo` (ka10030 / ka10027 / ...): ranked rows, paged with the
+    `cont-yn` / `next-key` response headers
+  - `/api/dostk/ordr` (kt10000 / kt10001 / kt10003) and `/api/dostk/acnt` (kt00007 / kt00009):
+    answered by a `SimExchange` (M32-21)
+  - any other catalog api: `return_code=0` placeholder; unknown path: 404
+
+Payloads are deterministic: symbols of the M26 dataset use its last bar / top of book,
+other symbols get a price derived from a CRC of the code. Each response is delayed by a
+latency sample (`fixed:ms`, `uniform:lo:hi`, `normal:mean:sd`, `lognormal:median:sigma`,
+optionally per api-id), and requests can be answered with 429 (`return_code=5`) either
+with a probability or every N-th request of an api-id.
+
+Env (via `from_env`): KIWOOM_STANDIN_LATENCY, KIWOOM_STANDIN_LATENCY_BY_API,
+KIWOOM_STANDIN_429_RATE, KIWOOM_STANDIN_429_EVERY, KIWOOM_STANDIN_PAGE_SIZE,
+KIWOOM_STANDIN_RANK_ROWS, KIWOOM_STANDIN_TOKEN_TTL_SEC, KIWOOM_STANDIN_DATASET, KIWOOM_STANDIN_SEED.
+"""
+
+import csv
+import json
+import math
+import os
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from libs.catalog.api_catalog import ApiCatalog
+from libs.execution.sim_exchange import CANCEL_API, ORDER_APIS, STATUS_APIS, SimExchange, load_market_events
+
+DEFAULT_CATALOG_PATH = "data/specs/api_catalog.jsonl"
+DEFAULT_DATASET = "data/eval/m26_fixed_dataset_v1"
+
+TOKEN_API = "au10001"
+PRICE_API = "ka10001"
+
+# api used when a request carries no (valid) api-id header
+DEFAULT_API_BY_PATH = {
+    "/oauth2/token": TOKEN_API,
+    "/api/dostk/stkinfo": PRICE_API,
+    "/api/dostk/rkinfo": "ka10030",
+    "/api/dostk/ordr": "kt10000",
+    "/api/dostk/acnt": "kt00007",
+}
+
+# rank api -> (row list key, sort key)
+RANK_APIS = {
+    "ka10030": ("tdy_trde_qty_upper", "volume"),
+    "ka10027": ("pred_pre_flu_rt_upper", "change_rate"),
+}
+
+_MSG_OK = "정상적으로 처리되었습니다"
+_MSG_THROTTLED = "허용된 요청 개수를 초과하였습니다"
+
+_DISTS = ("fixed", "uniform", "normal", "lognormal")
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.getenv(name, "") or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(_env_float(name, float(default)))
+
+
+def _to_float(v: Any) -> Optional[float]:
+    try:
+        return float(str(v).replace(",", "").strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _norm_symbol(v: Any) -> str:
+    s = str(v or "").strip()
+    if s.startswith("A") and len(s) > 1 and s[1:].isdigit():
+        return s[1:]
+    return s
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    """Response delay distribution in milliseconds (see `parse`)."""
+
+    dist: str = "fixed"
+    a_ms: float = 0.0
+    b_ms: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: Any) -> "LatencyProfile":
+        """`"20"` / `"fixed:20"` / `"uniform:10:40"` / `"normal:20:5"` / `"lognormal:20:0.5"`."""
+        raw = str(spec or "").strip()
+        if not raw:
+            return cls()
+        parts = [p.strip() for p in raw.split(":")]
+        if _to_float(parts[0]) is not None:
+            parts = ["fixed"] + parts
+        dist = parts[0].lower()
+        if dist not in _DISTS:
+            raise ValueError(f"Unknown latency distribution: {parts[0]!r} (expected one of {_DISTS})")
+        nums = [_to_float(p) for p in parts[1:3]]
+        if any(n is None for n in nums):
+            raise ValueError(f"Invalid latency spec: {raw!r}")
+        a = nums[0] if nums else 0.0
+        b = nums[1] if len(nums) > 1 else (a if dist == "uniform" else 0.0)
+        return cls(dist=dist, a_ms=max(0.0, float(a)), b_ms=max(0.0, float(b)))
+
+    def sample_ms(self, rng: random.Random) -> float:
+        if self.dist == "uniform":
+            lo, hi = sorted((self.a_ms, self.b_ms))
+            return rng.uniform(lo, hi)
+        if self.dist == "normal":
+            return max(0.0, rng.gauss(self.a_ms, self.b_ms))
+        if self.dist == "lognormal":
+            # a = median, b = sigma of the underlying normal
+            return self.a_ms * math.exp(rng.gauss(0.0, self.b_ms))
+        return self.a_ms
+
+
+def parse_latency_map(raw: Any) -> Dict[str, LatencyProfile]:
+    """`"kt10000=fixed:40,ka10030=uniform:10:30"` -> {api_id: LatencyProfile}."""
+    out: Dict[str, LatencyProfile] = {}
+    for item in str(raw or "").split(","):
+        if "=" not in item:
+            continue
+        api_id, spec = item.split("=", 1)
+        if api_id.strip():
+            out[api_id.strip()] = LatencyProfile.parse(spec)
+    return out
+
+
+class StandinMarket:
+    """Deterministic quotes: M26 dataset symbols first, then CRC-priced synthetic codes."""
+
+    def __init__(self, quotes: Optional[Dict[str, Dict[str, float]]] = None, *, universe_size: int = 60):
+        self._quotes: Dict[str, Dict[str, float]] = {k: dict(v) for k, v in (quotes or {}).items()}
+        self.dataset_symbols = sorted(self._quotes, key=lambda s: (-self._quotes[s].get("volume", 0.0), s))
+        synthetic: List[str] = []
+        i = 0
+        while len(self.dataset_symbols) + len(synthetic) < max(0, int(universe_size)):
+            code = f"{100000 + i * 10:06d}"
+            if code not in self._quotes:
+                synthetic.append(code)
+            i += 1
+        self.symbols = self.dataset_symbols + synthetic
+
+    @classmethod
+    def from_dataset(cls, root: Any = DEFAULT_DATASET, *, universe_size: int = 60) -> "StandinMarket":
+        """Last daily / minute bar per symbol, with bid / ask from the last top-of-book row."""
+        base = Path(root)
+        quotes: Dict[str, Dict[str, float]] = {}
+        for name in ("ohlcv_1d.csv", "ohlcv_1m.csv"):
+            path = base / "market" / name
+            if not path.exists():
+                continue
+            with path.open(encoding="utf-8", newline="") as f:
+                for row in csv.DictReader(f):
+                    sym = _norm_symbol(row.get("symbol"))
+                    vals = {k: _to_float(row.get(k)) for k in ("open", "high", "low", "close", "volume")}
+                    if not sym or vals["close"] is None:
+                        continue
+                    q = quotes.setdefault(sym, {})
+                    if name == "ohlcv_1d.csv":
+                        # previous day's close; the open stands in for it on the first day
+                        prev = q.get("close", vals["open"] if vals["open"] is not None else vals["close"])
+                        q.update({k: v for k, v in vals.items() if v is not None})
+                        q["prev_close"] = prev
+                    else:
+                        q["close"] = vals["close"]
+        tob = base / "microstructure" / "top_of_book.jsonl"
+        if tob.exists():
+            for line in tob.read_text(encoding="utf-8").splitlines():
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                sym = _norm_symbol(row.get("symbol"))
+                bid, ask = _to_float(row.get("bid")), _to_float(row.get("ask"))
+                if sym and bid is not None and ask is not None:
+                    q = quotes.setdefault(sym, {"close": (bid + ask) / 2.0})
+                    q.update({"bid": bid, "ask": ask})
+        return cls(quotes, universe_size=universe_size)
+
+    def quote(self, symbol: Any) -> Dict[str, float]:
+        sym = _norm_symbol(symbol)
+        q = self._quotes.get(sym)
+        if q is None:
+            h = zlib.crc32(sym.encode("utf-8"))
+            close = float(1000 + (h % 9900) * 10)
+            q = {
+                "close": close,
+                "prev_close": round(close * (1.0 - ((h >> 8) % 601 - 300) / 10000.0), -1),
+                "volume": float(10_000 + (h >> 4) % 990_000),
+            }
+        close = float(q.get("close") or 0.0)
+        out = {
+            "close": close,
+            "open": float(q.get("open", close)),
+            "high": float(q.get("high", close)),
+            "low": float(q.get("low", close)),
+            "volume": float(q.get("volume", 0.0)),
+            "prev_close": float(q.get("prev_close", close)),
+            "bid": float(q.get("bid", close - 10)),
+            "ask": float(q.get("ask", close + 10)),
+        }
+        prev = out["prev_close"]
+        out["change_rate"] = round((close - prev) / prev * 100.0, 2) if prev else 0.0
+        return out
+
+
+@dataclass
+class StandinResponse:
+    status: int
+    payload: Dict[str, Any]
+    headers: Dict[str, str] = field(default_factory=dict)
+    api_id: Optional[str] = None
+    delay_sec: float = 0.0
+
+
+class KiwoomStandinServer:
+    """Localhost Kiwoom REST stand-in (see module docstring).
+
+    `handle()` is the socket-free core; `start()` serves it from a `ThreadingHTTPServer`
+    and sleeps the sampled latency in the handler thread before answering.
+    """
+
+    def __init__(
+        self,
+        *,
+        catalog: Optional[ApiCatalog] = None,
+        market: Optional[StandinMarket] = None,
+        exchange: Optional[SimExchange] = None,
+        latency: Optional[LatencyProfile] = None,
+        latency_by_api: Optional[Dict[str, LatencyProfile]] = None,
+        throttle_rate: float = 0.0,
+        throttle_every: int = 0,
+        page_size: int = 20,
+        token_ttl_sec: int = 86400,
+        require_auth: bool = True,
+        seed: int = 7,
+        clock: Any = time.time,
+    ):
+        self.catalog = catalog if catalog is not None else ApiCatalog.load(DEFAULT_CATALOG_PATH)
+        self.market = market if market is not None else StandinMarket.from_dataset()
+        self.exchange = exchange if exchange is not None else SimExchange(seed=seed)
+        self.latency = latency or LatencyProfile()
+        self.latency_by_api = dict(latency_by_api or {})
+        self.throttle_rate = max(0.0, min(1.0, float(throttle_rate)))
+        self.throttle_every = max(0, int(throttle_every))
+        self.page_size = max(1, int(page_size))
+        self.token_ttl_sec = max(1, int(token_ttl_sec))
+        self.require_auth = bool(require_auth)
+        self._clock = clock
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens: Dict[str, float] = {}
+        self._seeded: set = set()
+        self._apis_by_path: Dict[str, List[str]] = {}
+        for spec in self.catalog.list_specs():
+            if spec.path:
+                self._apis_by_path.setdefault(spec.path, []).append(spec.api_id)
+        self._srv: Optional[ThreadingHTTPServer] = None
+        self.reset_stats()
+
+    @classmethod
+    def from_env(cls, **overrides: Any) -> "KiwoomStandinServer":
+        seed = _env_int("KIWOOM_STANDIN_SEED", 7)
+        dataset = (os.getenv("KIWOOM_STANDIN_DATASET", "") or "").strip() or DEFAULT_DATASET
+        kwargs: Dict[str, Any] = {
+            "latency": LatencyProfile.parse(os.getenv("KIWOOM_STANDIN_LATENCY", "")),
+            "latency_by_api": parse_latency_map(os.getenv("KIWOOM_STANDIN_LATENCY_BY_API", "")),
+            "throttle_rate": _env_float("KIWOOM_STANDIN_429_RATE", 0.0),
+            "throttle_every": _env_int("KIWOOM_STANDIN_429_EVERY", 0),
+            "page_size": _env_int("KIWOOM_STANDIN_PAGE_SIZE", 20),
+            "token_ttl_sec": _env_int("KIWOOM_STANDIN_TOKEN_TTL_SEC", 86400),
+            "seed": seed,
+        }
+        if "market" not in overrides:
+            kwargs["market"] = StandinMarket.from_dataset(
+                dataset, universe_size=_env_int("KIWOOM_STANDIN_RANK_ROWS", 60)
+            )
+        if "exchange" not in overrides:
+            ex = SimExchange(seed=seed)
+            ex.replay(load_market_events(dataset))
+            kwargs["exchange"] = ex
+        kwargs.update(overrides)
+        return cls(**kwargs)
+
+    # --- stats -------------------------------------------------------------------------
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats: Dict[str, Any] = {
+                "requests": 0,
+                "throttled": 0,
+                "unauthorized": 0,
+                "tokens_issued": 0,
+                "by_api": {},
+                "by_status": {},
+            }
+            self._api_seq: Dict[str, int] = {}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self._stats)
+            out["by_api"] = dict(self._stats["by_api"])
+            out["by_status"] = dict(self._stats["by_status"])
+            return out
+
+    # --- routing -----------------------------------------------------------------------
+
+    def resolve_api(self, path: str, headers: Dict[str, str]) -> Optional[str]:
+        """api-id header when it belongs to `path`, else the path default; None for unknown paths."""
+        apis = self._apis_by_path.get(path)
+        if not apis:
+            return None
+        hdr = str(headers.get("api-id") or "").strip()
+        if hdr in apis:
+            return hdr
+        if path in DEFAULT_API_BY_PATH:
+            return DEFAULT_API_BY_PATH[path]
+        return apis[0] if len(apis) == 1 else ""
+
+    def handle(self, method: str, path: str, headers: Dict[str, Any], body: Any) -> StandinResponse:
+        hdrs = {str(k).lower(): str(v) for k, v in (headers or {}).items()}
+        body = body if isinstance(body, dict) else {}
+        path = "/" + str(path or "").split("?", 1)[0].strip("/")
+        api_id = self.resolve_api(path, hdrs)
+        if api_id is None:
+            resp = StandinResponse(404, {"return_code": 2, "return_msg": f"[STANDIN] unknown path {path}"})
+        elif not api_id:
+            resp = StandinResponse(400, {"return_code": 2, "return_msg": f"[STANDIN] api-id header required for {path}"})
+        else:
+            resp = self._dispatch(api_id, hdrs, body)
+        resp.api_id = api_id or None
+        resp.headers.setdefault("api-id", api_id or "")
+        resp.headers.setdefault("cont-yn", "N")
+        resp.headers.setdefault("next-key", "")
+        with self._lock:
+            profile = self.latency_by_api.get(api_id or "", self.latency)
+            resp.delay_sec = profile.sample_ms(self._rng) / 1000.0
+            self._stats["by_status"][resp.status] = self._stats["by_status"].get(resp.status, 0) + 1
+        return resp
+
+    def _dispatch(self, api_id: str, hdrs: Dict[str, str], body: Dict[str, Any]) -> StandinResponse:
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["by_api"][api_id] = self._stats["by_api"].get(api_id, 0) + 1
+            seq = self._api_seq[api_id] = self._api_seq.get(api_id, 0) + 1
+            throttled = (self.throttle_every > 0 and seq % self.throttle_every == 0) or (
+                self.throttle_rate > 0.0 and self._rng.random() < self.throttle_rate
+            )
+            if throttled:
+                self._stats["throttled"] += 1
+        if throttled:
+            return StandinResponse(429, {"return_code": 5, "return_msg": _MSG_THROTTLED}, {"Retry-After": "1"})
+        if api_id == TOKEN_API:
+            return self._token(body)
+        if self.require_auth and not self._authorized(hdrs.get("authorization", "")):
+            with self._lock:
+                self._stats["unauthorized"] += 1
+            return StandinResponse(401, {"return_code": 3, "return_msg": "[STANDIN] invalid or expired token"})
+        if api_id == PRICE_API:
+            return self._price(body)
+        if api_id in RANK_APIS or self.catalog.get(api_id).path == "/api/dostk/rkinfo":
+            return self._rank(api_id, hdrs, body)
+        if api_id in ORDER_APIS or api_id == CANCEL_API or api_id in STATUS_APIS:
+            return self._exchange(api_id, body)
+        return StandinResponse(200, {"return_code": 0, "return_msg": f"[STANDIN] {self.catalog.get(api_id).title}"})
+
+    # --- handlers ----------------------------------------------------------------------
+
+    def _authorized(self, authorization: str) -> bool:
+        token = authorization.strip()
+        if token.lower().startswith("bearer "):
+            token = token[7:].strip()
+        with self._lock:
+            expires_at = self._tokens.get(token)
+        return expires_at is not None and self._clock() < expires_at
+
+    def _token(self, body: Dict[str, Any]) -> StandinResponse:
+        if not str(body.get("appkey") or "").strip() or not str(body.get("secretkey") or "").strip():
+            return StandinResponse(400, {"return_code": 2, "return_msg": "[STANDIN] appkey / secretkey required"})
+        with self._lock:
+            self._stats["tokens_issued"] += 1
+            token = f"standin-{self._stats['tokens_issued']}"
+            expires_at = self._clock() + self.token_ttl_sec
+            self._tokens[token] = expires_at
+        expires_dt = datetime.fromtimestamp(expires_at, tz=timezone.utc).strftime("%Y%m%d%H%M%S")
+        return StandinResponse(
+            200,
+            {
+                "token": token,
+                "access_token": token,
+                "token_type": "bearer",
+                "expires_dt": expires_dt,
+                "expires_in": self.token_ttl_sec,
+                "return_code": 0,
+                "return_msg": _MSG_OK,
+            },
+        )
+
+    def _price(self, body: Dict[str, Any]) -> StandinResponse:
+        sym = _norm_symbol(body.get("stk_cd"))
+        if not sym:
+            return StandinResponse(400, {"return_code": 2, "return_msg": "[STANDIN] stk_cd required"})
+        q = self.market.quote(sym)
+        return StandinResponse(
+            200,
+            {
+                "stk_cd": sym,
+                "cur_prc": f"{q['close']:.0f}",
+                "open_pric": f"{q['open']:.0f}",
+                "high_pric": f"{q['high']:.0f}",
+                "low_pric": f"{q['low']:.0f}",
+                "base_pric": f"{q['prev_close']:.0f}",
+                "pred_pre": f"{q['close'] - q['prev_close']:+.0f}",
+                "flu_rt": f"{q['change_rate']:+.2f}",
+                "trde_qty": f"{q['volume']:.0f}",
+                "return_code": 0,
+                "return_msg": _MSG_OK,
+            },
+        )
+
+    def _rank(self, api_id: str, hdrs: Dict[str, str], body: Dict[str, Any]) -> StandinResponse:
+        list_key, sort_key = RANK_APIS.get(api_id, ("list", "volume"))
+        if api_id == "ka10030" and str(body.get("sort_tp") or "").strip() == "3":
+            sort_key = "value"
+        rows = []
+        for sym in self.market.symbols:
+            q = self.market.quote(sym)
+            rank_value = q["close"] * q["volume"] if sort_key == "value" else q[sort_key]
+            rows.append((rank_value, sym, q))
+        rows.sort(key=lambda r: (-r[0], r[1]))
+
+        start = 0
+        if hdrs.get("cont-yn", "").strip().upper() == "Y":
+            start = max(0, int(_to_float(hdrs.get("next-key")) or 0))
+        page = rows[start : start + self.page_size]
+        more = start + len(page) < len(rows)
+        payload_rows = [
+            {
+                "stk_cd": sym,
+                "cur_prc": f"{q['close']:.0f}",
+                "flu_rt": f"{q['change_rate']:+.2f}",
+                "trde_qty": f"{q['volume']:.0f}",
+                "trde_prica": f"{q['close'] * q['volume'] / 1_000_000:.0f}",
+            }
+            for _, sym, q in page
+        ]
+        headers = {"cont-yn": "Y" if more else "N", "next-key": str(start + len(page)) if more else ""}
+        return StandinResponse(200, {list_key: payload_rows, "return_code": 0, "return_msg": _MSG_OK}, headers)
+
+    def _exchange(self, api_id: str, body: Dict[str, Any]) -> StandinResponse:
+        with self._lock:
+            sym = _norm_symbol(body.get("stk_cd"))
+            if api_id in ORDER_APIS and sym and sym not in self._seeded:
+                # symbols outside the replayed dataset: give the book the deterministic quote once
+                self._seeded.add(sym)
+                if sym not in self.market.dataset_symbols:
+                    q = self.market.quote(sym)
+                    self.exchange.on_quote(sym, q["bid"], q["ask"])
+            payload = self.exchange.handle(api_id, body) or {"return_code": 1, "return_msg": "[STANDIN] not simulated"}
+        status = 200
+        if api_id in ORDER_APIS and payload.get("return_code") != 0:
+            status = 400
+        return StandinResponse(status, payload)
+
+    # --- HTTP --------------------------------------------------------------------------
+
+    @property
+    def base_url(self) -> str:
+        if self._srv is None:
+            raise RuntimeError("KiwoomStandinServer is not started")
+        host, port = self._srv.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> "KiwoomStandinServer":
+        if self._srv is not None:
+            return self
+        standin = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # keep-alive: headers and body leave in separate writes; without TCP_NODELAY
+            # Nagle + delayed ACK adds ~40ms to every response
+            disable_nagle_algorithm = True
+
+            def do_POST(self) -> None:  # noqa: N802 - http.server API
+                self._serve()
+
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                self._serve()
+
+            def _serve(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length > 0 else b""
+                try:
+                    body = json.loads(raw.decode("utf-8")) if raw else {}
+                except ValueError:
+                    body = {}
+                resp = standin.handle(self.command, self.path, dict(self.headers.items()), body)
+                if resp.delay_sec > 0:
+                    time.sleep(resp.delay_sec)
+                data = json.dumps(resp.payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(resp.status)
+                self.send_header("Content-Type", "application/json;charset=UTF-8")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in resp.headers.items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - http.server API
+                return
+
+        srv = ThreadingHTTPServer((host, int(port)), _Handler)
+        srv.daemon_threads = True
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        self._srv = srv
+        return self
+
+    def stop(self) -> None:
+        if self._srv is None:
+            return
+        self._srv.shutdown()
+        self._srv.server_close()
+        self._srv = None
+
+    def __enter__(self) -> "KiwoomStandinServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
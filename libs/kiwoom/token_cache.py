@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Optional
 import json
+import os
+import threading
 import time
 
 
@@ -43,13 +45,31 @@ class TokenRecord:
         )
 
 
+_LOCKS: Dict[str, threading.RLock] = {}
+_LOCKS_GUARD = threading.Lock()
+
+
+def _lock_for(path: Path) -> threading.RLock:
+    key = os.path.abspath(str(path))
+    with _LOCKS_GUARD:
+        lock = _LOCKS.get(key)
+        if lock is None:
+            lock = _LOCKS[key] = threading.RLock()
+        return lock
+
+
 class TokenCache:
     """File-based token cache (JSON).
     Keeps last token record to avoid re-auth on every run.
+
+    Caches on the same path share `lock` within the process (several readers may refresh
+    concurrently, e.g. the parallel snapshot reads); `save` replaces the file atomically so
+    a concurrent `load` never sees a half-written record.
     """
 
     def __init__(self, path: str | Path):
         self.path = Path(path)
+        self.lock = _lock_for(self.path)
 
     def load(self) -> Optional[TokenRecord]:
         if not self.path.exists():
@@ -67,4 +87,11 @@ class TokenCache:
 
     def save(self, rec: TokenRecord) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.path.write_text(json.dumps(rec.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with self.lock:
+            try:
+                tmp.write_text(json.dumps(rec.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+                os.replace(tmp, self.path)
+            finally:
+                if tmp.exists():
+                    tmp.unlink()
@@ -0,0 +1,321 @@
+"""Hedged LLM request execution (M32-1).
+
+Goal:
+- Bound tail latency of LLM calls without waiting out the full provider timeout.
+- If the primary model has not answered within a latency budget, fire the same
+  request at a secondary model and keep whichever valid response arrives first.
+
+The hedge delay is derived from a per-model latency histogram (percentile based),
+so the budget adapts automatically to the observed provider latency. Timed-out calls
+are recorded too (`record_model_outcome`), otherwise the slowest requests would be
+missing and the budget would drift low.
+
+Branches run on one process-wide pool. Once a branch wins, the loser is cancelled:
+its in-flight HTTP call finishes, but retry loops that call `hedge_sleep` /
+`check_hedge_cancelled` raise `HedgeCancelled` instead of starting another attempt.
+
+Env (prefix is caller-specific, e.g. AI_STRATEGIST_ / OPENROUTER_):
+- <PREFIX>HEDGE_PERCENTILE      (default: 95)
+- <PREFIX>HEDGE_DELAY_SEC       (default: 2.0, used until enough samples exist)
+- <PREFIX>HEDGE_MIN_DELAY_SEC   (default: 0.25)
+- <PREFIX>HEDGE_MAX_DELAY_SEC   (default: 10.0)
+- <PREFIX>HEDGE_MIN_SAMPLES     (default: 20)
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Shared branch pool size (primary + secondary per concurrent hedged call)
+HEDGE_POOL_WORKERS = 8
+
+# Log-spaced bucket upper bounds (seconds): 50ms .. 60s
+DEFAULT_BUCKET_BOUNDS_SEC: Tuple[float, ...] = (
+    0.05, 0.075, 0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.75,
+    1.0, 1.5, 2.0, 3.0, 4.0, 5.0, 7.5, 10.0, 15.0, 20.0, 30.0, 45.0, 60.0,
+)
+DEFAULT_MAX_SAMPLES = 1000
+
+
+class LatencyHistogram:
+    """Bucketed latency histogram with bounded memory.
+
+    When the sample count exceeds `max_samples`, all counts are halved so older
+    observations decay and the percentile follows recent provider behavior.
+    """
+
+    def __init__(
+        self,
+        bounds_sec: Tuple[float, ...] = DEFAULT_BUCKET_BOUNDS_SEC,
+        *,
+        max_samples: int = DEFAULT_MAX_SAMPLES,
+    ) -> None:
+        self.bounds_sec = tuple(sorted(float(b) for b in bounds_sec))
+        self.max_samples = max(2, int(max_samples))
+        # last bucket is overflow (> max bound)
+        self.counts: List[int] = [0] * (len(self.bounds_sec) + 1)
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def record(self, latency_sec: float) -> None:
+        x = max(0.0, float(latency_sec))
+        idx = bisect.bisect_left(self.bounds_sec, x)
+        with self._lock:
+            self.counts[idx] += 1
+            self.total += 1
+            if self.total > self.max_samples:
+                self.counts = [c // 2 for c in self.counts]
+                self.total = sum(self.counts)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Return bucket upper bound covering percentile `p` (0..100), or None if empty."""
+        with self._lock:
+            total = self.total
+            counts = list(self.counts)
+        if total <= 0:
+            return None
+        q = min(100.0, max(0.0, float(p)))
+        target = max(1, int(round(total * q / 100.0)))
+        seen = 0
+        for idx, c in enumerate(counts):
+            seen += c
+            if seen >= target:
+                if idx < len(self.bounds_sec):
+                    return self.bounds_sec[idx]
+                return self.bounds_sec[-1] if self.bounds_sec else None
+        return self.bounds_sec[-1] if self.bounds_sec else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"total": int(self.total), "counts": list(self.counts), "bounds_sec": list(self.bounds_sec)}
+
+
+_HISTOGRAMS: Dict[str, LatencyHistogram] = {}
+_HISTOGRAMS_LOCK = threading.Lock()
+
+
+def latency_histogram(model: str) -> LatencyHistogram:
+    """Process-wide latency histogram for one model."""
+    key = str(model or "").strip() or "unknown"
+    with _HISTOGRAMS_LOCK:
+        h = _HISTOGRAMS.get(key)
+        if h is None:
+            h = LatencyHistogram()
+            _HISTOGRAMS[key] = h
+        return h
+
+
+def record_model_latency(model: str, latency_sec: float) -> None:
+    latency_histogram(model).record(latency_sec)
+
+
+def reset_latency_histograms() -> None:
+    """Test helper: clear all process-wide histograms."""
+    with _HISTOGRAMS_LOCK:
+        _HISTOGRAMS.clear()
+
+
+def is_timeout_error(exc: BaseException) -> bool:
+    if isinstance(exc, TimeoutError):
+        return True
+    if isinstance(getattr(exc, "reason", None), TimeoutError):  # urllib.error.URLError
+        return True
+    return "timed out" in str(exc).lower()
+
+
+def record_model_outcome(model: str, latency_sec: float, error: Optional[BaseException] = None) -> None:
+    """Record a finished call: successes and timeouts (a lower bound of the true latency).
+
+    Other failures are skipped: a fast 4xx says nothing about how long an answer takes.
+    """
+    if error is None or is_timeout_error(error):
+        record_model_latency(model, latency_sec)
+
+
+class HedgeCancelled(Exception):
+    """The hedged branch lost the race; raised before it starts another attempt."""
+
+
+_BRANCH = threading.local()
+
+
+def check_hedge_cancelled() -> None:
+    """Raise `HedgeCancelled` when the current thread runs a hedged branch that lost."""
+    ev = getattr(_BRANCH, "cancelled", None)
+    if ev is not None and ev.is_set():
+        raise HedgeCancelled("hedged branch cancelled")
+
+
+def hedge_sleep(sec: float) -> None:
+    """`time.sleep` for retry backoff that wakes up (and raises) when the branch is cancelled."""
+    ev = getattr(_BRANCH, "cancelled", None)
+    if ev is None:
+        time.sleep(max(0.0, float(sec)))
+        return
+    if ev.wait(max(0.0, float(sec))):
+        raise HedgeCancelled("hedged branch cancelled")
+
+
+_POOL: Optional[ThreadPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _hedge_pool() -> ThreadPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ThreadPoolExecutor(max_workers=HEDGE_POOL_WORKERS, thread_name_prefix="llm-hedge")
+        return _POOL
+
+
+def _branch(fn: Callable[[], Any], cancelled: threading.Event) -> Callable[[], Any]:
+    def call() -> Any:
+        _BRANCH.cancelled = cancelled
+        try:
+            check_hedge_cancelled()
+            return fn()
+        finally:
+            _BRANCH.cancelled = None
+
+    return call
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return float(default)
+    try:
+        return float(raw)
+    except Exception:
+        return float(default)
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    percentile: float = 95.0
+    initial_delay_sec: float = 2.0
+    min_delay_sec: float = 0.25
+    max_delay_sec: float = 10.0
+    min_samples: int = 20
+
+    @staticmethod
+    def from_env(prefix: str) -> "HedgePolicy":
+        p = str(prefix or "")
+        return HedgePolicy(
+            percentile=min(100.0, max(0.0, _env_float(f"{p}HEDGE_PERCENTILE", 95.0))),
+            initial_delay_sec=max(0.0, _env_float(f"{p}HEDGE_DELAY_SEC", 2.0)),
+            min_delay_sec=max(0.0, _env_float(f"{p}HEDGE_MIN_DELAY_SEC", 0.25)),
+            max_delay_sec=max(0.0, _env_float(f"{p}HEDGE_MAX_DELAY_SEC", 10.0)),
+            min_samples=max(0, int(_env_float(f"{p}HEDGE_MIN_SAMPLES", 20))),
+        )
+
+    def delay_for(self, model: str) -> float:
+        """Hedge delay for `model`: histogram percentile clamped to [min, max]."""
+        h = latency_histogram(model)
+        delay = float(self.initial_delay_sec)
+        if h.total >= self.min_samples:
+            q = h.percentile(self.percentile)
+            if q is not None:
+                delay = float(q)
+        lo = float(self.min_delay_sec)
+        hi = max(lo, float(self.max_delay_sec))
+        return min(hi, max(lo, delay))
+
+
+@dataclass
+class HedgeResult:
+    value: Any
+    winner: str
+    hedged: bool
+    hedge_delay_sec: float
+    elapsed_sec: float
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+def run_hedged(
+    primary: Callable[[], Any],
+    secondary: Optional[Callable[[], Any]],
+    *,
+    hedge_delay_sec: float,
+) -> HedgeResult:
+    """Run `primary`; fire `secondary` after `hedge_delay_sec` (or on early primary failure).
+
+    A branch "wins" by returning without raising, so callers should raise inside the
+    callable for invalid/non-schema-conforming responses. The loser is cancelled: a
+    queued branch never starts, a running one finishes its in-flight call and stops at
+    its next `hedge_sleep` / `check_hedge_cancelled` (see module docstring).
+    If every branch fails, the primary error is re-raised.
+    """
+    t0 = time.perf_counter()
+    delay = max(0.0, float(hedge_delay_sec))
+    pool = _hedge_pool()
+    cancelled = threading.Event()
+    labels: Dict[Future, str] = {}
+    errors: Dict[str, BaseException] = {}
+    hedged = False
+    try:
+        f1 = pool.submit(_branch(primary, cancelled))
+        labels[f1] = "primary"
+        pending = {f1}
+        if secondary is not None:
+            done, pending = wait(pending, timeout=delay)
+            for f in done:
+                try:
+                    value = f.result()
+                    return HedgeResult(value, "primary", False, delay, time.perf_counter() - t0)
+                except Exception as e:
+                    errors["primary"] = e
+            f2 = pool.submit(_branch(secondary, cancelled))
+            labels[f2] = "secondary"
+            pending = set(pending) | {f2}
+            hedged = True
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # deterministic preference when both land in the same wakeup
+            for f in sorted(done, key=lambda d: 0 if labels[d] == "primary" else 1):
+                try:
+                    value = f.result()
+                except Exception as e:
+                    errors[labels[f]] = e
+                    continue
+                return HedgeResult(
+                    value,
+                    labels[f],
+                    hedged,
+                    delay,
+                    time.perf_counter() - t0,
+                    errors={k: str(v) for k, v in errors.items()},
+                )
+        err = errors.get("primary") or errors.get("secondary")
+        if err is None:  # pragma: no cover - defensive
+            raise RuntimeError("hedged call produced no result")
+        raise err
+    finally:
+        cancelled.set()
+        for f in labels:
+            f.cancel()
+
+
+__all__ = [
+    "DEFAULT_BUCKET_BOUNDS_SEC",
+    "HEDGE_POOL_WORKERS",
+    "HedgeCancelled",
+    "HedgePolicy",
+    "HedgeResult",
+    "LatencyHistogram",
+    "check_hedge_cancelled",
+    "hedge_sleep",
+    "is_timeout_error",
+    "latency_histogram",
+    "record_model_latency",
+    "record_model_outcome",
+    "reset_latency_histograms",
+    "run_hedged",
+]
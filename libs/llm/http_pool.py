@@ -0,0 +1,404 @@
+"""Pooled keep-alive HTTP client for LLM call sites (M32-2, stdlib-only).
+
+Goal:
+- Reuse TCP/TLS connections across strategist decisions, news scoring and
+  daily summaries instead of paying a new handshake per `urlopen` call.
+- Keep the urllib error contract so existing retry and error-mapping code keeps
+  working unchanged: `HTTPError` for non-2xx, `URLError` for failures while
+  connecting / sending (a connect timeout included, as `urlopen` reports it), and a
+  bare `TimeoutError` for a read timeout on the response.
+- Proxies: when `urllib.request.getproxies()` routes a URL through a proxy
+  (HTTP(S)_PROXY, not bypassed by NO_PROXY), the call goes through `urlopen`, which
+  implements proxying; direct hosts use the pool.
+
+Env:
+- LLM_HTTP_KEEPALIVE   (default: true; false -> one urlopen per call, legacy behavior)
+- LLM_HTTP_POOL_SIZE   (default: 4 idle connections per host)
+- LLM_HTTP_WARMUP      (default: false; open connections at process start)
+
+HTTP/2 is not available in the stdlib; HTTP/1.1 keep-alive covers the
+handshake cost, which is what dominates per-call overhead here.
+"""
+
+from __future__ import annotations
+
+import http.client
+import io
+import json
+import os
+import socket
+import ssl
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_POOL_SIZE = 4
+
+_StaleErrors = (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionResetError, BrokenPipeError)
+
+
+def _truthy(raw: str, default: bool) -> bool:
+    s = str(raw or "").strip().lower()
+    if not s:
+        return default
+    return s not in ("0", "false", "no", "off")
+
+
+def _set_nodelay(conn: http.client.HTTPConnection) -> None:
+    # Small JSON requests on a reused socket otherwise stall on Nagle + delayed ACK.
+    try:
+        if conn.sock is not None:
+            conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except Exception:
+        pass
+
+
+class _HTTPConnection(http.client.HTTPConnection):
+    def connect(self) -> None:
+        super().connect()
+        _set_nodelay(self)
+
+
+class _HTTPSConnection(http.client.HTTPSConnection):
+    def connect(self) -> None:
+        super().connect()
+        _set_nodelay(self)
+
+
+class KeepAliveHTTPClient:
+    """Thread-safe per-host pool of persistent HTTP/1.1 connections."""
+
+    def __init__(self, *, pool_size: int = DEFAULT_POOL_SIZE, ssl_context: Optional[ssl.SSLContext] = None) -> None:
+        self.pool_size = max(1, int(pool_size))
+        self._ssl_context = ssl_context
+        self._pools: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"requests": 0, "connects": 0, "reused": 0, "stale_retries": 0}
+
+    @staticmethod
+    def _split(url: str) -> Tuple[Tuple[str, str, int], str]:
+        u = urllib.parse.urlsplit(url)
+        scheme = (u.scheme or "http").lower()
+        if scheme not in ("http", "https"):
+            raise urllib.error.URLError(f"unsupported scheme: {scheme}")
+        host = u.hostname or ""
+        port = int(u.port or (443 if scheme == "https" else 80))
+        path = u.path or "/"
+        if u.query:
+            path = f"{path}?{u.query}"
+        return (scheme, host, port), path
+
+    def _new_conn(self, key: Tuple[str, str, int], timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        with self._lock:
+            self.stats["connects"] += 1
+        if scheme == "https":
+            ctx = self._ssl_context or ssl.create_default_context()
+            return _HTTPSConnection(host, port, timeout=timeout, context=ctx)
+        return _HTTPConnection(host, port, timeout=timeout)
+
+    def _acquire(self, key: Tuple[str, str, int], timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._pools.get(key) or []
+            conn = idle.pop() if idle else None
+        if conn is None:
+            return self._new_conn(key, timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            try:
+                conn.sock.settimeout(timeout)
+            except OSError:
+                conn.close()
+                return self._new_conn(key, timeout), False
+        return conn, True
+
+    def _release(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._pools.setdefault(key, [])
+            if len(idle) < self.pool_size:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        body: Optional[bytes],
+        timeout: float,
+    ) -> Tuple[Tuple[str, str, int], http.client.HTTPConnection, http.client.HTTPResponse]:
+        key, path = self._split(url)
+        hdrs = dict(headers or {})
+        hdrs.setdefault("Connection", "keep-alive")
+        with self._lock:
+            self.stats["requests"] += 1
+        for attempt in (0, 1):
+            conn, reused = self._acquire(key, timeout)
+            sent = False
+            try:
+                if conn.sock is None:
+                    conn.connect()
+                conn.request(method, path, body=body, headers=hdrs)
+                sent = True
+                resp = conn.getresponse()
+            except _StaleErrors as e:
+                conn.close()
+                # Idle connection was closed by the server; retry once on a fresh one.
+                if reused and attempt == 0:
+                    with self._lock:
+                        self.stats["stale_retries"] += 1
+                    continue
+                raise urllib.error.URLError(e) from e
+            except TimeoutError as e:
+                conn.close()
+                if not sent:  # connect / send timeout: urlopen reports URLError(timeout)
+                    raise urllib.error.URLError(e) from e
+                raise
+            except OSError as e:
+                conn.close()
+                raise urllib.error.URLError(e) from e
+            except Exception:
+                conn.close()
+                raise
+            if reused:
+                with self._lock:
+                    self.stats["reused"] += 1
+            return key, conn, resp
+        raise urllib.error.URLError("connection retry exhausted")  # pragma: no cover
+
+    def _finish(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection, resp: http.client.HTTPResponse) -> None:
+        if resp.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        body: Optional[bytes] = None,
+        timeout: float = 15.0,
+    ) -> Tuple[int, str, http.client.HTTPMessage, bytes]:
+        key, conn, resp = self._send(method, url, headers, body, timeout)
+        try:
+            data = resp.read()
+        except TimeoutError:
+            conn.close()
+            raise
+        except OSError as e:
+            conn.close()
+            raise urllib.error.URLError(e) from e
+        self._finish(key, conn, resp)
+        return int(resp.status), str(resp.reason or ""), resp.msg, data
+
+    def stream_post_json(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        timeout: float = 15.0,
+    ) -> Iterator[bytes]:
+        """POST JSON and yield raw response lines (SSE).
+
+        Closing the generator before the body is exhausted discards the connection
+        (the unread remainder makes it unusable for keep-alive).
+        """
+        data = json.dumps(payload).encode("utf-8")
+        key, conn, resp = self._send("POST", url, headers, data, timeout)
+        if int(resp.status) >= 400:
+            raw = resp.read()
+            self._finish(key, conn, resp)
+            raise urllib.error.HTTPError(url, int(resp.status), str(resp.reason or ""), resp.msg, io.BytesIO(raw))
+        exhausted = False
+        try:
+            while True:
+                try:
+                    line = resp.readline()
+                except TimeoutError:
+                    raise
+                except OSError as e:
+                    raise urllib.error.URLError(e) from e
+                if not line:
+                    exhausted = True
+                    return
+                yield line
+        finally:
+            if exhausted:
+                self._finish(key, conn, resp)
+            else:
+                conn.close()
+
+    def post_json(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        timeout: float = 15.0,
+    ) -> Dict[str, Any]:
+        data = json.dumps(payload).encode("utf-8")
+        status, reason, msg, raw = self.request("POST", url, headers=headers, body=data, timeout=timeout)
+        if status >= 400:
+            raise urllib.error.HTTPError(url, status, reason, msg, io.BytesIO(raw))
+        body = raw.decode("utf-8")
+        return json.loads(body) if body else {}
+
+    def warm_up(self, urls: Iterable[str], *, timeout: float = 5.0) -> Dict[str, bool]:
+        """Open one pooled connection per distinct host. Never raises."""
+        out: Dict[str, bool] = {}
+        seen = set()
+        for url in urls:
+            s = str(url or "").strip()
+            if not s:
+                continue
+            try:
+                key, _path = self._split(s)
+            except Exception:
+                out[s] = False
+                continue
+            if key in seen:
+                continue
+            seen.add(key)
+            try:
+                conn = self._new_conn(key, timeout)
+                conn.connect()
+                self._release(key, conn)
+                out[s] = True
+            except Exception:
+                out[s] = False
+        return out
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(v) for v in self._pools.values())
+
+    def close(self) -> None:
+        with self._lock:
+            pools = self._pools
+            self._pools = {}
+        for conns in pools.values():
+            for c in conns:
+                try:
+                    c.close()
+                except Exception:
+                    pass
+
+
+_SHARED: Optional[KeepAliveHTTPClient] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_http_client() -> KeepAliveHTTPClient:
+    """Process-wide pooled client shared by all LLM call sites."""
+    global _SHARED
+    with _SHARED_LOCK:
+        if _SHARED is None:
+            try:
+                size = int(os.getenv("LLM_HTTP_POOL_SIZE") or DEFAULT_POOL_SIZE)
+            except Exception:
+                size = DEFAULT_POOL_SIZE
+            _SHARED = KeepAliveHTTPClient(pool_size=size)
+        return _SHARED
+
+
+def reset_shared_http_client() -> None:
+    global _SHARED
+    with _SHARED_LOCK:
+        if _SHARED is not None:
+            _SHARED.close()
+        _SHARED = None
+
+
+def keepalive_enabled() -> bool:
+    return _truthy(os.getenv("LLM_HTTP_KEEPALIVE", ""), True)
+
+
+def proxy_for(url: str) -> Optional[str]:
+    """Proxy URL that urllib would use for `url` (env HTTP(S)_PROXY / NO_PROXY), else None."""
+    u = urllib.parse.urlsplit(str(url or ""))
+    proxy = urllib.request.getproxies().get((u.scheme or "http").lower())
+    if not proxy:
+        return None
+    try:
+        if urllib.request.proxy_bypass(u.hostname or ""):
+            return None
+    except Exception:
+        pass
+    return proxy
+
+
+def _pooled(url: str) -> bool:
+    return keepalive_enabled() and proxy_for(url) is None
+
+
+def urlopen_post_json(url: str, headers: Dict[str, str], payload: Dict[str, Any], timeout: float = 15.0) -> Dict[str, Any]:
+    """Legacy one-connection-per-call path (kept for LLM_HTTP_KEEPALIVE=false and benchmarks)."""
+    req = urllib.request.Request(url, method="POST")
+    for k, v in (headers or {}).items():
+        req.add_header(k, v)
+    data = json.dumps(payload).encode("utf-8")
+    with urllib.request.urlopen(req, data=data, timeout=timeout) as resp:
+        body = resp.read().decode("utf-8")
+        return json.loads(body) if body else {}
+
+
+def post_json(url: str, headers: Dict[str, str], payload: Dict[str, Any], timeout: float = 15.0) -> Dict[str, Any]:
+    if _pooled(url):
+        return shared_http_client().post_json(url, headers, payload, timeout=timeout)
+    return urlopen_post_json(url, headers, payload, timeout=timeout)
+
+
+def post_json_stream(url: str, headers: Dict[str, str], payload: Dict[str, Any], timeout: float = 15.0) -> Iterator[bytes]:
+    """Streaming POST yielding response lines; pooled unless LLM_HTTP_KEEPALIVE=false or proxied."""
+    if _pooled(url):
+        yield from shared_http_client().stream_post_json(url, headers, payload, timeout=timeout)
+        return
+    req = urllib.request.Request(url, method="POST")
+    for k, v in (headers or {}).items():
+        req.add_header(k, v)
+    data = json.dumps(payload).encode("utf-8")
+    with urllib.request.urlopen(req, data=data, timeout=timeout) as resp:
+        for line in resp:
+            yield line
+
+
+def llm_warmup_urls() -> List[str]:
+    """LLM endpoints configured in env (strategist + OpenRouter base)."""
+    urls: List[str] = []
+    provider = (os.getenv("AI_STRATEGIST_PROVIDER") or "rule").strip().lower()
+    endpoint = (os.getenv("AI_STRATEGIST_ENDPOINT") or "").strip()
+    if provider in ("openai", "http", "api") and endpoint:
+        urls.append(endpoint)
+    if (os.getenv("OPENROUTER_API_KEY") or "").strip():
+        urls.append((os.getenv("OPENROUTER_BASE_URL") or "https://openrouter.ai/api/v1").strip())
+    return urls
+
+
+def warm_up_llm_connections(*, force: bool = False) -> Dict[str, bool]:
+    """Process-start hook: pre-open pooled connections when LLM_HTTP_WARMUP is enabled."""
+    if not force and not _truthy(os.getenv("LLM_HTTP_WARMUP", ""), False):
+        return {}
+    if not keepalive_enabled():
+        return {}
+    try:
+        return shared_http_client().warm_up([u for u in llm_warmup_urls() if proxy_for(u) is None])
+    except Exception:
+        return {}
+
+
+__all__ = [
+    "KeepAliveHTTPClient",
+    "keepalive_enabled",
+    "llm_warmup_urls",
+    "post_json",
+    "post_json_stream",
+    "proxy_for",
+    "reset_shared_http_client",
+    "shared_http_client",
+    "urlopen_post_json",
+    "warm_up_llm_connections",
+]
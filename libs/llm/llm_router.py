@@ -7,15 +7,20 @@ Goal:
 Env:
 - OPENROUTER_DEFAULT_MODEL
 - OPENROUTER_MODEL_<ROLE> e.g. OPENROUTER_MODEL_STRATEGIST
+- OPENROUTER_HEDGE_MODEL_<ROLE> / OPENROUTER_HEDGE_MODEL (optional, M32-1)
+  secondary model fired when the primary exceeds its latency budget
+  (see `libs.llm.hedging` for OPENROUTER_HEDGE_* tuning keys)
 """
 
 from __future__ import annotations
 
 import json
 import os
+import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
+from libs.llm.hedging import HedgePolicy, record_model_outcome, run_hedged
 from libs.llm.openrouter_client import OpenRouterClient
 
 
@@ -23,17 +28,28 @@ def _env_model_key(role: str) -> str:
     return f"OPENROUTER_MODEL_{role.upper()}"
 
 
+class _EmptyCompletion(ValueError):
+    pass
+
+
+def _env_hedge_model_key(role: str) -> str:
+    return f"OPENROUTER_HEDGE_MODEL_{role.upper()}"
+
+
 @dataclass
 class LLMRoute:
     role: str
     model: str
     temperature: float = 0.2
     max_tokens: int = 512
+    hedge_model: str = ""
 
 
 class LLMRouter:
-    def __init__(self, client: Optional[OpenRouterClient]):
+    def __init__(self, client: Optional[OpenRouterClient], *, hedge_policy: Optional[HedgePolicy] = None):
         self.client = client
+        self.hedge_policy = hedge_policy or HedgePolicy.from_env("OPENROUTER_")
+        self.last_hedge: Dict[str, Any] = {}
 
     @staticmethod
     def from_env() -> "LLMRouter":
@@ -53,7 +69,35 @@ class LLMRouter:
 
         temperature = float(policy.get("temperature") or os.getenv("OPENROUTER_DEFAULT_TEMPERATURE", "0.2"))
         max_tokens = int(policy.get("max_tokens") or os.getenv("OPENROUTER_DEFAULT_MAX_TOKENS", "512"))
-        return LLMRoute(role=role, model=model, temperature=temperature, max_tokens=max_tokens)
+        hedge_model = (policy.get("hedge_model") or "").strip()
+        if not hedge_model:
+            hedge_model = (os.getenv(_env_hedge_model_key(role), "") or "").strip()
+        if not hedge_model:
+            hedge_model = (os.getenv("OPENROUTER_HEDGE_MODEL", "") or "").strip()
+        if hedge_model == model:
+            hedge_model = ""
+        return LLMRoute(
+            role=role,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            hedge_model=hedge_model,
+        )
+
+    def _complete_text(self, payload: Dict[str, Any]) -> str:
+        assert self.client is not None
+        model = str(payload.get("model") or "")
+        t0 = time.perf_counter()
+        try:
+            resp = self.client.chat_completions(payload)
+        except Exception as e:
+            record_model_outcome(model, time.perf_counter() - t0, e)
+            raise
+        record_model_outcome(model, time.perf_counter() - t0)
+        text = self.client.extract_text(resp)
+        if not str(text or "").strip():
+            raise _EmptyCompletion(f"empty completion from {payload.get('model')}")
+        return text
 
     def chat(self, role: str, messages: List[Dict[str, Any]], *, policy: Optional[Dict[str, Any]] = None) -> str:
         if self.client is None:
@@ -70,5 +114,32 @@ class LLMRouter:
             for k in ("top_p", "presence_penalty", "frequency_penalty", "seed"):
                 if k in policy:
                     payload[k] = policy[k]
-        resp = self.client.chat_completions(payload)
-        return self.client.extract_text(resp)
+        if not route.hedge_model:
+            t0 = time.perf_counter()
+            try:
+                resp = self.client.chat_completions(payload)
+            except Exception as e:
+                record_model_outcome(route.model, time.perf_counter() - t0, e)
+                raise
+            record_model_outcome(route.model, time.perf_counter() - t0)
+            return self.client.extract_text(resp)
+
+        hedge_payload = dict(payload)
+        hedge_payload["model"] = route.hedge_model
+        delay = self.hedge_policy.delay_for(route.model)
+        try:
+            result = run_hedged(
+                lambda: self._complete_text(payload),
+                lambda: self._complete_text(hedge_payload),
+                hedge_delay_sec=delay,
+            )
+        except _EmptyCompletion:
+            return ""
+        self.last_hedge = {
+            "hedged": bool(result.hedged),
+            "winner": result.winner,
+            "model": route.model if result.winner == "primary" else route.hedge_model,
+            "hedge_delay_sec": float(result.hedge_delay_sec),
+            "elapsed_sec": float(result.elapsed_sec),
+        }
+        return str(result.value or "")
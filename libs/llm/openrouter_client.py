@@ -1,6 +1,7 @@
 """OpenRouter HTTP client (stdlib-only).
 
-This module is intentionally dependency-free (uses urllib).
+This module is intentionally dependency-free (uses the stdlib keep-alive pool
+in `libs.llm.http_pool`, falling back to urllib when LLM_HTTP_KEEPALIVE=false).
 It provides a thin wrapper around OpenRouter's Chat Completions endpoint.
 
 Safety:
@@ -9,13 +10,12 @@ Safety:
 
 from __future__ import annotations
 
-import json
 import os
 import urllib.error
-import urllib.request
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
+from libs.llm.http_pool import post_json
 
 DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
 DEFAULT_TIMEOUT_SEC = 15
@@ -69,12 +69,8 @@ class OpenRouterClient:
         if self.cfg.x_title:
             headers["X-Title"] = self.cfg.x_title
 
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(url=url, data=data, headers=headers, method="POST")
         try:
-            with urllib.request.urlopen(req, timeout=self.cfg.timeout_sec) as resp:
-                raw = resp.read().decode("utf-8")
-                return json.loads(raw)
+            return post_json(url, headers, payload, timeout=self.cfg.timeout_sec)
         except urllib.error.HTTPError as e:
             body = ""
             try:
@@ -0,0 +1,259 @@
+"""Streaming chat-completions helpers (M32-3).
+
+Goal:
+- Parse SSE (`stream: true`) chat-completions incrementally and stop reading as soon
+  as the model has emitted one complete, caller-accepted JSON object.
+- Replace the "raw_decode at every `{` offset" fallback with a single linear scan.
+
+`JSONObjectScanner` tracks brace depth and string/escape state only while inside an
+object, so prose quotes/braces outside JSON do not confuse it. A top-level object is
+tried exactly once when its closing brace arrives. When it is not valid JSON (a `{` in
+prose), scanning restarts just past that `{`, so the result is the object at the earliest
+offset, as with per-offset `raw_decode`. Restarts are capped at MAX_RESCANS; past the cap
+the nested spans of the failed top-level span are tried instead, and the result may
+differ from per-offset `raw_decode` (e.g. more than MAX_RESCANS prose `{` before the
+object, or an object nested deeper than the json recursion limit).
+
+Fed chunks are kept in a list and only joined when a top-level object closes; chunks
+before the open top-level `{` are dropped, so feeding is linear in the stream length.
+"""
+
+from __future__ import annotations
+
+import json
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+MAX_RESCANS = 16
+
+
+class JSONObjectScanner:
+    """Incremental scanner yielding decoded top-level JSON objects from a text stream."""
+
+    def __init__(self) -> None:
+        self._parts: Deque[str] = deque()
+        self._base = 0  # global offset of _parts[0]
+        self._end = 0  # global offset just past the last fed char
+        self._pos = 0
+        self._rescans = 0
+        self._reset(depth=0)
+
+    def _reset(self, *, depth: int) -> None:
+        self._depth = depth
+        self._in_str = False
+        self._esc = False
+        self._stack: List[int] = []
+        self._spans: List[Tuple[int, int]] = []
+
+    @property
+    def text(self) -> str:
+        """Retained text: from the start of the still-open top-level `{` (or empty)."""
+        return self._joined()
+
+    def _joined(self) -> str:
+        if len(self._parts) > 1:
+            s = "".join(self._parts)
+            self._parts.clear()
+            self._parts.append(s)
+        return self._parts[0] if self._parts else ""
+
+    def _trim(self) -> None:
+        # Chunks that end before the open top-level `{` are never looked at again.
+        keep = self._stack[0] if self._depth > 0 and self._stack else self._end
+        while self._parts and self._base + len(self._parts[0]) <= keep:
+            self._base += len(self._parts.popleft())
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Append `chunk`; return objects completed by it (decoded dicts, in order)."""
+        if not chunk:
+            return []
+        self._parts.append(chunk)
+        self._end += len(chunk)
+        out = self._scan(chunk, self._end - len(chunk))
+        self._trim()
+        return out
+
+    def _rescan_after(self, start: int) -> bool:
+        # A `{` in prose can swallow a real object; retry once past it (bounded -> stays linear).
+        if self._rescans >= MAX_RESCANS:
+            return False
+        self._rescans += 1
+        self._reset(depth=0)
+        self._pos = start + 1
+        return True
+
+    def _scan(self, s: str, off: int) -> List[Dict[str, Any]]:
+        # `s` holds the text from global offset `off` to the end of what was fed.
+        out: List[Dict[str, Any]] = []
+        i = self._pos - off
+        n = len(s)
+        while i < n:
+            ch = s[i]
+            if self._depth == 0:
+                if ch == "{":
+                    self._reset(depth=1)
+                    self._stack = [off + i]
+                i += 1
+                continue
+            if self._in_str:
+                if self._esc:
+                    self._esc = False
+                elif ch == "\\":
+                    self._esc = True
+                elif ch == '"':
+                    self._in_str = False
+            elif ch == '"':
+                self._in_str = True
+            elif ch == "{":
+                self._depth += 1
+                self._stack.append(off + i)
+            elif ch == "}":
+                self._depth -= 1
+                start = self._stack.pop() if self._stack else off + i
+                self._spans.append((start, off + i + 1))
+                if self._depth == 0:
+                    s, off = self._joined(), self._base
+                    i, n = self._spans[-1][1] - 1 - off, len(s)
+                    obj = self._decode_spans(s, off, self._spans[-1:])
+                    if obj is None and self._rescan_after(start):
+                        i = self._pos - off
+                        continue
+                    if obj is None:
+                        obj = self._decode_spans(s, off, sorted(self._spans[:-1])[:MAX_RESCANS])
+                    if obj is not None:
+                        out.append(obj)
+                    self._reset(depth=0)
+            i += 1
+        self._pos = off + i
+        return out
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        """End of input: recover an object from inside a still-unclosed `{`."""
+        while self._depth > 0:
+            top = self._stack[0] if self._stack else self._pos
+            if not self._rescan_after(top):
+                return self._decode_spans(self._joined(), self._base, sorted(self._spans)[:MAX_RESCANS])
+            objs = self._scan(self._joined(), self._base)
+            if objs:
+                return objs[0]
+        return None
+
+    @staticmethod
+    def _decode_spans(s: str, off: int, spans: List[Tuple[int, int]]) -> Optional[Dict[str, Any]]:
+        # Decode a copy of each span: a JSONDecodeError on the whole buffer counts newlines from
+        # offset 0, which would make every failed span O(offset). Callers bound the span count.
+        for a, b in spans:
+            try:
+                obj = json.loads(s[a - off : b - off])
+            except Exception:
+                continue
+            if isinstance(obj, dict):
+                return obj
+        return None
+
+
+def find_first_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """Linear-time replacement for scanning `raw_decode` at every `{` offset."""
+    scanner = JSONObjectScanner()
+    objs = scanner.feed(str(text or ""))
+    if objs:
+        return objs[0]
+    return scanner.flush()
+
+
+def iter_sse_data(lines: Iterable[Any]) -> Iterator[str]:
+    """Yield `data:` payloads from an SSE line stream (bytes or str); stops at `[DONE]`."""
+    for raw in lines:
+        line = raw.decode("utf-8", errors="replace") if isinstance(raw, (bytes, bytearray)) else str(raw)
+        line = line.rstrip("\r\n")
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        if data:
+            yield data
+
+
+def _delta_text(chunk: Dict[str, Any]) -> str:
+    choices = chunk.get("choices")
+    if not isinstance(choices, list) or not choices:
+        return ""
+    first = choices[0] if isinstance(choices[0], dict) else {}
+    delta = first.get("delta") if isinstance(first.get("delta"), dict) else first.get("message")
+    if not isinstance(delta, dict):
+        return ""
+    content = delta.get("content")
+    return content if isinstance(content, str) else ""
+
+
+def _chunk_finish_reason(chunk: Dict[str, Any]) -> str:
+    choices = chunk.get("choices")
+    if not isinstance(choices, list) or not choices or not isinstance(choices[0], dict):
+        return ""
+    return str(choices[0].get("finish_reason") or "")
+
+
+def collect_chat_stream(
+    lines: Iterable[Any],
+    *,
+    accept: Optional[Callable[[Dict[str, Any]], bool]] = None,
+) -> Dict[str, Any]:
+    """Consume an SSE chat-completions stream into a non-streamed response shape.
+
+    Returns as soon as `accept(obj)` is true for a completed top-level JSON object
+    (`finish_reason="early_stop"`); the caller closes the underlying stream.
+    """
+    scanner = JSONObjectScanner()
+    parts: List[str] = []
+    usage: Dict[str, Any] = {}
+    finish_reason = ""
+    chunks = 0
+    for data in iter_sse_data(lines):
+        try:
+            chunk = json.loads(data)
+        except Exception:
+            continue
+        if not isinstance(chunk, dict):
+            continue
+        chunks += 1
+        if isinstance(chunk.get("usage"), dict):
+            usage = dict(chunk["usage"])
+        finish_reason = _chunk_finish_reason(chunk) or finish_reason
+        text = _delta_text(chunk)
+        if not text:
+            continue
+        parts.append(text)
+        for obj in scanner.feed(text):
+            if accept is None or accept(obj):
+                return _as_completion(json.dumps(obj, ensure_ascii=False), usage, "early_stop", chunks, parsed=obj)
+    return _as_completion("".join(parts), usage, finish_reason or "stop", chunks)
+
+
+def _as_completion(
+    content: str,
+    usage: Dict[str, Any],
+    finish_reason: str,
+    chunks: int,
+    *,
+    parsed: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    message: Dict[str, Any] = {"role": "assistant", "content": content}
+    if parsed is not None:
+        message["parsed"] = parsed
+    out: Dict[str, Any] = {
+        "choices": [{"message": message, "finish_reason": finish_reason}],
+        "stream": {"chunks": int(chunks), "early_stop": finish_reason == "early_stop"},
+    }
+    if usage:
+        out["usage"] = usage
+    return out
+
+
+__all__ = [
+    "JSONObjectScanner",
+    "collect_chat_stream",
+    "find_first_json_object",
+    "iter_sse_data",
+]
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+"""M32-23: In-memory last-quote table with incremental bars (streaming market data).
+
+`QuoteTable` is written by the realtime feed (`KiwoomRealtimeClient`, one writer thread)
+and read by graph nodes in the same process:
+
+  - `update(symbol, price=, qty=, bid=, ask=, cum_volume=, ts=)`: last trade / top of book,
+    folded into the current `bar_sec` bar (OHLC + volume; volume from `qty`, or from the
+    `cum_volume` delta when the feed only sends cumulative volume)
+  - `snapshot(symbols=, max_age_sec=)`: fresh rows only (`age_ms` added), shaped like
+    `market.quote` skill data (`price` / `cur` / `best_bid` / `best_ask`). Age is measured
+    from the last trade (`ts`); a row with only a top of book has `price=None`, so readers
+    treat a row as a quote only when `price` is set
+  - `ohlcv_by_symbol()`: closed + current bars in the `build_feature_map` input shape
+  - `watch(symbols)`: symbols the graph wants; listeners (the feed's `subscribe`) are
+    called with the newly watched ones
+
+State key: `state["quote_table"]`. Env: QUOTE_STREAM_MAX_AGE_MS (5000), QUOTE_STREAM_BAR_SEC (60),
+QUOTE_STREAM_MAX_BARS (240).
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+
+WatchListener = Callable[[List[str]], Any]
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.getenv(name, "") or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def _to_float(v: Any) -> Optional[float]:
+    if v is None:
+        return None
+    try:
+        x = float(str(v).replace(",", "").strip()) if isinstance(v, str) else float(v)
+    except (TypeError, ValueError):
+        return None
+    return x if x == x else None
+
+
+def _norm_symbol(v: Any) -> str:
+    s = str(v or "").strip()
+    if s.startswith("A") and len(s) > 1 and s[1:].isdigit():
+        return s[1:]
+    return s
+
+
+class QuoteTable:
+    """Thread-safe last quote + incremental bars per symbol (see module docstring)."""
+
+    def __init__(
+        self,
+        *,
+        bar_sec: float = 60.0,
+        max_bars: int = 240,
+        max_age_sec: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.bar_sec = max(1e-3, float(bar_sec))
+        self.max_bars = max(1, int(max_bars))
+        self.max_age_sec = max(0.0, float(max_age_sec))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._quotes: Dict[str, Dict[str, Any]] = {}
+        self._bars: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._watched: Dict[str, None] = {}
+        self._listeners: List[WatchListener] = []
+        self.version = 0
+
+    @classmethod
+    def from_env(cls) -> "QuoteTable":
+        return cls(
+            bar_sec=_env_float("QUOTE_STREAM_BAR_SEC", 60.0),
+            max_bars=int(_env_float("QUOTE_STREAM_MAX_BARS", 240)),
+            max_age_sec=_env_float("QUOTE_STREAM_MAX_AGE_MS", 5000.0) / 1000.0,
+        )
+
+    # ---------- writer side ----------
+
+    def update(
+        self,
+        symbol: Any,
+        *,
+        price: Any = None,
+        qty: Any = None,
+        bid: Any = None,
+        ask: Any = None,
+        cum_volume: Any = None,
+        ts: Optional[float] = None,
+        source: str = "stream",
+    ) -> bool:
+        """Apply one feed update. False when the symbol is empty or nothing usable was sent."""
+        sym = _norm_symbol(symbol)
+        px, b, a = _to_float(price), _to_float(bid), _to_float(ask)
+        if not sym or (px is None and b is None and a is None):
+            return False
+        now = self._clock() if ts is None else float(ts)
+        q = _to_float(qty)
+        cum = _to_float(cum_volume)
+        with self._lock:
+            row = self._quotes.get(sym)
+            if row is None:
+                row = self._quotes[sym] = {"symbol": sym, "price": None, "best_bid": None, "best_ask": None, "volume": None}
+            if q is None and cum is not None and row.get("volume") is not None:
+                q = max(0.0, cum - float(row["volume"]))
+            if px is not None and px > 0:
+                row["price"] = px
+                self._fold_bar(sym, px, q or 0.0, now)
+            if b is not None and b > 0:
+                row["best_bid"] = b
+            if a is not None and a > 0:
+                row["best_ask"] = a
+            if cum is not None:
+                row["volume"] = cum
+            # `ts` is the last trade: a bid/ask-only (0C) update must not make an old price look fresh
+            if (px is not None and px > 0) or "ts" not in row:
+                row["ts"] = now
+            row["book_ts"] = now
+            row["source"] = source
+            row["seq"] = row.get("seq", 0) + 1
+            self.version += 1
+        return True
+
+    def _fold_bar(self, sym: str, px: float, qty: float, now: float) -> None:
+        start = now - (now % self.bar_sec)
+        bars = self._bars.get(sym)
+        if bars is None:
+            bars = self._bars[sym] = deque(maxlen=self.max_bars)
+        cur = bars[-1] if bars else None
+        if cur is None or start > cur["ts"]:
+            bars.append({"ts": start, "open": px, "high": px, "low": px, "close": px, "volume": qty})
+            return
+        if start < cur["ts"]:
+            return  # late print for an already closed bar: last quote only
+        cur["high"] = max(cur["high"], px)
+        cur["low"] = min(cur["low"], px)
+        cur["close"] = px
+        cur["volume"] += qty
+
+    # ---------- reader side ----------
+
+    def get(self, symbol: Any) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._quotes.get(_norm_symbol(symbol))
+            return dict(row) if row is not None else None
+
+    def age_sec(self, symbol: Any, *, now: Optional[float] = None) -> Optional[float]:
+        row = self.get(symbol)
+        if row is None:
+            return None
+        now = self._clock() if now is None else float(now)
+        return max(0.0, now - float(row["ts"]))
+
+    def snapshot(
+        self,
+        *,
+        symbols: Optional[Iterable[Any]] = None,
+        max_age_sec: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Rows no older than `max_age_sec` (default: the table's), with `cur` and `age_ms`."""
+        limit = self.max_age_sec if max_age_sec is None else float(max_age_sec)
+        now = self._clock() if now is None else float(now)
+        with self._lock:
+            keys = list(self._quotes) if symbols is None else [_norm_symbol(s) for s in symbols]
+            rows = [self._quotes[k] for k in keys if k in self._quotes]
+            out: Dict[str, Dict[str, Any]] = {}
+            for row in rows:
+                age = max(0.0, now - float(row["ts"]))
+                if age > limit:
+                    continue
+                rec = dict(row)
+                rec["cur"] = rec.get("price")
+                rec["age_ms"] = round(age * 1000.0, 3)
+                out[rec["symbol"]] = rec
+        return out
+
+    def bars(self, symbol: Any) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(b) for b in self._bars.get(_norm_symbol(symbol), ())]
+
+    def ohlcv_by_symbol(self, symbols: Optional[Iterable[Any]] = None, *, min_bars: int = 1) -> Dict[str, List[Dict[str, Any]]]:
+        with self._lock:
+            keys = list(self._bars) if symbols is None else [_norm_symbol(s) for s in symbols]
+            return {
+                k: [dict(b) for b in self._bars[k]]
+                for k in keys
+                if k in self._bars and len(self._bars[k]) >= max(1, int(min_bars))
+            }
+
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return list(self._quotes)
+
+    # ---------- subscriptions ----------
+
+    def add_watch_listener(self, fn: WatchListener) -> None:
+        with self._lock:
+            self._listeners.append(fn)
+
+    def watched(self) -> List[str]:
+        with self._lock:
+            return list(self._watched)
+
+    def watch(self, symbols: Iterable[Any]) -> List[str]:
+        """Mark symbols as wanted; listeners get the newly watched ones. Returns them."""
+        with self._lock:
+            new = []
+            for s in symbols:
+                sym = _norm_symbol(s)
+                if sym and sym not in self._watched:
+                    self._watched[sym] = None
+                    new.append(sym)
+            listeners = list(self._listeners)
+        if new:
+            for fn in listeners:
+                fn(list(new))
+        return new
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "symbols": len(self._quotes),
+                "watched": len(self._watched),
+                "bars": sum(len(b) for b in self._bars.values()),
+                "updates": self.version,
+            }
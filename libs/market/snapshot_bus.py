@@ -0,0 +1,473 @@
+from __future__ import annotations
+
+"""M32-24: Shared-memory market snapshot bus (one ingest process, many graph workers).
+
+A file-backed `mmap` holding a numpy structured array: a small header plus one fixed-size
+record per symbol (last price, best bid / ask, cumulative volume, ts and the numeric
+`build_feature_map` features). One `MarketBusWriter` fills it; any number of
+`MarketBusReader`s in other processes read it without locks or JSON:
+
+  - per-record seqlock: the writer bumps `seq` to odd, writes the record, bumps it to even;
+    a reader copies the records and re-reads `seq`, and only retries the records whose
+    `seq` was odd or changed underneath (bounded, yielding; a record still torn is served
+    from the reader's last consistent copy and counted as `torn`)
+  - slots are append-only: a symbol is written into a free slot before `count` is raised,
+    so readers never see a half-assigned slot
+  - header `version` is bumped once per published batch (graph memo key); `generation`
+    changes when the writer recreates the file, and readers remap on the next read
+
+`MarketBusReader.snapshot()` / `features()` return rows shaped like `QuoteTable.snapshot()`,
+so a reader can be injected as `state["quote_table"]` (hydration, quote overlay, scanner).
+`attach_market_bus(state)` does that from env MARKET_BUS_PATH (workers of `run_trading_graph`).
+
+Env: MARKET_BUS_PATH (empty: off), MARKET_BUS_CAPACITY (512), MARKET_BUS_MAX_AGE_MS (5000).
+Single writer is a deployment rule (one ingest process per path); it is not locked.
+"""
+
+import math
+import mmap
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+MAGIC = b"MKTBUS01"
+LAYOUT = 1
+HEADER_SIZE = 64
+SYMBOL_BYTES = 16
+
+FEATURE_FIELDS = (
+    "close_last",
+    "rsi14",
+    "ma20",
+    "ma20_gap",
+    "atr14",
+    "volume_spike20",
+    "volatility20",
+    "signal_score",
+    "regime",
+)
+REGIMES = ("range", "trend", "high_volatility")
+
+HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "S8"),
+        ("layout", "<u4"),
+        ("capacity", "<u4"),
+        ("count", "<u4"),
+        ("writer_pid", "<u4"),
+        ("generation", "<u8"),
+        ("version", "<u8"),
+    ]
+)
+RECORD_DTYPE = np.dtype(
+    [
+        ("seq", "<u8"),
+        ("symbol", f"S{SYMBOL_BYTES}"),
+        ("price", "<f8"),
+        ("bid", "<f8"),
+        ("ask", "<f8"),
+        ("volume", "<f8"),
+        ("ts", "<f8"),
+        ("features", "<f8", (len(FEATURE_FIELDS),)),
+    ]
+)
+
+_NAN = float("nan")
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.getenv(name, "") or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def _norm_symbol(v: Any) -> str:
+    s = str(v or "").strip()
+    if s.startswith("A") and len(s) > 1 and s[1:].isdigit():
+        return s[1:]
+    return s
+
+
+def _num(v: Any) -> float:
+    if v is None:
+        return _NAN
+    try:
+        x = float(v)
+    except (TypeError, ValueError):
+        return _NAN
+    return x if math.isfinite(x) else _NAN
+
+
+def _opt(v: float) -> Optional[float]:
+    return None if math.isnan(v) else float(v)
+
+
+def _column(a: np.ndarray) -> List[Optional[float]]:
+    out = a.astype(object)
+    out[np.isnan(a)] = None
+    return out.tolist()
+
+
+def bus_file_size(capacity: int) -> int:
+    return HEADER_SIZE + int(capacity) * RECORD_DTYPE.itemsize
+
+
+def encode_features(features: Optional[Mapping[str, Any]]) -> List[float]:
+    f = features or {}
+    out = []
+    for name in FEATURE_FIELDS:
+        v = f.get(name)
+        if name == "regime":
+            out.append(float(REGIMES.index(v)) if v in REGIMES else _NAN)
+        else:
+            out.append(_num(v))
+    return out
+
+
+def decode_features(values: Iterable[float]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for name, v in zip(FEATURE_FIELDS, values):
+        x = float(v)
+        if name == "regime":
+            out[name] = REGIMES[int(x)] if not math.isnan(x) and 0 <= int(x) < len(REGIMES) else None
+        else:
+            out[name] = _opt(x)
+    return out
+
+
+class MarketBusWriter:
+    """Single writer: creates (or re-initialises) the bus file and publishes records."""
+
+    def __init__(self, path: str | Path, *, capacity: int = 512, clock: Any = time.time):
+        self.path = Path(path)
+        self.capacity = max(1, int(capacity))
+        self._clock = clock
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        size = bus_file_size(self.capacity)
+        # re-initialised in place and never shrunk: readers of a previous writer may still
+        # have it mapped (truncating under them would fault their next access)
+        self._file = open(self.path, "r+b" if self.path.exists() else "w+b")
+        if os.fstat(self._file.fileno()).st_size < size:
+            self._file.truncate(size)
+        self._mm = mmap.mmap(self._file.fileno(), size)
+        self._hdr = np.frombuffer(self._mm, dtype=HEADER_DTYPE, count=1, offset=0)
+        self._rec = np.frombuffer(self._mm, dtype=RECORD_DTYPE, count=self.capacity, offset=HEADER_SIZE)
+        self._slots: Dict[str, int] = {}
+        self.stats = {"writes": 0, "batches": 0, "dropped": 0}
+        self._hdr["count"] = 0
+        self._hdr["generation"] = time.time_ns()  # readers remap / re-index on change
+        self._rec["seq"] = 0
+        self._hdr[0] = (MAGIC, LAYOUT, self.capacity, 0, os.getpid() & 0xFFFFFFFF, time.time_ns(), 0)
+
+    @classmethod
+    def from_env(cls, path: Optional[str] = None) -> "MarketBusWriter":
+        p = (path or os.getenv("MARKET_BUS_PATH", "") or "").strip()
+        if not p:
+            raise ValueError("MARKET_BUS_PATH is not set")
+        return cls(p, capacity=int(_env_float("MARKET_BUS_CAPACITY", 512)))
+
+    def close(self) -> None:
+        if self._mm.closed:
+            return
+        del self._hdr, self._rec
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "MarketBusWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @property
+    def version(self) -> int:
+        return int(self._hdr["version"][0])
+
+    def _slot(self, sym: str) -> int:
+        i = self._slots.get(sym)
+        if i is not None:
+            return i
+        i = len(self._slots)
+        if i >= self.capacity:
+            return -1
+        # the slot is complete (even seq, symbol set) before readers can see it via `count`
+        self._rec[i] = (0, sym.encode("ascii", "replace")[:SYMBOL_BYTES], _NAN, _NAN, _NAN, _NAN, _NAN, [_NAN] * len(FEATURE_FIELDS))
+        self._slots[sym] = i
+        self._hdr["count"] = i + 1
+        return i
+
+    def write(
+        self,
+        symbol: Any,
+        *,
+        price: Any = None,
+        bid: Any = None,
+        ask: Any = None,
+        volume: Any = None,
+        ts: Optional[float] = None,
+        features: Optional[Mapping[str, Any]] = None,
+        publish: bool = True,
+    ) -> bool:
+        """Write one record (fields left as None keep their last value). False when full / no symbol."""
+        sym = _norm_symbol(symbol)
+        i = self._slot(sym) if sym else -1
+        if i < 0:
+            self.stats["dropped"] += 1
+            return False
+        rec = self._rec
+        cur = rec[i]
+        seq = int(cur["seq"])
+
+        def keep(new: Any, old: float) -> float:
+            return float(old) if new is None else _num(new)
+
+        row = (
+            seq + 1,
+            cur["symbol"],
+            keep(price, cur["price"]),
+            keep(bid, cur["bid"]),
+            keep(ask, cur["ask"]),
+            keep(volume, cur["volume"]),
+            float(self._clock() if ts is None else ts),
+            encode_features(features) if features is not None else list(cur["features"]),
+        )
+        rec["seq"][i] = seq + 1  # odd: readers retry this record
+        rec[i] = row
+        rec["seq"][i] = seq + 2
+        self.stats["writes"] += 1
+        if publish:
+            self.publish()
+        return True
+
+    def publish(self) -> int:
+        """Bump the header version (readers' change marker) once per batch."""
+        self._hdr["version"] += 1
+        self.stats["batches"] += 1
+        return self.version
+
+    def write_quotes(
+        self,
+        rows: Mapping[str, Mapping[str, Any]],
+        *,
+        features: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    ) -> int:
+        """Write `QuoteTable.snapshot()` / market.quote shaped rows (+ feature maps) as one batch."""
+        feats = {_norm_symbol(k): v for k, v in (features or {}).items()}
+        n = 0
+        for sym, row in rows.items():
+            ts = row.get("ts")
+            n += int(
+                self.write(
+                    sym,
+                    price=row.get("price", row.get("cur")),
+                    bid=row.get("best_bid"),
+                    ask=row.get("best_ask"),
+                    volume=row.get("volume"),
+                    ts=float(ts) if ts is not None else None,
+                    features=feats.get(_norm_symbol(sym)),
+                    publish=False,
+                )
+            )
+        self.publish()
+        return n
+
+
+class MarketBusReader:
+    """Lock-free reader of a bus file written by another process (see module docstring)."""
+
+    def __init__(self, path: str | Path, *, max_age_sec: float = 5.0, max_retries: int = 64, clock: Any = time.time):
+        self.path = Path(path)
+        self.max_age_sec = max(0.0, float(max_age_sec))
+        self.max_retries = max(1, int(max_retries))
+        self._clock = clock
+        self._mm: Optional[mmap.mmap] = None
+        self._generation = -1
+        self.stats = {"reads": 0, "retries": 0, "torn": 0, "remaps": 0}
+        self._map()
+
+    @classmethod
+    def from_env(cls, path: Optional[str] = None) -> "MarketBusReader":
+        p = (path or os.getenv("MARKET_BUS_PATH", "") or "").strip()
+        if not p:
+            raise ValueError("MARKET_BUS_PATH is not set")
+        return cls(p, max_age_sec=_env_float("MARKET_BUS_MAX_AGE_MS", 5000.0) / 1000.0)
+
+    def _map(self) -> None:
+        self._unmap()
+        with open(self.path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        hdr = np.frombuffer(mm, dtype=HEADER_DTYPE, count=1, offset=0)
+        if bytes(hdr["magic"][0]) != MAGIC or int(hdr["layout"][0]) != LAYOUT:
+            del hdr
+            mm.close()
+            raise ValueError(f"not a market bus file (layout {LAYOUT}): {self.path}")
+        capacity = int(hdr["capacity"][0])
+        if len(mm) < bus_file_size(capacity):
+            del hdr
+            mm.close()
+            raise ValueError(f"truncated market bus file: {self.path}")
+        self._mm = mm
+        self._hdr = hdr
+        self._rec = np.frombuffer(mm, dtype=RECORD_DTYPE, count=capacity, offset=HEADER_SIZE)
+        self._good = np.zeros(capacity, dtype=RECORD_DTYPE)  # last consistent copy per slot
+        self._generation = int(hdr["generation"][0])
+        self._index: Dict[str, int] = {}
+        self._indexed = 0
+
+    def _unmap(self) -> None:
+        if self._mm is not None and not self._mm.closed:
+            del self._hdr, self._rec
+            self._mm.close()
+        self._mm = None
+
+    def close(self) -> None:
+        self._unmap()
+
+    def __enter__(self) -> "MarketBusReader":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _refresh(self) -> int:
+        if self._mm is None:
+            self._map()
+        elif int(self._hdr["generation"][0]) != self._generation:
+            self.stats["remaps"] += 1
+            self._map()
+        n = min(int(self._hdr["count"][0]), len(self._rec))
+        if n > self._indexed:
+            for i, raw in enumerate(self._rec["symbol"][self._indexed : n], start=self._indexed):
+                self._index[bytes(raw).decode("ascii", "replace")] = i
+            self._indexed = n
+        return n
+
+    @property
+    def version(self) -> int:
+        """Writer batch counter (int; graph memo fingerprints include it)."""
+        if self._mm is None or int(self._hdr["generation"][0]) != self._generation:
+            self._refresh()
+        return int(self._hdr["version"][0])
+
+    def symbols(self) -> List[str]:
+        self._refresh()
+        return list(self._index)
+
+    def _read_records(self, idx: Optional[np.ndarray]) -> np.ndarray:
+        """Seqlock read: consistent copies of the requested slots.
+
+        A slot still being written after `max_retries` (the writer was preempted mid-record)
+        is answered from this reader's last consistent copy of it, or left out if none.
+        """
+        rec = self._rec
+        slots = idx if idx is not None else np.arange(self._indexed, dtype=np.intp)
+        recs = rec[slots]
+        after = rec["seq"][slots]
+        bad = np.nonzero((recs["seq"] != after) | (recs["seq"] & 1 == 1))[0]
+        keep = np.ones(len(recs), dtype=bool)
+        for j in bad:
+            slot = int(slots[j])
+            for attempt in range(self.max_retries):
+                self.stats["retries"] += 1
+                if attempt >= 4:
+                    time.sleep(0)  # yield: a preempted writer cannot finish while we spin
+                one = rec[slot : slot + 1].copy()
+                s = int(rec["seq"][slot])
+                if int(one["seq"][0]) == s and s % 2 == 0:
+                    recs[j] = one[0]
+                    break
+            else:
+                self.stats["torn"] += 1
+                if int(self._good["seq"][slot]) > 0:
+                    recs[j] = self._good[slot]
+                else:
+                    keep[j] = False
+        self._good[slots[keep]] = recs[keep]
+        self.stats["reads"] += 1
+        return recs[keep & (recs["seq"] > 0)]
+
+    def _select(self, symbols: Optional[Iterable[Any]]) -> Optional[np.ndarray]:
+        self._refresh()
+        if symbols is None:
+            return None
+        slots = [self._index[s] for s in (_norm_symbol(x) for x in symbols) if s in self._index]
+        return np.asarray(slots, dtype=np.intp)
+
+    def snapshot(
+        self,
+        *,
+        symbols: Optional[Iterable[Any]] = None,
+        max_age_sec: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fresh rows, shaped like `QuoteTable.snapshot()` (`source="bus"`)."""
+        limit = self.max_age_sec if max_age_sec is None else float(max_age_sec)
+        now = self._clock() if now is None else float(now)
+        recs = self._read_records(self._select(symbols))
+        age = np.maximum(0.0, now - recs["ts"])
+        fresh = recs[age <= limit]  # NaN ts (never written) compares False
+        syms = [raw.decode("ascii", "replace") for raw in fresh["symbol"].tolist()]
+        price, bid, ask, volume = (_column(fresh[k]) for k in ("price", "bid", "ask", "volume"))
+        age_ms = np.round(np.maximum(0.0, now - fresh["ts"]) * 1000.0, 3).tolist()
+        return {
+            sym: {
+                "symbol": sym,
+                "price": px,
+                "cur": px,
+                "best_bid": b,
+                "best_ask": a,
+                "volume": v,
+                "ts": ts,
+                "age_ms": age,
+                "source": "bus",
+            }
+            for sym, px, b, a, v, ts, age in zip(syms, price, bid, ask, volume, fresh["ts"].tolist(), age_ms)
+        }
+
+    def features(
+        self,
+        symbols: Optional[Iterable[Any]] = None,
+        *,
+        max_age_sec: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Published feature maps of fresh records (`build_feature_map` shape); empty ones skipped."""
+        limit = self.max_age_sec if max_age_sec is None else float(max_age_sec)
+        now = self._clock() if now is None else float(now)
+        recs = self._read_records(self._select(symbols))
+        fresh = recs[(np.maximum(0.0, now - recs["ts"]) <= limit) & ~np.all(np.isnan(recs["features"]), axis=1)]
+        return {
+            raw.decode("ascii", "replace"): decode_features(values)
+            for raw, values in zip(fresh["symbol"].tolist(), fresh["features"].tolist())
+        }
+
+
+_READERS: Dict[str, MarketBusReader] = {}
+
+
+def attach_market_bus(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Inject the process-wide bus reader as `state["quote_table"]` when MARKET_BUS_PATH is set.
+
+    An explicit `quote_table` wins; a missing / invalid bus file leaves state unchanged (the
+    ingest process may not be up yet) and is retried on the next call.
+    """
+    if state.get("quote_table") is not None:
+        return state
+    path = (os.getenv("MARKET_BUS_PATH", "") or "").strip()
+    if not path:
+        return state
+    reader = _READERS.get(path)
+    if reader is None:
+        try:
+            reader = _READERS[path] = MarketBusReader.from_env(path)
+        except (OSError, ValueError):
+            return state
+    state["quote_table"] = reader
+    return state
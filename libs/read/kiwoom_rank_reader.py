@@ -63,6 +63,15 @@ def _extract_symbols(payload: Any) -> List[str]:
     return out
 
 
+def _header(headers: Any, name: str) -> str:
+    if not isinstance(headers, dict):
+        return ""
+    for k, v in headers.items():
+        if str(k).lower() == name:
+            return str(v or "").strip()
+    return ""
+
+
 @dataclass(frozen=True)
 class RankFetchResult:
     url: str
@@ -130,15 +139,25 @@ class KiwoomRankReader:
                 "stex_tp": "1",
             }
 
-        url, resp = self.http.request("POST", self.ENDPOINT, headers=headers, json_body=body, dry_run=False)
-        if resp is None:
-            raise RuntimeError("HTTP response is None (unexpected: dry_run?)")
-
-        payload: Dict[str, Any] = {}
-        try:
-            payload = json.loads(resp.text) if resp.text else {}
-        except Exception:
-            payload = {}
-
-        syms = _extract_symbols(payload)
-        return syms[: max(1, int(topk))]
+        want = max(1, int(topk))
+        max_calls = max(1, int(self.s.kiwoom_pagination_max_calls))
+        syms: List[str] = []
+        for _ in range(max_calls):
+            url, resp = self.http.request("POST", self.ENDPOINT, headers=headers, json_body=body, dry_run=False)
+            if resp is None:
+                raise RuntimeError("HTTP response is None (unexpected: dry_run?)")
+
+            payload: Dict[str, Any] = {}
+            try:
+                payload = json.loads(resp.text) if resp.text else {}
+            except Exception:
+                payload = {}
+
+            syms.extend(s for s in _extract_symbols(payload) if s not in syms)
+            # M32-22: follow `cont-yn` / `next-key` continuation only while topk is not filled
+            cont = _header(resp.headers, "cont-yn").upper()
+            next_key = _header(resp.headers, "next-key")
+            if len(syms) >= want or cont != "Y" or not next_key:
+                break
+            headers = {**headers, "cont-yn": "Y", "next-key": next_key}
+        return syms[:want]
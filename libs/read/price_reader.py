@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import time
-from typing import Dict, Optional, Protocol
+from typing import Any, Dict, Optional, Protocol
 
 from libs.read.snapshot_models import MarketSnapshot
 
@@ -21,3 +21,23 @@ class MockPriceReader:
     def get_market_snapshot(self, symbol: str) -> MarketSnapshot:
         price = float(self.prices.get(symbol, self.default_price))
         return MarketSnapshot(symbol=symbol, price=price, ts=int(time.time()))
+
+
+class StreamPriceReader:
+    """M32-23: price from a streaming `QuoteTable` while fresh, else from `fallback` (REST)."""
+
+    def __init__(self, table: Any, fallback: Optional[PriceReader] = None):
+        self.table = table
+        self.fallback = fallback
+        self.hits = 0
+        self.misses = 0
+
+    def get_market_snapshot(self, symbol: str) -> MarketSnapshot:
+        row = next(iter(self.table.snapshot(symbols=[symbol]).values()), None)
+        if row is not None and row.get("price"):
+            self.hits += 1
+            return MarketSnapshot(symbol=symbol, price=float(row["price"]), ts=int(row["ts"]))
+        self.misses += 1
+        if self.fallback is None:
+            return MarketSnapshot(symbol=symbol, price=0.0, ts=int(time.time()))
+        return self.fallback.get_market_snapshot(symbol)
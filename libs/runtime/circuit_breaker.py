@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
 from libs.runtime.resilience_state import ensure_runtime_resilience_state
+from libs.runtime.shared_circuit_store import circuit_key, shared_circuit_store_from_env
 
 
 @dataclass(frozen=True)
@@ -72,6 +73,17 @@ def _scope_circuit_slot(state: Dict[str, Any], *, scope: str) -> Dict[str, Any]:
     return slot
 
 
+def _shared_key(scope: str) -> str:
+    return circuit_key("runtime", scope)
+
+
+def _mirror_shared(slot: Dict[str, Any], rec: Dict[str, Any]) -> None:
+    # M32-4: the shared store is authoritative; keep the per-run slot in sync for traces.
+    slot["state"] = str(rec.get("circuit_state") or rec.get("state") or slot.get("state") or "unknown")
+    slot["fail_count"] = max(0, _coerce_int(rec.get("fail_count"), 0))
+    slot["open_until_epoch"] = max(0, _coerce_int(float(rec.get("open_until_epoch") or 0.0), 0))
+
+
 def gate_runtime_circuit(
     state: Dict[str, Any],
     *,
@@ -92,6 +104,18 @@ def gate_runtime_circuit(
     now = _now_epoch(now_epoch)
     slot = _scope_circuit_slot(state, scope=scope)
 
+    store = shared_circuit_store_from_env()
+    if store is not None:
+        gated = store.gate(_shared_key(scope), now_epoch=now)
+        _mirror_shared(slot, gated)
+        return {
+            "allowed": bool(gated["allowed"]),
+            "reason": str(gated["reason"]),
+            "circuit_state": str(gated["circuit_state"]),
+            "fail_count": int(gated["fail_count"]),
+            "open_until_epoch": int(gated["open_until_epoch"]),
+        }
+
     cstate = str(slot.get("state") or "unknown").strip().lower()
     fail_count = max(0, _coerce_int(slot.get("fail_count"), 0))
     open_until = max(0, _coerce_int(slot.get("open_until_epoch"), 0))
@@ -145,7 +169,17 @@ def mark_runtime_circuit_failure(
     slot["fail_count"] = fail_count
     slot["last_error_type"] = str(error_type or "")
 
-    if cfg.enabled and fail_count >= cfg.fail_threshold:
+    store = shared_circuit_store_from_env()
+    if store is not None:
+        rec = store.record_failure(
+            _shared_key(scope),
+            error_type=str(error_type or ""),
+            fail_threshold=cfg.fail_threshold,
+            cooldown_sec=cfg.cooldown_sec,
+            now_epoch=now,
+        )
+        _mirror_shared(slot, rec)
+    elif cfg.enabled and fail_count >= cfg.fail_threshold:
         slot["state"] = "open"
         slot["open_until_epoch"] = max(0, now + int(cfg.cooldown_sec))
     else:
@@ -178,6 +212,9 @@ def mark_runtime_circuit_success(
 ) -> Dict[str, Any]:
     """Mark one success event and close/reset the circuit."""
     slot = _scope_circuit_slot(state, scope=scope)
+    store = shared_circuit_store_from_env()
+    if store is not None:
+        store.record_success(_shared_key(scope))
     slot["state"] = "closed"
     slot["fail_count"] = 0
     slot["open_until_epoch"] = 0
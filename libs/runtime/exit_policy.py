@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence
 
 
 def _to_float(v: Any, default: float = 0.0) -> float:
@@ -67,3 +67,78 @@ def evaluate_exit_policy(
     out["reason"] = "hold"
     return out
 
+
+
+def evaluate_exit_policy_batch(
+    *,
+    prices: Sequence[Optional[float]],
+    avg_prices: Sequence[Optional[float]],
+    qtys: Sequence[Any],
+    policy: Dict[str, Any] | None = None,
+    stop_loss_pcts: Optional[Sequence[Any]] = None,
+    take_profit_pcts: Optional[Sequence[Any]] = None,
+) -> Dict[str, Any]:
+    """M32-18: `evaluate_exit_policy` for a whole book in one pass.
+
+    Inputs are parallel sequences; per-row thresholds (None = policy value) override the policy.
+    Returns parallel columns; `exit_policy_row(batch, i)` rebuilds the exact scalar payload.
+    """
+    p = policy or {}
+    n = len(prices)
+    if len(avg_prices) != n or len(qtys) != n:
+        raise ValueError("prices, avg_prices and qtys must have the same length")
+    sl_policy = _clamp_non_negative(_to_float(p.get("stop_loss_pct"), 0.03))
+    tp_policy = _clamp_non_negative(_to_float(p.get("take_profit_pct"), 0.05))
+    sl_rows = list(stop_loss_pcts) if stop_loss_pcts is not None else [None] * n
+    tp_rows = list(take_profit_pcts) if take_profit_pcts is not None else [None] * n
+
+    triggered = [False] * n
+    reason = [""] * n
+    pnl = [None] * n
+    sl_col = [sl_policy] * n
+    tp_col = [tp_policy] * n
+    for i in range(n):
+        if sl_rows[i] is not None:
+            sl_col[i] = _clamp_non_negative(_to_float(sl_rows[i], 0.03))
+        if tp_rows[i] is not None:
+            tp_col[i] = _clamp_non_negative(_to_float(tp_rows[i], 0.05))
+        if max(0, int(qtys[i] or 0)) <= 0:
+            reason[i] = "no_position"
+            continue
+        price, avg = prices[i], avg_prices[i]
+        px = _to_float(price, 0.0) if price is not None else 0.0
+        apx = _to_float(avg, 0.0) if avg is not None else 0.0
+        if px <= 0.0 or apx <= 0.0:
+            reason[i] = "price_unavailable"
+            continue
+        r = float((px / apx) - 1.0)
+        pnl[i] = r
+        if sl_col[i] > 0.0 and r <= -sl_col[i]:
+            triggered[i], reason[i] = True, "stop_loss"
+        elif tp_col[i] > 0.0 and r >= tp_col[i]:
+            triggered[i], reason[i] = True, "take_profit"
+        else:
+            reason[i] = "hold"
+    return {
+        "n": n,
+        "triggered": triggered,
+        "reason": reason,
+        "pnl_ratio": pnl,
+        "stop_loss_pct": sl_col,
+        "take_profit_pct": tp_col,
+        "triggered_index": [i for i in range(n) if triggered[i]],
+    }
+
+
+def exit_policy_row(batch: Dict[str, Any], i: int) -> Dict[str, Any]:
+    """Row `i` of `evaluate_exit_policy_batch` in the `evaluate_exit_policy` payload shape."""
+    return {
+        "evaluated": True,
+        "triggered": bool(batch["triggered"][i]),
+        "reason": batch["reason"][i],
+        "pnl_ratio": batch["pnl_ratio"][i],
+        "thresholds": {
+            "stop_loss_pct": float(batch["stop_loss_pct"][i]),
+            "take_profit_pct": float(batch["take_profit_pct"][i]),
+        },
+    }
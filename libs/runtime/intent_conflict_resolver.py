@@ -3,6 +3,8 @@ from __future__ import annotations
 from collections import defaultdict
 from typing import Any, Dict, List, Optional, Tuple
 
+from libs.runtime.intent_guard_engine import engine_enabled, engine_resolve_intent_conflicts
+
 
 def _as_float(value: Any, default: float = 0.0) -> float:
     try:
@@ -88,7 +90,27 @@ def resolve_intent_conflicts(
     2. Apply per-symbol notional cap:
        - keep higher-priority intents first
        - block overflow intents (`symbol_notional_cap_exceeded`)
+
+    M32-16: evaluated by the single-pass intent table engine unless
+    `INTENT_GUARD_ENGINE=legacy`.
     """
+    fn = engine_resolve_intent_conflicts if engine_enabled() else _legacy_resolve_intent_conflicts
+    return fn(
+        intents,
+        default_symbol_max_notional=default_symbol_max_notional,
+        symbol_max_notional_map=symbol_max_notional_map,
+        market_prices=market_prices,
+    )
+
+
+def _legacy_resolve_intent_conflicts(
+    intents: List[Dict[str, Any]],
+    *,
+    default_symbol_max_notional: float = 0.0,
+    symbol_max_notional_map: Optional[Dict[str, float]] = None,
+    market_prices: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    """Pre-M32 per-intent dict implementation (reference for parity checks)."""
 
     cap_map: Dict[str, float] = {}
     if isinstance(symbol_max_notional_map, dict):
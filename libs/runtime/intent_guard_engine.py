@@ -0,0 +1,454 @@
+from __future__ import annotations
+
+"""M32-16: Single-pass intent conflict / budget guard engine.
+
+Same policy and the same output as `resolve_intent_conflicts` (M27-2) and
+`apply_portfolio_budget_guard` (M27-3), computed over a compact intent table:
+
+  - every intent is normalized ONCE into parallel columns (kind / symbol / side /
+    strategy / notional / priority score); no per-intent scratch dicts
+  - rows are grouped by symbol (and by strategy for the budget stage) once; each
+    symbol group resolves side conflict and notional cap in one visit, sorting only
+    the survivors of a capped symbol
+  - outcomes are kept per row and emitted in index order, so approved / blocked need
+    no final sort
+
+Result dicts (approved / blocked rows, reason counts, indices) are identical to the
+legacy implementations, including the guard's re-indexing of budget-screened intents
+before conflict resolution. `INTENT_GUARD_ENGINE=legacy` switches the public
+functions back to the original code paths.
+"""
+
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_KIND_INVALID_TYPE = 0
+_KIND_MISSING_SYMBOL = 1
+_KIND_OK = 2
+
+_SIDES = ("BUY", "SELL")
+_EPS = 1e-9
+_INF = float("inf")
+_INVALID_REASONS = ("invalid_intent_type", "missing_symbol", "invalid_side")
+
+
+def _as_float(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except Exception:
+        return float(default)
+
+
+def _num(value: Any) -> Optional[float]:
+    """`float(value)` or None; same result as `_as_float` without raising on the common None/number cases."""
+    if value is None:
+        return None
+    cls = value.__class__
+    if cls is float:
+        return value
+    if cls is int:
+        return float(value)
+    try:
+        return float(value)
+    except Exception:
+        return None
+
+
+def _norm_symbol(value: Any) -> str:
+    return str(value or "").strip().upper()
+
+
+def _norm_strategy(value: Any) -> str:
+    return str(value or "").strip()
+
+
+def engine_enabled() -> bool:
+    return str(os.getenv("INTENT_GUARD_ENGINE", "table") or "table").strip().lower() != "legacy"
+
+
+def normalize_cap_map(symbol_max_notional_map: Optional[Dict[str, float]]) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    if isinstance(symbol_max_notional_map, dict):
+        for k, v in symbol_max_notional_map.items():
+            out[_norm_symbol(k)] = max(0.0, _as_float(v, 0.0))
+    return out
+
+
+normalize_price_map = normalize_cap_map
+
+
+def build_strategy_budget_map(
+    *,
+    allocation_result: Optional[Dict[str, Any]],
+    strategy_budget_map: Optional[Dict[str, Any]],
+) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+
+    if isinstance(allocation_result, dict):
+        rows = allocation_result.get("allocations")
+        if isinstance(rows, list):
+            for row in rows:
+                if not isinstance(row, dict):
+                    continue
+                strategy_id = _norm_strategy(row.get("strategy_id"))
+                if not strategy_id:
+                    continue
+                out[strategy_id] = max(0.0, _as_float(row.get("allocated_notional"), 0.0))
+
+    if isinstance(strategy_budget_map, dict):
+        for k, v in strategy_budget_map.items():
+            strategy_id = _norm_strategy(k)
+            if not strategy_id:
+                continue
+            out[strategy_id] = max(0.0, _as_float(v, 0.0))
+
+    return out
+
+
+class IntentTable:
+    """Columnar, normalize-once view of an intent list.
+
+    `kind[i]`: invalid type / missing symbol / ok. `side[i]` is "" when not BUY/SELL.
+    `strategy_raw` is the resolver's `str(strategy_id or "")`, `strategy` the guard's
+    stripped id. `notional` / `score` follow the M27 requested-notional and priority rules.
+    """
+
+    __slots__ = ("intents", "kind", "symbol", "side", "strategy_raw", "strategy", "notional", "score")
+
+    def __init__(self, intents: Sequence[Any], price_map: Dict[str, float]):
+        self.intents = intents
+        n = len(intents)
+        kind = [_KIND_OK] * n
+        symbol = [""] * n
+        side = [""] * n
+        strategy_raw = [""] * n
+        strategy = [""] * n
+        notional = [0.0] * n
+        score = [0.0] * n
+        for i, raw in enumerate(intents):
+            if not isinstance(raw, dict):
+                kind[i] = _KIND_INVALID_TYPE
+                continue
+            get = raw.get
+            sid = str(get("strategy_id") or "")
+            strategy_raw[i] = sid
+            strategy[i] = sid.strip()
+            sym = str(get("symbol") or "").strip().upper()
+            if not sym:
+                kind[i] = _KIND_MISSING_SYMBOL
+                continue
+            symbol[i] = sym
+            sd = str(get("side") or get("action") or "").strip().upper()
+            side[i] = sd if sd in _SIDES else ""
+
+            req = _num(get("requested_notional"))
+            if req is None:
+                req = _num(get("notional"))
+            if req is None or not req > 0.0:  # NaN falls back like legacy `direct > 0.0`
+                q = _num(get("qty"))
+                qty = max(0, int(q)) if q is not None and q == q and q not in (_INF, -_INF) else 0
+                if qty <= 0:
+                    req = 1.0
+                else:
+                    price = _num(get("price"))
+                    if price is None:
+                        price = _num(get("unit_price"))
+                    if price is None:
+                        price = price_map.get(sym, 0.0)
+                    req = float(qty) * price if price > 0.0 else float(qty)
+            notional[i] = req
+
+            conf = _num(get("confidence"))
+            if conf is None:
+                meta = get("meta")
+                conf = _as_float(meta.get("confidence"), 0.0) if isinstance(meta, dict) else 0.0
+            prio = _num(get("priority"))
+            score[i] = (0.0 if prio is None else prio) * 1000.0 + conf * 100.0 + req * 0.000001
+
+        self.kind = kind
+        self.symbol = symbol
+        self.side = side
+        self.strategy_raw = strategy_raw
+        self.strategy = strategy
+        self.notional = notional
+        self.score = score
+
+
+def _conflict_stage(
+    t: IntentTable,
+    rows: Sequence[int],
+    *,
+    default_cap: float,
+    cap_map: Dict[str, float],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, int], int]:
+    """M27-2 over table rows `rows`; output `index` is the position within `rows`."""
+    n = len(rows)
+    # outcome per position: None = approved, else (reason, cap, used)
+    outcome: List[Optional[Tuple[str, float, float]]] = [None] * n
+    groups: Dict[str, List[int]] = {}
+    kind, side, symbol, score, notional = t.kind, t.side, t.symbol, t.score, t.notional
+    for j, i in enumerate(rows):
+        k = kind[i]
+        if k == _KIND_INVALID_TYPE:
+            outcome[j] = ("invalid_intent_type", 0.0, 0.0)
+        elif k == _KIND_MISSING_SYMBOL:
+            outcome[j] = ("missing_symbol", 0.0, 0.0)
+        elif not side[i]:
+            outcome[j] = ("invalid_side", 0.0, 0.0)
+        else:
+            g = groups.get(symbol[i])
+            if g is None:
+                groups[symbol[i]] = [j]
+            else:
+                g.append(j)
+
+    for sym, js in groups.items():
+        best_buy: Optional[float] = None
+        best_sell: Optional[float] = None
+        for j in js:
+            sc = score[rows[j]]
+            if side[rows[j]] == "BUY":
+                if best_buy is None or sc > best_buy:
+                    best_buy = sc
+            elif best_sell is None or sc > best_sell:
+                best_sell = sc
+        survivors = js
+        if best_buy is not None and best_sell is not None:
+            if abs(best_buy - best_sell) <= _EPS:
+                for j in js:
+                    outcome[j] = ("side_conflict_tie", 0.0, 0.0)
+                continue
+            winner = "BUY" if best_buy > best_sell else "SELL"
+            survivors = []
+            for j in js:
+                if side[rows[j]] == winner:
+                    survivors.append(j)
+                else:
+                    outcome[j] = ("opposite_side_conflict", 0.0, 0.0)
+
+        cap = cap_map[sym] if sym in cap_map else default_cap
+        if cap <= 0.0:
+            continue
+        used = 0.0
+        for j in sorted(survivors, key=lambda x: (-score[rows[x]], x)):
+            requested = max(0.0, notional[rows[j]])
+            if used + requested <= cap + _EPS:
+                used += requested
+            else:
+                outcome[j] = ("symbol_notional_cap_exceeded", cap, used)
+
+    approved: List[Dict[str, Any]] = []
+    blocked: List[Dict[str, Any]] = []
+    reason_counts: Dict[str, int] = {}
+    invalid_total = 0
+    intents, strategy_raw = t.intents, t.strategy_raw
+    for j, i in enumerate(rows):
+        out = outcome[j]
+        if out is None:
+            approved.append(
+                {
+                    "index": j,
+                    "strategy_id": strategy_raw[i],
+                    "symbol": symbol[i],
+                    "side": side[i],
+                    "requested_notional": float(notional[i]),
+                    "priority_score": float(score[i]),
+                    "status": "approved",
+                    "intent": intents[i],
+                }
+            )
+            continue
+        reason = out[0]
+        reason_counts[reason] = reason_counts.get(reason, 0) + 1
+        if reason in _INVALID_REASONS:
+            invalid_total += 1
+            blocked.append({"index": j, "status": "blocked", "reason": reason, "intent": intents[i]})
+            continue
+        row = {
+            "index": j,
+            "strategy_id": strategy_raw[i],
+            "symbol": symbol[i],
+            "side": side[i],
+            "requested_notional": float(max(0.0, notional[i]) if reason == "symbol_notional_cap_exceeded" else notional[i]),
+            "priority_score": float(score[i]),
+            "status": "blocked",
+            "reason": reason,
+            "intent": intents[i],
+        }
+        if reason == "symbol_notional_cap_exceeded":
+            row["symbol_cap_notional"] = float(out[1])
+            row["symbol_used_notional"] = float(out[2])
+        blocked.append(row)
+    return approved, blocked, reason_counts, invalid_total
+
+
+def engine_resolve_intent_conflicts(
+    intents: List[Dict[str, Any]],
+    *,
+    default_symbol_max_notional: float = 0.0,
+    symbol_max_notional_map: Optional[Dict[str, float]] = None,
+    market_prices: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    """`resolve_intent_conflicts` (M27-2) on the intent table."""
+    if not isinstance(intents, list):
+        return {
+            "ok": False,
+            "intent_total": 0,
+            "approved_total": 0,
+            "blocked_total": 0,
+            "invalid_total": 0,
+            "blocked_reason_counts": {},
+            "approved": [],
+            "blocked": [],
+            "failures": ["intents must be list"],
+        }
+    t = IntentTable(intents, normalize_price_map(market_prices))
+    approved, blocked, reason_counts, invalid_total = _conflict_stage(
+        t,
+        range(len(intents)),
+        default_cap=max(0.0, _as_float(default_symbol_max_notional, 0.0)),
+        cap_map=normalize_cap_map(symbol_max_notional_map),
+    )
+    return {
+        "ok": True,
+        "intent_total": len(intents),
+        "approved_total": len(approved),
+        "blocked_total": len(blocked),
+        "invalid_total": int(invalid_total),
+        "blocked_reason_counts": reason_counts,
+        "approved": approved,
+        "blocked": blocked,
+        "failures": [],
+    }
+
+
+def engine_apply_portfolio_budget_guard(
+    intents: List[Dict[str, Any]],
+    *,
+    allocation_result: Optional[Dict[str, Any]] = None,
+    strategy_budget_map: Optional[Dict[str, Any]] = None,
+    default_symbol_max_notional: float = 0.0,
+    symbol_max_notional_map: Optional[Dict[str, float]] = None,
+    market_prices: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    """`apply_portfolio_budget_guard` (M27-3) on the intent table: budget stage, then conflicts."""
+    failures: List[str] = []
+    budget_map = build_strategy_budget_map(allocation_result=allocation_result, strategy_budget_map=strategy_budget_map)
+    budget_enabled = len(budget_map) > 0
+    if not isinstance(intents, list):
+        failures.append("intents must be list")
+        intents = []
+
+    t = IntentTable(intents, normalize_price_map(market_prices))
+    kind, strategy, symbol, notional, score = t.kind, t.strategy, t.symbol, t.notional, t.score
+
+    blocked_budget: List[Dict[str, Any]] = []
+    ok_rows: List[int] = []
+    for i, k in enumerate(kind):
+        if k == _KIND_OK:
+            ok_rows.append(i)
+        elif k == _KIND_INVALID_TYPE:
+            blocked_budget.append({"index": i, "status": "blocked", "reason": "invalid_intent_type", "intent": intents[i]})
+        else:
+            blocked_budget.append(
+                {"index": i, "strategy_id": strategy[i], "status": "blocked", "reason": "missing_symbol", "intent": intents[i]}
+            )
+
+    strategy_usage: Dict[str, Dict[str, float]] = {}
+    if not budget_enabled:
+        screened = ok_rows
+    else:
+        screened = []
+        by_strategy: Dict[str, List[int]] = {}
+        for i in ok_rows:
+            g = by_strategy.get(strategy[i])
+            if g is None:
+                by_strategy[strategy[i]] = [i]
+            else:
+                g.append(i)
+        for sid, budget in budget_map.items():
+            strategy_usage[sid] = {
+                "budget_notional": float(budget),
+                "used_notional": 0.0,
+                "remaining_notional": float(budget),
+            }
+
+        for sid in sorted(by_strategy):
+            rows = sorted(by_strategy[sid], key=lambda x: (-score[x], x))
+            if not sid or sid not in budget_map:
+                reason = "missing_strategy_id" if not sid else "missing_strategy_budget"
+                for i in rows:
+                    blocked_budget.append(
+                        {
+                            "index": i,
+                            "strategy_id": sid,
+                            "symbol": symbol[i],
+                            "requested_notional": float(notional[i]),
+                            "priority_score": float(score[i]),
+                            "status": "blocked",
+                            "reason": reason,
+                            "intent": intents[i],
+                        }
+                    )
+                continue
+
+            budget = float(max(0.0, budget_map[sid]))
+            used = 0.0
+            for i in rows:
+                requested = float(max(0.0, notional[i]))
+                if requested <= 0.0:
+                    requested = 1.0
+                if used + requested <= budget + _EPS:
+                    used += requested
+                    screened.append(i)
+                    continue
+                blocked_budget.append(
+                    {
+                        "index": i,
+                        "strategy_id": sid,
+                        "symbol": symbol[i],
+                        "requested_notional": requested,
+                        "priority_score": float(score[i]),
+                        "status": "blocked",
+                        "reason": "strategy_budget_exceeded",
+                        "intent": intents[i],
+                        "strategy_budget_notional": float(budget),
+                        "strategy_used_notional": float(used),
+                    }
+                )
+            strategy_usage[sid] = {
+                "budget_notional": float(budget),
+                "used_notional": float(used),
+                "remaining_notional": float(max(0.0, budget - used)),
+            }
+
+    approved, blocked_conflict, conflict_counts, _ = _conflict_stage(
+        t,
+        screened,
+        default_cap=float(max(0.0, _as_float(default_symbol_max_notional, 0.0))),
+        cap_map=normalize_cap_map(symbol_max_notional_map),
+    )
+
+    reason_counts: Dict[str, int] = {}
+    for row in blocked_budget:
+        reason_counts[row["reason"]] = reason_counts.get(row["reason"], 0) + 1
+    for reason, c in conflict_counts.items():
+        reason_counts[reason] = reason_counts.get(reason, 0) + c
+
+    return {
+        "ok": len(failures) == 0,
+        "budget_enabled": budget_enabled,
+        "intent_total": len(intents),
+        "budget_screened_total": len(screened),
+        "approved_total": len(approved),
+        "blocked_total": len(blocked_budget) + len(blocked_conflict),
+        "blocked_reason_counts": reason_counts,
+        "strategy_budget": {
+            "strategy_total": len(budget_map),
+            "map": {k: float(v) for k, v in budget_map.items()},
+            "usage": strategy_usage,
+        },
+        "approved": approved,
+        "blocked": blocked_budget + blocked_conflict,
+        "failures": failures,
+    }
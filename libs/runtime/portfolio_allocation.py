@@ -81,8 +81,30 @@ def allocate_portfolio_budget(
     *,
     total_notional: float,
     reserve_ratio: float = 0.0,
+    mode: str = "static",
+    risk_allocator: Optional[Any] = None,
 ) -> Dict[str, Any]:
-    """M27-1: deterministic multi-strategy portfolio allocation scaffold."""
+    """M27-1: deterministic multi-strategy portfolio allocation scaffold.
+
+    M32-17: `mode="risk_parity"` / `"vol_target"` delegates to a caller-held
+    `libs.runtime.risk_allocation.RiskAllocator` (covariance cache + warm start).
+    """
+    mode = str(mode or "static").strip().lower()
+    if mode != "static":
+        if risk_allocator is None:
+            return {
+                "ok": False,
+                "mode": mode,
+                "allocations": [],
+                "failures": [f"allocation mode {mode} requires risk_allocator"],
+            }
+        return risk_allocator.allocate(
+            strategy_profiles,
+            total_notional=total_notional,
+            reserve_ratio=reserve_ratio,
+            mode=mode,
+        )
+
     total = max(0.0, _as_float(total_notional, 0.0))
     reserve = _to_ratio(reserve_ratio, default=0.0)
     reserve_notional = total * reserve
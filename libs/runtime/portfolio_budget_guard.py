@@ -3,7 +3,8 @@ from __future__ import annotations
 from collections import defaultdict
 from typing import Any, Dict, List, Optional
 
-from libs.runtime.intent_conflict_resolver import resolve_intent_conflicts
+from libs.runtime.intent_conflict_resolver import _legacy_resolve_intent_conflicts
+from libs.runtime.intent_guard_engine import engine_apply_portfolio_budget_guard, engine_enabled
 
 
 def _as_float(value: Any, default: float = 0.0) -> float:
@@ -91,7 +92,32 @@ def apply_portfolio_budget_guard(
     symbol_max_notional_map: Optional[Dict[str, float]] = None,
     market_prices: Optional[Dict[str, float]] = None,
 ) -> Dict[str, Any]:
-    """M27-3: commander/supervisor boundary guard (budget -> conflict resolution)."""
+    """M27-3: commander/supervisor boundary guard (budget -> conflict resolution).
+
+    M32-16: evaluated by the single-pass intent table engine unless
+    `INTENT_GUARD_ENGINE=legacy`.
+    """
+    fn = engine_apply_portfolio_budget_guard if engine_enabled() else _legacy_apply_portfolio_budget_guard
+    return fn(
+        intents,
+        allocation_result=allocation_result,
+        strategy_budget_map=strategy_budget_map,
+        default_symbol_max_notional=default_symbol_max_notional,
+        symbol_max_notional_map=symbol_max_notional_map,
+        market_prices=market_prices,
+    )
+
+
+def _legacy_apply_portfolio_budget_guard(
+    intents: List[Dict[str, Any]],
+    *,
+    allocation_result: Optional[Dict[str, Any]] = None,
+    strategy_budget_map: Optional[Dict[str, Any]] = None,
+    default_symbol_max_notional: float = 0.0,
+    symbol_max_notional_map: Optional[Dict[str, float]] = None,
+    market_prices: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    """Pre-M32 implementation (reference for parity checks)."""
     failures: List[str] = []
     cap_map: Dict[str, float] = {}
     if isinstance(symbol_max_notional_map, dict):
@@ -238,7 +264,7 @@ def apply_portfolio_budget_guard(
                 "remaining_notional": float(max(0.0, budget - used)),
             }
 
-    conflict = resolve_intent_conflicts(
+    conflict = _legacy_resolve_intent_conflicts(
         approved_after_budget,
         default_symbol_max_notional=float(max(0.0, _as_float(default_symbol_max_notional, 0.0))),
         symbol_max_notional_map=cap_map,
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from math import floor
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence
 
 
 def _to_float(v: Any, default: float = 0.0) -> float:
@@ -128,3 +128,148 @@ def evaluate_position_size(
         out["reason"] = "ok"
     return out
 
+
+
+def _per_row(values: Any, n: int) -> list:
+    if isinstance(values, (list, tuple)):
+        if len(values) != n:
+            raise ValueError(f"per-row input length {len(values)} != {n}")
+        return list(values)
+    return [values] * n
+
+
+def evaluate_position_size_batch(
+    *,
+    prices: Sequence[Optional[float]],
+    cash: Any,
+    policy: Dict[str, Any] | None = None,
+    risk_context: Dict[str, Any] | None = None,
+    stop_loss_pcts: Optional[Sequence[Any]] = None,
+    sequential_cash: bool = False,
+) -> Dict[str, Any]:
+    """M32-18: `evaluate_position_size` over many candidates in one pass.
+
+    Policy/risk-context coercion happens once; `cash` may be a scalar or per-row list and
+    `stop_loss_pcts` optionally overrides the policy stop per row (None = policy value).
+    With `sequential_cash` the rows share the scalar `cash`: each row is sized against the
+    cash left after the notional (qty * price) of the rows before it.
+    Returns parallel columns; `position_size_row(batch, i)` rebuilds the exact scalar payload.
+    """
+    p = policy or {}
+    rc = risk_context or {}
+    n = len(prices)
+    if sequential_cash and isinstance(cash, (list, tuple)):
+        raise ValueError("sequential_cash needs a scalar cash")
+    cash_rows = _per_row(cash, n)
+    remaining = (_to_float(cash, 0.0) if cash is not None else 0.0) if sequential_cash else 0.0
+    sl_rows = _per_row(None, n) if stop_loss_pcts is None else _per_row(stop_loss_pcts, n)
+
+    risk_ratio = _clamp(_to_float(p.get("risk_per_trade_ratio"), _to_float(rc.get("per_trade_risk_ratio"), 0.01)), 0.0, 1.0)
+    sl_fallback = _to_float(
+        (p.get("exit_policy") or {}).get("stop_loss_pct") if isinstance(p.get("exit_policy"), dict) else 0.03, 0.03
+    )
+    sl_policy = _clamp(_to_float(p.get("stop_loss_pct"), sl_fallback), 0.0, 1.0)
+    notional_ratio = _clamp(_to_float(p.get("position_notional_ratio"), 0.10), 0.0, 1.0)
+    max_qty = max(0, _to_int(p.get("max_position_qty"), 0))
+    min_qty = max(1, _to_int(p.get("min_position_qty"), 1))
+    lot_size = max(1, _to_int(p.get("lot_size"), 1))
+
+    out: Dict[str, Any] = {
+        "n": n,
+        "qty": [0] * n,
+        "reason": [""] * n,
+        "price": [None] * n,
+        "cash": [None] * n,
+        "stop_loss_pct": [sl_policy] * n,
+        "risk_budget": [0.0] * n,
+        "notional_budget": [0.0] * n,
+        "qty_by_risk": [0] * n,
+        "qty_by_notional": [0] * n,
+        "policy": {
+            "risk_per_trade_ratio": float(risk_ratio),
+            "position_notional_ratio": float(notional_ratio),
+            "lot_size": int(lot_size),
+            "min_qty": int(min_qty),
+            "max_qty": int(max_qty),
+        },
+    }
+    qty_col, reason_col = out["qty"], out["reason"]
+    for i in range(n):
+        price = prices[i]
+        px = _to_float(price, 0.0) if price is not None else 0.0
+        c_raw = (remaining if remaining > 0.0 else None) if sequential_cash else cash_rows[i]
+        c = _to_float(c_raw, 0.0) if c_raw is not None else 0.0
+        out["price"][i] = px if px > 0.0 else None
+        out["cash"][i] = c if c >= 0.0 else None
+        if px <= 0.0:
+            reason_col[i] = "price_unavailable"
+            continue
+        if c <= 0.0:
+            reason_col[i] = "cash_unavailable"
+            continue
+
+        sl = sl_policy if sl_rows[i] is None else _clamp(_to_float(sl_rows[i], sl_fallback), 0.0, 1.0)
+        out["stop_loss_pct"][i] = sl
+        risk_budget = float(c * risk_ratio)
+        notional_budget = float(c * notional_ratio)
+        out["risk_budget"][i] = risk_budget
+        out["notional_budget"][i] = notional_budget
+        if risk_budget <= 0.0 and notional_budget <= 0.0:
+            reason_col[i] = "budget_zero"
+            continue
+
+        if sl > 0.0:
+            qty_risk = int(floor(risk_budget / float(px * sl)))
+        else:
+            qty_risk = int(floor(risk_budget / float(px))) if risk_budget > 0.0 else 0
+        qty_notional = int(floor(notional_budget / float(px))) if notional_budget > 0.0 else 0
+        if qty_risk > 0 and qty_notional > 0:
+            qty = min(qty_risk, qty_notional)
+        else:
+            qty = qty_risk if qty_risk > 0 else (qty_notional if qty_notional > 0 else 0)
+        if max_qty > 0 and qty > max_qty:
+            qty = max_qty
+        if qty > 0:
+            qty = int((qty // lot_size) * lot_size)
+        if qty > 0 and qty < min_qty:
+            qty = 0
+        qty_col[i] = int(max(0, qty))
+        out["qty_by_risk"][i] = int(max(0, qty_risk))
+        out["qty_by_notional"][i] = int(max(0, qty_notional))
+        reason_col[i] = "ok" if qty_col[i] > 0 else "computed_qty_zero"
+        remaining -= qty_col[i] * px
+    return out
+
+
+def position_size_row(batch: Dict[str, Any], i: int) -> Dict[str, Any]:
+    """Row `i` of `evaluate_position_size_batch` in the `evaluate_position_size` payload shape."""
+    reason = batch["reason"][i]
+    pol = batch["policy"]
+    inputs: Dict[str, Any] = {}
+    if reason == "budget_zero":
+        inputs = {
+            "risk_per_trade_ratio": pol["risk_per_trade_ratio"],
+            "position_notional_ratio": pol["position_notional_ratio"],
+        }
+    elif reason in ("ok", "computed_qty_zero"):
+        inputs = {
+            "risk_per_trade_ratio": float(pol["risk_per_trade_ratio"]),
+            "stop_loss_pct": float(batch["stop_loss_pct"][i]),
+            "position_notional_ratio": float(pol["position_notional_ratio"]),
+            "risk_budget": float(batch["risk_budget"][i]),
+            "notional_budget": float(batch["notional_budget"][i]),
+            "qty_by_risk": int(batch["qty_by_risk"][i]),
+            "qty_by_notional": int(batch["qty_by_notional"][i]),
+            "lot_size": int(pol["lot_size"]),
+            "min_qty": int(pol["min_qty"]),
+            "max_qty": int(pol["max_qty"]),
+        }
+    return {
+        "evaluated": True,
+        "qty": int(batch["qty"][i]),
+        "reason": reason,
+        "price": batch["price"][i],
+        "cash": batch["cash"][i],
+        "mode": "risk_budget",
+        "inputs": inputs,
+    }
@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+"""M32-17: Covariance-aware portfolio allocation (risk parity / volatility target).
+
+`allocate_portfolio_budget` (M27-1) splits notional by static profile weight. `RiskAllocator`
+keeps an EWMA covariance of per-tick returns and allocates by risk instead:
+
+  - `risk_parity`: equal (or profile-weight budgeted) risk contribution per strategy, solved with
+    Newton's method on the convex risk-budgeting objective, warm-started from the previous tick
+  - `vol_target`: inverse-volatility weights scaled so the portfolio hits a target annualized
+    volatility (never above the allocatable notional)
+
+Returns are observed either per strategy (e.g. M26 fill PnL / notional) or per symbol together
+with strategy exposures (`set_exposures`); in the latter case the strategy covariance
+`E Σ Eᵀ` is maintained incrementally with every observation, so a tick costs one rank-1
+update plus a small strategy-level solve.
+
+The result has the same shape as `allocate_portfolio_budget` (so it can be passed as
+`allocation_result` to the M27-3 budget guard) plus `mode` and a `risk` block.
+"""
+
+import math
+import os
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from libs.runtime.portfolio_allocation import _as_float, _normalize_profiles, _to_ratio
+
+RISK_ALLOCATION_MODES = ("risk_parity", "vol_target")
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = str(os.getenv(name, "") or "").strip()
+    return _as_float(raw, default) if raw else float(default)
+
+
+class EwmaCovariance:
+    """Exponentially weighted mean/covariance over a fixed key universe, one return vector per update."""
+
+    def __init__(self, keys: Sequence[str], *, halflife: float = 20.0):
+        self.keys: List[str] = [str(k) for k in keys]
+        self.pos: Dict[str, int] = {k: i for i, k in enumerate(self.keys)}
+        n = len(self.keys)
+        self.lam = 0.5 ** (1.0 / max(1e-6, float(halflife)))
+        self.mean = np.zeros(n)
+        self.cov = np.zeros((n, n))
+        self.nobs = 0
+        self._decay = 1.0
+        self._scratch = np.empty((n, n))
+
+    def vector(self, returns: Any) -> np.ndarray:
+        """Map `{key: return}` (unknown keys ignored, missing = 0) or an array to a return vector."""
+        if isinstance(returns, Mapping):
+            x = np.zeros(len(self.keys))
+            pos = self.pos
+            for k, v in returns.items():
+                i = pos.get(str(k))
+                if i is not None:
+                    x[i] = _as_float(v, 0.0)
+        else:
+            x = np.array(returns, dtype=float).reshape(-1)
+            if x.shape[0] != len(self.keys):
+                raise ValueError(f"return vector length {x.shape[0]} != universe size {len(self.keys)}")
+        x[~np.isfinite(x)] = 0.0
+        return x
+
+    def update(self, x: np.ndarray) -> np.ndarray:
+        """Fold one observation in; returns the deviation from the previous mean (for projections)."""
+        lam = self.lam
+        d = x - self.mean
+        self.mean += (1.0 - lam) * d
+        np.multiply.outer(d * (1.0 - lam), d, out=self._scratch)
+        self.cov += self._scratch
+        self.cov *= lam
+        self.nobs += 1
+        self._decay *= lam
+        return d
+
+    @property
+    def bias_correction(self) -> float:
+        return 1.0 / max(1e-12, 1.0 - self._decay)
+
+    def covariance(self) -> np.ndarray:
+        return self.cov * self.bias_correction
+
+
+def _shrink(cov: np.ndarray, shrinkage: float) -> np.ndarray:
+    """Shrink toward the diagonal and floor missing variances at the median observed variance."""
+    out = cov * (1.0 - shrinkage)
+    diag = np.diag(cov).copy()
+    ok = np.isfinite(diag) & (diag > 0.0)
+    floor = float(np.median(diag[ok])) if ok.any() else 1e-8
+    diag[~ok] = floor
+    np.fill_diagonal(out, diag)
+    return out
+
+
+def risk_parity_weights(
+    cov: np.ndarray,
+    budgets: np.ndarray,
+    *,
+    x0: Optional[np.ndarray] = None,
+    tol: float = 1e-8,
+    max_iter: int = 50,
+) -> Dict[str, Any]:
+    """Risk-budgeting weights: minimize ½xᵀΣx − Σ bᵢ log xᵢ (Newton, damped), w = x / Σx.
+
+    At the optimum xᵢ(Σx)ᵢ = bᵢ, i.e. each weight's share of portfolio variance equals its budget.
+    """
+    b = budgets / budgets.sum()
+    vol = np.sqrt(np.diag(cov))
+    x = np.array(x0, dtype=float) if x0 is not None else b / vol
+    x[~(x > 0.0)] = (b / vol)[~(x > 0.0)]
+    x /= math.sqrt(float(x @ cov @ x))
+
+    iterations = 0
+    err = float("inf")
+    for iterations in range(1, max_iter + 1):
+        sx = cov @ x
+        rc = x * sx
+        err = float(np.max(np.abs(rc / rc.sum() - b)))
+        if err <= tol:
+            iterations -= 1
+            break
+        g = sx - b / x
+        h = cov + np.diag(b / (x * x))
+        dx = np.linalg.solve(h, g)
+        dec = math.sqrt(max(0.0, float(g @ dx)))
+        step = 1.0 if dec < 0.25 else 1.0 / (1.0 + dec)
+        nxt = x - step * dx
+        while np.any(nxt <= 0.0):
+            step *= 0.5
+            nxt = x - step * dx
+        x = nxt
+    w = x / x.sum()
+    return {"weights": w, "iterations": int(iterations), "converged": err <= tol, "max_budget_error": err}
+
+
+def _cap_and_redistribute(target: np.ndarray, caps: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Clip at per-strategy caps (inf = none); hand the excess to uncapped rows pro rata to weight."""
+    alloc = np.minimum(target, caps)
+    eps = 1e-9
+    for _ in range(len(alloc)):
+        leftover = float(target.sum() - alloc.sum())
+        room = caps - alloc
+        open_ = room > eps
+        if leftover <= eps or not open_.any():
+            break
+        share = weights * open_
+        alloc = alloc + np.minimum(leftover * share / share.sum(), room)
+    return alloc
+
+
+class RiskAllocator:
+    """Per-process allocator: EWMA covariance cache + previous solution for warm starts."""
+
+    def __init__(
+        self,
+        keys: Sequence[str],
+        *,
+        halflife: float = 20.0,
+        shrinkage: float = 0.1,
+        min_obs: int = 20,
+        target_volatility: float = 0.15,
+        periods_per_year: float = 252.0,
+        max_iter: int = 50,
+        tol: float = 1e-8,
+    ):
+        self.cache = EwmaCovariance(keys, halflife=halflife)
+        self.shrinkage = min(1.0, max(0.0, float(shrinkage)))
+        self.min_obs = max(1, int(min_obs))
+        self.target_volatility = max(0.0, float(target_volatility))
+        self.periods_per_year = max(1.0, float(periods_per_year))
+        self.max_iter = max(1, int(max_iter))
+        self.tol = float(tol)
+        self._exposure_ids: List[str] = []
+        self._exposure_pos: Dict[str, int] = {}
+        self._exposures: Optional[np.ndarray] = None
+        self._proj_cov: Optional[np.ndarray] = None
+        self._prev_weights: Dict[str, float] = {}
+
+    @classmethod
+    def from_env(cls, keys: Sequence[str]) -> "RiskAllocator":
+        return cls(
+            keys,
+            halflife=_env_float("PORTFOLIO_RISK_HALFLIFE", 20.0),
+            shrinkage=_env_float("PORTFOLIO_RISK_SHRINKAGE", 0.1),
+            min_obs=int(_env_float("PORTFOLIO_RISK_MIN_OBS", 20)),
+            target_volatility=_env_float("PORTFOLIO_TARGET_VOLATILITY", 0.15),
+            periods_per_year=_env_float("PORTFOLIO_RISK_PERIODS_PER_YEAR", 252.0),
+        )
+
+    def set_exposures(self, exposures: Mapping[str, Mapping[str, float]]) -> None:
+        """Strategy -> {symbol: weight}; the cache universe is then symbols, not strategies."""
+        ids = [str(k).strip() for k in exposures]
+        e = np.zeros((len(ids), len(self.cache.keys)))
+        pos = self.cache.pos
+        for r, sid in enumerate(exposures):
+            row = exposures[sid]
+            if isinstance(row, Mapping):
+                for sym, w in row.items():
+                    c = pos.get(str(sym))
+                    if c is not None:
+                        e[r, c] = _as_float(w, 0.0)
+        self._exposure_ids = ids
+        self._exposure_pos = {k: i for i, k in enumerate(ids)}
+        self._exposures = e
+        self._proj_cov = e @ self.cache.cov @ e.T
+
+    def observe(self, returns: Any) -> None:
+        d = self.cache.update(self.cache.vector(returns))
+        if self._exposures is not None and self._proj_cov is not None:
+            lam = self.cache.lam
+            ed = self._exposures @ d
+            self._proj_cov += (1.0 - lam) * np.outer(ed, ed)
+            self._proj_cov *= lam
+
+    def strategy_covariance(self, strategy_ids: Sequence[str]) -> np.ndarray:
+        """Shrunk, bias-corrected covariance of per-period returns for `strategy_ids` (in order)."""
+        if self._exposures is not None and self._proj_cov is not None:
+            src, pos = self._proj_cov * self.cache.bias_correction, self._exposure_pos
+        else:
+            src, pos = self.cache.covariance(), self.cache.pos
+        idx = np.array([pos.get(s, -1) for s in strategy_ids])
+        known = idx >= 0
+        out = np.zeros((len(idx), len(idx)))
+        if known.any():
+            k = idx[known]
+            out[np.ix_(known, known)] = src[np.ix_(k, k)]
+        return _shrink(out, self.shrinkage)
+
+    def allocate(
+        self,
+        strategy_profiles: List[Dict[str, Any]],
+        *,
+        total_notional: float,
+        reserve_ratio: float = 0.0,
+        mode: str = "risk_parity",
+        target_volatility: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Risk-based counterpart of `allocate_portfolio_budget`; profile `weight` acts as the risk budget."""
+        total = max(0.0, _as_float(total_notional, 0.0))
+        reserve = _to_ratio(reserve_ratio, default=0.0)
+        reserve_notional = total * reserve
+        allocatable = max(0.0, total - reserve_notional)
+        mode = str(mode or "risk_parity").strip().lower()
+
+        normalized = _normalize_profiles(strategy_profiles)
+        active = normalized["active_profiles"]
+        failures: List[str] = list(normalized["failures"])
+        if mode not in RISK_ALLOCATION_MODES:
+            failures.append(f"unsupported allocation mode: {mode}")
+        if not active and not failures:
+            failures.append("no active strategy profile")
+
+        base = {
+            "total_notional": round(total, 8),
+            "reserve_ratio": round(reserve, 8),
+            "reserve_notional": round(reserve_notional, 8),
+            "allocatable_notional": round(allocatable, 8),
+            "active_strategy_total": len(active),
+        }
+        if not active or mode not in RISK_ALLOCATION_MODES:
+            return {
+                "ok": False,
+                "mode": mode,
+                **base,
+                "allocation_total": 0.0,
+                "unallocated_notional": round(allocatable, 8),
+                "allocations": [],
+                "risk": {"nobs": self.cache.nobs},
+                "failures": failures,
+            }
+
+        ids = [str(p["strategy_id"]) for p in active]
+        budgets = np.array([_as_float(p["weight"], 0.0) for p in active])
+        budgets = budgets / budgets.sum()
+        risk: Dict[str, Any] = {"nobs": self.cache.nobs, "shrinkage": self.shrinkage}
+        cov = self.strategy_covariance(ids)
+        vol = np.sqrt(np.diag(cov))
+
+        if self.cache.nobs < self.min_obs:
+            weights = budgets
+            scale = 1.0
+            risk["fallback"] = "insufficient_history"
+        elif mode == "risk_parity":
+            x0 = None
+            if self._prev_weights:
+                prev = np.array([self._prev_weights.get(s, 0.0) for s in ids])
+                x0 = np.where(prev > 0.0, prev, budgets / vol)
+            solved = risk_parity_weights(cov, budgets, x0=x0, tol=self.tol, max_iter=self.max_iter)
+            weights = solved["weights"]
+            risk.update(
+                warm_start=x0 is not None,
+                iterations=solved["iterations"],
+                converged=solved["converged"],
+                max_budget_error=round(solved["max_budget_error"], 12),
+            )
+            scale = 1.0
+            if target_volatility is not None and _as_float(target_volatility, 0.0) > 0.0:
+                port = math.sqrt(float(weights @ cov @ weights) * self.periods_per_year)
+                scale = min(1.0, _as_float(target_volatility, 0.0) / port) if port > 0.0 else 1.0
+        else:
+            inv = budgets / vol
+            weights = inv / inv.sum()
+            target = self.target_volatility if target_volatility is None else max(0.0, _as_float(target_volatility, 0.0))
+            port = math.sqrt(float(weights @ cov @ weights) * self.periods_per_year)
+            scale = min(1.0, target / port) if port > 0.0 and target > 0.0 else 1.0
+            risk["target_volatility"] = round(target, 8)
+
+        if "fallback" not in risk:
+            self._prev_weights = {s: float(w) for s, w in zip(ids, weights)}
+
+        targets = allocatable * scale * weights
+        caps = np.array(
+            [
+                allocatable * _to_ratio(p["max_notional_ratio"], default=1.0) if p.get("max_notional_ratio") is not None else np.inf
+                for p in active
+            ]
+        )
+        alloc = _cap_and_redistribute(targets, caps, weights)
+
+        sigma_w = cov @ weights
+        port_var = float(weights @ sigma_w)
+        contrib = weights * sigma_w / port_var if port_var > 0.0 else budgets
+        risk.update(
+            scale=round(scale, 8),
+            portfolio_volatility=round(math.sqrt(max(0.0, port_var) * self.periods_per_year) * scale, 8),
+        )
+
+        rows = []
+        for i, p in enumerate(active):
+            rows.append(
+                {
+                    "strategy_id": ids[i],
+                    "weight": round(_as_float(p["weight"]), 8),
+                    "normalized_weight": round(float(weights[i]), 8),
+                    "target_notional": round(float(targets[i]), 8),
+                    "allocated_notional": round(float(alloc[i]), 8),
+                    "max_notional": None if not np.isfinite(caps[i]) else round(float(caps[i]), 8),
+                    "volatility": round(float(vol[i]) * math.sqrt(self.periods_per_year), 8),
+                    "risk_contribution": round(float(contrib[i]), 8),
+                }
+            )
+        allocation_total = float(alloc.sum())
+        return {
+            "ok": len(failures) == 0,
+            "mode": mode,
+            **base,
+            "allocation_total": round(allocation_total, 8),
+            "unallocated_notional": round(max(0.0, allocatable - allocation_total), 8),
+            "allocations": rows,
+            "risk": risk,
+            "failures": failures,
+        }
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+DEFAULT_PROBE_TTL_SEC = 30.0
+
+
+def _coerce_float(value: Any, default: float) -> float:
+    try:
+        return float(value)
+    except Exception:
+        return float(default)
+
+
+def _now(now_epoch: Optional[float]) -> float:
+    if now_epoch is None:
+        return float(time.time())
+    return _coerce_float(now_epoch, time.time())
+
+
+def circuit_key(scope: str, model: str = "") -> str:
+    s = str(scope or "").strip() or "strategist"
+    m = str(model or "").strip()
+    return f"{s}|{m}" if m else s
+
+
+def default_probe_owner() -> str:
+    """Per-thread identity used to claim the half-open probe slot (threads of one
+    process must not share a probe; thread ids are reused, so a per-thread token is added)."""
+    token = getattr(_THREAD, "token", None)
+    if token is None:
+        token = _THREAD.token = uuid.uuid4().hex[:6]
+    return f"{os.getpid()}:{_PROCESS_TOKEN}:{threading.get_ident()}.{token}"
+
+
+_PROCESS_TOKEN = uuid.uuid4().hex[:8]
+_THREAD = threading.local()
+
+
+class SQLiteCircuitBreakerStore:
+    """Cross-process circuit breaker state (M32-4).
+
+    One row per key (`scope|model`). WAL mode lets many worker processes read while
+    one writes; state changes run in `BEGIN IMMEDIATE` so the half-open probe slot
+    is claimed by exactly one process. Each process keeps one connection; `gate()`
+    answers a closed (or still cooling / already probed) breaker from a plain read and
+    takes the write lock only to claim the probe.
+
+    States: closed -> open (threshold failures) -> half_open (cooldown elapsed,
+    one probe owner) -> closed (probe success) | open (probe failure).
+    """
+
+    def __init__(self, path: str = "data/state/circuit_breaker.db", *, probe_ttl_sec: float = DEFAULT_PROBE_TTL_SEC):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.probe_ttl_sec = max(1.0, float(probe_ttl_sec))
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid = 0
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _session(self) -> Iterator[sqlite3.Connection]:
+        """The process's connection, serialized by a lock (reopened after fork)."""
+        with self._lock:
+            if self._conn is None or self._conn_pid != os.getpid():
+                self._conn = self._connect()
+                self._conn_pid = os.getpid()
+            yield self._conn
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        with self._session() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _init_db(self) -> None:
+        with self._session() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS circuit_breaker (
+                    key TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    fail_count INTEGER NOT NULL,
+                    open_until_epoch REAL NOT NULL,
+                    last_error_type TEXT NOT NULL,
+                    probe_owner TEXT NOT NULL,
+                    probe_until_epoch REAL NOT NULL,
+                    updated_ts REAL NOT NULL
+                )
+                """
+            )
+
+    @staticmethod
+    def _row_to_dict(key: str, row: Optional[sqlite3.Row]) -> Dict[str, Any]:
+        if row is None:
+            return {
+                "key": key,
+                "state": "closed",
+                "fail_count": 0,
+                "open_until_epoch": 0.0,
+                "last_error_type": "",
+                "probe_owner": "",
+                "probe_until_epoch": 0.0,
+                "updated_ts": 0.0,
+            }
+        return {
+            "key": str(row["key"]),
+            "state": str(row["state"]),
+            "fail_count": int(row["fail_count"]),
+            "open_until_epoch": float(row["open_until_epoch"]),
+            "last_error_type": str(row["last_error_type"] or ""),
+            "probe_owner": str(row["probe_owner"] or ""),
+            "probe_until_epoch": float(row["probe_until_epoch"]),
+            "updated_ts": float(row["updated_ts"]),
+        }
+
+    @staticmethod
+    def _select(conn: sqlite3.Connection, key: str) -> Optional[sqlite3.Row]:
+        return conn.execute(
+            """
+            SELECT key, state, fail_count, open_until_epoch, last_error_type,
+                   probe_owner, probe_until_epoch, updated_ts
+            FROM circuit_breaker WHERE key = ?
+            """,
+            (key,),
+        ).fetchone()
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, rec: Dict[str, Any]) -> None:
+        conn.execute(
+            """
+            INSERT INTO circuit_breaker(
+                key, state, fail_count, open_until_epoch, last_error_type,
+                probe_owner, probe_until_epoch, updated_ts
+            ) VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                state = excluded.state,
+                fail_count = excluded.fail_count,
+                open_until_epoch = excluded.open_until_epoch,
+                last_error_type = excluded.last_error_type,
+                probe_owner = excluded.probe_owner,
+                probe_until_epoch = excluded.probe_until_epoch,
+                updated_ts = excluded.updated_ts
+            """,
+            (
+                rec["key"],
+                rec["state"],
+                int(rec["fail_count"]),
+                float(rec["open_until_epoch"]),
+                str(rec["last_error_type"] or ""),
+                str(rec["probe_owner"] or ""),
+                float(rec["probe_until_epoch"]),
+                float(rec["updated_ts"]),
+            ),
+        )
+
+    def get(self, key: str) -> Dict[str, Any]:
+        with self._session() as conn:
+            return self._row_to_dict(key, self._select(conn, key))
+
+    def list_all(self) -> List[Dict[str, Any]]:
+        with self._session() as conn:
+            rows = conn.execute(
+                """
+                SELECT key, state, fail_count, open_until_epoch, last_error_type,
+                       probe_owner, probe_until_epoch, updated_ts
+                FROM circuit_breaker ORDER BY key ASC
+                """
+            ).fetchall()
+        return [self._row_to_dict(str(r["key"]), r) for r in rows]
+
+    @staticmethod
+    def _verdict(rec: Dict[str, Any], who: str, now: float) -> Tuple[bool, str, bool]:
+        """(allowed, reason, claims_probe) for one gate call against `rec`."""
+        if rec["state"] not in ("open", "half_open"):
+            return True, "allowed", False
+        if rec["state"] == "open" and rec["open_until_epoch"] > now:
+            return False, "circuit_open", False
+        if rec["probe_owner"] and rec["probe_until_epoch"] > now and rec["probe_owner"] != who:
+            return False, "circuit_probe_in_flight", False
+        return True, "circuit_half_open", True
+
+    def gate(self, key: str, *, owner: Optional[str] = None, now_epoch: Optional[float] = None) -> Dict[str, Any]:
+        """Gate one request. After cooldown only the probe owner is allowed through."""
+        now = _now(now_epoch)
+        who = str(owner or default_probe_owner())
+        with self._session() as conn:
+            rec = self._row_to_dict(key, self._select(conn, key))
+            state = rec["state"]
+            allowed, reason, claim = self._verdict(rec, who, now)
+            if claim:
+                # the only write: take the lock and re-check before claiming the probe
+                with self._tx() as tx:
+                    rec = self._row_to_dict(key, self._select(tx, key))
+                    state = rec["state"]
+                    allowed, reason, claim = self._verdict(rec, who, now)
+                    if claim:
+                        rec["state"] = "half_open"
+                        rec["probe_owner"] = who
+                        rec["probe_until_epoch"] = now + self.probe_ttl_sec
+                        rec["updated_ts"] = now
+                        self._upsert(tx, rec)
+        return {
+            "allowed": allowed,
+            "reason": reason,
+            "circuit_state": rec["state"] if allowed else state,
+            "fail_count": int(rec["fail_count"]),
+            "open_until_epoch": int(rec["open_until_epoch"]),
+            "probe_owner": rec["probe_owner"],
+        }
+
+    def release_probe(self, key: str, *, owner: Optional[str] = None, now_epoch: Optional[float] = None) -> bool:
+        """Give up `owner`'s half-open probe claim without an outcome (e.g. the attempt was
+        cancelled), so the next caller can probe instead of waiting for the claim TTL."""
+        now = _now(now_epoch)
+        who = str(owner or default_probe_owner())
+        with self._tx() as tx:
+            rec = self._row_to_dict(key, self._select(tx, key))
+            if rec["state"] != "half_open" or rec["probe_owner"] != who:
+                return False
+            rec["probe_owner"] = ""
+            rec["probe_until_epoch"] = 0.0
+            rec["updated_ts"] = now
+            self._upsert(tx, rec)
+        return True
+
+    def record_failure(
+        self,
+        key: str,
+        *,
+        error_type: str = "",
+        fail_threshold: int,
+        cooldown_sec: float,
+        now_epoch: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        now = _now(now_epoch)
+        with self._tx() as conn:
+            rec = self._row_to_dict(key, self._select(conn, key))
+            rec["fail_count"] = int(rec["fail_count"]) + 1
+            rec["last_error_type"] = str(error_type or "")
+            enabled = int(fail_threshold) > 0 and float(cooldown_sec) > 0
+            if enabled and (rec["state"] == "half_open" or rec["fail_count"] >= int(fail_threshold)):
+                # probe failure reopens immediately; threshold reached opens everywhere
+                rec["state"] = "open"
+                rec["open_until_epoch"] = max(float(rec["open_until_epoch"]), now + float(cooldown_sec))
+            elif rec["state"] != "half_open":
+                rec["state"] = "closed"
+            rec["probe_owner"] = ""
+            rec["probe_until_epoch"] = 0.0
+            rec["updated_ts"] = now
+            self._upsert(conn, rec)
+        return rec
+
+    def record_success(self, key: str, *, now_epoch: Optional[float] = None) -> Dict[str, Any]:
+        now = _now(now_epoch)
+        rec = self._row_to_dict(key, None)
+        rec["updated_ts"] = now
+        with self._session() as conn:
+            cur = self._select(conn, key)
+            if cur is not None and str(cur["state"]) == "closed" and int(cur["fail_count"]) == 0:
+                return self._row_to_dict(key, cur)
+            with self._tx() as tx:
+                self._upsert(tx, rec)
+        return rec
+
+
+_STORES: Dict[str, SQLiteCircuitBreakerStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def shared_circuit_store_from_env() -> Optional[SQLiteCircuitBreakerStore]:
+    """Return the process-wide shared store when CIRCUIT_STORE_DB_PATH is set, else None.
+
+    Env:
+      - CIRCUIT_STORE_DB_PATH (empty -> per-run/per-process breaker only, legacy behavior)
+      - CIRCUIT_STORE_PROBE_TTL_SEC (default: 30; half-open probe claim lifetime)
+    """
+    path = str((os.getenv("CIRCUIT_STORE_DB_PATH") or "").strip())
+    if not path:
+        return None
+    ttl = _coerce_float((os.getenv("CIRCUIT_STORE_PROBE_TTL_SEC") or "").strip() or DEFAULT_PROBE_TTL_SEC, DEFAULT_PROBE_TTL_SEC)
+    cache_key = f"{path}|{ttl}"
+    with _STORES_LOCK:
+        store = _STORES.get(cache_key)
+        if store is None:
+            try:
+                store = SQLiteCircuitBreakerStore(path, probe_ttl_sec=ttl)
+            except Exception:
+                return None
+            _STORES[cache_key] = store
+        return store
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+"""M32-7: Lightweight per-node span tracing.
+
+A `SpanTracer` records nested spans with monotonic timing (`perf_counter_ns`) and
+small attribute dicts. One run produces one compact event:
+
+    stage="runtime_trace", event="spans", payload={
+      "trace": "run_trading_graph",
+      "total_us": 1234,
+      "spans": [[name, parent_index, start_us, dur_us, {attrs}], ...]
+    }
+
+`parent_index` is -1 for roots; parents always precede their children (spans timed on
+worker threads are appended via `record()` when they finish). Tracing is off unless enabled (env `RUNTIME_TRACE_ENABLED` or
+`state["trace_enabled"]`); disabled runs use `NullTracer` with no timing overhead.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+TRACE_STAGE = "runtime_trace"
+TRACE_EVENT = "spans"
+STATE_KEY = "tracer"
+
+
+def _is_trueish(v: Any) -> bool:
+    if isinstance(v, bool):
+        return v
+    return str(v or "").strip().lower() in ("1", "true", "yes", "y", "on")
+
+
+class SpanTracer:
+    def __init__(self, name: str):
+        self.name = str(name or "trace")
+        self._t0 = time.perf_counter_ns()
+        self._spans: List[List[Any]] = []
+        self._stack: List[int] = []
+
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+        """Time a block; yields the span's attribute dict (mutable while open)."""
+        parent = self._stack[-1] if self._stack else -1
+        rec: List[Any] = [str(name), parent, 0, 0, dict(attrs)]
+        idx = len(self._spans)
+        self._spans.append(rec)
+        self._stack.append(idx)
+        start = time.perf_counter_ns()
+        rec[2] = (start - self._t0) // 1000
+        try:
+            yield rec[4]
+        except BaseException as e:
+            rec[4]["error_type"] = type(e).__name__
+            raise
+        finally:
+            rec[3] = (time.perf_counter_ns() - start) // 1000
+            self._stack.pop()
+
+    def set_attrs(self, **attrs: Any) -> None:
+        """Attach attributes to the innermost open span (no-op when none is open)."""
+        if self._stack:
+            self._spans[self._stack[-1]][4].update(attrs)
+
+    def record(self, name: str, start_ns: int, dur_ns: int, **attrs: Any) -> None:
+        """Add an already-finished span under the innermost open span.
+
+        For work timed on other threads (the span stack is not thread-safe).
+        """
+        parent = self._stack[-1] if self._stack else -1
+        self._spans.append([str(name), parent, max(0, (int(start_ns) - self._t0) // 1000), max(0, int(dur_ns) // 1000), dict(attrs)])
+
+    def to_payload(self) -> Dict[str, Any]:
+        spans = [[s[0], s[1], int(s[2]), int(s[3]), s[4]] if s[4] else [s[0], s[1], int(s[2]), int(s[3])] for s in self._spans]
+        return {
+            "trace": self.name,
+            "total_us": int((time.perf_counter_ns() - self._t0) // 1000),
+            "spans": spans,
+        }
+
+
+class NullTracer:
+    """Disabled tracer: same surface, no bookkeeping."""
+
+    name = ""
+
+    @property
+    def enabled(self) -> bool:
+        return False
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+        yield {}
+
+    def set_attrs(self, **attrs: Any) -> None:
+        return None
+
+    def record(self, name: str, start_ns: int, dur_ns: int, **attrs: Any) -> None:
+        return None
+
+    def to_payload(self) -> Dict[str, Any]:
+        return {}
+
+
+NULL_TRACER = NullTracer()
+
+
+def trace_enabled(state: Optional[Dict[str, Any]] = None) -> bool:
+    if isinstance(state, dict) and "trace_enabled" in state:
+        return _is_trueish(state.get("trace_enabled"))
+    return _is_trueish(os.getenv("RUNTIME_TRACE_ENABLED", ""))
+
+
+def current_tracer(state: Dict[str, Any]) -> Any:
+    """Enclosing tracer from state, or the no-op tracer."""
+    existing = state.get(STATE_KEY) if isinstance(state, dict) else None
+    if existing is not None and hasattr(existing, "span"):
+        return existing
+    return NULL_TRACER
+
+
+def begin_trace(state: Dict[str, Any], name: str) -> tuple[Any, bool]:
+    """Return `(tracer, owned)`.
+
+    Reuses an enclosing tracer from `state["tracer"]` (nested runtime -> graph) or starts
+    a new one when tracing is enabled; `owned=True` means the caller must `end_trace`.
+    """
+    existing = state.get(STATE_KEY)
+    if existing is not None and hasattr(existing, "span"):
+        return existing, False
+    if not trace_enabled(state):
+        return NULL_TRACER, False
+    tracer = SpanTracer(name)
+    state[STATE_KEY] = tracer
+    return tracer, True
+
+
+def _make_event_logger(state: Dict[str, Any]) -> Any:
+    injected = state.get("event_logger")
+    if injected is not None and hasattr(injected, "log"):
+        return injected
+    from libs.core.event_logger import EventLogger
+
+    return EventLogger(log_path=Path(os.getenv("EVENT_LOG_PATH", "./data/logs/events.jsonl")))
+
+
+def end_trace(state: Dict[str, Any], tracer: Any) -> Dict[str, Any]:
+    """Detach the tracer, keep the payload in `state["runtime_trace"]` and emit one event."""
+    if state.get(STATE_KEY) is tracer:
+        state.pop(STATE_KEY, None)
+    if not getattr(tracer, "enabled", False):
+        return {}
+    payload = tracer.to_payload()
+    state["runtime_trace"] = payload
+    try:
+        run_id = str(state.get("run_id") or "runtime-trace")
+        _make_event_logger(state).log(run_id=run_id, stage=TRACE_STAGE, event=TRACE_EVENT, payload=payload)
+    except Exception:
+        pass
+    return payload
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+"""M32-25: Background prefetch of next-tick reads (M13 live loop).
+
+`TickPrefetcher` keeps a staged buffer of reads for the next tick, fetched on a small
+thread pool while the current tick's decision / execution (and the loop sleep) run:
+
+  - `submit(key, fetch, group=, delay_sec=)`: start `fetch()` in the background after
+    `delay_sec` (replaces a staged entry for the same key)
+  - `take(key)`: the staged result if it is usable, else `(False, None)` and the caller
+    reads cold. A fetch still running is awaited (it started before a cold read would);
+    one still waiting for its delay is cancelled. Discards are deterministic: a result
+    older than `max_age_sec` (measured from the fetch start) is `stale`, a failed fetch
+    is an `error`, and nothing is ever served twice (`take` pops the entry)
+  - `invalidate(group, refetch=True)`: drop a group's staged entries (e.g. the account
+    after an order was placed) and refetch them
+
+`PrefetchingReader(inner, prefetcher, group=, methods=)` wraps a reader (price, portfolio,
+rank): each listed method call is answered from the buffer when possible and then re-staged
+for the next tick. Token freshness rides along: the Kiwoom readers run `ensure_token` inside
+the prefetched call, so an expiring token is refreshed on the worker thread, off the tick path.
+
+Env: M13_PREFETCH_ENABLED (false; `prefetcher_for`), M13_PREFETCH_MAX_AGE_SEC (5),
+M13_PREFETCH_DELAY_SEC (0), M13_PREFETCH_WORKERS (2).
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+
+STATE_KEY = "tick_prefetcher"
+
+
+def _is_trueish(v: Any) -> bool:
+    if isinstance(v, bool):
+        return v
+    return str(v or "").strip().lower() in ("1", "true", "yes", "y", "on")
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.getenv(name, "") or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+class _Staged:
+    __slots__ = ("fetch", "group", "delay_sec", "due_at", "future", "cancelled", "started_at")
+
+    def __init__(self, fetch: Callable[[], Any], group: str, delay_sec: float, due_at: float) -> None:
+        self.fetch = fetch
+        self.group = group
+        self.delay_sec = delay_sec
+        self.due_at = due_at
+        self.future: Optional[Future] = None
+        self.cancelled = threading.Event()
+        self.started_at: Optional[float] = None
+
+
+_CANCELLED = object()
+
+
+class TickPrefetcher:
+    """Staged buffer of next-tick reads (see module docstring)."""
+
+    def __init__(
+        self,
+        *,
+        max_age_sec: float = 5.0,
+        delay_sec: float = 0.0,
+        max_workers: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_age_sec = max(0.0, float(max_age_sec))
+        self.delay_sec = max(0.0, float(delay_sec))
+        self._clock = clock
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="tick-prefetch")
+        self._lock = threading.Lock()
+        self._staged: Dict[Hashable, _Staged] = {}
+        self.stats = {"submitted": 0, "hits": 0, "misses": 0, "stale": 0, "invalidated": 0, "errors": 0, "waited": 0, "cancelled": 0}
+
+    @classmethod
+    def from_env(cls, **overrides: Any) -> "TickPrefetcher":
+        kwargs: Dict[str, Any] = {
+            "max_age_sec": _env_float("M13_PREFETCH_MAX_AGE_SEC", 5.0),
+            "delay_sec": _env_float("M13_PREFETCH_DELAY_SEC", 0.0),
+            "max_workers": int(_env_float("M13_PREFETCH_WORKERS", 2)),
+        }
+        kwargs.update(overrides)
+        return cls(**kwargs)
+
+    def _run(self, entry: _Staged) -> Any:
+        if entry.delay_sec > 0 and entry.cancelled.wait(entry.delay_sec):
+            return _CANCELLED
+        if entry.cancelled.is_set():
+            return _CANCELLED
+        entry.started_at = self._clock()
+        return entry.fetch()
+
+    def submit(self, key: Hashable, fetch: Callable[[], Any], *, group: str = "default", delay_sec: Optional[float] = None) -> None:
+        delay = self.delay_sec if delay_sec is None else max(0.0, float(delay_sec))
+        entry = _Staged(fetch, str(group), delay, self._clock() + delay)
+        with self._lock:
+            old = self._staged.pop(key, None)
+            self._staged[key] = entry
+            self.stats["submitted"] += 1
+        if old is not None:
+            old.cancelled.set()
+        entry.future = self._pool.submit(self._run, entry)
+
+    def take(self, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._staged.pop(key, None)
+        if entry is None or entry.future is None:
+            return self._miss("misses")
+        if entry.started_at is None and not entry.future.done() and self._clock() < entry.due_at:
+            entry.cancelled.set()  # still inside its delay: a cold read now is fresher
+            return self._miss("cancelled")
+        if not entry.future.done():
+            with self._lock:
+                self.stats["waited"] += 1
+        try:
+            value = entry.future.result()
+        except Exception:
+            return self._miss("errors")
+        if value is _CANCELLED or entry.started_at is None:
+            return self._miss("cancelled")
+        if self._clock() - entry.started_at > self.max_age_sec:
+            return self._miss("stale")
+        with self._lock:
+            self.stats["hits"] += 1
+        return True, value
+
+    def _miss(self, reason: str) -> Tuple[bool, Any]:
+        with self._lock:
+            self.stats[reason] += 1
+            if reason != "misses":
+                self.stats["misses"] += 1
+        return False, None
+
+    def invalidate(self, group: str, *, refetch: bool = True) -> int:
+        """Discard the group's staged reads; optionally refetch them. Returns the number dropped."""
+        with self._lock:
+            keys = [k for k, e in self._staged.items() if e.group == group]
+            entries = [(k, self._staged.pop(k)) for k in keys]
+            self.stats["invalidated"] += len(entries)
+        for k, e in entries:
+            e.cancelled.set()
+            if refetch:
+                self.submit(k, e.fetch, group=group, delay_sec=e.delay_sec)
+        return len(entries)
+
+    def staged(self) -> Iterable[Hashable]:
+        with self._lock:
+            return list(self._staged)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "staged": len(self._staged), "max_age_sec": self.max_age_sec, "delay_sec": self.delay_sec}
+
+    def close(self) -> None:
+        with self._lock:
+            entries = list(self._staged.values())
+            self._staged.clear()
+        for e in entries:
+            e.cancelled.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class PrefetchingReader:
+    """Reader proxy: `methods` are answered from the prefetcher and re-staged after each call."""
+
+    def __init__(self, inner: Any, prefetcher: TickPrefetcher, *, group: str, methods: Iterable[str]):
+        self.inner = inner
+        self.prefetcher = prefetcher
+        self.group = group
+        self.methods = frozenset(methods)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.inner, name)
+        if name not in self.methods or not callable(attr):
+            return attr
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            key = (self.group, name, args, tuple(sorted(kwargs.items())))
+            hit, value = self.prefetcher.take(key)
+            if not hit:
+                value = attr(*args, **kwargs)
+            self.prefetcher.submit(key, lambda: attr(*args, **kwargs), group=self.group)
+            return value
+
+        return call
+
+
+# state key -> (prefetch group, reader methods served from the buffer)
+PREFETCH_READERS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "price_reader": ("market", ("get_market_snapshot",)),
+    "portfolio_reader": ("portfolio", ("get_portfolio_snapshot",)),
+    "rank_reader": ("rank", ("get_top_symbols",)),
+}
+
+
+def install_prefetch_readers(state: Dict[str, Any], prefetcher: TickPrefetcher) -> Dict[str, Any]:
+    """Wrap the state's readers once. Price / portfolio readers default to the Kiwoom readers
+    that `build_snapshots` would build per tick (so they are reused across ticks)."""
+    if state.get("price_reader") is None:
+        from libs.read.kiwoom_price_reader import KiwoomPriceReader
+
+        state["price_reader"] = KiwoomPriceReader.from_env()
+    if state.get("portfolio_reader") is None:
+        from libs.read.kiwoom_portfolio_reader import KiwoomPortfolioReader
+
+        state["portfolio_reader"] = KiwoomPortfolioReader.from_env()
+    for key, (group, methods) in PREFETCH_READERS.items():
+        reader = state.get(key)
+        if reader is None:
+            continue
+        if isinstance(reader, PrefetchingReader):
+            if reader.prefetcher is prefetcher:
+                continue
+            reader = reader.inner
+        state[key] = PrefetchingReader(reader, prefetcher, group=group, methods=methods)
+    return state
+
+
+def prefetch_enabled() -> bool:
+    return _is_trueish(os.getenv("M13_PREFETCH_ENABLED", ""))
+
+
+def prefetcher_for(state: Dict[str, Any]) -> Optional[TickPrefetcher]:
+    """`state["tick_prefetcher"]` if injected; else one from env when M13_PREFETCH_ENABLED is on."""
+    pf = state.get(STATE_KEY)
+    if pf is None and prefetch_enabled():
+        pf = state[STATE_KEY] = TickPrefetcher.from_env()
+    return pf
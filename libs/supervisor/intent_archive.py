@@ -0,0 +1,387 @@
+from __future__ import annotations
+
+"""M32-14: Compaction / cold archival of the intent journal.
+
+Terminal intents (executed / failed / rejected) whose last update is older than N days
+are moved out of the live stores:
+
+  - `intents.jsonl` rows            -> `<archive>/<day>/intents_<stamp>.jsonl.gz`
+  - `intent_state` + `intent_journal` -> `<archive>/<day>/intent_state_<stamp>.jsonl.gz`
+
+Segments are registered in `<archive>/<day>/manifest.json` (`archive_manifest.v1`,
+sha256 / bytes / line_count per file), so `scripts/check_log_archive_integrity.py`
+verifies them like any other archived log. An intent is archived only when every
+live source that knows it agrees it is terminal and old (SQLite state, JSONL latest
+row), so compaction never hides a reconcile mismatch.
+
+Order of operations: segments + manifest are written (and fsynced) first, then the
+SQLite rows are deleted in one transaction, then `intents.jsonl` is rewritten through
+a temp file + `os.replace` (rows appended meanwhile are carried over). A crash
+before the deletes leaves duplicates in the archive, never losses. Writers that
+append to the journal hold `intent_journal_lock` (shared, on a `<path>.lock`
+sidecar), and the final tail copy + replace holds it exclusively, so no row can land
+in the old file after its tail was copied.
+
+Archived data stays readable: `iter_archived_rows` / `load_archived_intent`, and the
+`--include-archived` flag of the query / reconcile scripts.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+try:  # POSIX advisory locks; elsewhere the lock is a no-op
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+from libs.supervisor.intent_journal_index import row_intent_id
+from libs.supervisor.intent_state_store import INTENT_TERMINAL_STATES
+
+ARCHIVE_SCHEMA = "archive_manifest.v1"
+KIND_INTENTS = "intents"
+KIND_STATE = "intent_state"
+
+_TERMINAL_MARKERS = set(INTENT_TERMINAL_STATES)
+
+
+def default_archive_dir() -> Path:
+    return Path(str(os.getenv("INTENT_ARCHIVE_DIR", "") or "").strip() or "data/logs/archive")
+
+
+def default_after_days() -> int:
+    try:
+        return max(0, int(os.getenv("INTENT_ARCHIVE_AFTER_DAYS", "30") or 30))
+    except ValueError:
+        return 30
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _as_int(v: Any) -> int:
+    try:
+        return int(float(v or 0))
+    except Exception:
+        return 0
+
+
+# ---- reading the live stores ------------------------------------------------
+
+
+def _read_jsonl(path: Path) -> Tuple[List[Tuple[bytes, Dict[str, Any]]], int]:
+    """(raw line, parsed row) pairs for complete lines + the byte length consumed."""
+    if not path.exists():
+        return [], 0
+    data = path.read_bytes()
+    end = data.rfind(b"\n") + 1  # a partial trailing line belongs to a writer mid-append
+    out: List[Tuple[bytes, Dict[str, Any]]] = []
+    for raw in data[:end].splitlines(keepends=True):
+        try:
+            row = json.loads(raw.decode("utf-8"))
+        except Exception:
+            row = None
+        out.append((raw, row if isinstance(row, dict) else {}))
+    return out, end
+
+
+def _jsonl_latest(rows: List[Tuple[bytes, Dict[str, Any]]]) -> Dict[str, Tuple[int, str]]:
+    """{intent_id: (latest ts, latest status)}; ts ties -> later line."""
+    latest: Dict[str, Tuple[int, str]] = {}
+    for _, row in rows:
+        iid = row_intent_id(row) if row else ""
+        if not iid:
+            continue
+        ts = _as_int(row.get("ts"))
+        prev = latest.get(iid)
+        if prev is None or ts >= prev[0]:
+            latest[iid] = (ts, str(row.get("status") or "").strip().lower())
+    return latest
+
+
+def _sqlite_rows(db_path: Path) -> Dict[str, Dict[str, Any]]:
+    if not db_path.exists():
+        return {}
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute("SELECT intent_id, state, updated_ts, version FROM intent_state").fetchall()
+        except sqlite3.Error:
+            return {}
+    return {str(r["intent_id"]): dict(r) for r in rows}
+
+
+def select_archivable(
+    jsonl_latest: Dict[str, Tuple[int, str]], sqlite_rows: Dict[str, Dict[str, Any]], *, cutoff_epoch: int
+) -> Set[str]:
+    """Ids that every live source agrees are terminal and last touched before `cutoff_epoch`."""
+    out: Set[str] = set()
+    for iid in set(jsonl_latest) | set(sqlite_rows):
+        st = sqlite_rows.get(iid)
+        if st is not None and (str(st.get("state")) not in INTENT_TERMINAL_STATES or _as_int(st.get("updated_ts")) >= cutoff_epoch):
+            continue
+        jl = jsonl_latest.get(iid)
+        if jl is not None and (jl[1] not in _TERMINAL_MARKERS or jl[0] >= cutoff_epoch):
+            continue
+        out.add(iid)
+    return out
+
+
+# ---- writing segments ------------------------------------------------------
+
+
+def _write_segment(path: Path, lines: List[bytes]) -> Dict[str, Any]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as raw:
+        # mtime=0: the same rows always produce the same bytes / sha256
+        with gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as gz:
+            for line in lines:
+                gz.write(line if line.endswith(b"\n") else line + b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp, path)
+    return {
+        "name": path.name,
+        "sha256": _sha256_file(path),
+        "bytes": int(path.stat().st_size),
+        "line_count": len(lines),
+        "compression": "gzip",
+    }
+
+
+def _update_manifest(day_dir: Path, day: str, entries: List[Dict[str, Any]]) -> Path:
+    path = day_dir / "manifest.json"
+    manifest: Dict[str, Any] = {}
+    if path.exists():
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            manifest = {}
+    if not isinstance(manifest, dict):
+        manifest = {}
+    files = [f for f in (manifest.get("files") or []) if isinstance(f, dict)]
+    names = {e["name"] for e in entries}
+    files = [f for f in files if f.get("name") not in names] + entries
+    manifest.update({"schema_version": manifest.get("schema_version") or ARCHIVE_SCHEMA, "day": day, "files": files})
+    tmp = path.with_name("manifest.json.tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+def _state_lines(db_path: Path, ids: List[str]) -> List[bytes]:
+    if not ids or not db_path.exists():
+        return []
+    arg = (json.dumps(ids),)
+    out: List[bytes] = []
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.row_factory = sqlite3.Row
+        for r in conn.execute(
+            "SELECT intent_id, state, updated_ts, version FROM intent_state "
+            "WHERE intent_id IN (SELECT value FROM json_each(?)) ORDER BY intent_id",
+            arg,
+        ):
+            out.append(json.dumps({"table": "intent_state", **dict(r)}, ensure_ascii=False).encode("utf-8"))
+        for r in conn.execute(
+            "SELECT id, intent_id, ts, from_state, to_state, reason, meta_json, execution_json FROM intent_journal "
+            "WHERE intent_id IN (SELECT value FROM json_each(?)) ORDER BY id",
+            arg,
+        ):
+            out.append(json.dumps({"table": "intent_journal", **dict(r)}, ensure_ascii=False).encode("utf-8"))
+    return out
+
+
+def _delete_sqlite(db_path: Path, ids: List[str]) -> int:
+    if not ids or not db_path.exists():
+        return 0
+    terminal = json.dumps(sorted(INTENT_TERMINAL_STATES))
+    conn = sqlite3.connect(str(db_path), timeout=10.0, isolation_level=None)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # re-check the state inside the transaction: only terminal rows are ever deleted
+            keep = (json.dumps(ids), terminal)
+            conn.execute(
+                "DELETE FROM intent_journal WHERE intent_id IN ("
+                " SELECT intent_id FROM intent_state WHERE intent_id IN (SELECT value FROM json_each(?))"
+                " AND state IN (SELECT value FROM json_each(?)))",
+                keep,
+            )
+            c = conn.execute(
+                "DELETE FROM intent_state WHERE intent_id IN (SELECT value FROM json_each(?)) "
+                "AND state IN (SELECT value FROM json_each(?))",
+                keep,
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return int(c.rowcount or 0)
+    finally:
+        conn.close()
+
+
+@contextmanager
+def intent_journal_lock(path: str | Path, *, exclusive: bool = False) -> Iterator[None]:
+    """Advisory lock on the journal's `<path>.lock` sidecar (the journal inode itself is
+    replaced by compaction). Appenders take it shared and open the journal inside it."""
+    if fcntl is None:
+        yield
+        return
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with open(p.with_name(p.name + ".lock"), "a+b") as lf:
+        fcntl.flock(lf.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
+
+
+def _rewrite_jsonl(path: Path, kept: List[bytes], consumed: int) -> None:
+    """Replace `path` with `kept` + anything appended after byte `consumed`."""
+    tmp = path.with_name(path.name + ".compact.tmp")
+    with open(tmp, "wb") as out:
+        out.writelines(kept)
+        with path.open("rb") as src:
+            src.seek(consumed)
+            while True:  # bulk of the tail without blocking appenders
+                chunk = src.read(1024 * 1024)
+                if not chunk:
+                    break
+                out.write(chunk)
+            with intent_journal_lock(path, exclusive=True):
+                out.write(src.read())  # rows appended since; none can follow until replaced
+                out.flush()
+                os.fsync(out.fileno())
+                os.replace(tmp, path)
+
+
+# ---- public API --------------------------------------------------------------
+
+
+def compact_intent_journal(
+    *,
+    intent_log_path: str | Path = "data/logs/intents.jsonl",
+    state_db_path: Optional[str | Path] = None,
+    archive_dir: Optional[str | Path] = None,
+    older_than_days: Optional[int] = None,
+    now_epoch: Optional[int] = None,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """Move terminal intents older than `older_than_days` to compressed archive segments."""
+    log_path = Path(intent_log_path)
+    db_path = Path(state_db_path) if state_db_path else log_path.with_suffix(".db")
+    root = Path(archive_dir) if archive_dir else default_archive_dir()
+    days = default_after_days() if older_than_days is None else max(0, int(older_than_days))
+    now = int(now_epoch if now_epoch is not None else time.time())
+    cutoff = now - days * 86400
+
+    rows, consumed = _read_jsonl(log_path)
+    sqlite_rows = _sqlite_rows(db_path)
+    ids = sorted(select_archivable(_jsonl_latest(rows), sqlite_rows, cutoff_epoch=cutoff))
+    id_set = set(ids)
+    archived_lines = [raw for raw, row in rows if row and row_intent_id(row) in id_set]
+    kept_lines = [raw for raw, row in rows if not (row and row_intent_id(row) in id_set)]
+
+    out: Dict[str, Any] = {
+        "ok": True,
+        "dry_run": bool(dry_run),
+        "intent_log_path": str(log_path),
+        "state_db_path": str(db_path),
+        "archive_dir": str(root),
+        "older_than_days": days,
+        "cutoff_epoch": cutoff,
+        "archived_intent_total": len(ids),
+        "archived_jsonl_rows": len(archived_lines),
+        "kept_jsonl_rows": len(kept_lines),
+        "archived_state_rows": sum(1 for iid in ids if iid in sqlite_rows),
+        "segments": [],
+    }
+    if dry_run or not ids:
+        return out
+
+    day = datetime.fromtimestamp(now, tz=timezone.utc).strftime("%Y-%m-%d")
+    stamp = datetime.fromtimestamp(now, tz=timezone.utc).strftime("%H%M%S") + f"_{os.getpid()}"
+    day_dir = root / day
+    entries: List[Dict[str, Any]] = []
+    for kind, lines in ((KIND_INTENTS, archived_lines), (KIND_STATE, _state_lines(db_path, ids))):
+        if not lines:
+            continue
+        entry = _write_segment(day_dir / f"{kind}_{stamp}.jsonl.gz", lines)
+        entries.append({**entry, "kind": kind, "intent_total": len(ids), "cutoff_epoch": cutoff})
+    out["manifest_path"] = str(_update_manifest(day_dir, day, entries))
+    out["segments"] = entries
+
+    out["deleted_state_rows"] = _delete_sqlite(db_path, ids)
+    if archived_lines:
+        _rewrite_jsonl(log_path, kept_lines, consumed)
+    return out
+
+
+def _segments(root: Path, kind: str) -> Iterator[Path]:
+    if not root.exists():
+        return
+    for day_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+        try:
+            manifest = json.loads((day_dir / "manifest.json").read_text(encoding="utf-8"))
+        except Exception:
+            continue
+        files = manifest.get("files") if isinstance(manifest, dict) else None
+        for f in files if isinstance(files, list) else []:
+            if isinstance(f, dict) and f.get("kind") == kind and (day_dir / str(f.get("name"))).exists():
+                yield day_dir / str(f["name"])
+
+
+def iter_archived_rows(archive_dir: Optional[str | Path] = None, *, kind: str = KIND_INTENTS) -> Iterator[Dict[str, Any]]:
+    """Rows of every archived segment of `kind` (oldest day first, manifest order)."""
+    for path in _segments(Path(archive_dir) if archive_dir else default_archive_dir(), kind):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except Exception:
+                    continue
+                if isinstance(row, dict):
+                    yield row
+
+
+def load_archived_state(archive_dir: Optional[str | Path] = None) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+    """(intent_state rows by id, intent_journal rows) from archived segments."""
+    states: Dict[str, Dict[str, Any]] = {}
+    journal: List[Dict[str, Any]] = []
+    for row in iter_archived_rows(archive_dir, kind=KIND_STATE):
+        table = row.pop("table", "")
+        if table == "intent_state":
+            states[str(row.get("intent_id"))] = row
+        elif table == "intent_journal":
+            journal.append(row)
+    return states, journal
+
+
+def load_archived_intent(intent_id: str, archive_dir: Optional[str | Path] = None) -> Optional[Dict[str, Any]]:
+    """Archived JSONL rows, final state and state journal for one intent (None if not archived)."""
+    iid = str(intent_id or "")
+    rows = [r for r in iter_archived_rows(archive_dir, kind=KIND_INTENTS) if row_intent_id(r) == iid]
+    states, journal = load_archived_state(archive_dir)
+    if not rows and iid not in states:
+        return None
+    return {
+        "intent_id": iid,
+        "rows": rows,
+        "state": states.get(iid),
+        "journal": [j for j in journal if str(j.get("intent_id")) == iid],
+    }
@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+"""M32-12: Offset index over the intent journal JSONL.
+
+`intents.jsonl` stays the source of truth (and the export format). A SQLite sidecar
+(`<journal>.idx.db`) maps every complete line to its byte offset plus the fields the
+approval path looks up:
+
+  - journal(line_no, offset, length, rid, own_id, ts, status): B-trees on (rid, line_no)
+    and (own_id, line_no); `own_id` is the top-level intent_id only (`IntentStore.load`)
+  - intent_latest(rid, first_line, latest_line, latest_ts): latest row per intent
+    (ts ties -> later line, same rule as the old linear scans)
+  - meta: indexed_bytes, head signature, latest "intent row" (O(1) `last_intent`)
+
+The index catches up incrementally: only bytes appended since the last refresh are
+parsed, and a refresh is skipped entirely while the file size is unchanged. A
+truncated/rotated journal (shorter file, different first line or a new inode) is
+re-indexed from scratch. Partial trailing lines (a writer mid-append) are left for the next refresh.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_HEAD_BYTES = 256
+
+
+def _unwrap_intent(row: Any) -> Optional[Dict[str, Any]]:
+    if not isinstance(row, dict):
+        return None
+    if "intent" in row and isinstance(row.get("intent"), dict):
+        return row["intent"]
+    return row
+
+
+def row_intent_id(row: Dict[str, Any]) -> str:
+    """Journal row key: top-level intent_id, else the wrapped intent's id."""
+    rid = row.get("intent_id") or (_unwrap_intent(row) or {}).get("intent_id")
+    return str(rid or "")
+
+
+def _as_int(v: Any) -> int:
+    try:
+        return int(v or 0)
+    except Exception:
+        return 0
+
+
+class IntentJournalIndex:
+    def __init__(self, journal_path: str | Path, index_path: Optional[str | Path] = None):
+        self.journal_path = Path(journal_path)
+        self.index_path = Path(index_path) if index_path else self.journal_path.with_name(self.journal_path.name + ".idx.db")
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid = 0
+        self._seen: Tuple[int, int] = (-1, -1)  # (inode, size) at the last complete refresh
+
+    # ---- sqlite ---------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.index_path), timeout=10.0, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS journal (
+                line_no INTEGER PRIMARY KEY,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                rid TEXT NOT NULL,
+                own_id TEXT NOT NULL,
+                ts INTEGER NOT NULL,
+                status TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_journal_rid_line ON journal(rid, line_no)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_journal_own_line ON journal(own_id, line_no)")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS intent_latest (
+                rid TEXT PRIMARY KEY,
+                first_line INTEGER NOT NULL,
+                latest_line INTEGER NOT NULL,
+                latest_ts INTEGER NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_intent_latest_ts ON intent_latest(latest_ts, first_line)")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT NOT NULL)")
+        return conn
+
+    @contextmanager
+    def _session(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            if self._conn is None or self._conn_pid != os.getpid():
+                self._conn = self._connect()
+                self._conn_pid = os.getpid()
+            yield self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _meta_get(conn: sqlite3.Connection, key: str, default: str = "") -> str:
+        row = conn.execute("SELECT v FROM meta WHERE k = ?", (key,)).fetchone()
+        return str(row["v"]) if row is not None else default
+
+    @staticmethod
+    def _meta_set(conn: sqlite3.Connection, key: str, value: Any) -> None:
+        conn.execute("INSERT INTO meta(k, v) VALUES(?, ?) ON CONFLICT(k) DO UPDATE SET v = excluded.v", (key, str(value)))
+
+    # ---- indexing -------------------------------------------------------
+
+    def _head_signature(self) -> str:
+        try:
+            with self.journal_path.open("rb") as f:
+                head = f.read(_HEAD_BYTES)
+        except OSError:
+            return ""
+        return hashlib.sha1(head.split(b"\n", 1)[0]).hexdigest() if head else ""
+
+    def refresh(self) -> int:
+        """Index rows appended since the last refresh. Returns the number of new rows."""
+        try:
+            st = self.journal_path.stat()
+            ino, size = int(st.st_ino), int(st.st_size)
+        except OSError:
+            ino, size = 0, 0
+        if (ino, size) == self._seen:
+            return 0
+        with self._session() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                added = self._catch_up(conn, ino, size)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        return added
+
+    def _reset(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM journal")
+        conn.execute("DELETE FROM intent_latest")
+        conn.execute("DELETE FROM meta")
+
+    def _catch_up(self, conn: sqlite3.Connection, ino: int, size: int) -> int:
+        indexed = _as_int(self._meta_get(conn, "indexed_bytes", "0"))
+        sig = self._head_signature()
+        replaced = str(ino) != self._meta_get(conn, "journal_ino", str(ino))  # rewritten via os.replace (M32-14)
+        if size < indexed or replaced or (indexed > 0 and sig != self._meta_get(conn, "head_sig")):
+            self._reset(conn)
+            indexed = 0
+        self._meta_set(conn, "journal_ino", ino)
+        if size == indexed:
+            self._seen = (ino, size)
+            return 0
+
+        with self.journal_path.open("rb") as f:
+            f.seek(indexed)
+            chunk = f.read(size - indexed)
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return 0  # only a partial line so far
+        chunk = chunk[: end + 1]
+
+        row = conn.execute("SELECT MAX(line_no) AS n FROM journal").fetchone()
+        line_no = _as_int(row["n"] if row is not None else 0)
+        last_ts = _as_int(self._meta_get(conn, "last_intent_ts", "-1") or -1)
+        last_line = _as_int(self._meta_get(conn, "last_intent_line", "0"))
+
+        journal_rows: List[Tuple[int, int, int, str, str, int, str]] = []
+        pos = 0
+        while pos < len(chunk):
+            nl = chunk.index(b"\n", pos)
+            raw = chunk[pos:nl]
+            offset = indexed + pos
+            pos = nl + 1
+            text = raw.strip()
+            if not text:
+                continue
+            try:
+                rec = json.loads(text.decode("utf-8"))
+            except Exception:
+                continue
+            if not isinstance(rec, dict):
+                continue
+            line_no += 1
+            ts = _as_int(rec.get("ts"))
+            journal_rows.append(
+                (line_no, offset, len(raw), row_intent_id(rec), str(rec.get("intent_id") or ""), ts, str(rec.get("status") or ""))
+            )
+            if (_unwrap_intent(rec) or {}).get("intent_id") and ts >= last_ts:
+                last_ts, last_line = ts, line_no
+
+        conn.executemany(
+            "INSERT INTO journal(line_no, offset, length, rid, own_id, ts, status) VALUES(?, ?, ?, ?, ?, ?, ?)", journal_rows
+        )
+        conn.executemany(
+            """
+            INSERT INTO intent_latest(rid, first_line, latest_line, latest_ts) VALUES(?, ?, ?, ?)
+            ON CONFLICT(rid) DO UPDATE SET latest_line = excluded.latest_line, latest_ts = excluded.latest_ts
+            WHERE excluded.latest_ts >= intent_latest.latest_ts
+            """,
+            [(r[3], r[0], r[0], r[5]) for r in journal_rows if r[3]],
+        )
+        new_indexed = indexed + len(chunk)
+        self._meta_set(conn, "indexed_bytes", new_indexed)
+        self._meta_set(conn, "head_sig", sig)
+        if last_line:
+            self._meta_set(conn, "last_intent_ts", last_ts)
+            self._meta_set(conn, "last_intent_line", last_line)
+        self._seen = (ino, size) if new_indexed == size else (-1, -1)
+        return len(journal_rows)
+
+    # ---- reads ----------------------------------------------------------
+
+    def _read_at(self, locs: List[Tuple[int, int]]) -> List[Optional[Dict[str, Any]]]:
+        out: List[Optional[Dict[str, Any]]] = []
+        if not locs:
+            return out
+        with self.journal_path.open("rb") as f:
+            for offset, length in locs:
+                f.seek(offset)
+                try:
+                    rec = json.loads(f.read(length).decode("utf-8"))
+                except Exception:
+                    rec = None
+                out.append(rec if isinstance(rec, dict) else None)
+        return out
+
+    def _read_rows(self, locs: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        return [r for r in self._read_at(locs) if r is not None]
+
+    def _rows_by_lines(self, conn: sqlite3.Connection, sql: str, args: Tuple[Any, ...]) -> List[Dict[str, Any]]:
+        locs = [(int(r["offset"]), int(r["length"])) for r in conn.execute(sql, args).fetchall()]
+        return self._read_rows(locs)
+
+    def last_row_for(self, intent_id: str) -> Optional[Dict[str, Any]]:
+        """Last journal row (file order) whose top-level intent_id is `intent_id`."""
+        self.refresh()
+        with self._session() as conn:
+            rows = self._rows_by_lines(
+                conn, "SELECT offset, length FROM journal WHERE own_id = ? ORDER BY line_no DESC LIMIT 1", (str(intent_id),)
+            )
+        return rows[0] if rows else None
+
+    def latest_row(self, intent_id: str) -> Optional[Dict[str, Any]]:
+        """Latest row by ts (ties -> later line) for `intent_id`."""
+        self.refresh()
+        with self._session() as conn:
+            rows = self._rows_by_lines(
+                conn,
+                """
+                SELECT j.offset, j.length FROM intent_latest l JOIN journal j ON j.line_no = l.latest_line
+                WHERE l.rid = ?
+                """,
+                (str(intent_id),),
+            )
+        return rows[0] if rows else None
+
+    def _rows_keyed(self, conn: sqlite3.Connection, sql: str, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        # one query per batch (ids bound as a JSON array); rows are read in file order
+        found = sorted((int(r["offset"]), int(r["length"]), str(r["k"])) for r in conn.execute(sql, (json.dumps(ids),)))
+        rows = self._read_at([(o, n) for o, n, _ in found])
+        return {k: row for (_, _, k), row in zip(found, rows) if row is not None}
+
+    def last_rows_for(self, intent_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Batch `last_row_for`: {intent_id: last row with that top-level intent_id}."""
+        self.refresh()
+        ids = sorted({str(i) for i in intent_ids if i})
+        if not ids:
+            return {}
+        with self._session() as conn:
+            return self._rows_keyed(
+                conn,
+                """
+                SELECT j.own_id AS k, j.offset, j.length FROM journal j
+                JOIN (
+                    SELECT own_id, MAX(line_no) AS line_no FROM journal
+                    WHERE own_id IN (SELECT value FROM json_each(?)) GROUP BY own_id
+                ) m ON m.line_no = j.line_no
+                """,
+                ids,
+            )
+
+    def latest_rows_for(self, intent_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Batch `latest_row`: {intent_id: latest row by ts}."""
+        self.refresh()
+        ids = sorted({str(i) for i in intent_ids if i})
+        if not ids:
+            return {}
+        with self._session() as conn:
+            return self._rows_keyed(
+                conn,
+                """
+                SELECT l.rid AS k, j.offset, j.length FROM intent_latest l JOIN journal j ON j.line_no = l.latest_line
+                WHERE l.rid IN (SELECT value FROM json_each(?))
+                """,
+                ids,
+            )
+
+    def rows_for(self, intent_id: str, *, limit: int = 1000) -> List[Dict[str, Any]]:
+        """All rows for `intent_id` in file order (history)."""
+        self.refresh()
+        with self._session() as conn:
+            return self._rows_by_lines(
+                conn,
+                "SELECT offset, length FROM journal WHERE rid = ? ORDER BY line_no ASC LIMIT ?",
+                (str(intent_id), max(1, int(limit))),
+            )
+
+    def last_intent_row(self) -> Optional[Dict[str, Any]]:
+        """Latest row (by ts) that carries an intent with an intent_id."""
+        self.refresh()
+        with self._session() as conn:
+            line = _as_int(self._meta_get(conn, "last_intent_line", "0"))
+            if not line:
+                return None
+            rows = self._rows_by_lines(conn, "SELECT offset, length FROM journal WHERE line_no = ?", (line,))
+        return rows[0] if rows else None
+
+    def latest_rows(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Latest row per intent, newest first (ts desc; ties by first appearance)."""
+        self.refresh()
+        with self._session() as conn:
+            return self._rows_by_lines(
+                conn,
+                """
+                SELECT j.offset, j.length FROM intent_latest l JOIN journal j ON j.line_no = l.latest_line
+                ORDER BY l.latest_ts DESC, l.first_line ASC
+                LIMIT ?
+                """,
+                (max(1, int(limit)),),
+            )
+
+    def tail(self, n: int = 1) -> List[Dict[str, Any]]:
+        """Last `n` rows in file order."""
+        self.refresh()
+        with self._session() as conn:
+            rows = self._rows_by_lines(
+                conn, "SELECT offset, length FROM journal ORDER BY line_no DESC LIMIT ?", (max(1, int(n)),)
+            )
+        rows.reverse()
+        return rows
+
+    def read_since(self, cursor: int = 0, *, limit: int = 1000) -> Tuple[List[Dict[str, Any]], int]:
+        """Tail reader: rows after line `cursor` (0 = start). Returns `(rows, next_cursor)`."""
+        self.refresh()
+        with self._session() as conn:
+            found = conn.execute(
+                "SELECT line_no, offset, length FROM journal WHERE line_no > ? ORDER BY line_no ASC LIMIT ?",
+                (int(cursor), max(1, int(limit))),
+            ).fetchall()
+        if not found:
+            return [], int(cursor)
+        return self._read_rows([(int(r["offset"]), int(r["length"])) for r in found]), int(found[-1]["line_no"])
+
+    def stats(self) -> Dict[str, Any]:
+        self.refresh()
+        with self._session() as conn:
+            rows = conn.execute("SELECT COUNT(*) AS n FROM journal").fetchone()
+            ids = conn.execute("SELECT COUNT(*) AS n FROM intent_latest").fetchone()
+            return {
+                "rows": int(rows["n"]),
+                "intents": int(ids["n"]),
+                "indexed_bytes": _as_int(self._meta_get(conn, "indexed_bytes", "0")),
+                "index_path": str(self.index_path),
+            }
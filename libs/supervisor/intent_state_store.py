@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import json
+import os
 import sqlite3
+import threading
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 
 INTENT_STATE_PENDING = "pending_approval"
@@ -40,6 +43,34 @@ _ALLOWED_TRANSITIONS = {
 }
 
 
+_SQL_SELECT_STATE = "SELECT intent_id, state, updated_ts, version FROM intent_state WHERE intent_id = ?"
+_SQL_SELECT_STATES = (
+    "SELECT intent_id, state, updated_ts, version FROM intent_state WHERE intent_id IN (SELECT value FROM json_each(?))"
+)
+_SQL_INSERT_STATE = "INSERT INTO intent_state(intent_id, state, updated_ts, version) VALUES(?, ?, ?, ?)"
+_SQL_INSERT_JOURNAL = """
+    INSERT INTO intent_journal(intent_id, ts, from_state, to_state, reason, meta_json, execution_json)
+    VALUES(?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_UPDATE_CAS_STATE = """
+    UPDATE intent_state
+    SET state = ?, updated_ts = ?, version = ?
+    WHERE intent_id = ? AND state = ?
+"""
+_SQL_UPDATE_CAS_VERSION = """
+    UPDATE intent_state
+    SET state = ?, updated_ts = ?, version = ?
+    WHERE intent_id = ? AND version = ?
+"""
+_SQL_UPDATE_TOUCH = "UPDATE intent_state SET updated_ts = ? WHERE intent_id = ?"
+
+
+def _is_trueish(v: Any) -> bool:
+    if isinstance(v, bool):
+        return v
+    return str(v or "").strip().lower() in ("1", "true", "yes", "y", "on")
+
+
 def _now_epoch() -> int:
     return int(time.time())
 
@@ -102,20 +133,76 @@ class IntentStateMachine:
 
 
 class SQLiteIntentStateStore:
-    """SQLite-first intent state/journal store (M24-1 scaffold)."""
+    """SQLite-first intent state/journal store (M24-1 scaffold).
 
-    def __init__(self, path: str = "data/state/intent_state.db"):
+    M32-11: `persistent=True` (or env `INTENT_STATE_PERSISTENT_CONN=true`) keeps one
+    connection per process in WAL mode with `synchronous=NORMAL`; the SQL text is
+    constant so sqlite3's per-connection statement cache keeps them prepared. Every
+    `transition` runs in one `BEGIN IMMEDIATE` transaction, and `transition_many`
+    applies a batch in one transaction with per-item optimistic checks.
+    """
+
+    def __init__(self, path: str = "data/state/intent_state.db", *, persistent: Optional[bool] = None):
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        if persistent is None:
+            persistent = _is_trueish(os.getenv("INTENT_STATE_PERSISTENT_CONN", ""))
+        self.persistent = bool(persistent)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid = 0
         self._init_db()
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(str(self.path))
+        conn = sqlite3.connect(
+            str(self.path),
+            timeout=10.0,
+            isolation_level=None,
+            check_same_thread=not self.persistent,
+            cached_statements=256,
+        )
         conn.row_factory = sqlite3.Row
+        if self.persistent:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
         return conn
 
+    @contextmanager
+    def _session(self) -> Iterator[sqlite3.Connection]:
+        """Shared connection (persistent mode, serialized by a lock) or a fresh one."""
+        if not self.persistent:
+            conn = self._connect()
+            try:
+                yield conn
+            finally:
+                conn.close()
+            return
+        with self._lock:
+            if self._conn is None or self._conn_pid != os.getpid():
+                # never reuse a connection inherited across fork
+                self._conn = self._connect()
+                self._conn_pid = os.getpid()
+            yield self._conn
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        with self._session() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
     def _init_db(self) -> None:
-        with self._connect() as conn:
+        with self._tx() as conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS intent_state (
@@ -146,7 +233,30 @@ class SQLiteIntentStateStore:
                 ON intent_journal(intent_id, ts)
                 """
             )
-            conn.commit()
+            # M32-14: compaction selects terminal rows by age
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_intent_state_updated ON intent_state(updated_ts)")
+
+    @staticmethod
+    def _row_to_state(row: Any) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        return {
+            "intent_id": str(row["intent_id"]),
+            "state": str(row["state"]),
+            "updated_ts": int(row["updated_ts"]),
+            "version": int(row["version"]),
+        }
+
+    def _select_state(self, conn: sqlite3.Connection, iid: str) -> Optional[Dict[str, Any]]:
+        return self._row_to_state(conn.execute(_SQL_SELECT_STATE, (iid,)).fetchone())
+
+    def _ensure_in(self, conn: sqlite3.Connection, iid: str, ts: int) -> Dict[str, Any]:
+        cur = self._select_state(conn, iid)
+        if cur is not None:
+            return cur
+        conn.execute(_SQL_INSERT_STATE, (iid, INTENT_STATE_PENDING, ts, 1))
+        conn.execute(_SQL_INSERT_JOURNAL, (iid, ts, "", INTENT_STATE_PENDING, "init", "{}", None))
+        return {"intent_id": iid, "state": INTENT_STATE_PENDING, "updated_ts": ts, "version": 1}
 
     def ensure_intent(self, intent_id: str, *, initial_state: str = INTENT_STATE_PENDING) -> Dict[str, Any]:
         iid = str(intent_id or "").strip()
@@ -156,131 +266,196 @@ class SQLiteIntentStateStore:
         if init != INTENT_STATE_PENDING:
             raise ValueError("initial_state must be pending_approval")
 
-        row = self.get_state(iid)
-        if row is not None:
-            return row
-
-        ts = _now_epoch()
-        with self._connect() as conn:
-            conn.execute(
-                "INSERT INTO intent_state(intent_id, state, updated_ts, version) VALUES(?, ?, ?, ?)",
-                (iid, init, ts, 1),
-            )
-            conn.execute(
-                """
-                INSERT INTO intent_journal(intent_id, ts, from_state, to_state, reason, meta_json, execution_json)
-                VALUES(?, ?, ?, ?, ?, ?, ?)
-                """,
-                (iid, ts, "", init, "init", "{}", None),
-            )
-            conn.commit()
-        return self.get_state(iid) or {"intent_id": iid, "state": init, "updated_ts": ts, "version": 1}
+        with self._tx() as conn:
+            return self._ensure_in(conn, iid, _now_epoch())
 
     def get_state(self, intent_id: str) -> Optional[Dict[str, Any]]:
         iid = str(intent_id or "").strip()
         if not iid:
             return None
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT intent_id, state, updated_ts, version FROM intent_state WHERE intent_id = ?",
-                (iid,),
-            ).fetchone()
-            if row is None:
-                return None
-            return {
-                "intent_id": str(row["intent_id"]),
-                "state": str(row["state"]),
-                "updated_ts": int(row["updated_ts"]),
-                "version": int(row["version"]),
-            }
-
-    def transition(
+        with self._session() as conn:
+            return self._select_state(conn, iid)
+
+    def ensure_many(self, intent_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Batch `ensure_intent` in one transaction. Returns {intent_id: state row}."""
+        ids = [iid for iid in dict.fromkeys(str(i or "").strip() for i in intent_ids) if iid]
+        if not ids:
+            return {}
+        ts = _now_epoch()
+        with self._tx() as conn:
+            return {iid: self._ensure_in(conn, iid, ts) for iid in ids}
+
+    def get_states(self, intent_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Batch `get_state` (one query). Unknown intents are absent from the result."""
+        ids = sorted({str(i or "").strip() for i in intent_ids} - {""})
+        if not ids:
+            return {}
+        with self._session() as conn:
+            rows = conn.execute(_SQL_SELECT_STATES, (json.dumps(ids),)).fetchall()
+        return {str(r["intent_id"]): self._row_to_state(r) for r in rows}
+
+    def _transition_in(
         self,
+        conn: sqlite3.Connection,
+        cur: Dict[str, Any],
         *,
-        intent_id: str,
+        iid: str,
         to_state: str,
-        expected_from_state: Optional[str] = None,
-        reason: str = "",
-        meta: Optional[Dict[str, Any]] = None,
-        execution: Optional[Dict[str, Any]] = None,
+        expected_from_state: Optional[str],
+        expected_version: Optional[int],
+        reason: str,
+        meta: Optional[Dict[str, Any]],
+        execution: Optional[Dict[str, Any]],
+        ts: int,
     ) -> Dict[str, Any]:
-        iid = str(intent_id or "").strip()
-        if not iid:
-            raise ValueError("intent_id is required")
-
-        cur = self.get_state(iid)
-        if cur is None:
-            cur = self.ensure_intent(iid)
-
-        from_state = str(cur.get("state") or "")
+        """Validate + apply one transition to `cur` on an open transaction. Raises ValueError."""
         expected = _as_state(expected_from_state) if expected_from_state is not None else ""
         if expected_from_state is not None and not expected:
             raise ValueError(f"Invalid expected_from_state: {expected_from_state}")
+
+        from_state = str(cur.get("state") or "")
         if expected and from_state != expected:
             raise ValueError(f"State mismatch: expected={expected}, current={from_state}")
+        cur_version = int(cur.get("version") or 1)
+        if expected_version is not None and cur_version != int(expected_version):
+            raise ValueError(f"Version mismatch: expected={int(expected_version)}, current={cur_version}")
 
         tr = IntentStateMachine.apply(from_state, to_state, allow_terminal_idempotent=True)
         if not tr.ok:
             raise ValueError(f"Invalid intent state transition: {from_state} -> {to_state} ({tr.reason})")
 
-        ts = _now_epoch()
         meta_json = json.dumps(meta or {}, ensure_ascii=False)
         execution_json = json.dumps(execution, ensure_ascii=False) if isinstance(execution, dict) else None
 
-        with self._connect() as conn:
-            if tr.changed:
-                next_version = int(cur.get("version") or 1) + 1
-                if expected:
-                    c = conn.execute(
-                        """
-                        UPDATE intent_state
-                        SET state = ?, updated_ts = ?, version = ?
-                        WHERE intent_id = ? AND state = ?
-                        """,
-                        (tr.to_state, ts, next_version, iid, expected),
-                    )
-                    if int(c.rowcount or 0) != 1:
-                        conn.rollback()
-                        latest = self.get_state(iid) or {}
-                        raise ValueError(
-                            f"State mismatch during CAS update: expected={expected}, current={latest.get('state')}"
-                        )
-                else:
-                    conn.execute(
-                        "UPDATE intent_state SET state = ?, updated_ts = ?, version = ? WHERE intent_id = ?",
-                        (tr.to_state, ts, next_version, iid),
-                    )
-            else:
-                next_version = int(cur.get("version") or 1)
-                conn.execute(
-                    "UPDATE intent_state SET updated_ts = ? WHERE intent_id = ?",
-                    (ts, iid),
+        if tr.changed:
+            next_version = cur_version + 1
+            c = conn.execute(_SQL_UPDATE_CAS_VERSION, (tr.to_state, ts, next_version, iid, cur_version))
+            if int(c.rowcount or 0) != 1:
+                latest = self._select_state(conn, iid) or {}
+                raise ValueError(
+                    f"State mismatch during CAS update: expected={expected or from_state}, current={latest.get('state')}"
                 )
-
-            conn.execute(
-                """
-                INSERT INTO intent_journal(intent_id, ts, from_state, to_state, reason, meta_json, execution_json)
-                VALUES(?, ?, ?, ?, ?, ?, ?)
-                """,
-                (iid, ts, tr.from_state, tr.to_state, reason or tr.reason, meta_json, execution_json),
-            )
-            conn.commit()
-
-        out = self.get_state(iid) or {}
-        out["transition"] = {
-            "from_state": tr.from_state,
-            "to_state": tr.to_state,
-            "changed": tr.changed,
-            "reason": tr.reason,
+        else:
+            next_version = cur_version
+            conn.execute(_SQL_UPDATE_TOUCH, (ts, iid))
+
+        conn.execute(_SQL_INSERT_JOURNAL, (iid, ts, tr.from_state, tr.to_state, reason or tr.reason, meta_json, execution_json))
+        return {
+            "intent_id": iid,
+            "state": tr.to_state,
+            "updated_ts": ts,
+            "version": next_version,
+            "transition": {
+                "from_state": tr.from_state,
+                "to_state": tr.to_state,
+                "changed": tr.changed,
+                "reason": tr.reason,
+            },
         }
+
+    def transition(
+        self,
+        *,
+        intent_id: str,
+        to_state: str,
+        expected_from_state: Optional[str] = None,
+        reason: str = "",
+        meta: Optional[Dict[str, Any]] = None,
+        execution: Optional[Dict[str, Any]] = None,
+        expected_version: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        iid = str(intent_id or "").strip()
+        if not iid:
+            raise ValueError("intent_id is required")
+
+        # same single-item path as transition_many: an unknown intent is still created
+        # (pending) even when the transition itself is rejected
+        out = self.transition_many(
+            [
+                {
+                    "intent_id": iid,
+                    "to_state": to_state,
+                    "expected_from_state": expected_from_state,
+                    "expected_version": expected_version,
+                    "reason": reason,
+                    "meta": meta,
+                    "execution": execution,
+                }
+            ]
+        )[0]
+        if not out["ok"]:
+            raise ValueError(out["error"])
+        out.pop("ok", None)
+        out.pop("index", None)
         return out
 
+    def transition_many(self, items: Sequence[Dict[str, Any]], *, atomic: bool = False) -> List[Dict[str, Any]]:
+        """Apply a batch of transitions in one transaction.
+
+        Item keys: `intent_id`, `to_state`, optional `expected_from_state`,
+        `expected_version`, `reason`, `meta`, `execution`. Each item is checked against
+        the current row (optimistic state/version check) inside its own savepoint; a
+        failed item is rolled back alone and reported as `{"ok": False, "error": ...}`.
+        Items apply in order, so one batch may move the same intent several times; an item
+        with `requires_previous=True` is applied only if the previous item of the same
+        intent in this batch applied (e.g. approve, then claim only if the approve applied).
+
+        `atomic=True` rolls back the whole batch on the first failure and raises.
+        """
+        ts = _now_epoch()
+        results: List[Dict[str, Any]] = []
+        applied: Dict[str, bool] = {}
+        with self._tx() as conn:
+            for idx, raw in enumerate(items):
+                item = raw if isinstance(raw, dict) else {}
+                iid = str(item.get("intent_id") or "").strip()
+                if not iid:
+                    err = "intent_id is required"
+                    if atomic:
+                        raise ValueError(f"item {idx}: {err}")
+                    results.append({"index": idx, "intent_id": "", "ok": False, "error": err})
+                    continue
+                if item.get("requires_previous") and applied.get(iid) is False:
+                    err = "previous transition of this intent did not apply"
+                    if atomic:
+                        raise ValueError(f"item {idx} ({iid}): {err}")
+                    results.append({"index": idx, "intent_id": iid, "ok": False, "error": err})
+                    continue
+                # unknown intents are ensured outside the item savepoint (legacy semantics)
+                cur = self._ensure_in(conn, iid, ts)
+                conn.execute("SAVEPOINT intent_item")
+                try:
+                    out = self._transition_in(
+                        conn,
+                        cur,
+                        iid=iid,
+                        to_state=str(item.get("to_state") or ""),
+                        expected_from_state=item.get("expected_from_state"),
+                        expected_version=item.get("expected_version"),
+                        reason=str(item.get("reason") or ""),
+                        meta=item.get("meta") if isinstance(item.get("meta"), dict) else None,
+                        execution=item.get("execution") if isinstance(item.get("execution"), dict) else None,
+                        ts=ts,
+                    )
+                except ValueError as e:
+                    conn.execute("ROLLBACK TO SAVEPOINT intent_item")
+                    conn.execute("RELEASE SAVEPOINT intent_item")
+                    if atomic:
+                        raise ValueError(f"item {idx} ({iid}): {e}") from e
+                    results.append({"index": idx, "intent_id": iid, "ok": False, "error": str(e)})
+                    applied[iid] = False
+                    continue
+                conn.execute("RELEASE SAVEPOINT intent_item")
+                applied[iid] = True
+                results.append({"index": idx, "ok": True, **out})
+        return results
+
     def list_journal(self, intent_id: str, *, limit: int = 100) -> List[Dict[str, Any]]:
         iid = str(intent_id or "").strip()
         if not iid:
             return []
         lim = max(1, int(limit))
-        with self._connect() as conn:
+        with self._session() as conn:
             rows = conn.execute(
                 """
                 SELECT id, intent_id, ts, from_state, to_state, reason, meta_json, execution_json
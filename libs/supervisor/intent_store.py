@@ -1,9 +1,19 @@
 from __future__ import annotations
 
 import json
+import os
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from libs.supervisor.intent_archive import intent_journal_lock, load_archived_intent
+from libs.supervisor.intent_journal_index import IntentJournalIndex, _unwrap_intent, row_intent_id
+
+
+def _is_trueish(v: Any) -> bool:
+    if isinstance(v, bool):
+        return v
+    return str(v or "").strip().lower() in ("1", "true", "yes", "y", "on")
 
 
 class IntentStore:
@@ -11,10 +21,33 @@ class IntentStore:
 
     Stores JSONL records:
       {"ts": 1234567890, "intent_id": "...", "intent": {...}}
+
+    M32-12: lookups go through an offset index (`IntentJournalIndex`, sidecar
+    `<path>.idx.db`) unless disabled (`indexed=False` / env
+    `INTENT_JOURNAL_INDEX_ENABLED=false`). The JSONL file stays the source of truth;
+    any index failure falls back to the linear scan.
     """
 
-    def __init__(self, path: str = "data/logs/intents.jsonl"):
+    def __init__(
+        self,
+        path: str = "data/logs/intents.jsonl",
+        *,
+        indexed: Optional[bool] = None,
+        archive_dir: Optional[str] = None,
+    ):
         self.path = Path(path)
+        self.archive_dir = archive_dir  # M32-14: None -> INTENT_ARCHIVE_DIR / data/logs/archive
+        if indexed is None:
+            indexed = _is_trueish(os.getenv("INTENT_JOURNAL_INDEX_ENABLED", "true"))
+        self.index: Optional[IntentJournalIndex] = IntentJournalIndex(self.path) if indexed else None
+
+    def _indexed(self, method: str, *args: Any, **kwargs: Any) -> Tuple[bool, Any]:
+        if self.index is None or not self.path.exists():
+            return False, None
+        try:
+            return True, getattr(self.index, method)(*args, **kwargs)
+        except Exception:
+            return False, None
 
     def save(self, intent: Dict[str, Any]) -> None:
         intent_id = str(intent.get("intent_id") or "")
@@ -22,15 +55,35 @@ class IntentStore:
             return
         self.path.parent.mkdir(parents=True, exist_ok=True)
         rec = {"ts": int(time.time()), "intent_id": intent_id, "intent": intent}
-        with self.path.open("a", encoding="utf-8") as f:
+        with intent_journal_lock(self.path), self.path.open("a", encoding="utf-8") as f:
             f.write(json.dumps(rec, ensure_ascii=False) + "\n")
 
-    def load(self, intent_id: str, *, scan_limit: int = 5000) -> Optional[Dict[str, Any]]:
+    def _archived(self, intent_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return load_archived_intent(str(intent_id), self.archive_dir)
+        except Exception:
+            return None
+
+    def load(self, intent_id: str, *, scan_limit: int = 5000, include_archived: bool = False) -> Optional[Dict[str, Any]]:
         if not intent_id:
             return None
+        intent = self._load_live(intent_id, scan_limit)
+        if intent is not None or not include_archived:
+            return intent
+        # M32-14: compacted intents live in archive segments
+        own = [r for r in (self._archived(intent_id) or {}).get("rows") or [] if str(r.get("intent_id")) == str(intent_id)]
+        intent = own[-1].get("intent") if own else None
+        return intent if isinstance(intent, dict) else None
+
+    def _load_live(self, intent_id: str, scan_limit: int) -> Optional[Dict[str, Any]]:
         if not self.path.exists():
             return None
 
+        ok, rec = self._indexed("last_row_for", str(intent_id))
+        if ok:
+            intent = rec.get("intent") if isinstance(rec, dict) else None
+            return intent if isinstance(intent, dict) else None
+
         # scan from end for speed (approx) - read all lines then reverse
         lines = self.path.read_text(encoding="utf-8").splitlines()
         for line in reversed(lines[-scan_limit:]):
@@ -52,9 +105,19 @@ class IntentStore:
         if not isinstance(row, dict):
             return
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        with self.path.open("a", encoding="utf-8") as f:
+        with intent_journal_lock(self.path), self.path.open("a", encoding="utf-8") as f:
             f.write(json.dumps(row, ensure_ascii=False) + "\n")
 
+    def append_rows(self, rows: List[Dict[str, Any]]) -> int:
+        """Append several journal rows in one buffered write. Returns the number written."""
+        lines = [json.dumps(r, ensure_ascii=False) + "\n" for r in rows if isinstance(r, dict)]
+        if not lines:
+            return 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with intent_journal_lock(self.path), self.path.open("a", encoding="utf-8") as f:
+            f.write("".join(lines))
+        return len(lines)
+
     def load_all_rows(self, *, scan_limit: int = 200000) -> list[Dict[str, Any]]:
         """Load all journal rows (best-effort)."""
         if not self.path.exists():
@@ -72,3 +135,115 @@ class IntentStore:
             if isinstance(r, dict):
                 rows.append(r)
         return rows
+
+    # ---- indexed lookups (linear-scan fallback) -------------------------------
+
+    def latest_row(self, intent_id: str, *, include_archived: bool = False) -> Optional[Dict[str, Any]]:
+        """Latest journal row for `intent_id` by ts (ties -> later line).
+
+        `include_archived=True` falls back to compacted segments (M32-14) when the
+        intent is no longer in the live journal.
+        """
+        if not intent_id:
+            return None
+        row = self._latest_live(intent_id)
+        if row is not None or not include_archived:
+            return row
+        latest: Optional[Dict[str, Any]] = None
+        for r in (self._archived(intent_id) or {}).get("rows") or []:
+            if (latest is None) or (int(r.get("ts") or 0) >= int(latest.get("ts") or 0)):
+                latest = r
+        return latest
+
+    def _latest_live(self, intent_id: str) -> Optional[Dict[str, Any]]:
+        ok, rec = self._indexed("latest_row", str(intent_id))
+        if ok:
+            return rec
+        latest: Optional[Dict[str, Any]] = None
+        for r in self.load_all_rows():
+            if row_intent_id(r) != str(intent_id):
+                continue
+            if (latest is None) or (int(r.get("ts") or 0) >= int(latest.get("ts") or 0)):
+                latest = r
+        return latest
+
+    def load_many(self, intent_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Batch `load`: {intent_id: intent} for ids with a stored (top-level id) row."""
+        ids = {str(i) for i in intent_ids if i}
+        if not ids or not self.path.exists():
+            return {}
+        ok, recs = self._indexed("last_rows_for", sorted(ids))
+        if not ok:
+            recs = {}
+            for r in self.load_all_rows(scan_limit=5000):
+                if str(r.get("intent_id")) in ids:
+                    recs[str(r.get("intent_id"))] = r
+        out: Dict[str, Dict[str, Any]] = {}
+        for iid, rec in recs.items():
+            intent = rec.get("intent") if isinstance(rec, dict) else None
+            if isinstance(intent, dict):
+                out[iid] = intent
+        return out
+
+    def latest_rows_for(self, intent_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Batch `latest_row`: {intent_id: latest row by ts (ties -> later line)}."""
+        ids = {str(i) for i in intent_ids if i}
+        if not ids:
+            return {}
+        ok, recs = self._indexed("latest_rows_for", sorted(ids))
+        if ok:
+            return recs
+        latest: Dict[str, Dict[str, Any]] = {}
+        for r in self.load_all_rows():
+            rid = row_intent_id(r)
+            if rid not in ids:
+                continue
+            prev = latest.get(rid)
+            if (prev is None) or (int(r.get("ts") or 0) >= int(prev.get("ts") or 0)):
+                latest[rid] = r
+        return latest
+
+    def last_intent_row(self) -> Optional[Dict[str, Any]]:
+        """Latest row (by ts) carrying an intent with an intent_id."""
+        ok, rec = self._indexed("last_intent_row")
+        if ok:
+            return rec
+        best: Optional[Dict[str, Any]] = None
+        for r in self.load_all_rows():
+            if not (_unwrap_intent(r) or {}).get("intent_id"):
+                continue
+            if (best is None) or (int(r.get("ts") or 0) >= int(best.get("ts") or 0)):
+                best = r
+        return best
+
+    def latest_rows(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Latest row per intent, newest first (ts desc; ties keep first-seen order)."""
+        ok, rows = self._indexed("latest_rows", limit)
+        if ok:
+            return rows
+        latest_by_id: Dict[str, Dict[str, Any]] = {}
+        for r in self.load_all_rows():
+            rid = row_intent_id(r)
+            if not rid:
+                continue
+            prev = latest_by_id.get(rid)
+            if (prev is None) or (int(r.get("ts") or 0) >= int(prev.get("ts") or 0)):
+                latest_by_id[rid] = r
+        items = sorted(latest_by_id.values(), key=lambda x: int(x.get("ts") or 0), reverse=True)
+        return items[: max(1, int(limit))]
+
+    def tail_rows(self, n: int = 1) -> List[Dict[str, Any]]:
+        """Last `n` journal rows in file order."""
+        ok, rows = self._indexed("tail", n)
+        if ok:
+            return rows
+        rows = self.load_all_rows()
+        return rows[-max(1, int(n)):] if rows else []
+
+    def read_since(self, cursor: int = 0, *, limit: int = 1000) -> Tuple[List[Dict[str, Any]], int]:
+        """Tail reader: rows after row number `cursor`. Returns `(rows, next_cursor)`."""
+        ok, out = self._indexed("read_since", cursor, limit=limit)
+        if ok:
+            return out
+        rows = self.load_all_rows()[int(cursor) : int(cursor) + max(1, int(limit))]
+        return rows, int(cursor) + len(rows)
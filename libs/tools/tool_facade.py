@@ -5,12 +5,13 @@ import uuid
 import json
 from dataclasses import asdict
 from pathlib import Path
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Sequence
 
 from libs.skills.runner import CompositeSkillRunner
 from libs.supervisor.two_phase import TwoPhaseSupervisor
 from libs.supervisor.intent_store import IntentStore
 from libs.approval.service import ApprovalService
+from libs.execution.order_dispatch import shared_dispatcher
 
 from libs.agent.intent_parser import parse_nl
 from libs.agent.router import route
@@ -94,7 +95,8 @@ class ToolFacade:
         return rows
 
     def _last_row(self) -> Optional[Dict[str, Any]]:
-        rows = self._load_all_rows()
+        # M32-12: tail read through the journal index instead of parsing the whole file
+        rows = self.intent_store.tail_rows(1)
         return rows[-1] if rows else None
 
     def _last_intent(self) -> Optional[Dict[str, Any]]:
@@ -174,6 +176,18 @@ class ToolFacade:
     def reject_intent(self, *, intent_id: Optional[str] = None, reason: str = "rejected") -> Dict[str, Any]:
         return self.approvals.reject(intent_id=intent_id, reason=reason)
 
+    def approve_intents(self, *, intent_ids: Sequence[str]) -> Dict[str, Any]:
+        # M32-19: ORDER_DISPATCH_WORKERS > 1 submits the claimed orders concurrently
+        return self.approvals.approve_many(
+            intent_ids=intent_ids,
+            execution_enabled=_execution_enabled(),
+            execute_fn=lambda it: self.order_execute(intent=it),
+            dispatcher=shared_dispatcher() if _execution_enabled() else None,
+        )
+
+    def reject_intents(self, *, intent_ids: Sequence[str], reason: str = "rejected") -> Dict[str, Any]:
+        return self.approvals.reject_many(intent_ids=intent_ids, reason=reason)
+
     def _append_intent_marker(
         self,
         *,
@@ -193,43 +207,21 @@ class ToolFacade:
         if execution is not None:
             marker["execution"] = execution
 
-        self.intent_store_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.intent_store_path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(marker, ensure_ascii=False) + "\n")
+        self.intent_store.append_row(marker)  # same journal; honours the compaction lock
 
     def _latest_row(self, intent_id: str) -> Optional[Dict[str, Any]]:
         # Find the latest row for this intent_id (stable retry semantics).
-        rows = self._load_all_rows()
-        latest: Optional[Dict[str, Any]] = None
-        for r in rows:
-            rid = r.get("intent_id") or (_unwrap_intent(r) or {}).get("intent_id")
-            if str(rid) != str(intent_id):
-                continue
-            ts = int(r.get("ts") or 0)
-            if (latest is None) or (ts >= int(latest.get("ts") or 0)):
-                latest = r
-        return latest
+        return self.intent_store.latest_row(intent_id)
 
 
     def list_intents(self, limit: int = 5) -> Dict[str, Any]:
         # Rows contain both stored intents and status markers (e.g., rejected). We want
         # a stable "최근주문" view, so we aggregate by intent_id where the latest row wins.
-        rows = self._load_all_rows()
-
-        latest_by_id = {}
-        for r in rows:
+        uniq = []
+        for r in self.intent_store.latest_rows(limit=max(1, int(limit))):  # newest first
             intent = _unwrap_intent(r) or {}
             intent_id = intent.get("intent_id") or r.get("intent_id")
-            if not intent_id:
-                continue
-            ts = int(r.get("ts") or 0)
-            prev = latest_by_id.get(intent_id)
-            if (prev is None) or (ts >= int(prev.get("ts") or 0)):
-                latest_by_id[intent_id] = {**r, "intent": intent, "ts": ts, "intent_id": intent_id}
-
-        # newest first
-        uniq = sorted(latest_by_id.values(), key=lambda x: int(x.get("ts") or 0), reverse=True)
-        uniq = uniq[: max(1, int(limit))]
+            uniq.append({**r, "intent": intent, "ts": int(r.get("ts") or 0), "intent_id": intent_id})
 
         out = []
         for r in uniq:
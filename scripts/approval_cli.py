@@ -3,7 +3,8 @@ from __future__ import annotations
 import argparse
 import json
 import sys
-from typing import Any, Dict, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 from libs.tools.tool_facade import ToolFacade
 
@@ -12,8 +13,23 @@ def _print(obj: Dict[str, Any]) -> None:
     sys.stdout.write(json.dumps(obj, ensure_ascii=False, indent=2) + "\n")
 
 
+def _collect_ids(args: argparse.Namespace) -> List[str]:
+    ids: List[str] = []
+    for chunk in args.intent_ids or []:
+        ids.extend(x.strip() for x in str(chunk).replace(",", " ").split())
+    if args.file:
+        text = sys.stdin.read() if args.file == "-" else Path(args.file).read_text(encoding="utf-8")
+        ids.extend(line.strip() for line in text.splitlines())
+    return [x for x in ids if x and not x.startswith("#")]
+
+
+def _add_ids_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--intent-ids", action="append", default=[], help="Comma/space separated ids (repeatable)")
+    p.add_argument("--file", default=None, help="File with one intent_id per line ('-' = stdin)")
+
+
 def main(argv: Optional[list[str]] = None) -> int:
-    p = argparse.ArgumentParser(description="M16 approval CLI (preview/approve/reject/list)")
+    p = argparse.ArgumentParser(description="M16 approval CLI (preview/approve/reject/list, approve-many/reject-many)")
     sub = p.add_subparsers(dest="cmd", required=True)
 
     p_prev = sub.add_parser("preview", help="Preview intent by id (or last if omitted)")
@@ -26,6 +42,13 @@ def main(argv: Optional[list[str]] = None) -> int:
     p_rej.add_argument("--intent-id", default=None)
     p_rej.add_argument("--reason", default="rejected")
 
+    p_app_many = sub.add_parser("approve-many", help="Approve several intents in one batch (M32-13)")
+    _add_ids_args(p_app_many)
+
+    p_rej_many = sub.add_parser("reject-many", help="Reject several intents in one batch (M32-13)")
+    _add_ids_args(p_rej_many)
+    p_rej_many.add_argument("--reason", default="rejected")
+
     p_list = sub.add_parser("list", help="List recent intents")
     p_list.add_argument("--limit", type=int, default=10)
 
@@ -44,6 +67,18 @@ def main(argv: Optional[list[str]] = None) -> int:
         _print(api.reject_intent(intent_id=args.intent_id, reason=args.reason))
         return 0
 
+    if args.cmd in ("approve-many", "reject-many"):
+        ids = _collect_ids(args)
+        if not ids:
+            _print({"ok": False, "message": "No intent_ids given (--intent-ids / --file)."})
+            return 2
+        if args.cmd == "approve-many":
+            out = api.approve_intents(intent_ids=ids)
+        else:
+            out = api.reject_intents(intent_ids=ids, reason=args.reason)
+        _print(out)
+        return 0 if out.get("ok") else 1
+
     if args.cmd == "list":
         _print(api.list_intents(limit=args.limit))
         return 0
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from libs.runtime.intent_conflict_resolver import _legacy_resolve_intent_conflicts
+from libs.runtime.intent_guard_engine import engine_apply_portfolio_budget_guard, engine_resolve_intent_conflicts
+from libs.runtime.portfolio_budget_guard import _legacy_apply_portfolio_budget_guard
+
+_NON_FINITE = (float("nan"), float("inf"), "nan", float("-inf"), "inf")
+
+
+def make_intents(*, intents: int, symbols: int, strategies: int, seed: int) -> List[Dict[str, Any]]:
+    """Synthetic multi-strategy intent batch (mixed sides, sizing fields, a few malformed and
+    non-finite sizing rows)."""
+    rnd = random.Random(seed)
+    out: List[Dict[str, Any]] = []
+    for i in range(intents):
+        row: Dict[str, Any] = {
+            "intent_id": f"b-{i}",
+            "strategy_id": f"s{rnd.randrange(strategies)}",
+            "symbol": f"{rnd.randrange(symbols):06d}",
+            "side": "BUY" if rnd.random() < 0.6 else "SELL",
+            "priority": rnd.randrange(4),
+            "confidence": round(rnd.random(), 3),
+        }
+        if rnd.random() < 0.5:
+            row["requested_notional"] = float(rnd.randrange(1, 50)) * 10000.0
+        else:
+            row["qty"] = rnd.randrange(1, 20)
+        out.append(row)
+    for i in range(0, intents, 1000):
+        out[i] = {"intent_id": f"bad-{i}", "side": "HOLD", "symbol": out[i]["symbol"]}
+    for k, i in enumerate(range(500, intents, 1000)):
+        out[i]["requested_notional"] = _NON_FINITE[k % len(_NON_FINITE)]
+    return out
+
+
+def _time(fn: Callable[[], Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    best = float("inf")
+    res: Dict[str, Any] = {}
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        res = fn()
+        best = min(best, time.perf_counter() - t0)
+    return {"sec": round(best, 4), "result": res}
+
+
+def run_benchmark(
+    *,
+    intents: int = 50000,
+    symbols: int = 2000,
+    strategies: int = 8,
+    repeat: int = 3,
+    seed: int = 7,
+) -> Dict[str, Any]:
+    """Best-of-`repeat` wall time for the legacy resolver/guard vs the M32-16 intent table engine.
+
+    `parity` is True when both implementations return identical results (approved / blocked rows,
+    indices, reason counts, strategy usage).
+    """
+    rows = make_intents(intents=int(intents), symbols=max(1, int(symbols)), strategies=max(1, int(strategies)), seed=seed)
+    prices = {f"{s:06d}": 10000.0 + s for s in range(max(1, int(symbols)))}
+    caps = {"default_symbol_max_notional": 1500000.0, "market_prices": prices}
+    budgets = {f"s{k}": float(intents) * 25000.0 / max(1, int(strategies)) for k in range(max(1, int(strategies)) - 1)}
+
+    cases = {
+        "resolve_intent_conflicts": (
+            lambda: _legacy_resolve_intent_conflicts(rows, **caps),
+            lambda: engine_resolve_intent_conflicts(rows, **caps),
+        ),
+        "apply_portfolio_budget_guard": (
+            lambda: _legacy_apply_portfolio_budget_guard(rows, strategy_budget_map=budgets, **caps),
+            lambda: engine_apply_portfolio_budget_guard(rows, strategy_budget_map=budgets, **caps),
+        ),
+    }
+    out: Dict[str, Any] = {"intents": len(rows), "symbols": int(symbols), "strategies": int(strategies), "repeat": int(repeat)}
+    for name, (legacy_fn, engine_fn) in cases.items():
+        legacy = _time(legacy_fn, repeat)
+        engine = _time(engine_fn, repeat)
+        out[name] = {
+            "legacy_sec": legacy["sec"],
+            "engine_sec": engine["sec"],
+            "speedup": round(legacy["sec"] / engine["sec"], 2) if engine["sec"] > 0 else 0.0,
+            "approved_total": engine["result"]["approved_total"],
+            "blocked_total": engine["result"]["blocked_total"],
+            "blocked_reason_counts": engine["result"]["blocked_reason_counts"],
+            "parity": legacy["result"] == engine["result"],
+        }
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="M32-16: intent conflict/budget guard engine vs legacy.")
+    p.add_argument("--intents", type=int, default=50000)
+    p.add_argument("--symbols", type=int, default=2000)
+    p.add_argument("--strategies", type=int, default=8)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--seed", type=int, default=7)
+    p.add_argument("--json", action="store_true")
+    args = p.parse_args(argv)
+
+    out = run_benchmark(
+        intents=args.intents,
+        symbols=args.symbols,
+        strategies=args.strategies,
+        repeat=args.repeat,
+        seed=args.seed,
+    )
+    if args.json:
+        print(json.dumps(out, ensure_ascii=False))
+    else:
+        print("=== intent guard engine ===")
+        for name in ("resolve_intent_conflicts", "apply_portfolio_budget_guard"):
+            r = out[name]
+            print(
+                f"{name:<30} legacy={r['legacy_sec']:>8}s engine={r['engine_sec']:>8}s "
+                f"speedup={r['speedup']:>6} parity={r['parity']}"
+            )
+    ok = all(out[name]["parity"] for name in ("resolve_intent_conflicts", "apply_portfolio_budget_guard"))
+    return 0 if ok else 3
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
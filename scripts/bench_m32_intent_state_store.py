@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from libs.supervisor.intent_state_store import (
+    INTENT_STATE_APPROVED,
+    INTENT_STATE_EXECUTED,
+    INTENT_STATE_EXECUTING,
+    SQLiteIntentStateStore,
+)
+
+_CHAIN = (INTENT_STATE_APPROVED, INTENT_STATE_EXECUTING, INTENT_STATE_EXECUTED)
+
+
+def _rate(n: int, sec: float) -> float:
+    return round(n / sec, 1) if sec > 0 else 0.0
+
+
+def _bench_single(store: SQLiteIntentStateStore, ids: List[str]) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    n = 0
+    for to_state in _CHAIN:
+        for iid in ids:
+            store.transition(intent_id=iid, to_state=to_state, reason="bench")
+            n += 1
+    sec = time.perf_counter() - t0
+    return {"transitions": n, "sec": round(sec, 3), "transitions_per_sec": _rate(n, sec)}
+
+
+def _bench_batch(store: SQLiteIntentStateStore, ids: List[str], batch_size: int) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    n = 0
+    failed = 0
+    for to_state in _CHAIN:
+        for i in range(0, len(ids), batch_size):
+            chunk = ids[i : i + batch_size]
+            out = store.transition_many([{"intent_id": iid, "to_state": to_state, "reason": "bench"} for iid in chunk])
+            n += len(out)
+            failed += sum(1 for r in out if not r["ok"])
+    sec = time.perf_counter() - t0
+    return {"transitions": n, "failed": failed, "sec": round(sec, 3), "transitions_per_sec": _rate(n, sec)}
+
+
+def run_benchmark(*, intents: int = 10000, batch_size: int = 500, legacy_intents: int = 0, db_dir: str = "") -> Dict[str, Any]:
+    """Transitions/sec for the per-call store, the persistent (WAL) store and transition_many.
+
+    Each mode moves its own intents pending -> approved -> executing -> executed (3 per intent).
+    The per-call mode reconnects on every call, so it uses `legacy_intents` (default intents/10).
+    """
+    intents = max(1, int(intents))
+    legacy_n = max(1, int(legacy_intents or intents // 10))
+    with tempfile.TemporaryDirectory(dir=db_dir or None) as tmp:
+        legacy = SQLiteIntentStateStore(str(Path(tmp) / "legacy.db"), persistent=False)
+        persistent = SQLiteIntentStateStore(str(Path(tmp) / "persistent.db"), persistent=True)
+        batched = SQLiteIntentStateStore(str(Path(tmp) / "batched.db"), persistent=True)
+        try:
+            out = {
+                "intents": intents,
+                "batch_size": int(batch_size),
+                "per_call": {"intents": legacy_n, **_bench_single(legacy, [f"L{i:06d}" for i in range(legacy_n)])},
+                "persistent": {"intents": intents, **_bench_single(persistent, [f"P{i:06d}" for i in range(intents)])},
+                "transition_many": {
+                    "intents": intents,
+                    **_bench_batch(batched, [f"B{i:06d}" for i in range(intents)], max(1, int(batch_size))),
+                },
+            }
+        finally:
+            persistent.close()
+            batched.close()
+    base = float(out["per_call"]["transitions_per_sec"]) or 1.0
+    out["speedup_vs_per_call"] = {
+        "persistent": round(float(out["persistent"]["transitions_per_sec"]) / base, 2),
+        "transition_many": round(float(out["transition_many"]["transitions_per_sec"]) / base, 2),
+    }
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="M32-11: SQLiteIntentStateStore transition throughput.")
+    p.add_argument("--intents", type=int, default=10000)
+    p.add_argument("--batch-size", type=int, default=500)
+    p.add_argument("--legacy-intents", type=int, default=0, help="Intents for the per-call mode (default intents/10).")
+    p.add_argument("--db-dir", default="", help="Directory for temporary databases (default system temp).")
+    p.add_argument("--json", action="store_true")
+    args = p.parse_args(argv)
+
+    out = run_benchmark(
+        intents=args.intents,
+        batch_size=args.batch_size,
+        legacy_intents=args.legacy_intents,
+        db_dir=args.db_dir,
+    )
+    if args.json:
+        print(json.dumps(out, ensure_ascii=False))
+    else:
+        print("=== SQLiteIntentStateStore throughput ===")
+        for mode in ("per_call", "persistent", "transition_many"):
+            r = out[mode]
+            print(f"{mode:<16} intents={r['intents']:>7} transitions={r['transitions']:>7} tps={r['transitions_per_sec']:>10}")
+        print(f"speedup_vs_per_call={out['speedup_vs_per_call']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
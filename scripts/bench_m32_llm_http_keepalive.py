@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from libs.llm.http_pool import KeepAliveHTTPClient, urlopen_post_json
+
+
+_STUB_BODY = json.dumps(
+    {
+        "choices": [{"message": {"content": "{\"intent\": {\"action\": \"NOOP\"}}"}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    }
+).encode("utf-8")
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_POST(self) -> None:  # noqa: N802
+        n = int(self.headers.get("Content-Length") or 0)
+        if n:
+            self.rfile.read(n)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_STUB_BODY)))
+        self.end_headers()
+        self.wfile.write(_STUB_BODY)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+
+def start_stub_server() -> ThreadingHTTPServer:
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+
+def _measure(call: Callable[[], Dict[str, Any]], n: int) -> Dict[str, float]:
+    samples: List[float] = []
+    for _ in range(max(1, int(n))):
+        t0 = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    samples.sort()
+    p95_idx = min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))
+    return {
+        "calls": len(samples),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "p50_ms": round(samples[len(samples) // 2], 4),
+        "p95_ms": round(samples[p95_idx], 4),
+    }
+
+
+def run_benchmark(*, calls: int = 200, url: str = "") -> Dict[str, Any]:
+    srv = None
+    if not url:
+        srv = start_stub_server()
+        url = f"http://127.0.0.1:{srv.server_address[1]}/api/v1/chat/completions"
+    headers = {"Content-Type": "application/json", "Authorization": "Bearer bench"}
+    payload = {"model": "bench/model", "messages": [{"role": "user", "content": "ping"}]}
+    pool = KeepAliveHTTPClient(pool_size=2)
+    try:
+        urlopen_stats = _measure(lambda: urlopen_post_json(url, headers, payload, timeout=5.0), calls)
+        pooled_stats = _measure(lambda: pool.post_json(url, headers, payload, timeout=5.0), calls)
+    finally:
+        pool.close()
+        if srv is not None:
+            srv.shutdown()
+            srv.server_close()
+    speedup = 0.0
+    if pooled_stats["mean_ms"] > 0:
+        speedup = round(urlopen_stats["mean_ms"] / pooled_stats["mean_ms"], 3)
+    return {
+        "url": url,
+        "urlopen": urlopen_stats,
+        "keepalive": pooled_stats,
+        "keepalive_connects": int(pool.stats.get("connects") or 0),
+        "keepalive_reused": int(pool.stats.get("reused") or 0),
+        "per_call_overhead_saved_ms": round(urlopen_stats["mean_ms"] - pooled_stats["mean_ms"], 4),
+        "speedup": speedup,
+    }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="M32-2 benchmark: per-call overhead, urlopen vs keep-alive pool.")
+    p.add_argument("--calls", type=int, default=200)
+    p.add_argument("--url", default="", help="Target endpoint (default: local stub server).")
+    p.add_argument("--json", action="store_true")
+    return p
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    out = run_benchmark(calls=int(args.calls), url=str(args.url or "").strip())
+    if args.json:
+        print(json.dumps(out, ensure_ascii=False))
+    else:
+        print(
+            f"calls={out['urlopen']['calls']} urlopen_mean_ms={out['urlopen']['mean_ms']} "
+            f"keepalive_mean_ms={out['keepalive']['mean_ms']} speedup={out['speedup']} "
+            f"connects={out['keepalive_connects']} reused={out['keepalive_reused']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
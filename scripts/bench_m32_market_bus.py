@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from libs.kiwoom.standin_server import KiwoomStandinServer, LatencyProfile
+from libs.market.snapshot_bus import MarketBusReader, MarketBusWriter
+from libs.read.kiwoom_price_reader import KiwoomPriceReader
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    xs = sorted(values)
+    return xs[min(len(xs) - 1, int(round(q / 100.0 * (len(xs) - 1))))]
+
+
+def _rest_worker(env: Dict[str, str], codes: List[str], ticks: int, barrier: Any, out: Any) -> None:
+    os.environ.update(env)
+    reader = KiwoomPriceReader.from_env()
+    barrier.wait()
+    tick_ms: List[float] = []
+    for _ in range(ticks):
+        t0 = time.perf_counter()
+        for sym in codes:
+            reader.get_market_snapshot(sym)
+        tick_ms.append((time.perf_counter() - t0) * 1000.0)
+    out.put({"tick_ms": tick_ms})
+
+
+def _bus_worker(path: str, barrier: Any, done: Any, out: Any) -> None:
+    reader = MarketBusReader(path)
+    barrier.wait()
+    read_us: List[float] = []
+    violations = 0
+    rows = 0
+    while True:
+        last = done.is_set()
+        t0 = time.perf_counter()
+        snap = reader.snapshot(max_age_sec=1e9)
+        read_us.append((time.perf_counter() - t0) * 1e6)
+        for r in snap.values():
+            rows += 1
+            # the writer keeps bid = price - 1 and ask = price + 1: a torn record breaks it
+            if r["best_bid"] != r["price"] - 1 or r["best_ask"] != r["price"] + 1:
+                violations += 1
+        if last:
+            break
+    out.put({"read_us": read_us, "rows": rows, "violations": violations, "version": reader.version, **reader.stats})
+
+
+def run_benchmark(
+    *,
+    workers: int = 3,
+    ticks: int = 10,
+    symbols: int = 10,
+    latency: str = "normal:5:2",
+    churn: int = 50,
+) -> Dict[str, Any]:
+    """N graph-worker processes reading the same quotes: each over REST vs one ingest + the bus.
+
+    per_process: every worker reads `symbols` prices (ka10001) per tick from the stand-in.
+    bus: the parent reads them once per tick and publishes to the shared-memory bus, then
+    rewrites every record `churn` more times (price, bid = price - 1, ask = price + 1) while
+    the workers spin on `snapshot()`; a torn (non-seqlocked) read would break the invariant.
+    Workers are spawned processes, as under the M28 launch templates.
+    """
+    ctx = mp.get_context("spawn")
+    n_workers = max(1, int(workers))
+    n_ticks = max(1, int(ticks))
+    server = KiwoomStandinServer.from_env(latency=LatencyProfile.parse(latency))
+    codes = list(server.market.symbols)[: max(1, int(symbols))]
+    out: Dict[str, Any] = {"workers": n_workers, "ticks": n_ticks, "symbols": len(codes)}
+    with tempfile.TemporaryDirectory() as tmp, server:
+        env = {
+            "KIWOOM_MODE": "mock",
+            "KIWOOM_BASE_URL_MOCK": server.base_url,
+            "KIWOOM_APP_KEY": "standin-app",
+            "KIWOOM_APP_SECRET": "standin-secret",
+            "KIWOOM_TOKEN_CACHE_PATH": str(Path(tmp) / "token_cache.json"),
+            "KIWOOM_RETRY_MAX": "0",
+        }
+
+        # --- per_process ---
+        q = ctx.Queue()
+        barrier = ctx.Barrier(n_workers + 1)
+        procs = [ctx.Process(target=_rest_worker, args=(env, codes, n_ticks, barrier, q)) for _ in range(n_workers)]
+        for p in procs:
+            p.start()
+        barrier.wait()
+        server.reset_stats()
+        t0 = time.perf_counter()
+        results = [q.get(timeout=120) for _ in procs]
+        elapsed = time.perf_counter() - t0
+        for p in procs:
+            p.join()
+        tick_ms = [x for r in results for x in r["tick_ms"]]
+        out["per_process"] = {
+            "price_requests": int(server.stats()["by_api"].get("ka10001", 0)),
+            "elapsed_sec": round(elapsed, 4),
+            "tick_ms_p50": round(_pct(tick_ms, 50), 3),
+            "tick_ms_p95": round(_pct(tick_ms, 95), 3),
+        }
+
+        # --- bus ---
+        old = {k: os.environ.get(k) for k in env}
+        os.environ.update(env)
+        try:
+            rest = KiwoomPriceReader.from_env()
+        finally:
+            for k, v in old.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+        path = str(Path(tmp) / "market_bus")
+        writer = MarketBusWriter(path, capacity=max(16, len(codes)))
+        q = ctx.Queue()
+        barrier = ctx.Barrier(n_workers + 1)
+        done = ctx.Event()
+        procs = [ctx.Process(target=_bus_worker, args=(path, barrier, done, q)) for _ in range(n_workers)]
+        for p in procs:
+            p.start()
+        barrier.wait()
+        server.reset_stats()
+        t0 = time.perf_counter()
+        for _ in range(n_ticks):
+            prices = {sym: rest.get_market_snapshot(sym).price for sym in codes}
+            for j in range(max(0, int(churn)) + 1):
+                for sym, px in prices.items():
+                    p = px + j
+                    writer.write(sym, price=p, bid=p - 1, ask=p + 1, volume=j, publish=False)
+                writer.publish()
+        ingest_sec = time.perf_counter() - t0
+        done.set()
+        results = [q.get(timeout=120) for _ in procs]
+        for p in procs:
+            p.join()
+        read_us = [x for r in results for x in r["read_us"]]
+        out["bus"] = {
+            "price_requests": int(server.stats()["by_api"].get("ka10001", 0)),
+            "ingest_sec": round(ingest_sec, 4),
+            "writes": writer.stats["writes"],
+            "reads": len(read_us),
+            "read_us_p50": round(_pct(read_us, 50), 3),
+            "read_us_p95": round(_pct(read_us, 95), 3),
+            "rows_read": sum(r["rows"] for r in results),
+            "violations": sum(r["violations"] for r in results),
+            "retries": sum(r["retries"] for r in results),
+            "torn": sum(r["torn"] for r in results),
+            "final_version": writer.version,
+        }
+        writer.close()
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="M32-24: per-process REST reads vs one ingest process + shared-memory bus.")
+    p.add_argument("--workers", type=int, default=3)
+    p.add_argument("--ticks", type=int, default=10)
+    p.add_argument("--symbols", type=int, default=10)
+    p.add_argument("--latency", default="normal:5:2", help="REST latency: fixed:ms | uniform:lo:hi | normal:mean:sd | lognormal:median:sigma")
+    p.add_argument("--churn", type=int, default=50, help="extra rewrites of every record per tick (seqlock stress)")
+    p.add_argument("--json", action="store_true")
+    args = p.parse_args(argv)
+
+    out = run_benchmark(workers=args.workers, ticks=args.ticks, symbols=args.symbols, latency=args.latency, churn=args.churn)
+    if args.json:
+        print(json.dumps(out, ensure_ascii=False))
+    else:
+        pp, bus = out["per_process"], out["bus"]
+        print(f"=== Market bus: {out['workers']} workers x {out['symbols']} symbols x {out['ticks']} ticks ===")
+        print(f"per_process price_requests={pp['price_requests']} tick p50/p95={pp['tick_ms_p50']}/{pp['tick_ms_p95']}ms")
+        print(
+            f"bus         price_requests={bus['price_requests']} reads={bus['reads']} "
+            f"read p50/p95={bus['read_us_p50']}/{bus['read_us_p95']}us writes={bus['writes']} "
+            f"violations={bus['violations']} retries={bus['retries']} torn={bus['torn']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from libs.kiwoom.realtime_ws import KiwoomRealtimeClient
+from libs.kiwoom.standin_feed import KiwoomStandinFeed
+from libs.kiwoom.standin_server import KiwoomStandinServer, LatencyProfile
+from libs.market.quote_table import QuoteTable
+from libs.read.kiwoom_price_reader import KiwoomPriceReader
+from libs.read.price_reader import StreamPriceReader
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    xs = sorted(values)
+    return xs[min(len(xs) - 1, int(round(q / 100.0 * (len(xs) - 1))))]
+
+
+@contextmanager
+def _patched_env(values: Dict[str, str]) -> Iterator[None]:
+    saved = {k: os.environ.get(k) for k in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+def _summary(tick_ms: List[float], requests: int, ticks: int) -> Dict[str, Any]:
+    return {
+        "tick_ms_p50": round(_pct(tick_ms, 50), 3),
+        "tick_ms_p95": round(_pct(tick_ms, 95), 3),
+        "tick_ms_max": round(max(tick_ms), 3) if tick_ms else 0.0,
+        "price_requests": requests,
+        "price_requests_per_tick": round(requests / max(1, ticks), 3),
+    }
+
+
+def run_benchmark(
+    *,
+    ticks: int = 50,
+    symbols: int = 5,
+    latency: str = "normal:5:2",
+    drop_at: int = -1,
+    max_age_ms: float = 5000.0,
+) -> Dict[str, Any]:
+    """Per-tick quote reads: REST polling vs the realtime feed, both against local stand-ins.
+
+    poll: one ka10001 call per symbol per tick (`KiwoomPriceReader`).
+    stream: every tick the stand-in feed publishes one print per symbol; reads go through
+    `StreamPriceReader(QuoteTable, fallback=KiwoomPriceReader)`, so REST is only hit for
+    missing / stale symbols. `drop_at` cuts the feed connection before that tick to
+    exercise reconnect + resubscribe (reads fall back to REST until quotes flow again).
+    """
+    n = max(1, int(ticks))
+    server = KiwoomStandinServer.from_env(latency=LatencyProfile.parse(latency))
+    codes = list(server.market.symbols)[: max(1, int(symbols))]
+    out: Dict[str, Any] = {"ticks": n, "symbols": len(codes)}
+    with tempfile.TemporaryDirectory() as tmp, server, KiwoomStandinFeed() as feed:
+        env = {
+            "KIWOOM_MODE": "mock",
+            "KIWOOM_BASE_URL_MOCK": server.base_url,
+            "KIWOOM_WS_URL_MOCK": feed.url,
+            "KIWOOM_APP_KEY": "standin-app",
+            "KIWOOM_APP_SECRET": "standin-secret",
+            "KIWOOM_TOKEN_CACHE_PATH": str(Path(tmp) / "token_cache.json"),
+            "KIWOOM_RETRY_MAX": "0",
+            "QUOTE_STREAM_RECONNECT_MIN_SEC": "0.05",
+        }
+        with _patched_env(env):
+            rest = KiwoomPriceReader.from_env()
+
+            # --- poll ---
+            server.reset_stats()
+            tick_ms: List[float] = []
+            for _ in range(n):
+                t0 = time.perf_counter()
+                for sym in codes:
+                    rest.get_market_snapshot(sym)
+                tick_ms.append((time.perf_counter() - t0) * 1000.0)
+            out["poll"] = _summary(tick_ms, int(server.stats()["by_api"].get("ka10001", 0)), n)
+
+            # --- stream ---
+            table = QuoteTable(max_age_sec=max_age_ms / 1000.0)
+            reader = StreamPriceReader(table, fallback=rest)
+            feed_ms: List[float] = []
+            ages: List[float] = []
+            tick_ms = []
+            with KiwoomRealtimeClient.from_env(table) as client:
+                table.watch(codes)
+                feed.wait_for(lambda: set(codes) <= feed.subscriptions())
+                server.reset_stats()
+                for i in range(n):
+                    if i == drop_at:
+                        feed.drop_connections()
+                        _expire(table, codes)
+                    for k, sym in enumerate(codes):
+                        seq = (table.get(sym) or {}).get("seq", 0)
+                        t_pub = time.perf_counter()
+                        if feed.publish(sym, 10000.0 + i * 10 + k, qty=1.0):
+                            while (table.get(sym) or {}).get("seq", 0) == seq and time.perf_counter() - t_pub < 1.0:
+                                time.sleep(0)
+                            feed_ms.append((time.perf_counter() - t_pub) * 1000.0)
+                    t0 = time.perf_counter()
+                    for sym in codes:
+                        reader.get_market_snapshot(sym)
+                    tick_ms.append((time.perf_counter() - t0) * 1000.0)
+                    ages.extend(r["age_ms"] for r in table.snapshot(symbols=codes).values())
+                stats = dict(client.stats)
+            out["stream"] = {
+                **_summary(tick_ms, int(server.stats()["by_api"].get("ka10001", 0)), n),
+                "stream_hits": reader.hits,
+                "rest_fallbacks": reader.misses,
+                "feed_ms_p50": round(_pct(feed_ms, 50), 3),
+                "feed_ms_p95": round(_pct(feed_ms, 95), 3),
+                "quote_age_ms_p95": round(_pct(ages, 95), 3),
+                "connects": stats["connects"],
+                "quotes": stats["quotes"],
+                "bars": table.stats()["bars"],
+            }
+    return out
+
+
+def _expire(table: QuoteTable, codes: List[str]) -> None:
+    # a dropped feed leaves the last quotes in place; age them out so reads must fall back
+    for sym in codes:
+        row = table.get(sym)
+        if row is not None:
+            table.update(sym, price=row["price"], ts=float(row["ts"]) - table.max_age_sec - 1.0)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="M32-23: quote reads, REST polling vs the realtime stream (local stand-ins).")
+    p.add_argument("--ticks", type=int, default=50)
+    p.add_argument("--symbols", type=int, default=5)
+    p.add_argument("--latency", default="normal:5:2", help="REST latency: fixed:ms | uniform:lo:hi | normal:mean:sd | lognormal:median:sigma")
+    p.add_argument("--drop-at", type=int, default=-1, help="cut the feed connection before this tick")
+    p.add_argument("--max-age-ms", type=float, default=5000.0)
+    p.add_argument("--json", action="store_true")
+    args = p.parse_args(argv)
+
+    out = run_benchmark(ticks=args.ticks, symbols=args.symbols, latency=args.latency, drop_at=args.drop_at, max_age_ms=args.max_age_ms)
+    if args.json:
+        print(json.dumps(out, ensure_ascii=False))
+    else:
+        print("=== Quote reads: poll vs stream ===")
+        for mode in ("poll", "stream"):
+            r = out[mode]
+            print(
+                f"{mode:6s} tick p50/p95={r['tick_ms_p50']}/{r['tick_ms_p95']}ms "
+                f"price_requests={r['price_requests']} ({r['price_requests_per_tick']}/tick)"
+            )
+        s = out["stream"]
+        print(
+            f"stream hits={s['stream_hits']} fallbacks={s['rest_fallbacks']} feed p50/p95={s['feed_ms_p50']}/{s['feed_ms_p95']}ms "
+            f"age p95={s['quote_age_ms_p95']}ms connects={s['connects']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from libs.runtime.risk_allocation import RiskAllocator
+
+
+def _pct(values: List[float], q: float) -> float:
+    return round(float(np.percentile(values, q)) * 1000.0, 3) if values else 0.0
+
+
+def run_benchmark(
+    *,
+    strategies: int = 50,
+    symbols: int = 500,
+    holdings: int = 20,
+    warmup: int = 60,
+    ticks: int = 200,
+    mode: str = "risk_parity",
+    seed: int = 7,
+) -> Dict[str, Any]:
+    """Per-tick latency of `observe` (covariance update) + `allocate` for strategies x symbols.
+
+    Symbol returns come from a 5-factor model; each strategy holds `holdings` equal-weight symbols.
+    """
+    rng = np.random.default_rng(seed)
+    keys = [f"{i:06d}" for i in range(max(1, int(symbols)))]
+    alloc = RiskAllocator(keys, min_obs=min(20, max(1, int(warmup))))
+    alloc.set_exposures(
+        {
+            f"s{j}": {keys[k]: 1.0 / holdings for k in rng.choice(len(keys), min(holdings, len(keys)), replace=False)}
+            for j in range(max(1, int(strategies)))
+        }
+    )
+    loadings = rng.normal(size=(len(keys), 5)) * 0.01
+    profiles = [{"strategy_id": f"s{j}", "weight": 1.0 + (j % 3)} for j in range(max(1, int(strategies)))]
+
+    def _returns() -> np.ndarray:
+        return loadings @ rng.normal(size=5) + rng.normal(size=len(keys)) * 0.01
+
+    for _ in range(max(0, int(warmup))):
+        alloc.observe(_returns())
+
+    observe_sec: List[float] = []
+    tick_sec: List[float] = []
+    iterations: List[int] = []
+    out: Dict[str, Any] = {}
+    for _ in range(max(1, int(ticks))):
+        r = _returns()
+        t0 = time.perf_counter()
+        alloc.observe(r)
+        t1 = time.perf_counter()
+        out = alloc.allocate(profiles, total_notional=1e9, mode=mode)
+        t2 = time.perf_counter()
+        observe_sec.append(t1 - t0)
+        tick_sec.append(t2 - t0)
+        iterations.append(int(out["risk"].get("iterations", 0)))
+
+    return {
+        "strategies": int(strategies),
+        "symbols": int(symbols),
+        "ticks": len(tick_sec),
+        "mode": mode,
+        "observe_ms_p50": _pct(observe_sec, 50),
+        "tick_ms_p50": _pct(tick_sec, 50),
+        "tick_ms_p95": _pct(tick_sec, 95),
+        "first_tick_iterations": iterations[0] if iterations else 0,
+        "warm_iterations_p50": float(np.median(iterations[1:])) if len(iterations) > 1 else 0.0,
+        "converged": bool(out.get("risk", {}).get("converged", mode != "risk_parity")),
+        "allocation_total": out.get("allocation_total"),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="M32-17: RiskAllocator per-tick latency.")
+    p.add_argument("--strategies", type=int, default=50)
+    p.add_argument("--symbols", type=int, default=500)
+    p.add_argument("--holdings", type=int, default=20)
+    p.add_argument("--warmup", type=int, default=60)
+    p.add_argument("--ticks", type=int, default=200)
+    p.add_argument("--mode", default="risk_parity", choices=["risk_parity", "vol_target"])
+    p.add_argument("--json", action="store_true")
+    args = p.parse_args(argv)
+
+    out = run_benchmark(
+        strategies=args.strategies,
+        symbols=args.symbols,
+        holdings=args.holdings,
+        warmup=args.warmup,
+        ticks=args.ticks,
+        mode=args.mode,
+    )
+    if args.json:
+        print(json.dumps(out, ensure_ascii=False))
+    else:
+        print("=== RiskAllocator tick latency ===")
+        print(
+            f"{out['mode']} {out['strategies']}x{out['symbols']} observe_p50={out['observe_ms_p50']}ms "
+            f"tick_p50={out['tick_ms_p50']}ms tick_p95={out['tick_ms_p95']}ms "
+            f"iters(first/warm)={out['first_tick_iterations']}/{out['warm_iterations_p50']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
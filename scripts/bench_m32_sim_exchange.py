@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from libs.catalog.api_request_builder import PreparedRequest
+from libs.execution.executors.mock_executor import MockExecutor
+from libs.execution.sim_exchange import SimExchange
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    xs = sorted(values)
+    return xs[min(len(xs) - 1, int(round(q / 100.0 * (len(xs) - 1))))]
+
+
+def run_benchmark(
+    *,
+    orders: int = 20000,
+    symbols: int = 50,
+    quotes_per_order: float = 0.5,
+    market_ratio: float = 0.3,
+    latency_ms: float = 20.0,
+    latency_jitter_ms: float = 5.0,
+    seed: int = 11,
+) -> Dict[str, Any]:
+    """Replay a synthetic quote stream interleaved with order submissions through MockExecutor.
+
+    Every order goes through `MockExecutor.execute` (kt10000/kt10001 request shape), so the
+    number measures the mock execution path end to end, not the matching engine alone.
+    """
+    rng = random.Random(seed)
+    ex = SimExchange(latency_ms=latency_ms, latency_jitter_ms=latency_jitter_ms, top_qty=200, seed=seed)
+    executor = MockExecutor(exchange=ex)
+    syms = [f"{100000 + i:06d}" for i in range(max(1, int(symbols)))]
+    mids = {s: 50000.0 for s in syms}
+    ts = 1_700_000_000.0
+    for s in syms:
+        ex.on_quote(s, mids[s] - 50, mids[s] + 50, ts=ts)
+
+    t0 = time.perf_counter()
+    quote_events = 0
+    for _ in range(max(1, int(orders))):
+        ts += 0.01
+        quote_budget = quotes_per_order
+        while quote_budget > 0 and rng.random() < quote_budget:
+            s = rng.choice(syms)
+            mids[s] = max(1000.0, mids[s] + rng.choice((-50.0, 0.0, 50.0)))
+            ex.on_quote(s, mids[s] - 50, mids[s] + 50, ts=ts)
+            quote_events += 1
+            quote_budget -= 1.0
+        s = rng.choice(syms)
+        buy = rng.random() < 0.5
+        market = rng.random() < market_ratio
+        px = "" if market else str(int(mids[s] + rng.choice((-100, -50, 0, 50, 100))))
+        req = PreparedRequest(
+            api_id="kt10000" if buy else "kt10001",
+            method="POST",
+            path="/api/dostk/ordr",
+            headers={},
+            query={},
+            body={"dmst_stex_tp": "KRX", "stk_cd": s, "ord_qty": str(rng.randint(1, 50)), "ord_uv": px, "trde_tp": "3" if market else "0"},
+        )
+        executor.execute(req)
+    ts += 1.0
+    ex.advance(ts)  # let in-flight orders arrive
+    elapsed = time.perf_counter() - t0
+
+    latencies = [f["latency_sec"] * 1000.0 for f in ex.fills]
+    st = ex.stats()
+    filled = st["by_status"].get("filled", 0)
+    return {
+        "orders": st["orders"],
+        "symbols": len(syms),
+        "quote_events": quote_events,
+        "elapsed_sec": round(elapsed, 4),
+        "orders_per_sec": round(st["orders"] / elapsed, 1) if elapsed > 0 else 0.0,
+        "fills": st["fills"],
+        "filled_ratio": round(filled / max(1, st["orders"]), 4),
+        "by_status": st["by_status"],
+        "avg_slippage_bps": st["avg_slippage_bps"],
+        "fill_latency_ms_p50": round(_pct(latencies, 50), 3),
+        "fill_latency_ms_p95": round(_pct(latencies, 95), 3),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="M32-21: simulated exchange replay throughput.")
+    p.add_argument("--orders", type=int, default=20000)
+    p.add_argument("--symbols", type=int, default=50)
+    p.add_argument("--latency-ms", type=float, default=20.0)
+    p.add_argument("--latency-jitter-ms", type=float, default=5.0)
+    p.add_argument("--market-ratio", type=float, default=0.3)
+    p.add_argument("--json", action="store_true")
+    args = p.parse_args(argv)
+
+    out = run_benchmark(
+        orders=args.orders,
+        symbols=args.symbols,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        market_ratio=args.market_ratio,
+    )
+    if args.json:
+        print(json.dumps(out, ensure_ascii=False))
+    else:
+        print("=== SimExchange replay ===")
+        print(
+            f"orders={out['orders']} symbols={out['symbols']} {out['orders_per_sec']} orders/s "
+            f"fills={out['fills']} filled_ratio={out['filled_ratio']} slippage={out['avg_slippage_bps']}bps "
+            f"fill_latency p50/p95={out['fill_latency_ms_p50']}/{out['fill_latency_ms_p95']}ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from graphs.commander_runtime import run_commander_runtime
+from libs.catalog.api_request_builder import PreparedRequest
+from libs.execution.executors.real_executor import RealExecutor
+from libs.kiwoom.standin_server import KiwoomStandinServer, LatencyProfile, parse_latency_map
+from libs.read.kiwoom_price_reader import KiwoomPriceReader
+from libs.read.kiwoom_rank_reader import KiwoomRankReader, RankMode
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    xs = sorted(values)
+    return xs[min(len(xs) - 1, int(round(q / 100.0 * (len(xs) - 1))))]
+
+
+@contextmanager
+def _patched_env(values: Dict[str, str]) -> Iterator[None]:
+    saved = {k: os.environ.get(k) for k in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+def run_benchmark(
+    *,
+    ticks: int = 50,
+    topk: int = 5,
+    order_every: int = 5,
+    latency: str = "normal:5:2",
+    latency_by_api: str = "",
+    throttle_rate: float = 0.0,
+    throttle_every: int = 0,
+    page_size: int = 20,
+    seed: int = 7,
+) -> Dict[str, Any]:
+    """Drive commander runtime ticks against a local stand-in server.
+
+    One tick = `run_commander_runtime` (graph_spine) whose graph step reads the volume rank
+    (ka10030, paged), a price (ka10001) for each top symbol, and every `order_every` ticks
+    submits a 1-share market order (kt10000) through `RealExecutor`. The readers and the
+    executor are built from env exactly as in a live run, pointed at the stand-in.
+    """
+    server = KiwoomStandinServer.from_env(
+        latency=LatencyProfile.parse(latency),
+        latency_by_api=parse_latency_map(latency_by_api),
+        throttle_rate=throttle_rate,
+        throttle_every=throttle_every,
+        page_size=page_size,
+        seed=seed,
+    )
+    tick_ms: List[float] = []
+    errors: Dict[str, int] = {}
+    zero_prices = 0
+    orders = 0
+    with tempfile.TemporaryDirectory() as tmp, server:
+        env = {
+            "KIWOOM_MODE": "mock",
+            "EXECUTION_MODE": "real",
+            "KIWOOM_BASE_URL_MOCK": server.base_url,
+            "KIWOOM_APP_KEY": "standin-app",
+            "KIWOOM_APP_SECRET": "standin-secret",
+            "KIWOOM_TOKEN_CACHE_PATH": str(Path(tmp) / "token_cache.json"),
+            "KIWOOM_RETRY_MAX": "0",
+            "EVENT_LOG_PATH": str(Path(tmp) / "events.jsonl"),
+        }
+        with _patched_env(env):
+            rank = KiwoomRankReader.from_env()
+            price = KiwoomPriceReader.from_env()
+            executor = RealExecutor()
+
+            def _graph(state: Dict[str, Any]) -> Dict[str, Any]:
+                nonlocal zero_prices, orders
+                symbols = rank.get_top_symbols(mode=RankMode.VOLUME, topk=topk)
+                snaps = [price.get_market_snapshot(s) for s in symbols]
+                zero_prices += sum(1 for s in snaps if s.price <= 0)
+                if order_every > 0 and symbols and int(state["tick"]) % order_every == 0:
+                    executor.execute(
+                        PreparedRequest(
+                            api_id="kt10000",
+                            method="POST",
+                            path="/api/dostk/ordr",
+                            headers={"api-id": "kt10000"},
+                            query={},
+                            body={"dmst_stex_tp": "KRX", "stk_cd": symbols[0], "ord_qty": "1", "ord_uv": "", "trde_tp": "3"},
+                        )
+                    )
+                    orders += 1
+                state["path"] = "graph_spine"
+                state["decision"] = "noop"
+                state["scanned"] = len(snaps)
+                return state
+
+            t_start = time.perf_counter()
+            for i in range(max(1, int(ticks))):
+                t0 = time.perf_counter()
+                try:
+                    run_commander_runtime({"run_id": f"m32-standin-{i}", "tick": i}, mode="graph_spine", graph_runner=_graph)
+                except Exception as e:
+                    errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                tick_ms.append((time.perf_counter() - t0) * 1000.0)
+            elapsed = time.perf_counter() - t_start
+        st = server.stats()
+
+    return {
+        "ticks": len(tick_ms),
+        "elapsed_sec": round(elapsed, 4),
+        "ticks_per_sec": round(len(tick_ms) / elapsed, 2) if elapsed > 0 else 0.0,
+        "tick_ms_p50": round(_pct(tick_ms, 50), 3),
+        "tick_ms_p95": round(_pct(tick_ms, 95), 3),
+        "tick_ms_p99": round(_pct(tick_ms, 99), 3),
+        "tick_ms_max": round(max(tick_ms), 3) if tick_ms else 0.0,
+        "requests": st["requests"],
+        "requests_by_api": st["by_api"],
+        "responses_by_status": {str(k): v for k, v in sorted(st["by_status"].items())},
+        "throttled": st["throttled"],
+        "tokens_issued": st["tokens_issued"],
+        "orders": orders,
+        "zero_prices": zero_prices,
+        "errors": errors,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="M32-22: commander runtime load against the local Kiwoom stand-in.")
+    p.add_argument("--ticks", type=int, default=50)
+    p.add_argument("--topk", type=int, default=5)
+    p.add_argument("--order-every", type=int, default=5)
+    p.add_argument("--latency", default="normal:5:2", help="fixed:ms | uniform:lo:hi | normal:mean:sd | lognormal:median:sigma")
+    p.add_argument("--latency-by-api", default="", help="e.g. kt10000=fixed:40,ka10030=uniform:10:30")
+    p.add_argument("--throttle-rate", type=float, default=0.0, help="probability of a 429 answer")
+    p.add_argument("--throttle-every", type=int, default=0, help="429 on every N-th request of an api-id")
+    p.add_argument("--page-size", type=int, default=20)
+    p.add_argument("--json", action="store_true")
+    args = p.parse_args(argv)
+
+    out = run_benchmark(
+        ticks=args.ticks,
+        topk=args.topk,
+        order_every=args.order_every,
+        latency=args.latency,
+        latency_by_api=args.latency_by_api,
+        throttle_rate=args.throttle_rate,
+        throttle_every=args.throttle_every,
+        page_size=args.page_size,
+    )
+    if args.json:
+        print(json.dumps(out, ensure_ascii=False))
+    else:
+        print("=== Kiwoom stand-in load ===")
+        print(
+            f"ticks={out['ticks']} {out['ticks_per_sec']} ticks/s "
+            f"tick p50/p95/p99={out['tick_ms_p50']}/{out['tick_ms_p95']}/{out['tick_ms_p99']}ms "
+            f"requests={out['requests']} throttled={out['throttled']} tokens={out['tokens_issued']} "
+            f"orders={out['orders']} errors={out['errors']}"
+        )
+        print(f"by_api={out['requests_by_api']} by_status={out['responses_by_status']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
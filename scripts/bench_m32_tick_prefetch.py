@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from graphs.nodes.build_snapshots import build_snapshots
+from graphs.pipelines.m13_live_loop import run_m13_once
+from libs.read.snapshot_models import MarketSnapshot, PortfolioSnapshot
+from libs.runtime.tick_prefetch import TickPrefetcher
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    xs = sorted(values)
+    return xs[min(len(xs) - 1, int(round(q / 100.0 * (len(xs) - 1))))]
+
+
+class _SlowReads:
+    """Price + account reads with a fixed I/O latency. Every read returns a new serial
+    (as the price / cash) and remembers when it started, so the age of what a tick
+    consumed can be checked."""
+
+    def __init__(self, io_ms: float) -> None:
+        self.io_sec = max(0.0, float(io_ms)) / 1000.0
+        self._lock = threading.Lock()
+        self.started: Dict[int, float] = {}
+        self.calls = 0
+
+    def _read(self) -> int:
+        with self._lock:
+            self.calls += 1
+            serial = self.calls
+            self.started[serial] = time.monotonic()
+        time.sleep(self.io_sec)
+        return serial
+
+    def get_market_snapshot(self, symbol: str) -> MarketSnapshot:
+        return MarketSnapshot(symbol=symbol, price=float(self._read()), ts=int(time.time()))
+
+    def get_portfolio_snapshot(self) -> PortfolioSnapshot:
+        return PortfolioSnapshot(cash=float(self._read()), positions=[])
+
+
+def _run_loop(
+    *, ticks: int, io_ms: float, compute_ms: float, gap_ms: float, order_every: int, prefetcher: Optional[TickPrefetcher]
+) -> Dict[str, Any]:
+    reads = _SlowReads(io_ms)
+    state: Dict[str, Any] = {"symbol": "005930", "price_reader": reads, "portfolio_reader": reads}
+    if prefetcher is not None:
+        state["tick_prefetcher"] = prefetcher
+    tick_ms: List[float] = []
+    ages_ms: List[float] = []
+    n = {"i": 0}
+
+    def tick_fn(s: Dict[str, Any], dt: Any = None) -> Dict[str, Any]:
+        s = build_snapshots(s)
+        now = time.monotonic()
+        for serial in (int(s["market_snapshot"]["price"]), int(s["portfolio_snapshot"]["cash"])):
+            ages_ms.append((now - reads.started[serial]) * 1000.0)
+        time.sleep(compute_ms / 1000.0)  # decision + execution
+        n["i"] += 1
+        s["tick_skipped"] = False
+        s["execution"] = {"allowed": bool(order_every > 0 and n["i"] % order_every == 0)}
+        return s
+
+    for i in range(max(1, int(ticks))):
+        t0 = time.perf_counter()
+        state = run_m13_once(state, load_state_fn=lambda s: s, save_state_fn=lambda s: s, tick_fn=tick_fn, eod_fn=lambda s, dt=None: s)
+        tick_ms.append((time.perf_counter() - t0) * 1000.0)
+        if gap_ms > 0:
+            time.sleep(gap_ms / 1000.0)  # loop sleep (SCAN_INTERVAL_SEC)
+    out: Dict[str, Any] = {
+        "tick_ms_p50": round(_pct(tick_ms, 50), 3),
+        "tick_ms_p95": round(_pct(tick_ms, 95), 3),
+        "reads": reads.calls,
+        "consumed_age_ms_max": round(max(ages_ms), 3),
+    }
+    if prefetcher is not None:
+        out["prefetch"] = prefetcher.summary()
+        prefetcher.close()
+    return out
+
+
+def run_benchmark(
+    *,
+    ticks: int = 20,
+    io_ms: float = 40.0,
+    compute_ms: float = 40.0,
+    gap_ms: float = 20.0,
+    order_every: int = 5,
+    max_age_ms: float = 500.0,
+) -> Dict[str, Any]:
+    """M13 loop ticks with and without the next-tick prefetcher.
+
+    Each tick reads a price and the account (`io_ms` each, in parallel via build_snapshots),
+    then spends `compute_ms` on decision / execution; every `order_every`-th tick places an
+    order. sequential: reads on the tick path. prefetch: the reads are staged during the
+    previous tick and served if younger than `max_age_ms`. stale: the same loop with a
+    loop gap longer than `max_age_ms`, so every staged read is discarded and re-read cold.
+    """
+    kw = {"ticks": ticks, "io_ms": io_ms, "compute_ms": compute_ms, "order_every": order_every}
+    return {
+        "ticks": int(ticks),
+        "io_ms": float(io_ms),
+        "compute_ms": float(compute_ms),
+        "max_age_ms": float(max_age_ms),
+        "sequential": _run_loop(gap_ms=gap_ms, prefetcher=None, **kw),
+        "prefetch": _run_loop(gap_ms=gap_ms, prefetcher=TickPrefetcher(max_age_sec=max_age_ms / 1000.0), **kw),
+        "stale": _run_loop(gap_ms=max_age_ms * 1.5, prefetcher=TickPrefetcher(max_age_sec=max_age_ms / 1000.0), **kw),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="M32-25: M13 loop ticks with vs without background next-tick prefetch.")
+    p.add_argument("--ticks", type=int, default=20)
+    p.add_argument("--io-ms", type=float, default=40.0, help="latency of each price / account read")
+    p.add_argument("--compute-ms", type=float, default=40.0, help="decision + execution time per tick")
+    p.add_argument("--gap-ms", type=float, default=20.0, help="loop sleep between ticks")
+    p.add_argument("--order-every", type=int, default=5, help="every Nth tick places an order (0 = never)")
+    p.add_argument("--max-age-ms", type=float, default=500.0, help="prefetch freshness bound")
+    p.add_argument("--json", action="store_true")
+    args = p.parse_args(argv)
+
+    out = run_benchmark(
+        ticks=args.ticks,
+        io_ms=args.io_ms,
+        compute_ms=args.compute_ms,
+        gap_ms=args.gap_ms,
+        order_every=args.order_every,
+        max_age_ms=args.max_age_ms,
+    )
+    if args.json:
+        print(json.dumps(out, ensure_ascii=False))
+    else:
+        print(f"=== Tick prefetch: {out['ticks']} ticks, io={out['io_ms']}ms compute={out['compute_ms']}ms ===")
+        for name in ("sequential", "prefetch", "stale"):
+            r = out[name]
+            pf = r.get("prefetch") or {}
+            extra = f" hits={pf['hits']} stale={pf['stale']} invalidated={pf['invalidated']}" if pf else ""
+            print(
+                f"{name:<10} tick p50/p95={r['tick_ms_p50']}/{r['tick_ms_p95']}ms reads={r['reads']} "
+                f"max consumed age={r['consumed_age_ms_max']}ms{extra}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import gzip
 import hashlib
 import json
 from datetime import date, datetime, timedelta, timezone
@@ -21,7 +22,11 @@ def _sha256_file(path: Path) -> str:
 
 def _line_count(path: Path) -> int:
     n = 0
-    with path.open("r", encoding="utf-8", errors="ignore") as f:
+    # compressed segments (e.g. M32-14 intent archives) are counted decompressed
+    opener = gzip.open(path, "rt", encoding="utf-8", errors="ignore") if path.suffix == ".gz" else path.open(
+        "r", encoding="utf-8", errors="ignore"
+    )
+    with opener as f:
         for _ in f:
             n += 1
     return n
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from libs.supervisor.intent_archive import compact_intent_journal, default_after_days, default_archive_dir
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        description="M32-14: move terminal intents older than N days from intents.jsonl / intent state DB to archive segments."
+    )
+    p.add_argument("--intent-log-path", default="data/logs/intents.jsonl")
+    p.add_argument("--state-db-path", default="")
+    p.add_argument("--archive-dir", default="", help="Default: INTENT_ARCHIVE_DIR or data/logs/archive")
+    p.add_argument("--older-than-days", type=int, default=None, help="Default: INTENT_ARCHIVE_AFTER_DAYS or 30")
+    p.add_argument("--dry-run", action="store_true")
+    p.add_argument("--json", action="store_true")
+    return p
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    db_raw = str(args.state_db_path or "").strip() or str((os.getenv("INTENT_STATE_DB_PATH", "") or "").strip())
+    out = compact_intent_journal(
+        intent_log_path=str(args.intent_log_path),
+        state_db_path=db_raw or None,
+        archive_dir=str(args.archive_dir or "").strip() or default_archive_dir(),
+        older_than_days=default_after_days() if args.older_than_days is None else int(args.older_than_days),
+        dry_run=bool(args.dry_run),
+    )
+    if args.json:
+        print(json.dumps(out, ensure_ascii=False))
+    else:
+        print(
+            f"ok={out['ok']} dry_run={out['dry_run']} archived_intent_total={out['archived_intent_total']} "
+            f"archived_jsonl_rows={out['archived_jsonl_rows']} kept_jsonl_rows={out['kept_jsonl_rows']} "
+            f"archived_state_rows={out['archived_state_rows']} segments={len(out['segments'])}"
+        )
+    return 0 if out["ok"] else 3
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,6 +9,12 @@ import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from libs.supervisor.intent_archive import default_archive_dir, load_archived_state
+
 
 def _resolve_db_path(*, state_db_path: str, intent_log_path: str) -> Path:
     raw = str(state_db_path or "").strip()
@@ -112,6 +118,40 @@ def _load_recent_journal(db_path: Path, *, limit: int, state_filter: str = "") -
     return out
 
 
+def _merge_archived(
+    state_rows: List[Dict[str, Any]],
+    journal_transition_total: Dict[str, int],
+    *,
+    archive_dir: str,
+    state_filter: str = "",
+) -> int:
+    """M32-14: add compacted intents (read from archive segments) to the live results."""
+    states, journal = load_archived_state(archive_dir or None)
+    live = {r["intent_id"] for r in state_rows}
+    added = 0
+    for iid, r in states.items():
+        if iid in live:
+            continue
+        state_rows.append(
+            {
+                "intent_id": iid,
+                "state": str(r.get("state") or ""),
+                "updated_ts": int(r.get("updated_ts") or 0),
+                "version": int(r.get("version") or 0),
+                "archived": True,
+            }
+        )
+        added += 1
+    for j in journal:
+        to_state = str(j.get("to_state") or "")
+        if state_filter and to_state != state_filter:
+            continue
+        key = f"{str(j.get('from_state') or '')}->{to_state}"
+        journal_transition_total[key] = int(journal_transition_total.get(key, 0)) + 1
+    state_rows.sort(key=lambda r: (-int(r.get("updated_ts") or 0), str(r.get("intent_id") or "")))
+    return added
+
+
 def _summary(
     state_rows: List[Dict[str, Any]],
     *,
@@ -166,6 +206,8 @@ def _build_parser() -> argparse.ArgumentParser:
     p.add_argument("--limit", type=int, default=20)
     p.add_argument("--stuck-executing-sec", type=int, default=0)
     p.add_argument("--require-no-stuck", action="store_true")
+    p.add_argument("--include-archived", action="store_true", help="Also read compacted intents (M32-14).")
+    p.add_argument("--archive-dir", default="", help="Default: INTENT_ARCHIVE_DIR or data/logs/archive")
     p.add_argument("--json", action="store_true")
     return p
 
@@ -182,6 +224,14 @@ def main(argv: Optional[List[str]] = None) -> int:
         state_filter = str(args.state or "").strip().lower()
         state_rows = _load_state_rows(db_path)
         journal_transition_total = _load_journal_transition_total(db_path, state_filter=state_filter)
+        archived_total = 0
+        if bool(args.include_archived):
+            archived_total = _merge_archived(
+                state_rows,
+                journal_transition_total,
+                archive_dir=str(args.archive_dir or "").strip() or str(default_archive_dir()),
+                state_filter=state_filter,
+            )
         summary = _summary(
             state_rows,
             now_epoch=now_epoch,
@@ -203,6 +253,8 @@ def main(argv: Optional[List[str]] = None) -> int:
         "ok": True,
         "state_db_path": str(db_path),
         "state_filter": state_filter,
+        "include_archived": bool(args.include_archived),
+        "archived_total": int(archived_total),
         "summary": summary,
         "recent_journal": recent_journal,
     }
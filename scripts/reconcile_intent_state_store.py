@@ -4,9 +4,12 @@ import argparse
 import json
 import os
 import sqlite3
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from libs.supervisor.intent_archive import KIND_INTENTS, default_archive_dir, iter_archived_rows, load_archived_state
+from libs.supervisor.intent_store import IntentStore
 from libs.supervisor.intent_state_store import (
     INTENT_STATE_APPROVED,
     INTENT_STATE_EXECUTED,
@@ -144,12 +147,147 @@ def _repair_intent(db_path: Path, intent_id: str, final_state: str) -> Optional[
         return str(e)
 
 
+# ---- M32-15: watermark-based incremental mode ----------------------------------
+
+_TAIL_BLOCK = 64 * 1024
+
+
+def _default_watermark_path(db_path: Path) -> Path:
+    return db_path.with_name(db_path.name + ".reconcile_wm.json")
+
+
+def _load_watermark(path: Path) -> Dict[str, Any]:
+    try:
+        obj = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return obj if isinstance(obj, dict) else {}
+
+
+def _save_watermark(path: Path, wm: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(wm, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _journal_end(log_path: Path) -> Tuple[int, int]:
+    """(inode, byte offset just past the last complete line) of the JSONL journal."""
+    if not log_path.exists():
+        return 0, 0
+    st = log_path.stat()
+    with log_path.open("rb") as f:
+        pos = int(st.st_size)
+        while pos > 0:
+            start = max(0, pos - _TAIL_BLOCK)
+            f.seek(start)
+            nl = f.read(pos - start).rfind(b"\n")
+            if nl >= 0:
+                return int(st.st_ino), start + nl + 1
+            pos = start
+    return int(st.st_ino), 0
+
+
+def _max_state_journal_id(db_path: Path) -> int:
+    if not db_path.exists():
+        return 0
+    with sqlite3.connect(str(db_path)) as conn:
+        try:
+            row = conn.execute("SELECT COALESCE(MAX(id), 0) FROM intent_journal").fetchone()
+        except sqlite3.Error:
+            return 0
+    return int(row[0] or 0)
+
+
+def _jsonl_ids_between(log_path: Path, start: int, end: int) -> Set[str]:
+    out: Set[str] = set()
+    if end <= start:
+        return out
+    with log_path.open("rb") as f:
+        f.seek(start)
+        chunk = f.read(end - start)
+    for raw in chunk.splitlines():
+        try:
+            obj = json.loads(raw.decode("utf-8"))
+        except Exception:
+            continue
+        if isinstance(obj, dict):
+            iid = _extract_intent_id(obj)
+            if iid:
+                out.add(iid)
+    return out
+
+
+def _state_ids_between(db_path: Path, after_id: int, upto_id: int) -> Set[str]:
+    if not db_path.exists() or upto_id <= after_id:
+        return set()
+    with sqlite3.connect(str(db_path)) as conn:
+        rows = conn.execute(
+            "SELECT DISTINCT intent_id FROM intent_journal WHERE id > ? AND id <= ?", (int(after_id), int(upto_id))
+        ).fetchall()
+    return {str(r[0]) for r in rows}
+
+
+def _load_sqlite_states_for(db_path: Path, ids: Set[str]) -> Dict[str, str]:
+    if not db_path.exists() or not ids:
+        return {}
+    with sqlite3.connect(str(db_path)) as conn:
+        try:
+            rows = conn.execute(
+                "SELECT intent_id, state FROM intent_state WHERE intent_id IN (SELECT value FROM json_each(?))",
+                (json.dumps(sorted(ids)),),
+            ).fetchall()
+        except sqlite3.Error:
+            return {}
+    return {str(r[0]): str(r[1] or "") for r in rows}
+
+
+def _expected_state_for(log_path: Path, ids: Set[str]) -> Dict[str, str]:
+    """Expected state of `ids` from their latest JSONL row (M32-12 index, no full scan)."""
+    if not ids:
+        return {}
+    latest = IntentStore(str(log_path)).latest_rows_for(sorted(ids))
+    return {iid: _normalize_status(row.get("status")) for iid, row in latest.items()}
+
+
+def _full_pass_reason(
+    args: argparse.Namespace, wm: Dict[str, Any], *, ino: int, end: int, max_id: int, now: int
+) -> str:
+    if bool(args.full):
+        return "requested"
+    if not wm:
+        return "no_watermark"
+    if int(wm.get("journal_ino") or 0) != ino or int(wm.get("journal_offset") or 0) > end:
+        return "journal_rewritten"
+    if int(wm.get("max_journal_id") or 0) > max_id:
+        return "state_db_reset"
+    every = max(0, int(args.full_every_sec))
+    if every and now - int(wm.get("last_full_ts") or 0) >= every:
+        return "periodic"
+    return ""
+
+
 def _build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(description="Reconcile JSONL intent journal and SQLite intent state store.")
     p.add_argument("--intent-log-path", default="data/logs/intents.jsonl")
     p.add_argument("--state-db-path", default="")
     p.add_argument("--repair", action="store_true", help="Repair missing/mismatched SQLite states by replaying from JSONL.")
     p.add_argument("--limit-details", type=int, default=20)
+    p.add_argument("--include-archived", action="store_true", help="Also compare compacted intents (M32-14).")
+    p.add_argument("--archive-dir", default="", help="Default: INTENT_ARCHIVE_DIR or data/logs/archive")
+    p.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reconcile only intents touched since the last watermark (M32-15); falls back to a full pass when needed.",
+    )
+    p.add_argument("--full", action="store_true", help="With --incremental: force a full pass and reset the watermark.")
+    p.add_argument(
+        "--full-every-sec",
+        type=int,
+        default=int(os.getenv("INTENT_RECONCILE_FULL_EVERY_SEC", "86400") or 86400),
+        help="With --incremental: run a full pass when the last one is older than this (0 = never).",
+    )
+    p.add_argument("--watermark-path", default="", help="Default: <state db>.reconcile_wm.json")
     p.add_argument("--json", action="store_true")
     return p
 
@@ -164,9 +302,41 @@ def main(argv: Optional[List[str]] = None) -> int:
         env_db = str((os.getenv("INTENT_STATE_DB_PATH", "") or "").strip())
         db_path = Path(env_db) if env_db else log_path.with_suffix(".db")
 
-    rows = _load_jsonl(log_path)
-    expected = _expected_state_by_intent(rows)
-    sqlite_before = _load_sqlite_states(db_path)
+    now = int(time.time())
+    wm_path = Path(str(args.watermark_path).strip()) if str(args.watermark_path or "").strip() else _default_watermark_path(db_path)
+    wm = _load_watermark(wm_path) if bool(args.incremental) else {}
+    # bounds first: anything written after this point belongs to the next run
+    max_id = _max_state_journal_id(db_path)
+    ino, end = _journal_end(log_path)
+    full_reason = _full_pass_reason(args, wm, ino=ino, end=end, max_id=max_id, now=now) if bool(args.incremental) else "full"
+    incremental = bool(args.incremental) and not full_reason
+    scope: Optional[Set[str]] = None
+
+    archived_states: Dict[str, str] = {}
+    if incremental:
+        scope = (
+            _jsonl_ids_between(log_path, int(wm.get("journal_offset") or 0), end)
+            | _state_ids_between(db_path, int(wm.get("max_journal_id") or 0), max_id)
+            | {str(x) for x in (wm.get("pending") or [])}
+        )
+        expected = _expected_state_for(log_path, scope)
+        live_ids = set(expected)
+    else:
+        rows = _load_jsonl(log_path)
+        live_ids = set(_expected_state_by_intent(rows))
+        if bool(args.include_archived):
+            archive_dir = str(args.archive_dir or "").strip() or str(default_archive_dir())
+            # archived rows sort before live ones on equal ts (_line 0)
+            rows = [{**r, "_line": 0} for r in iter_archived_rows(archive_dir, kind=KIND_INTENTS)] + rows
+            archived_states = {iid: str(r.get("state") or "") for iid, r in load_archived_state(archive_dir)[0].items()}
+        expected = _expected_state_by_intent(rows)
+
+    def _states() -> Dict[str, str]:
+        if scope is not None:
+            return _load_sqlite_states_for(db_path, scope)
+        return {**archived_states, **_load_sqlite_states(db_path)}
+
+    sqlite_before = _states()
 
     missing = sorted([iid for iid in expected.keys() if iid not in sqlite_before])
     mismatch = sorted(
@@ -177,25 +347,45 @@ def main(argv: Optional[List[str]] = None) -> int:
     repaired: List[str] = []
     repair_errors: Dict[str, str] = {}
     if bool(args.repair):
-        for iid in (missing + mismatch):
+        # archived intents are never replayed into the live store
+        for iid in (i for i in (missing + mismatch) if i in live_ids or i not in archived_states):
             err = _repair_intent(db_path, iid, expected.get(iid, INTENT_STATE_PENDING))
             if err:
                 repair_errors[iid] = err
             else:
                 repaired.append(iid)
 
-    sqlite_after = _load_sqlite_states(db_path)
+    sqlite_after = _states()
     missing_after = sorted([iid for iid in expected.keys() if iid not in sqlite_after])
     mismatch_after = sorted(
         [iid for iid, st in expected.items() if iid in sqlite_after and str(sqlite_after.get(iid) or "") != st]
     )
 
     ok = (len(missing_after) == 0) and (len(mismatch_after) == 0) and (len(repair_errors) == 0)
+    if bool(args.incremental):
+        # unresolved intents stay in scope for the next incremental run
+        _save_watermark(
+            wm_path,
+            {
+                "journal_ino": ino,
+                "journal_offset": end,
+                "max_journal_id": max_id,
+                "last_full_ts": now if not incremental else int(wm.get("last_full_ts") or 0),
+                "updated_ts": now,
+                "pending": sorted(set(missing_after) | set(mismatch_after) | set(orphan) | set(repair_errors)),
+            },
+        )
     lim = max(1, int(args.limit_details))
     summary = {
         "ok": bool(ok),
+        "mode": "incremental" if incremental else "full",
+        "full_reason": full_reason if bool(args.incremental) else "",
+        "scope_total": int(len(scope)) if scope is not None else None,
+        "watermark_path": str(wm_path) if bool(args.incremental) else "",
         "intent_log_path": str(log_path),
         "state_db_path": str(db_path),
+        "include_archived": bool(args.include_archived),
+        "archived_intent_total": int(len(archived_states)),
         "jsonl_intent_total": int(len(expected)),
         "sqlite_intent_total_before": int(len(sqlite_before)),
         "sqlite_intent_total_after": int(len(sqlite_after)),
@@ -221,7 +411,7 @@ def main(argv: Optional[List[str]] = None) -> int:
         print(json.dumps(summary, ensure_ascii=False))
     else:
         print(
-            f"ok={summary['ok']} jsonl_intent_total={summary['jsonl_intent_total']} "
+            f"ok={summary['ok']} mode={summary['mode']} jsonl_intent_total={summary['jsonl_intent_total']} "
             f"missing_before={summary['missing_total_before']} mismatch_before={summary['mismatch_total_before']} "
             f"repaired_total={summary['repaired_total']} missing_after={summary['missing_total_after']} "
             f"mismatch_after={summary['mismatch_total_after']}"
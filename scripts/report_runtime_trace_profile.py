@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from libs.runtime.span_tracer import TRACE_EVENT, TRACE_STAGE
+
+
+def _load_jsonl(path: Path) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    if not path.exists():
+        return out
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            s = line.strip()
+            if not s:
+                continue
+            try:
+                rec = json.loads(s)
+            except Exception:
+                continue
+            if isinstance(rec, dict):
+                out.append(rec)
+    return out
+
+
+def _trace_payloads(rows: List[Dict[str, Any]], *, trace: str = "") -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    for rec in rows:
+        if rec.get("stage") != TRACE_STAGE or rec.get("event") != TRACE_EVENT:
+            continue
+        p = rec.get("payload") if isinstance(rec.get("payload"), dict) else {}
+        if not isinstance(p.get("spans"), list):
+            continue
+        if trace and str(p.get("trace") or "") != trace:
+            continue
+        out.append(p)
+    return out
+
+
+def _percentile(sorted_vals: List[float], p: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    idx = min(len(sorted_vals) - 1, max(0, int(round(p / 100.0 * (len(sorted_vals) - 1)))))
+    return float(sorted_vals[idx])
+
+
+def _span_rows(payload: Dict[str, Any]) -> List[Tuple[str, int, int, int]]:
+    rows: List[Tuple[str, int, int, int]] = []
+    for s in payload.get("spans") or []:
+        if not isinstance(s, list) or len(s) < 4:
+            continue
+        rows.append((str(s[0]), int(s[1]), int(s[2]), int(s[3])))
+    return rows
+
+
+def aggregate_node_latency(payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per span name: count, total, p50/p95/p99/max in ms (durations summed per run).
+
+    `cache_hits` counts spans restored from the graph node memo (attr `cache="hit"`).
+    """
+    per_name: Dict[str, List[float]] = {}
+    hits: Dict[str, int] = {}
+    for p in payloads:
+        for s in p.get("spans") or []:
+            if isinstance(s, list) and len(s) > 4 and isinstance(s[4], dict) and s[4].get("cache") == "hit":
+                hits[str(s[0])] = hits.get(str(s[0]), 0) + 1
+        run_totals: Dict[str, int] = {}
+        for name, _parent, _start, dur in _span_rows(p):
+            # retry_scan repeats nodes in one run; profile the per-run cost
+            run_totals[name] = run_totals.get(name, 0) + dur
+        for name, dur in run_totals.items():
+            per_name.setdefault(name, []).append(dur / 1000.0)
+    table: List[Dict[str, Any]] = []
+    for name, vals in per_name.items():
+        vals.sort()
+        table.append(
+            {
+                "node": name,
+                "runs": len(vals),
+                "p50_ms": round(_percentile(vals, 50), 3),
+                "p95_ms": round(_percentile(vals, 95), 3),
+                "p99_ms": round(_percentile(vals, 99), 3),
+                "max_ms": round(vals[-1], 3),
+                "total_ms": round(sum(vals), 3),
+                "cache_hits": hits.get(name, 0),
+            }
+        )
+    table.sort(key=lambda r: r["total_ms"], reverse=True)
+    return table
+
+
+def folded_stacks(payloads: List[Dict[str, Any]]) -> List[str]:
+    """Brendan Gregg folded format: `a;b;c <self_us>` (feed to flamegraph.pl / speedscope)."""
+    acc: Dict[str, int] = {}
+    for p in payloads:
+        rows = _span_rows(p)
+        child_us = [0] * len(rows)
+        for name, parent, _start, dur in rows:
+            if 0 <= parent < len(rows):
+                child_us[parent] += dur
+        paths: List[str] = []
+        for i, (name, parent, _start, dur) in enumerate(rows):
+            path = f"{paths[parent]};{name}" if 0 <= parent < i else name
+            paths.append(path)
+            self_us = max(0, dur - child_us[i])
+            if self_us:
+                acc[path] = acc.get(path, 0) + self_us
+    return [f"{path} {us}" for path, us in sorted(acc.items())]
+
+
+def _print_table(table: List[Dict[str, Any]], runs: int) -> None:
+    print("=== Runtime Trace Profile ===")
+    print(f"runs={runs}")
+    print(f"{'node':<24} {'runs':>6} {'p50_ms':>10} {'p95_ms':>10} {'p99_ms':>10} {'max_ms':>10} {'hits':>6}")
+    for r in table:
+        print(
+            f"{r['node']:<24} {r['runs']:>6} {r['p50_ms']:>10.3f} {r['p95_ms']:>10.3f} "
+            f"{r['p99_ms']:>10.3f} {r['max_ms']:>10.3f} {r['cache_hits']:>6}"
+        )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="M32-7: aggregate runtime_trace span events into a latency profile.")
+    p.add_argument("--path", default=os.getenv("EVENT_LOG_PATH", "./data/logs/events.jsonl"))
+    p.add_argument("--trace", default="", help="Filter by trace root name (run_trading_graph / commander_runtime).")
+    p.add_argument("--folded", action="store_true", help="Emit folded stacks (self time in us) instead of the table.")
+    p.add_argument("--json", action="store_true")
+    args = p.parse_args(argv)
+
+    payloads = _trace_payloads(_load_jsonl(Path(args.path)), trace=str(args.trace or "").strip())
+    if args.folded:
+        for line in folded_stacks(payloads):
+            print(line)
+        return 0
+    table = aggregate_node_latency(payloads)
+    if args.json:
+        print(json.dumps({"runs": len(payloads), "nodes": table}, ensure_ascii=False))
+    else:
+        _print_table(table, len(payloads))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
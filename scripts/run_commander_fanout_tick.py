@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from graphs.commander_fanout import DEFAULT_TICK_FN, run_commander_fanout
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="M32-10: run one tick for N strategy/account profiles in a process pool.")
+    p.add_argument("--spec", required=True, help="JSON file: {profiles:[...], shared:{...}, strategy_budget_map:{...}, ...}")
+    p.add_argument("--mode", choices=["process", "thread", "inline"], default=None)
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--tick-fn", default=DEFAULT_TICK_FN, help="module:function run per profile.")
+    p.add_argument("--json", action="store_true", help="Emit the full result as JSON.")
+    return p
+
+
+def load_spec(path: str) -> Dict[str, Any]:
+    spec = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(spec, dict) or not isinstance(spec.get("profiles"), list):
+        raise ValueError("spec must be an object with a 'profiles' list")
+    return spec
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    spec = load_spec(args.spec)
+    out = run_commander_fanout(
+        spec["profiles"],
+        shared=spec.get("shared") if isinstance(spec.get("shared"), dict) else None,
+        tick_fn=str(args.tick_fn),
+        mode=args.mode,
+        max_workers=args.workers,
+        allocation_result=spec.get("allocation_result"),
+        strategy_budget_map=spec.get("strategy_budget_map"),
+        default_symbol_max_notional=float(spec.get("default_symbol_max_notional") or 0.0),
+        symbol_max_notional_map=spec.get("symbol_max_notional_map"),
+        market_prices=spec.get("market_prices"),
+    )
+    if args.json:
+        print(json.dumps(out, ensure_ascii=False, default=str))
+    else:
+        print(
+            f"mode={out['mode']} workers={out['workers']} profiles={out['profile_total']} errors={out['profile_errors']} "
+            f"intents={len(out['intents'])} approved={len(out['approved_intents'])} blocked={len(out['blocked_intents'])} "
+            f"tick_wall_ms={out['tick_wall_ms']} tick_sum_ms={out['tick_sum_ms']}"
+        )
+    return 0 if out["profile_errors"] == 0 else 3
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
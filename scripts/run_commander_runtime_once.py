@@ -11,6 +11,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from graphs.commander_runtime import run_commander_runtime, RuntimeMode
+from libs.llm.http_pool import warm_up_llm_connections
 
 
 def _stub_graph_runner(state: Dict[str, Any]) -> Dict[str, Any]:
@@ -76,6 +77,8 @@ def main(argv: Optional[List[str]] = None) -> int:
     typed_mode = cast(Optional[RuntimeMode], args.mode)
 
     if args.live:
+        # M32-2: pre-open pooled LLM connections (LLM_HTTP_WARMUP=true).
+        warm_up_llm_connections()
         out = run_commander_runtime(state, mode=typed_mode)
     else:
         out = run_commander_runtime(
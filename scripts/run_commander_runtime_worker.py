@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, cast
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from graphs.commander_runtime import RuntimeMode
+from graphs.commander_worker import CommanderRuntimeWorker, WarmRuntimeComponents
+from libs.llm.http_pool import warm_up_llm_connections
+from scripts.run_commander_runtime_once import (
+    _stub_decide,
+    _stub_execute,
+    _stub_graph_runner,
+    _stub_integrated_runner,
+)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="M32-6: run commander runtime ticks on a warm worker.")
+    p.add_argument("--mode", choices=["graph_spine", "decision_packet", "integrated_chain"], default=None)
+    p.add_argument("--ticks", type=int, default=5)
+    p.add_argument("--sleep-sec", type=float, default=0.0)
+    p.add_argument("--run-id-prefix", default="m32-worker")
+    p.add_argument("--catalog-path", default=None)
+    p.add_argument("--skills-dir", default=None)
+    p.add_argument("--live", action="store_true", help="Use real node path instead of offline smoke stubs.")
+    p.add_argument("--json", action="store_true", help="Emit compact JSON summary.")
+    return p
+
+
+def run_worker(
+    *,
+    ticks: int,
+    mode: Optional[str] = None,
+    live: bool = False,
+    sleep_sec: float = 0.0,
+    run_id_prefix: str = "m32-worker",
+    catalog_path: Optional[str] = None,
+    skills_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    runtime_kwargs: Dict[str, Any] = {"mode": cast(Optional[RuntimeMode], mode)}
+    if not live:
+        runtime_kwargs.update(
+            graph_runner=_stub_graph_runner,
+            integrated_runner=_stub_integrated_runner,
+            decide=_stub_decide,
+            execute=_stub_execute,
+        )
+    else:
+        # M32-2: pre-open pooled LLM connections (LLM_HTTP_WARMUP=true).
+        warm_up_llm_connections()
+    worker = CommanderRuntimeWorker(
+        WarmRuntimeComponents(catalog_path=catalog_path, skills_dir=skills_dir),
+        runtime_kwargs=runtime_kwargs,
+    )
+    worker.start()
+    outs = worker.run(lambda i: {"run_id": f"{run_id_prefix}-{i + 1}"}, ticks=ticks, sleep_sec=sleep_sec)
+    summary = worker.summary()
+    summary["live"] = bool(live)
+    summary["per_tick"] = [dict(o.get("runtime_worker") or {}) for o in outs]
+    summary["last_status"] = outs[-1].get("runtime_status", "ok") if outs else None
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    out = run_worker(
+        ticks=int(args.ticks),
+        mode=args.mode,
+        live=bool(args.live),
+        sleep_sec=float(args.sleep_sec),
+        run_id_prefix=str(args.run_id_prefix),
+        catalog_path=args.catalog_path,
+        skills_dir=args.skills_dir,
+    )
+    if args.json:
+        print(json.dumps(out, ensure_ascii=False))
+    else:
+        print(
+            f"ticks={out['ticks']} cold_setup_ms={out['cold_setup_ms']} mean_setup_ms={out['mean_setup_ms']} "
+            f"mean_decision_ms={out['mean_decision_ms']} reloads={out['reloads']} setup_saved_ms={out['setup_saved_ms']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,7 +6,10 @@ from argparse import ArgumentParser
 from datetime import datetime
 from typing import Any, Dict, Optional
 
+from graphs.commander_worker import WarmRuntimeComponents
+from libs.llm.http_pool import warm_up_llm_connections
 from libs.runtime.market_hours import now_kst
+from libs.runtime.tick_prefetch import STATE_KEY as PREFETCH_STATE_KEY, TickPrefetcher, prefetch_enabled
 from graphs.pipelines.m13_live_loop import run_m13_once
 
 
@@ -19,12 +22,25 @@ def main(argv: Optional[list[str]] = None) -> int:
     p = ArgumentParser(description="Run M13 live loop (mock-safe).")
     p.add_argument("--once", action="store_true", help="Run a single iteration and exit.")
     p.add_argument("--sleep-sec", type=int, default=int(os.getenv("SCAN_INTERVAL_SEC", "60")), help="Sleep seconds between iterations.")
+    p.add_argument("--warm", action="store_true", help="Reuse catalog/supervisor/executor across iterations (M32-6).")
+    p.add_argument("--prefetch", action="store_true", help="Prefetch next-tick reads in the background (M32-25).")
     args = p.parse_args(argv)
 
     state: Dict[str, Any] = _build_initial_state()
+    # M32-2: pre-open pooled LLM connections (LLM_HTTP_WARMUP=true).
+    warm_up_llm_connections()
+    components = WarmRuntimeComponents() if args.warm else None
+    if args.prefetch or prefetch_enabled():
+        # M32-25: start the next tick's reads M13_PREFETCH_LEAD_SEC before it, not right after this one
+        lead = float(os.getenv("M13_PREFETCH_LEAD_SEC", "2") or 2)
+        state[PREFETCH_STATE_KEY] = TickPrefetcher.from_env(delay_sec=max(0.0, max(1, int(args.sleep_sec)) - lead))
 
     while True:
         dt: datetime = now_kst()
+        if components is not None:
+            # hot-reloads on catalog/skills/.env mtime change
+            components.refresh()
+            components.inject(state)
         state = run_m13_once(state, dt=dt)
 
         if args.once:
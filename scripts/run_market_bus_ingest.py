@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from libs.market.quote_table import QuoteTable
+from libs.market.snapshot_bus import MarketBusWriter
+from libs.read.kiwoom_price_reader import KiwoomPriceReader
+from libs.read.kiwoom_rank_reader import KiwoomRankReader, RankMode
+from libs.runtime.feature_engine import build_feature_map
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="M32-24: single ingest process filling the shared-memory market bus.")
+    p.add_argument("--path", default="", help="bus file (default: env MARKET_BUS_PATH)")
+    p.add_argument("--capacity", type=int, default=0, help="symbol slots (default: env MARKET_BUS_CAPACITY / 512)")
+    p.add_argument("--source", choices=["rest", "stream"], default="rest")
+    p.add_argument("--rank-mode", choices=[m.value for m in RankMode], default=RankMode.VOLUME.value)
+    p.add_argument("--topk", type=int, default=20)
+    p.add_argument("--rank-every", type=int, default=10, help="refresh the rank list every N ticks")
+    p.add_argument("--interval-sec", type=float, default=1.0)
+    p.add_argument("--ticks", type=int, default=0, help="0 = run until interrupted")
+    p.add_argument("--json", action="store_true", help="Emit compact JSON summary.")
+    return p
+
+
+def run_ingest(
+    *,
+    path: str = "",
+    capacity: int = 0,
+    source: str = "rest",
+    rank_mode: str = RankMode.VOLUME.value,
+    topk: int = 20,
+    rank_every: int = 10,
+    interval_sec: float = 1.0,
+    ticks: int = 0,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Dict[str, Any]:
+    """Read the rank list and quotes once for every worker, and publish them to the bus.
+
+    rest: one ka10001 call per ranked symbol per tick. stream: the ranked symbols are
+    watched by a `KiwoomRealtimeClient`, and REST is only called for symbols without a
+    fresh streamed quote. Either way quotes are folded into a local `QuoteTable`, whose
+    bars give the `build_feature_map` features published next to the quotes.
+    """
+    writer = MarketBusWriter(path, capacity=capacity) if path and capacity > 0 else MarketBusWriter.from_env(path or None)
+    table = QuoteTable.from_env()
+    rank = KiwoomRankReader.from_env()
+    price = KiwoomPriceReader.from_env()
+    client = None
+    if source == "stream":
+        from libs.kiwoom.realtime_ws import KiwoomRealtimeClient
+
+        client = KiwoomRealtimeClient.from_env(table).start()
+
+    symbols: List[str] = []
+    stats: Dict[str, Any] = {"ticks": 0, "rank_calls": 0, "price_calls": 0, "published": 0, "errors": {}}
+    try:
+        i = 0
+        while ticks <= 0 or i < ticks:
+            t0 = time.monotonic()
+            try:
+                if not symbols or (rank_every > 0 and i % rank_every == 0):
+                    symbols = rank.get_top_symbols(mode=RankMode(rank_mode), topk=topk) or symbols
+                    stats["rank_calls"] += 1
+                    table.watch(symbols)
+                streamed = table.snapshot(symbols=symbols) if client is not None else {}
+                for sym in symbols:
+                    if streamed.get(sym, {}).get("source") == "stream" and streamed[sym].get("price"):
+                        continue
+                    snap = price.get_market_snapshot(sym)
+                    stats["price_calls"] += 1
+                    if snap.price > 0:
+                        table.update(sym, price=snap.price, source="rest")
+                features = build_feature_map(table.ohlcv_by_symbol(symbols))
+                stats["published"] += writer.write_quotes(table.snapshot(symbols=symbols), features=features)
+            except Exception as e:
+                stats["errors"][type(e).__name__] = stats["errors"].get(type(e).__name__, 0) + 1
+            i += 1
+            stats["ticks"] = i
+            if ticks <= 0 or i < ticks:
+                sleep(max(0.0, interval_sec - (time.monotonic() - t0)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if client is not None:
+            client.stop()
+            stats["stream"] = dict(client.stats)
+        stats["bus"] = {"path": str(writer.path), "version": writer.version, **writer.stats}
+        writer.close()
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    out = run_ingest(
+        path=str(args.path or "").strip(),
+        capacity=int(args.capacity),
+        source=args.source,
+        rank_mode=args.rank_mode,
+        topk=args.topk,
+        rank_every=args.rank_every,
+        interval_sec=args.interval_sec,
+        ticks=args.ticks,
+    )
+    if args.json:
+        print(json.dumps(out, ensure_ascii=False))
+    else:
+        print(
+            f"ticks={out['ticks']} rank_calls={out['rank_calls']} price_calls={out['price_calls']} "
+            f"published={out['published']} bus={out['bus']['path']} errors={out['errors']}"
+        )
+    return 0 if not out["errors"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
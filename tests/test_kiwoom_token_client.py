@@ -83,3 +83,31 @@ def test_missing_credentials_raises(tmp_path, monkeypatch):
 
     with pytest.raises(KiwoomAuthError):
         cli.ensure_token()
+
+
+def test_concurrent_clients_share_one_refresh(tmp_path, monkeypatch):
+    import threading
+
+    s = make_settings(tmp_path, monkeypatch)
+
+    class SlowSession(DummySession):
+        def request(self, **kwargs):
+            time.sleep(0.05)
+            return super().request(**kwargs)
+
+    sessions = [SlowSession(payload={"access_token": f"tok{i}", "expires_in": 100}) for i in range(2)]
+    clients = [KiwoomTokenClient(s, HttpClient(s.base_url, session=sess, retry_max=0)) for sess in sessions]
+    results = [None, None]
+
+    def run(i):
+        results[i] = clients[i].ensure_token()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(len(sess.calls) for sess in sessions) == 1
+    assert sorted(r.action for r in results) == ["cache_hit", "refreshed"]
+    assert results[0].token == results[1].token
+    assert [p.name for p in tmp_path.iterdir()] == ["token_cache.json"]  # no temp files left
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+
+import pytest
+
+from graphs.commander_fanout import merge_profile_intents, run_commander_fanout
+from scripts.run_commander_fanout_tick import main as fanout_main
+
+
+SHARED = {
+    "mock_scan_results": {
+        "005930": {"score": 0.9, "risk_score": 0.1, "confidence": 0.9},
+        "000660": {"score": 0.8, "risk_score": 0.2, "confidence": 0.8},
+        "035420": {"score": 0.7, "risk_score": 0.9, "confidence": 0.9},
+    },
+    "market_prices": {"005930": 70000, "000660": 150000, "035420": 200000},
+}
+
+
+def _profiles():  # type: ignore[no-untyped-def]
+    return [
+        {"profile_id": "p1", "strategy_id": "s1", "account_id": "A", "state": {"candidates": [{"symbol": "005930"}]}},
+        {"profile_id": "p2", "strategy_id": "s1", "account_id": "A", "state": {"candidates": [{"symbol": "000660"}]}},
+        {"profile_id": "p3", "strategy_id": "s2", "account_id": "B", "state": {"candidates": [{"symbol": "035420"}]}},
+        {"profile_id": "p4", "strategy_id": "s2", "account_id": "B", "state": {"candidates": [{"symbol": "005930"}]}},
+    ]
+
+
+def _slow_tick(state):  # type: ignore[no-untyped-def]
+    time.sleep(float(state.get("sleep_sec") or 0.0))
+    state["decision"] = "approve"
+    state["intents"] = [{"symbol": state["symbol"], "side": "BUY", "qty": 1, "pid": os.getpid()}]
+    return state
+
+
+def _failing_tick(state):  # type: ignore[no-untyped-def]
+    if state.get("boom"):
+        raise RuntimeError("tick failed")
+    return _slow_tick(state)
+
+
+@pytest.fixture(autouse=True)
+def _event_log(tmp_path, monkeypatch):  # type: ignore[no-untyped-def]
+    monkeypatch.setenv("EVENT_LOG_PATH", str(tmp_path / "events.jsonl"))
+
+
+def test_m32_10_one_guard_over_merged_intents_in_profile_order():
+    out = run_commander_fanout(_profiles(), shared=SHARED, mode="inline", strategy_budget_map={"s1": 100000, "s2": 100000})
+    assert [p["decision"] for p in out["profiles"]] == ["approve", "approve", "reject", "approve"]
+    assert [(i["profile_id"], i["symbol"], i["strategy_id"], i["account_id"]) for i in out["intents"]] == [
+        ("p1", "005930", "s1", "A"),
+        ("p2", "000660", "s1", "A"),
+        ("p4", "005930", "s2", "B"),
+    ]
+    # s1 budget fits one 70k order only; the guard saw all profiles at once
+    assert out["portfolio_guard"]["intent_total"] == 3
+    assert [b["reason"] for b in out["blocked_intents"]] == ["strategy_budget_exceeded"]
+    assert sorted(i["profile_id"] for i in out["approved_intents"]) == ["p1", "p4"]
+
+
+def test_m32_10_process_pool_matches_inline_result():
+    kw = dict(shared=SHARED, strategy_budget_map={"s1": 100000, "s2": 100000})
+    inline = run_commander_fanout(_profiles(), mode="inline", **kw)
+    pooled = run_commander_fanout(_profiles(), mode="process", max_workers=2, **kw)
+    assert pooled["mode"] == "process" and pooled["workers"] == 2
+    for key in ("intents", "approved_intents", "blocked_intents"):
+        assert pooled[key] == inline[key], key
+    # shared market data is never mutated by a tick
+    assert SHARED["mock_scan_results"]["005930"]["confidence"] == 0.9
+
+
+def test_m32_10_wall_time_scales_with_workers_not_profiles():
+    profiles = [{"profile_id": f"p{i}", "strategy_id": "s", "state": {"symbol": f"00{i:04d}"}} for i in range(4)]
+    shared = {"sleep_sec": 0.3}
+    t0 = time.perf_counter()
+    out = run_commander_fanout(profiles, shared=shared, tick_fn=_slow_tick, mode="process", max_workers=4)
+    wall = time.perf_counter() - t0
+    assert out["profile_errors"] == 0
+    assert out["tick_sum_ms"] >= 1200
+    assert wall < 1.0
+    assert len({i["pid"] for i in out["intents"]}) > 1
+    assert [i["profile_id"] for i in out["intents"]] == ["p0", "p1", "p2", "p3"]
+
+
+def test_m32_10_profile_failure_is_isolated_and_validation():
+    profiles = [
+        {"profile_id": "ok", "state": {"symbol": "005930"}},
+        {"profile_id": "bad", "state": {"symbol": "000660", "boom": True}},
+    ]
+    out = run_commander_fanout(profiles, tick_fn=_failing_tick, mode="thread")
+    assert out["profile_errors"] == 1
+    bad = out["profiles"][1]
+    assert (bad["ok"], bad["decision"], bad["error_type"]) == (False, "error", "RuntimeError")
+    assert [i["profile_id"] for i in out["approved_intents"]] == ["ok"]
+
+    with pytest.raises(ValueError):
+        run_commander_fanout([{"profile_id": "x"}, {"profile_id": "x"}], mode="inline")
+    assert merge_profile_intents([{"profile_id": "a", "intents": [{"symbol": "1", "strategy_id": "keep"}, "junk"]}]) == [
+        {"symbol": "1", "strategy_id": "keep", "profile_id": "a"}
+    ]
+
+
+def test_m32_10_script_runs_spec(tmp_path, capsys):
+    spec = tmp_path / "spec.json"
+    spec.write_text(json.dumps({"profiles": _profiles(), "shared": SHARED, "strategy_budget_map": {"s1": 100000, "s2": 100000}}))
+    assert fanout_main(["--spec", str(spec), "--mode", "inline", "--json"]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert out["profile_total"] == 4 and len(out["approved_intents"]) == 2
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from libs.supervisor.intent_state_store import (
+    INTENT_STATE_APPROVED,
+    INTENT_STATE_EXECUTED,
+    INTENT_STATE_EXECUTING,
+    INTENT_STATE_PENDING,
+    INTENT_STATE_REJECTED,
+    SQLiteIntentStateStore,
+)
+from scripts.bench_m32_intent_state_store import run_benchmark
+
+
+def test_m32_11_persistent_mode_reuses_one_wal_connection(tmp_path):
+    store = SQLiteIntentStateStore(str(tmp_path / "s.db"), persistent=True)
+    store.ensure_intent("i-1")
+    conn = store._conn
+    store.transition(intent_id="i-1", to_state=INTENT_STATE_APPROVED)
+    assert store._conn is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+    # a second store (other process/worker) sees committed rows immediately
+    other = SQLiteIntentStateStore(str(tmp_path / "s.db"), persistent=True)
+    assert other.get_state("i-1")["state"] == INTENT_STATE_APPROVED
+    store.close()
+    other.close()
+
+
+def test_m32_11_transition_many_checks_each_item(tmp_path):
+    store = SQLiteIntentStateStore(str(tmp_path / "s.db"), persistent=True)
+    for iid in ("a", "b", "c", "d"):
+        store.ensure_intent(iid)
+    store.transition(intent_id="d", to_state=INTENT_STATE_APPROVED)
+
+    out = store.transition_many(
+        [
+            {"intent_id": "a", "to_state": INTENT_STATE_APPROVED, "expected_version": 1, "reason": "ok"},
+            {"intent_id": "b", "to_state": INTENT_STATE_APPROVED, "expected_version": 7},
+            {"intent_id": "c", "to_state": INTENT_STATE_EXECUTING},
+            {"intent_id": "d", "to_state": INTENT_STATE_REJECTED, "expected_from_state": INTENT_STATE_PENDING},
+            {"intent_id": "a", "to_state": INTENT_STATE_EXECUTING, "expected_version": 2},
+            {"intent_id": "", "to_state": INTENT_STATE_APPROVED},
+        ]
+    )
+    assert [r["ok"] for r in out] == [True, False, False, False, True, False]
+    assert "Version mismatch" in out[1]["error"]
+    assert "Invalid intent state transition" in out[2]["error"]
+    assert "State mismatch" in out[3]["error"]
+    assert (out[4]["state"], out[4]["version"]) == (INTENT_STATE_EXECUTING, 3)
+
+    assert store.get_state("a")["state"] == INTENT_STATE_EXECUTING
+    b = store.get_state("b")
+    assert (b["state"], b["version"]) == (INTENT_STATE_PENDING, 1)
+    assert store.get_state("d")["state"] == INTENT_STATE_APPROVED
+    # failed items leave no journal rows behind
+    assert [r["to_state"] for r in store.list_journal("b")] == [INTENT_STATE_PENDING]
+    assert [r["to_state"] for r in store.list_journal("a")] == [INTENT_STATE_PENDING, INTENT_STATE_APPROVED, INTENT_STATE_EXECUTING]
+
+
+def test_m32_11_atomic_batch_rolls_back_everything(tmp_path):
+    store = SQLiteIntentStateStore(str(tmp_path / "s.db"))
+    store.ensure_intent("a")
+    with pytest.raises(ValueError, match="item 1"):
+        store.transition_many(
+            [
+                {"intent_id": "a", "to_state": INTENT_STATE_APPROVED},
+                {"intent_id": "new", "to_state": INTENT_STATE_EXECUTED},
+            ],
+            atomic=True,
+        )
+    assert store.get_state("a")["state"] == INTENT_STATE_PENDING
+    assert store.get_state("new") is None
+
+
+def test_m32_11_single_transition_keeps_legacy_semantics(tmp_path):
+    for persistent in (False, True):
+        store = SQLiteIntentStateStore(str(tmp_path / f"s{int(persistent)}.db"), persistent=persistent)
+        with pytest.raises(ValueError, match="Invalid intent state transition"):
+            store.transition(intent_id="x", to_state=INTENT_STATE_EXECUTED)
+        # unknown intent is still created as pending
+        assert store.get_state("x")["state"] == INTENT_STATE_PENDING
+        out = store.transition(intent_id="x", to_state=INTENT_STATE_APPROVED, expected_version=1)
+        assert set(out) == {"intent_id", "state", "updated_ts", "version", "transition"}
+        assert out["transition"]["changed"] is True
+        with pytest.raises(ValueError, match="State mismatch"):
+            store.transition(intent_id="x", to_state=INTENT_STATE_EXECUTING, expected_from_state=INTENT_STATE_PENDING)
+        store.close()
+
+
+def test_m32_11_persistent_store_is_thread_safe(tmp_path):
+    store = SQLiteIntentStateStore(str(tmp_path / "s.db"), persistent=True)
+    errors: list = []
+
+    def worker(k: int) -> None:
+        try:
+            for i in range(50):
+                store.transition(intent_id=f"t{k}-{i}", to_state=INTENT_STATE_APPROVED)
+        except Exception as e:  # pragma: no cover - failure path
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert all(store.get_state(f"t{k}-49")["state"] == INTENT_STATE_APPROVED for k in range(4))
+
+
+def test_m32_11_env_switch_and_benchmark(tmp_path, monkeypatch):
+    monkeypatch.setenv("INTENT_STATE_PERSISTENT_CONN", "true")
+    assert SQLiteIntentStateStore(str(tmp_path / "e.db")).persistent is True
+    monkeypatch.delenv("INTENT_STATE_PERSISTENT_CONN")
+    assert SQLiteIntentStateStore(str(tmp_path / "f.db")).persistent is False
+
+    out = run_benchmark(intents=200, batch_size=50, legacy_intents=20, db_dir=str(tmp_path))
+    assert out["transition_many"]["transitions"] == 600 and out["transition_many"]["failed"] == 0
+    assert out["persistent"]["transitions"] == 600
+    assert out["transition_many"]["transitions_per_sec"] > 0
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import random
+import time
+
+from libs.approval.service import ApprovalService
+from libs.supervisor.intent_journal_index import IntentJournalIndex
+from libs.supervisor.intent_store import IntentStore
+
+
+def _write_rows(path, rows):  # type: ignore[no-untyped-def]
+    with path.open("a", encoding="utf-8") as f:
+        for r in rows:
+            f.write(json.dumps(r) + "\n")
+
+
+def _random_rows(n: int, seed: int = 7):  # type: ignore[no-untyped-def]
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        iid = f"i-{rnd.randrange(40)}"
+        ts = 1000 + rnd.randrange(50)  # non-monotonic with many ties
+        kind = rnd.random()
+        if kind < 0.4:
+            rows.append({"ts": ts, "intent_id": iid, "intent": {"intent_id": iid, "symbol": "005930", "n": i}})
+        elif kind < 0.8:
+            rows.append({"ts": ts, "intent_id": iid, "status": "approved", "reason": None, "intent": {"intent_id": iid, "n": i}})
+        else:
+            rows.append({"ts": ts, "status": "note", "intent": {"intent_id": iid, "n": i}})
+    return rows
+
+
+def test_m32_12_index_matches_linear_scan(tmp_path):
+    path = tmp_path / "intents.jsonl"
+    _write_rows(path, _random_rows(600))
+    path.open("a").write("not json\n\n")
+    _write_rows(path, _random_rows(200, seed=9))
+    indexed = IntentStore(str(path), indexed=True)
+    scan = IntentStore(str(path), indexed=False)
+
+    for k in range(42):
+        iid = f"i-{k}"
+        assert indexed.latest_row(iid) == scan.latest_row(iid)
+        assert indexed.load(iid) == scan.load(iid, scan_limit=10**6)
+    assert indexed.last_intent_row() == scan.last_intent_row()
+    assert indexed.latest_rows(15) == scan.latest_rows(15)
+    assert indexed.tail_rows(3) == scan.tail_rows(3)
+    assert ApprovalService(indexed).list_intents(8) == ApprovalService(scan).list_intents(8)
+
+
+def test_m32_12_incremental_refresh_partial_line_and_rotation(tmp_path):
+    path = tmp_path / "intents.jsonl"
+    idx = IntentJournalIndex(path)
+    _write_rows(path, [{"ts": 1, "intent_id": "a", "intent": {"intent_id": "a"}}])
+    assert idx.refresh() == 1
+    assert idx.refresh() == 0
+
+    # writer mid-append: partial line is not indexed until completed
+    with path.open("a") as f:
+        f.write('{"ts": 2, "intent_id": "b", "intent": {"intent_id": "b"}')
+    assert idx.refresh() == 0
+    with path.open("a") as f:
+        f.write("}\n")
+    assert idx.refresh() == 1
+    assert idx.last_intent_row()["intent_id"] == "b"
+
+    rows, cursor = idx.read_since(0)
+    assert [r["intent_id"] for r in rows] == ["a", "b"] and cursor == 2
+    _write_rows(path, [{"ts": 3, "intent_id": "c", "status": "approved", "intent": {"intent_id": "c"}}])
+    rows, cursor = idx.read_since(cursor)
+    assert [r["intent_id"] for r in rows] == ["c"] and cursor == 3
+
+    # rotation: a new, shorter file is re-indexed from scratch
+    path.write_text(json.dumps({"ts": 9, "intent_id": "z", "intent": {"intent_id": "z"}}) + "\n")
+    assert idx.latest_row("a") is None
+    assert idx.stats()["rows"] == 1
+    assert idx.tail(5)[0]["intent_id"] == "z"
+
+
+def test_m32_12_approval_path_does_not_scan_journal(tmp_path, monkeypatch):
+    path = tmp_path / "intents.jsonl"
+    rows = [{"ts": 1000 + i, "intent_id": f"bulk-{i}", "intent": {"intent_id": f"bulk-{i}", "symbol": "005930"}} for i in range(30000)]
+    _write_rows(path, rows)
+    store = IntentStore(str(path), indexed=True)
+    svc = ApprovalService(store, state_store=None)
+    svc.state_store = None
+    store.index.refresh()
+
+    def _no_scan(*a, **k):  # type: ignore[no-untyped-def]
+        raise AssertionError("full journal scan")
+
+    monkeypatch.setattr(store, "load_all_rows", _no_scan)
+    t0 = time.perf_counter()
+    last = svc.last_intent()
+    p = svc.preview(intent_id="bulk-17")
+    r = svc.reject(intent_id="bulk-42", reason="ops")
+    elapsed = time.perf_counter() - t0
+    assert last["intent_id"] == "bulk-29999"
+    assert p["ok"] is True and p["intent"]["intent_id"] == "bulk-17"
+    assert r["ok"] is True
+    assert svc.last_intent()["intent_id"] == "bulk-42"  # the newer marker row wins
+    assert svc.preview(intent_id="bulk-42")["status"] == "rejected"
+    assert elapsed < 0.5
+
+
+def test_m32_12_env_disables_index(tmp_path, monkeypatch):
+    monkeypatch.setenv("INTENT_JOURNAL_INDEX_ENABLED", "false")
+    store = IntentStore(str(tmp_path / "intents.jsonl"))
+    assert store.index is None
+    store.save({"intent_id": "x", "symbol": "1"})
+    assert store.load("x") == {"intent_id": "x", "symbol": "1"}
+    assert not (tmp_path / "intents.jsonl.idx.db").exists()
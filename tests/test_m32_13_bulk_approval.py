@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from libs.approval.service import ApprovalService
+from libs.supervisor.intent_state_store import (
+    INTENT_STATE_APPROVED,
+    INTENT_STATE_EXECUTED,
+    INTENT_STATE_EXECUTING,
+    INTENT_STATE_FAILED,
+    INTENT_STATE_PENDING,
+    INTENT_STATE_REJECTED,
+    SQLiteIntentStateStore,
+)
+from libs.supervisor.intent_store import IntentStore
+
+
+def _seed(store: IntentStore, ids: List[str]) -> None:
+    store.append_rows(
+        [
+            {
+                "ts": 1700000000 + i,
+                "intent_id": iid,
+                "intent": {"intent_id": iid, "action": "BUY", "symbol": "005930", "qty": 1, "order_type": "market"},
+            }
+            for i, iid in enumerate(ids)
+        ]
+    )
+
+
+def _svc(tmp_path: Path):
+    store = IntentStore(str(tmp_path / "intents.jsonl"))
+    state = SQLiteIntentStateStore(str(tmp_path / "intent_state.db"), persistent=True)
+    return store, state, ApprovalService(store, state_store=state)
+
+
+def _statuses(out: Dict[str, Any]) -> Dict[str, Any]:
+    return {r["intent_id"]: r for r in out["results"]}
+
+
+def test_m32_13_reject_many_matches_single_reject_rules(tmp_path: Path):
+    store, state, svc = _svc(tmp_path)
+    _seed(store, ["a", "b", "c"])
+    assert svc.approve(intent_id="b", execution_enabled=False, execute_fn=lambda it: {})["ok"] is True
+
+    out = svc.reject_many(intent_ids=["a", "b", "a", "missing", "c"], reason="ops sweep")
+    res = _statuses(out)
+    assert [r["intent_id"] for r in out["results"]] == ["a", "b", "missing", "c"]  # input order, deduped
+    assert res["a"]["ok"] is True and res["c"]["ok"] is True
+    assert res["b"]["ok"] is False and "approved" in res["b"]["message"].lower()
+    assert res["missing"]["ok"] is False
+    assert out["ok"] is False and out["ok_count"] == 2 and out["error_count"] == 2
+    assert state.get_state("a")["state"] == INTENT_STATE_REJECTED
+    assert state.get_state("b")["state"] == INTENT_STATE_APPROVED
+    assert svc.preview(intent_id="c")["status"] == "rejected"
+    assert svc.reject_many(intent_ids=["a"])["results"][0]["message"] == "Already rejected."
+
+
+def test_m32_13_approve_many_uses_one_transaction_and_one_marker_write(tmp_path: Path, monkeypatch):
+    store, state, svc = _svc(tmp_path)
+    ids = [f"i-{n}" for n in range(50)]
+    _seed(store, ids)
+
+    calls = {"tx": 0, "write": 0, "single": 0}
+    orig_many, orig_rows = state.transition_many, store.append_rows
+
+    def _many(items, **kw):
+        calls["tx"] += 1
+        return orig_many(items, **kw)
+
+    def _rows(rows):
+        calls["write"] += 1
+        return orig_rows(rows)
+
+    def _single(*a, **kw):
+        calls["single"] += 1
+        raise AssertionError("bulk path must not scan/append per intent")
+
+    monkeypatch.setattr(state, "transition_many", _many)
+    monkeypatch.setattr(store, "append_rows", _rows)
+    monkeypatch.setattr(store, "append_row", _single)
+    monkeypatch.setattr(store, "latest_row", _single)
+    monkeypatch.setattr(store, "load", _single)
+
+    out = svc.approve_many(intent_ids=ids, execution_enabled=False, execute_fn=lambda it: {})
+    assert out["ok"] is True and out["ok_count"] == 50
+    assert calls == {"tx": 1, "write": 1, "single": 0}
+    assert all(r["status"] == "approved" for r in out["results"])
+    assert {r["state"] for r in state.get_states(ids).values()} == {INTENT_STATE_APPROVED}
+
+    # already approved + execution disabled: nothing to write
+    again = svc.approve_many(intent_ids=ids[:3], execution_enabled=False, execute_fn=lambda it: {})
+    assert all("Already approved" in r["note"] for r in again["results"])
+
+
+def test_m32_13_approve_many_executes_and_records_failures(tmp_path: Path):
+    store, state, svc = _svc(tmp_path)
+    _seed(store, ["x", "y", "z"])
+    ran: List[str] = []
+
+    def _exec(intent: Dict[str, Any]) -> Dict[str, Any]:
+        ran.append(intent["intent_id"])
+        if intent["intent_id"] == "y":
+            raise RuntimeError("broker down")
+        return {"ok": True, "order_id": f"o-{intent['intent_id']}"}
+
+    out = svc.approve_many(intent_ids=["x", "y", "z"], execution_enabled=True, execute_fn=_exec)
+    res = _statuses(out)
+    assert ran == ["x", "y", "z"]
+    assert res["x"]["status"] == "executed" and res["x"]["execution"]["order_id"] == "o-x"
+    assert res["y"]["ok"] is False and res["y"]["status"] == "failed"
+    assert state.get_state("z")["state"] == INTENT_STATE_EXECUTED
+    assert state.get_state("y")["state"] == INTENT_STATE_FAILED
+
+    markers = [json.loads(line) for line in (tmp_path / "intents.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [m["status"] for m in markers if m.get("intent_id") == "x" and m.get("status")] == [
+        "approved",
+        "executing",
+        "executed",
+    ]
+
+    # executed intents return the cached execution, not a second run
+    ran.clear()
+    again = svc.approve_many(intent_ids=["x"], execution_enabled=True, execute_fn=_exec)
+    assert ran == [] and again["results"][0]["note"].startswith("Already executed")
+
+
+def test_m32_13_approve_many_keeps_duplicate_claim_guard(tmp_path: Path):
+    store, state, svc = _svc(tmp_path)
+    _seed(store, ["p", "q"])
+    svc.approve_many(intent_ids=["p", "q"], execution_enabled=False, execute_fn=lambda it: {})
+    # another worker claimed "q" after our statuses were read: simulate by claiming now
+    other = ApprovalService(store, state_store=SQLiteIntentStateStore(str(tmp_path / "intent_state.db")))
+    state.transition(intent_id="q", to_state=INTENT_STATE_EXECUTING, expected_from_state=INTENT_STATE_APPROVED)
+
+    ran: List[str] = []
+    out = svc.approve_many(
+        intent_ids=["p", "q"], execution_enabled=True, execute_fn=lambda it: ran.append(it["intent_id"]) or {"ok": True}
+    )
+    res = _statuses(out)
+    assert ran == ["p"]
+    assert res["q"]["ok"] is False and "executing" in res["q"]["message"].lower()
+    assert other.preview(intent_id="q")["status"] == INTENT_STATE_EXECUTING
+
+
+def test_m32_13_claim_lost_inside_batch_is_not_executed(tmp_path: Path, monkeypatch):
+    store, state, svc = _svc(tmp_path)
+    _seed(store, ["r"])
+    svc.approve(intent_id="r", execution_enabled=False, execute_fn=lambda it: {})
+    orig_many = state.transition_many
+
+    def _race(items, **kw):
+        # a concurrent worker wins the approved -> executing CAS just before our transaction
+        orig_many([{"intent_id": "r", "to_state": INTENT_STATE_EXECUTING, "expected_from_state": INTENT_STATE_APPROVED}])
+        return orig_many(items, **kw)
+
+    monkeypatch.setattr(state, "transition_many", _race)
+    ran: List[str] = []
+    out = svc.approve_many(intent_ids=["r"], execution_enabled=True, execute_fn=lambda it: ran.append("r") or {})
+    assert ran == []
+    assert out["results"][0] == {"ok": False, "intent_id": "r", "message": "Intent is executing."}
+
+
+def test_m32_13_approve_many_records_each_outcome_before_the_next_execution(tmp_path: Path):
+    store, state, svc = _svc(tmp_path)
+    _seed(store, ["s1", "s2"])
+    seen: Dict[str, str] = {}
+
+    def _exec(intent: Dict[str, Any]) -> Dict[str, Any]:
+        if intent["intent_id"] == "s2":
+            seen["s1"] = state.get_state("s1")["state"]
+            seen["marker"] = svc.preview(intent_id="s1")["execution"]["order_id"]
+        return {"ok": True, "order_id": f"o-{intent['intent_id']}"}
+
+    out = svc.approve_many(intent_ids=["s1", "s2"], execution_enabled=True, execute_fn=_exec)
+    assert out["ok"] is True
+    assert seen == {"s1": INTENT_STATE_EXECUTED, "marker": "o-s1"}  # recorded before s2 ran
+
+
+def test_m32_13_approve_lost_to_concurrent_approver_is_not_executed(tmp_path: Path, monkeypatch):
+    store, state, svc = _svc(tmp_path)
+    _seed(store, ["t"])
+    orig_many = state.transition_many
+
+    def _race(items, **kw):
+        # another approver moves t pending -> approved after our statuses were read
+        if items and items[0].get("to_state") == INTENT_STATE_APPROVED:
+            orig_many([{"intent_id": "t", "to_state": INTENT_STATE_APPROVED, "expected_from_state": INTENT_STATE_PENDING}])
+        return orig_many(items, **kw)
+
+    monkeypatch.setattr(state, "transition_many", _race)
+    ran: List[str] = []
+    out = svc.approve_many(intent_ids=["t"], execution_enabled=True, execute_fn=lambda it: ran.append("t") or {})
+    single = ApprovalService(store, state_store=state)
+    assert ran == [] and out["results"][0]["ok"] is False  # same as approve(): the approve error wins
+    assert state.get_state("t")["state"] == INTENT_STATE_APPROVED  # not claimed, so not stuck in executing
+    assert single.approve(intent_id="t", execution_enabled=True, execute_fn=lambda it: {"ok": True})["status"] == "executed"
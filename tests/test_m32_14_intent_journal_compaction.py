@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+from libs.approval.service import ApprovalService
+from libs.supervisor.intent_archive import compact_intent_journal, load_archived_intent
+from libs.supervisor.intent_state_store import SQLiteIntentStateStore
+from libs.supervisor.intent_store import IntentStore
+from scripts.check_log_archive_integrity import main as integrity_main
+from scripts.query_intent_state_store import main as query_main
+from scripts.reconcile_intent_state_store import main as reconcile_main
+
+_FUTURE = int(time.time()) + 40 * 86400  # "now" for compaction: everything written today is 40 days old
+
+
+def _setup(tmp_path: Path):
+    log = tmp_path / "intents.jsonl"
+    db = tmp_path / "intents.db"
+    store = IntentStore(str(log))
+    svc = ApprovalService(store, state_store=SQLiteIntentStateStore(str(db)))
+    for iid in ("done", "gone", "open", "ok2"):
+        store.save({"intent_id": iid, "action": "BUY", "symbol": "005930", "qty": 1})
+    svc.approve(intent_id="done", execution_enabled=True, execute_fn=lambda it: {"ok": True, "order_id": "o1"})
+    svc.reject(intent_id="gone", reason="stale")
+    svc.approve(intent_id="ok2", execution_enabled=False, execute_fn=lambda it: {})
+    svc.preview(intent_id="open")  # registers the pending state
+    return log, db, store, svc
+
+
+def test_m32_14_compaction_moves_old_terminal_intents_to_verified_segments(tmp_path: Path, capsys):
+    log, db, store, svc = _setup(tmp_path)
+    archive = tmp_path / "archive"
+    assert store.latest_row("open") is not None  # builds the index before the rewrite
+
+    out = compact_intent_journal(intent_log_path=log, state_db_path=db, archive_dir=archive, older_than_days=30, now_epoch=_FUTURE)
+    assert out["archived_intent_total"] == 2 and out["archived_state_rows"] == 2
+    assert {s["kind"] for s in out["segments"]} == {"intents", "intent_state"}
+
+    live_ids = {json.loads(line).get("intent_id") for line in log.read_text(encoding="utf-8").splitlines()}
+    assert live_ids == {"open", "ok2"}
+    state = SQLiteIntentStateStore(str(db))
+    assert state.get_state("done") is None and state.get_state("ok2")["state"] == "approved"
+
+    # live lookups (index re-built after the rewrite) and the archived read path
+    assert store.latest_row("done") is None
+    assert store.latest_row("open")["intent_id"] == "open"
+    reader = IntentStore(str(log), archive_dir=str(archive))
+    assert reader.latest_row("done", include_archived=True)["status"] == "executed"
+    assert reader.load("gone", include_archived=True)["symbol"] == "005930"
+    arch = load_archived_intent("done", archive)
+    assert arch["state"]["state"] == "executed" and [j["to_state"] for j in arch["journal"]][-1] == "executed"
+
+    day = Path(out["manifest_path"]).parent.name
+    rc = integrity_main(
+        ["--archive-dir", str(archive), "--day", day, "--report-dir", str(tmp_path / "rep"), "--allow-stale", "--json"]
+    )
+    report = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert rc == 0 and report["verified_total"] == 2 and report["line_count_mismatch_total"] == 0
+
+
+def test_m32_14_compaction_skips_recent_and_disagreeing_intents(tmp_path: Path):
+    log, db, store, svc = _setup(tmp_path)
+    # JSONL says executed, SQLite still approved -> reconcile mismatch must stay visible
+    store.append_row({"ts": int(time.time()), "intent_id": "ok2", "status": "executed", "intent": {"intent_id": "ok2"}})
+
+    recent = compact_intent_journal(intent_log_path=log, state_db_path=db, archive_dir=tmp_path / "a", older_than_days=30)
+    assert recent["archived_intent_total"] == 0 and recent["segments"] == []
+
+    dry = compact_intent_journal(
+        intent_log_path=log, state_db_path=db, archive_dir=tmp_path / "a", older_than_days=30, now_epoch=_FUTURE, dry_run=True
+    )
+    assert dry["archived_intent_total"] == 2 and not (tmp_path / "a").exists()
+
+    out = compact_intent_journal(intent_log_path=log, state_db_path=db, archive_dir=tmp_path / "a", older_than_days=30, now_epoch=_FUTURE)
+    assert out["archived_intent_total"] == 2
+    assert store.latest_row("ok2")["status"] == "executed"
+
+
+def test_m32_14_rows_appended_during_the_rewrite_are_not_lost(tmp_path: Path, monkeypatch):
+    import threading
+
+    import libs.supervisor.intent_archive as archive_mod
+
+    log, db, store, svc = _setup(tmp_path)
+    writer = IntentStore(str(log), indexed=False)
+    real_fsync = archive_mod.os.fsync
+    appenders = []
+
+    def fsync_then_race(fd):  # type: ignore[no-untyped-def]
+        # another process appends between the tail copy and os.replace
+        t = threading.Thread(target=writer.save, args=({"intent_id": "late", "action": "BUY"},))
+        t.start()
+        t.join(0.2)
+        appenders.append(t)
+        real_fsync(fd)
+
+    monkeypatch.setattr(archive_mod.os, "fsync", fsync_then_race)
+    out = compact_intent_journal(intent_log_path=log, state_db_path=db, archive_dir=tmp_path / "a", older_than_days=30, now_epoch=_FUTURE)
+    for t in appenders:
+        t.join(5)
+    assert out["archived_intent_total"] == 2 and appenders  # the last fsync is the journal rewrite
+    live_ids = [json.loads(line).get("intent_id") for line in log.read_text(encoding="utf-8").splitlines()]
+    assert live_ids.count("late") == len(appenders) and {"open", "ok2"} <= set(live_ids)
+
+
+def test_m32_14_query_and_reconcile_include_archived(tmp_path: Path, capsys):
+    log, db, store, svc = _setup(tmp_path)
+    archive = tmp_path / "archive"
+    compact_intent_journal(intent_log_path=log, state_db_path=db, archive_dir=archive, older_than_days=30, now_epoch=_FUTURE)
+
+    assert query_main(["--state-db-path", str(db), "--json"]) == 0
+    live = json.loads(capsys.readouterr().out.strip())
+    assert live["summary"]["total"] == 2
+
+    assert query_main(["--state-db-path", str(db), "--include-archived", "--archive-dir", str(archive), "--json"]) == 0
+    full = json.loads(capsys.readouterr().out.strip())
+    assert full["archived_total"] == 2 and full["summary"]["total"] == 4
+    assert full["summary"]["current_state_total"]["executed"] == 1
+    assert full["summary"]["journal_transition_total"]["executing->executed"] == 1
+
+    for extra in ([], ["--include-archived", "--archive-dir", str(archive)]):
+        rc = reconcile_main(["--intent-log-path", str(log), "--state-db-path", str(db), "--json", *extra])
+        res = json.loads(capsys.readouterr().out.strip())
+        assert rc == 0 and res["missing_total_before"] == 0 and res["mismatch_total_before"] == 0
+    assert res["jsonl_intent_total"] == 4 and res["archived_intent_total"] == 2
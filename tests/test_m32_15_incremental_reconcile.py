@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import scripts.reconcile_intent_state_store as reconcile
+from libs.approval.service import ApprovalService
+from libs.supervisor.intent_state_store import INTENT_STATE_APPROVED, INTENT_STATE_EXECUTING, SQLiteIntentStateStore
+from libs.supervisor.intent_store import IntentStore
+
+
+def _setup(tmp_path: Path, n: int = 20):
+    log = tmp_path / "intents.jsonl"
+    db = tmp_path / "intent_state.db"
+    store = IntentStore(str(log))
+    state = SQLiteIntentStateStore(str(db))
+    svc = ApprovalService(store, state_store=state)
+    for i in range(n):
+        store.save({"intent_id": f"i{i}", "action": "BUY", "symbol": "005930", "qty": 1})
+        svc.preview(intent_id=f"i{i}")
+    return log, db, store, state, svc
+
+
+def _run(capsys, log: Path, db: Path, *extra: str):
+    rc = reconcile.main(["--intent-log-path", str(log), "--state-db-path", str(db), "--incremental", "--json", *extra])
+    return rc, json.loads(capsys.readouterr().out.strip())
+
+
+def test_m32_15_first_incremental_run_is_full_then_scope_is_only_touched(tmp_path: Path, capsys, monkeypatch):
+    log, db, store, state, svc = _setup(tmp_path)
+    rc, first = _run(capsys, log, db)
+    assert rc == 0 and first["mode"] == "full" and first["full_reason"] == "no_watermark"
+    wm = json.loads(Path(first["watermark_path"]).read_text(encoding="utf-8"))
+    assert wm["journal_offset"] == log.stat().st_size and wm["max_journal_id"] > 0
+
+    rc, idle = _run(capsys, log, db)
+    assert rc == 0 and idle["mode"] == "incremental" and idle["scope_total"] == 0
+
+    def _no_full_scan(path):
+        raise AssertionError("incremental mode must not read the whole journal")
+
+    monkeypatch.setattr(reconcile, "_load_jsonl", _no_full_scan)
+    svc.approve(intent_id="i3", execution_enabled=False, execute_fn=lambda it: {})  # JSONL + SQLite
+    store.append_row({"ts": 2**31, "intent_id": "i5", "status": "rejected", "intent": {"intent_id": "i5"}})  # JSONL only
+    state.transition(intent_id="i7", to_state=INTENT_STATE_APPROVED, expected_from_state="pending_approval")  # SQLite only
+
+    rc, inc = _run(capsys, log, db)
+    assert rc == 3 and inc["mode"] == "incremental" and inc["scope_total"] == 3
+    assert inc["details"]["mismatch_before"] == ["i5", "i7"]
+
+
+def test_m32_15_unresolved_intents_stay_pending_until_repaired(tmp_path: Path, capsys):
+    log, db, store, state, svc = _setup(tmp_path, n=3)
+    _run(capsys, log, db)
+    state.transition(intent_id="i1", to_state=INTENT_STATE_APPROVED, expected_from_state="pending_approval")
+    state.transition(intent_id="i1", to_state=INTENT_STATE_EXECUTING, expected_from_state=INTENT_STATE_APPROVED)
+
+    rc, a = _run(capsys, log, db)
+    assert rc == 3 and a["details"]["mismatch_before"] == ["i1"]
+    rc, b = _run(capsys, log, db)  # nothing new touched: i1 is re-checked from the watermark
+    assert rc == 3 and b["scope_total"] == 1 and b["details"]["mismatch_before"] == ["i1"]
+
+    store.append_row({"ts": 2**31, "intent_id": "i1", "status": "executing", "intent": {"intent_id": "i1"}})
+    rc, c = _run(capsys, log, db)
+    assert rc == 0 and c["mismatch_total_after"] == 0
+    rc, d = _run(capsys, log, db)
+    assert rc == 0 and d["scope_total"] == 0
+
+
+def test_m32_15_full_pass_fallbacks(tmp_path: Path, capsys):
+    log, db, store, state, svc = _setup(tmp_path, n=3)
+    _, first = _run(capsys, log, db)
+    wm_path = Path(first["watermark_path"])
+
+    assert _run(capsys, log, db, "--full")[1]["full_reason"] == "requested"
+
+    wm = json.loads(wm_path.read_text(encoding="utf-8"))
+    wm["last_full_ts"] = 0
+    wm_path.write_text(json.dumps(wm), encoding="utf-8")
+    assert _run(capsys, log, db)[1]["full_reason"] == "periodic"
+    wm["last_full_ts"] = 0
+    wm_path.write_text(json.dumps(wm), encoding="utf-8")
+    assert _run(capsys, log, db, "--full-every-sec", "0")[1]["mode"] == "incremental"
+
+    # journal rewritten (e.g. compaction via os.replace): offsets are meaningless
+    tmp = log.with_name("rewritten.jsonl")
+    tmp.write_bytes(log.read_bytes())
+    tmp.replace(log)
+    rc, out = _run(capsys, log, db)
+    assert rc == 0 and out["full_reason"] == "journal_rewritten"
+
+    # legacy invocation (no --incremental) never touches the watermark
+    before = wm_path.read_text(encoding="utf-8")
+    assert reconcile.main(["--intent-log-path", str(log), "--state-db-path", str(db), "--json"]) == 0
+    assert json.loads(capsys.readouterr().out.strip())["mode"] == "full"
+    assert wm_path.read_text(encoding="utf-8") == before
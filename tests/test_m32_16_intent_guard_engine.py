@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, List
+
+from libs.runtime.intent_conflict_resolver import _legacy_resolve_intent_conflicts, resolve_intent_conflicts
+from libs.runtime.intent_guard_engine import engine_apply_portfolio_budget_guard, engine_resolve_intent_conflicts
+from libs.runtime.portfolio_budget_guard import _legacy_apply_portfolio_budget_guard, apply_portfolio_budget_guard
+from scripts.bench_m32_intent_guard_engine import run_benchmark
+
+_NAN, _INF = float("nan"), float("inf")
+
+
+def _canon(value: Any) -> Any:
+    """NaN never equals itself; both paths derive fresh NaN floats, so compare them as a marker."""
+    if isinstance(value, float) and value != value:
+        return "<nan>"
+    if isinstance(value, dict):
+        return {k: _canon(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_canon(v) for v in value]
+    return value
+
+
+def _messy_intents(seed: int, n: int = 400) -> List[Any]:
+    rnd = random.Random(seed)
+    out: List[Any] = []
+    for i in range(n):
+        r = rnd.random()
+        if r < 0.02:
+            out.append("not-a-dict")
+            continue
+        row: Dict[str, Any] = {
+            "strategy_id": rnd.choice(["s1", " s2 ", "s3", "", None, "ghost"]),
+            "symbol": rnd.choice(["005930", " 000660", "aapl", "", None, "035420"]),
+            rnd.choice(["side", "action"]): rnd.choice(["BUY", "sell", " Buy ", "HOLD", None]),
+            "priority": rnd.choice([0, 1, 2, "3", None, "x", _NAN]),
+        }
+        if rnd.random() < 0.5:
+            row["confidence"] = rnd.choice([0.1, 0.5, 0.9, "bad", None, _NAN])
+        else:
+            row["meta"] = {"confidence": rnd.choice([0.2, 0.7, "0.4"])}
+        sizing = rnd.random()
+        if sizing < 0.3:
+            row["requested_notional"] = rnd.choice([100000.0, 250000.0, 0, -5, "abc", None, _NAN, "nan", _INF, -_INF, "inf"])
+        elif sizing < 0.5:
+            row["notional"] = rnd.choice([50000, "120000", 0, _NAN, "-inf"])
+        elif sizing < 0.8:
+            row["qty"] = rnd.choice([1, 3, "2", 0, -1, "x", _NAN, _INF, "nan"])
+            if rnd.random() < 0.3:
+                row[rnd.choice(["price", "unit_price"])] = rnd.choice([70000, "0", None, _NAN, "inf"])
+        out.append(row)
+    return out
+
+
+_KW = {
+    "default_symbol_max_notional": 400000.0,
+    "symbol_max_notional_map": {"aapl": 150000.0, "035420": 0},
+    "market_prices": {"005930": 71000.0, "000660": "150000"},
+}
+
+
+def test_m32_16_conflict_engine_matches_legacy_exactly():
+    for seed in range(12):
+        intents = _messy_intents(seed)
+        for kw in (_KW, {}):
+            assert _canon(engine_resolve_intent_conflicts(intents, **kw)) == _canon(_legacy_resolve_intent_conflicts(intents, **kw))
+    assert engine_resolve_intent_conflicts("bad") == _legacy_resolve_intent_conflicts("bad")  # type: ignore[arg-type]
+
+
+def test_m32_16_budget_engine_matches_legacy_exactly():
+    alloc = {"allocations": [{"strategy_id": "s1", "allocated_notional": 300000}, {"strategy_id": "s2", "allocated_notional": 5}]}
+    for seed in range(12):
+        intents = _messy_intents(seed)
+        for extra in ({"allocation_result": alloc, "strategy_budget_map": {"s3": 900000}}, {}):
+            expected = _legacy_apply_portfolio_budget_guard(intents, **extra, **_KW)
+            got = engine_apply_portfolio_budget_guard(intents, **extra, **_KW)
+            assert _canon(got) == _canon(expected)
+            # reason count ordering follows the blocked list (budget stage first, then conflicts)
+            assert list(got["blocked_reason_counts"]) == list(expected["blocked_reason_counts"])
+    assert engine_apply_portfolio_budget_guard(None) == _legacy_apply_portfolio_budget_guard(None)  # type: ignore[arg-type]
+
+
+def test_m32_16_public_functions_switch_with_env(monkeypatch):
+    intents = _messy_intents(99)
+    calls: List[str] = []
+    import libs.runtime.intent_conflict_resolver as resolver_mod
+    import libs.runtime.portfolio_budget_guard as guard_mod
+
+    monkeypatch.setattr(resolver_mod, "engine_resolve_intent_conflicts", lambda *a, **k: calls.append("engine") or {})
+    monkeypatch.setattr(guard_mod, "engine_apply_portfolio_budget_guard", lambda *a, **k: calls.append("engine") or {})
+    resolve_intent_conflicts(intents, **_KW)
+    apply_portfolio_budget_guard(intents, **_KW)
+    assert calls == ["engine", "engine"]
+
+    monkeypatch.setenv("INTENT_GUARD_ENGINE", "legacy")
+    assert _canon(resolve_intent_conflicts(intents, **_KW)) == _canon(_legacy_resolve_intent_conflicts(intents, **_KW))
+    assert _canon(apply_portfolio_budget_guard(intents, **_KW)) == _canon(_legacy_apply_portfolio_budget_guard(intents, **_KW))
+    assert calls == ["engine", "engine"]
+
+
+def test_m32_16_benchmark_reports_parity():
+    out = run_benchmark(intents=3000, symbols=200, strategies=4, repeat=1)
+    for name in ("resolve_intent_conflicts", "apply_portfolio_budget_guard"):
+        assert out[name]["parity"] is True
+        assert out[name]["approved_total"] > 0 and out[name]["blocked_total"] > 0
+    assert out["apply_portfolio_budget_guard"]["blocked_reason_counts"].get("missing_strategy_budget", 0) > 0
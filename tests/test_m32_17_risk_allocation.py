@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import numpy as np
+
+from libs.runtime.portfolio_allocation import allocate_portfolio_budget
+from libs.runtime.risk_allocation import EwmaCovariance, RiskAllocator, risk_parity_weights
+from scripts.bench_m32_risk_allocation import run_benchmark
+
+
+def _returns(rng: np.random.Generator, n: int, ticks: int) -> np.ndarray:
+    vols = np.linspace(0.005, 0.03, n)
+    return rng.normal(size=(ticks, n)) * vols
+
+
+def test_m32_17_incremental_covariance_matches_batch_ewma():
+    rng = np.random.default_rng(0)
+    data = _returns(rng, 6, 80)
+    cache = EwmaCovariance([f"k{i}" for i in range(6)], halflife=10.0)
+    for row in data:
+        cache.update(cache.vector(row))
+
+    lam = 0.5 ** (1.0 / 10.0)
+    mean = np.zeros(6)
+    cov = np.zeros((6, 6))
+    for row in data:
+        d = row - mean
+        mean = mean + (1 - lam) * d
+        cov = lam * (cov + (1 - lam) * np.outer(d, d))
+    assert np.allclose(cache.cov, cov) and cache.nobs == 80
+
+    # strategy projection maintained per observation == E Σ Eᵀ
+    alloc = RiskAllocator([f"k{i}" for i in range(6)], halflife=10.0)
+    alloc.set_exposures({"a": {"k0": 0.5, "k1": 0.5}, "b": {"k2": 1.0, "zz": 3.0}})
+    for row in data:
+        alloc.observe({f"k{i}": v for i, v in enumerate(row)})
+    e = alloc._exposures
+    assert np.allclose(alloc._proj_cov, e @ alloc.cache.cov @ e.T)
+
+
+def test_m32_17_risk_parity_equalizes_budgeted_risk_and_warm_starts():
+    rng = np.random.default_rng(1)
+    keys = ["a", "b", "c", "d"]
+    alloc = RiskAllocator(keys, min_obs=20)
+    for row in _returns(rng, 4, 120):
+        alloc.observe(row)
+
+    profiles = [{"strategy_id": k, "weight": 2.0 if k == "d" else 1.0} for k in keys]
+    out = alloc.allocate(profiles, total_notional=1_000_000, reserve_ratio=0.1)
+    assert out["ok"] is True and out["mode"] == "risk_parity" and out["risk"]["converged"] is True
+    rc = {r["strategy_id"]: r["risk_contribution"] for r in out["allocations"]}
+    assert abs(rc["d"] - 0.4) < 1e-6 and all(abs(rc[k] - 0.2) < 1e-6 for k in "abc")
+    notional = {r["strategy_id"]: r["allocated_notional"] for r in out["allocations"]}
+    assert notional["a"] > notional["b"] > notional["c"]  # lower volatility -> more notional
+    assert abs(out["allocation_total"] - 900_000) < 1e-3
+
+    cold = risk_parity_weights(alloc.strategy_covariance(keys), np.array([1.0, 1.0, 1.0, 2.0]))
+    alloc.observe(_returns(rng, 4, 1)[0])
+    warm = alloc.allocate(profiles, total_notional=1_000_000)
+    assert warm["risk"]["warm_start"] is True and warm["risk"]["iterations"] < cold["iterations"]
+
+    capped = alloc.allocate(
+        [{**p, "max_notional_ratio": 0.3} if p["strategy_id"] == "a" else p for p in profiles], total_notional=1_000_000
+    )
+    rows = {r["strategy_id"]: r for r in capped["allocations"]}
+    assert abs(rows["a"]["allocated_notional"] - 300_000) < 1e-3
+    assert abs(capped["allocation_total"] - 1_000_000) < 1e-3
+
+
+def test_m32_17_vol_target_scales_down_and_fallbacks():
+    rng = np.random.default_rng(2)
+    alloc = RiskAllocator(["x", "y"], min_obs=10, target_volatility=0.05)
+    profiles = [{"strategy_id": "x", "weight": 1}, {"strategy_id": "y", "weight": 1}]
+
+    early = alloc.allocate(profiles, total_notional=100.0, mode="vol_target")
+    assert early["risk"]["fallback"] == "insufficient_history" and early["allocation_total"] == 100.0
+
+    for row in _returns(rng, 2, 50):
+        alloc.observe(row)
+    out = allocate_portfolio_budget(profiles, total_notional=100.0, mode="vol_target", risk_allocator=alloc)
+    assert out["ok"] is True and 0.0 < out["risk"]["scale"] < 1.0
+    assert abs(out["risk"]["portfolio_volatility"] - 0.05) < 1e-6
+    assert out["unallocated_notional"] > 0.0
+
+    assert allocate_portfolio_budget(profiles, total_notional=100.0, mode="risk_parity")["ok"] is False
+    assert alloc.allocate(profiles, total_notional=100.0, mode="kelly")["failures"] == ["unsupported allocation mode: kelly"]
+    assert allocate_portfolio_budget(profiles, total_notional=100.0)["allocation_total"] == 100.0  # static unchanged
+
+
+def test_m32_17_benchmark_shape():
+    out = run_benchmark(strategies=10, symbols=50, warmup=30, ticks=5)
+    assert out["ticks"] == 5 and out["converged"] is True
+    assert out["tick_ms_p50"] > 0.0 and abs(out["allocation_total"] - 1e9) < 1e-3
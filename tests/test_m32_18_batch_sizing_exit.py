@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from graphs.nodes.monitor_node import monitor_node
+from libs.runtime.exit_policy import evaluate_exit_policy, evaluate_exit_policy_batch, exit_policy_row
+from libs.runtime.position_sizing import evaluate_position_size, evaluate_position_size_batch, position_size_row
+
+
+def test_m32_18_position_size_batch_matches_scalar():
+    rnd = random.Random(3)
+    for _ in range(400):
+        policy = rnd.choice(
+            [
+                {},
+                {"risk_per_trade_ratio": rnd.choice([0, 0.02, "x"]), "position_notional_ratio": rnd.choice([0, 0.2])},
+                {"stop_loss_pct": rnd.choice([0, 0.05, "bad"]), "lot_size": rnd.choice([1, 10]), "max_position_qty": 7},
+                {"exit_policy": {"stop_loss_pct": 0.1}, "min_position_qty": 5},
+            ]
+        )
+        prices = [rnd.choice([None, 0, "x", 100.0, 5000, "77"]) for _ in range(6)]
+        cash = rnd.choice([None, 0, 1e6, "5e5", [1e6, None, 2e5, 0, "x", 3e6]])
+        stops = rnd.choice([None, [None, 0.02, "x", 0, 1.5, None]])
+        batch = evaluate_position_size_batch(prices=prices, cash=cash, policy=policy, risk_context={}, stop_loss_pcts=stops)
+        for i in range(6):
+            p = dict(policy)
+            if stops and stops[i] is not None:
+                p["stop_loss_pct"] = stops[i]
+            c = cash[i] if isinstance(cash, list) else cash
+            assert position_size_row(batch, i) == evaluate_position_size(price=prices[i], cash=c, policy=p, risk_context={})
+            assert batch["qty"][i] == position_size_row(batch, i)["qty"]
+
+
+def test_m32_18_position_size_batch_sequential_cash_matches_scalar_loop():
+    rnd = random.Random(5)
+    for _ in range(300):
+        policy = rnd.choice([{}, {"position_notional_ratio": 0.5, "risk_per_trade_ratio": 0.5}, {"lot_size": 10, "stop_loss_pct": 0.01}])
+        prices = [rnd.choice([None, 0, 100.0, 5000, "77", 250_000]) for _ in range(6)]
+        cash = rnd.choice([None, 0, 1e5, 1e6, "5e5"])
+        batch = evaluate_position_size_batch(prices=prices, cash=cash, policy=policy, risk_context={}, sequential_cash=True)
+        remaining = float(cash or 0)
+        for i in range(6):
+            row = evaluate_position_size(price=prices[i], cash=remaining if remaining > 0.0 else None, policy=policy, risk_context={})
+            assert position_size_row(batch, i) == row
+            remaining -= row["qty"] * (row["price"] or 0.0)
+    with pytest.raises(ValueError):  # per-row cash cannot be shared
+        evaluate_position_size_batch(prices=[1.0], cash=[1.0], sequential_cash=True)
+
+
+def test_m32_18_exit_batch_matches_scalar():
+    rnd = random.Random(4)
+    for _ in range(400):
+        policy = {"stop_loss_pct": rnd.choice([None, 0, 0.02, "x"]), "take_profit_pct": rnd.choice([None, 0, 0.04])}
+        prices = [rnd.choice([None, 0, 100, 95, 110, "103"]) for _ in range(5)]
+        avgs = [rnd.choice([None, 0, 100, "100"]) for _ in range(5)]
+        qtys = [rnd.choice([0, None, 3, -2]) for _ in range(5)]
+        tps = rnd.choice([None, [None, 0.01, "x", 0, 0.2]])
+        batch = evaluate_exit_policy_batch(prices=prices, avg_prices=avgs, qtys=qtys, policy=policy, take_profit_pcts=tps)
+        for i in range(5):
+            p = dict(policy)
+            if tps and tps[i] is not None:
+                p["take_profit_pct"] = tps[i]
+            assert exit_policy_row(batch, i) == evaluate_exit_policy(price=prices[i], avg_price=avgs[i], qty=qtys[i], policy=p)
+        assert batch["triggered_index"] == [i for i in range(5) if batch["triggered"][i]]
+
+
+def _book_state(**policy):
+    return {
+        "plan": {"thesis": "book"},
+        "selected": {"symbol": "AAA", "score": 0.9, "price": 100.0},
+        "scan_results": [
+            {"symbol": "AAA", "score": 0.9, "price": 100.0},
+            {"symbol": "BBB", "score": 0.8, "price": 50.0},
+            {"symbol": "CCC", "score": 0.7},
+        ],
+        "portfolio_snapshot": {
+            "cash": 1_000_000.0,
+            "positions": [
+                {"symbol": "BBB", "qty": 4, "avg_price": 60.0},
+                {"symbol": "DDD", "qty": 2, "avg_price": 100.0},
+                {"symbol": "EEE", "qty": 1, "avg_price": 100.0},
+            ],
+        },
+        "skill_results": {
+            "market.quote": {"CCC": {"cur": 20.0}, "DDD": {"cur": 107.0}, "EEE": {"cur": 101.0}},
+        },
+        "policy": {"monitor_multi_intent": True, **policy},
+    }
+
+
+def test_m32_18_monitor_emits_book_exits_and_sized_entries_in_one_pass():
+    state = _book_state(
+        use_exit_policy=True,
+        use_position_sizing=True,
+        stop_loss_pct=0.03,
+        take_profit_pct=0.05,
+        exit_thresholds_by_symbol={"EEE": {"take_profit_pct": 0.005}},
+    )
+    out = monitor_node(state)
+    sells = {x["symbol"]: x for x in out["intents"] if x["side"] == "SELL"}
+    buys = {x["symbol"]: x for x in out["intents"] if x["side"] == "BUY"}
+    assert sells["BBB"]["meta"]["exit_reason"] == "stop_loss" and sells["BBB"]["qty"] == 4
+    assert sells["DDD"]["meta"]["exit_reason"] == "take_profit"
+    assert sells["EEE"]["meta"]["exit_reason"] == "take_profit"  # per-symbol threshold
+    assert set(buys) == {"AAA", "CCC"}  # BBB exits this tick, so no re-entry
+    first = evaluate_position_size(price=100.0, cash=1_000_000.0, policy=state["policy"], risk_context={})
+    assert buys["AAA"]["qty"] == first["qty"] > 1
+    left = 1_000_000.0 - first["qty"] * 100.0  # CCC is sized against the cash AAA left
+    expected = evaluate_position_size(price=20.0, cash=left, policy=state["policy"], risk_context={})
+    assert buys["CCC"]["qty"] == expected["qty"] > 1 and buys["CCC"]["meta"]["sizing"]["cash"] == left
+    assert [x["side"] for x in out["intents"]][:3] == ["SELL", "SELL", "SELL"]
+    assert out["monitor"]["multi_intent"] is True
+    assert out["monitor"]["exit_intent_count"] == 3 and out["monitor"]["entry_intent_count"] == 2
+    assert out["monitor_book"]["exits"][0]["symbol"] == "BBB"
+
+
+def test_m32_18_monitor_multi_intent_defaults_and_entry_limit():
+    out = monitor_node(_book_state(monitor_max_entry_intents=2))
+    assert [(x["symbol"], x["side"], x["qty"]) for x in out["intents"]] == [("AAA", "BUY", 1), ("BBB", "BUY", 1)]
+    assert out["monitor"]["exit_policy_enabled"] is False and out["monitor_book"]["exits"] == []
+
+    single = monitor_node({**_book_state(), "policy": {}})
+    assert [x["symbol"] for x in single["intents"]] == ["AAA"] and "monitor_book" not in single
+
+
+def test_m32_18_monitor_book_never_commits_more_than_cash():
+    rows = [{"symbol": f"S{i:02d}", "score": 1.0 - i / 100, "price": 10_000.0} for i in range(12)]
+    state = {
+        "plan": {"thesis": "book"},
+        "scan_results": rows,
+        "portfolio_snapshot": {"cash": 1_000_000.0, "positions": []},
+        "policy": {"monitor_multi_intent": True, "use_position_sizing": True, "position_notional_ratio": 0.5, "stop_loss_pct": 0},
+    }
+    buys = monitor_node(dict(state))["intents"]
+    assert len(monitor_node(dict(state))["monitor_book"]["entries"]) == 5  # bounded by default
+    notional = [x["qty"] * 10_000.0 for x in buys]
+    assert sum(notional) <= 1_000_000.0
+    assert [x["meta"]["sizing"]["cash"] for x in buys][:2] == [1_000_000.0, 1_000_000.0 - notional[0]]
+
+    unlimited = monitor_node({**state, "policy": {**state["policy"], "monitor_max_entry_intents": 0}})
+    assert len(unlimited["monitor_book"]["entries"]) == 12
+    assert sum(x["qty"] for x in unlimited["intents"]) * 10_000.0 <= 1_000_000.0
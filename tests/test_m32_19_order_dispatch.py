@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+from libs.approval.service import ApprovalService
+from libs.execution import order_dispatch
+from libs.execution.order_dispatch import (
+    OrderDispatcher,
+    OrderRateLimiter,
+    idempotency_key,
+    order_api_id,
+    parse_rate_map,
+    shared_dispatcher,
+)
+from libs.supervisor.intent_state_store import INTENT_STATE_EXECUTED, INTENT_STATE_FAILED, SQLiteIntentStateStore
+from libs.supervisor.intent_store import IntentStore
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, sec: float) -> None:
+        self.sleeps.append(round(sec, 6))
+
+
+def test_m32_19_rate_limiter_paces_each_api_independently():
+    clock = _FakeClock()
+    lim = OrderRateLimiter(2.0, per_api={"kt10001": 4.0}, clock=clock, sleep=clock.sleep)
+    assert [round(lim.acquire("kt10000"), 6) for _ in range(3)] == [0.0, 0.5, 1.0]
+    assert [round(lim.acquire("kt10001"), 6) for _ in range(2)] == [0.0, 0.25]  # own bucket + override
+    clock.now += 10.0  # refill is capped at the burst size
+    assert [round(lim.acquire("kt10000"), 6) for _ in range(2)] == [0.0, 0.5]
+    assert clock.sleeps == [0.5, 1.0, 0.25, 0.5]
+
+    assert OrderRateLimiter(0.0).acquire("kt10000") == 0.0  # <= 0 disables pacing
+    assert parse_rate_map("kt10000:5, kt10001:x,bad,:3") == {"kt10000": 5.0}
+    assert order_api_id({"action": "sell"}) == "kt10001" and order_api_id({"side": "BUY"}) == "kt10000"
+
+
+def test_m32_19_dispatcher_dedupes_keys_and_guards_before_rate_token():
+    calls: List[str] = []
+    acquired: List[str] = []
+
+    class _Limiter(OrderRateLimiter):
+        def acquire(self, api_id: str) -> float:
+            acquired.append(api_id)
+            return 0.0
+
+    def _guard(intent: Dict[str, Any]) -> None:
+        if intent["qty"] > 10:
+            raise ValueError("qty guard")
+
+    with OrderDispatcher(max_workers=2, rate_limiter=_Limiter(), guard_fn=_guard) as d:
+        submit = lambda it: calls.append(it["intent_id"]) or {"ord_no": it["intent_id"]}  # noqa: E731
+        a = {"intent_id": "a", "action": "BUY", "qty": 1}
+        f1 = d.dispatch(submit, a, key="a:v3")
+        assert d.dispatch(submit, a, key="a:v3") is f1
+        out = {o.intent_id: o for o in d.run_many(submit, [(a, "a:v3"), ({"intent_id": "b", "action": "SELL", "qty": 99}, "b:v3")])}
+    assert calls == ["a"]  # one submission per key
+    assert out["a"].ok and out["a"].execution == {"ord_no": "a"} and out["a"].api_id == "kt10000"
+    assert out["b"].ok is False and out["b"].error == "qty guard" and out["b"].api_id == "kt10001"
+    assert acquired == ["kt10000"]  # blocked intent never took a token
+
+
+def test_m32_19_approve_many_submits_concurrently_with_claim_keys(tmp_path: Path):
+    store = IntentStore(str(tmp_path / "intents.jsonl"))
+    state = SQLiteIntentStateStore(str(tmp_path / "intent_state.db"), persistent=True)
+    svc = ApprovalService(store, state_store=state)
+    ids = ["x", "y", "z"]
+    store.append_rows(
+        [{"ts": 1 + i, "intent_id": iid, "intent": {"intent_id": iid, "action": "BUY", "qty": 1}} for i, iid in enumerate(ids)]
+    )
+
+    barrier = threading.Barrier(3, timeout=5)
+    seen: Dict[str, str] = {}
+
+    def _exec(intent: Dict[str, Any]) -> Dict[str, Any]:
+        barrier.wait()  # only passes when all three are in flight at once
+        seen[intent["intent_id"]] = intent["idempotency_key"]
+        if intent["intent_id"] == "y":
+            raise RuntimeError("broker down")
+        return {"ok": True, "ord_no": f"o-{intent['intent_id']}"}
+
+    with OrderDispatcher(max_workers=3, rate_limiter=OrderRateLimiter(0.0)) as d:
+        out = svc.approve_many(intent_ids=ids, execution_enabled=True, execute_fn=_exec, dispatcher=d)
+    res = {r["intent_id"]: r for r in out["results"]}
+    assert [r["intent_id"] for r in out["results"]] == ids
+    assert res["x"]["status"] == "executed" and res["x"]["execution"]["ord_no"] == "o-x"
+    assert res["y"]["status"] == "failed" and res["y"]["message"] == "broker down"
+    assert state.get_state("z")["state"] == INTENT_STATE_EXECUTED and state.get_state("y")["state"] == INTENT_STATE_FAILED
+
+    # key = intent id + the version produced by the approved -> executing claim (pending v1, approved v2, executing v3)
+    assert seen == {iid: idempotency_key(iid, 3) for iid in ids} == {iid: f"{iid}:v3" for iid in ids}
+    assert res["x"]["idempotency_key"] == "x:v3"
+    done = [j for j in state.list_journal("x") if j.get("to_state") == INTENT_STATE_EXECUTED]
+    assert done and done[-1]["meta"]["idempotency_key"] == "x:v3"
+
+
+def test_m32_19_fast_acks_are_recorded_while_a_slow_order_is_in_flight(tmp_path: Path):
+    store = IntentStore(str(tmp_path / "intents.jsonl"))
+    state = SQLiteIntentStateStore(str(tmp_path / "intent_state.db"), persistent=True)
+    svc = ApprovalService(store, state_store=state)
+    store.append_rows([{"ts": 1 + i, "intent_id": iid, "intent": {"intent_id": iid, "action": "BUY", "qty": 1}} for i, iid in enumerate("fs")])
+
+    release = threading.Event()
+    seen: Dict[str, str] = {}
+
+    def _exec(intent: Dict[str, Any]) -> Dict[str, Any]:
+        if intent["intent_id"] == "s":
+            # the slow order waits until the fast one's ack is in the state store
+            for _ in range(500):
+                if state.get_state("f")["state"] == INTENT_STATE_EXECUTED:
+                    seen["f"] = INTENT_STATE_EXECUTED
+                    break
+                release.wait(0.01)
+        return {"ok": True, "ord_no": f"o-{intent['intent_id']}"}
+
+    with OrderDispatcher(max_workers=2, rate_limiter=OrderRateLimiter(0.0)) as d:
+        out = svc.approve_many(intent_ids=["f", "s"], execution_enabled=True, execute_fn=_exec, dispatcher=d)
+    assert out["ok"] is True and seen == {"f": INTENT_STATE_EXECUTED}
+    assert state.get_state("s")["state"] == INTENT_STATE_EXECUTED
+
+
+def test_m32_19_dispatcher_from_env(monkeypatch):
+    assert OrderDispatcher.from_env() is None  # serial by default
+    monkeypatch.setenv("ORDER_DISPATCH_WORKERS", "3")
+    monkeypatch.setenv("ORDER_RATE_LIMIT_PER_SEC", "4")
+    monkeypatch.setenv("ORDER_RATE_LIMITS", "kt10001:2")
+    d = OrderDispatcher.from_env()
+    try:
+        assert d is not None and d.max_workers == 3
+        assert d.rate_limiter.rate_for("kt10000") == 4.0 and d.rate_limiter.rate_for("kt10001") == 2.0
+    finally:
+        d.close()
+
+
+def test_m32_19_shared_dispatcher_paces_across_bulk_approvals(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(order_dispatch, "_SHARED", {})
+    assert shared_dispatcher() is None  # serial by default
+    monkeypatch.setenv("ORDER_DISPATCH_WORKERS", "2")
+    monkeypatch.setenv("ORDER_RATE_LIMIT_PER_SEC", "2")
+    d = shared_dispatcher()
+    assert d is not None and shared_dispatcher() is d
+
+    store = IntentStore(str(tmp_path / "intents.jsonl"))
+    svc = ApprovalService(store, state_store=SQLiteIntentStateStore(str(tmp_path / "intent_state.db"), persistent=True))
+    rows = [("p", 1), ("q", 1), ("r", 99)]
+    store.append_rows([{"ts": 1 + i, "intent_id": iid, "intent": {"intent_id": iid, "action": "BUY", "qty": q}} for i, (iid, q) in enumerate(rows)])
+    waits: List[float] = []
+    acquire = d.rate_limiter.acquire
+    monkeypatch.setattr(d.rate_limiter, "acquire", lambda api_id: waits.append(acquire(api_id)) or waits[-1])
+
+    def _guard(intent: Dict[str, Any]) -> None:
+        if intent["qty"] > 10:
+            raise ValueError("qty guard")
+
+    try:
+        for iid in ("p", "q", "r"):  # back-to-back single-intent approvals, each through the shared dispatcher
+            out = svc.approve_many(
+                intent_ids=[iid],
+                execution_enabled=True,
+                execute_fn=lambda it: {"ok": True},
+                dispatcher=shared_dispatcher(),
+                guard_fn=_guard,
+            )
+        assert out["results"][0]["message"] == "qty guard"
+        assert len(waits) == 2 and waits[0] == 0.0 and waits[1] > 0.0  # the second call found the bucket spent
+    finally:
+        d.close()
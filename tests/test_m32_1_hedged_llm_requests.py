@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import time
+
+import libs.ai.providers.openai_provider as prov
+from libs.llm.hedging import HedgePolicy, LatencyHistogram, latency_histogram, reset_latency_histograms, run_hedged
+from libs.llm.llm_router import LLMRouter
+
+
+def _input() -> prov.StrategyInput:
+    return prov.StrategyInput(
+        symbol="005930",
+        market_snapshot={"symbol": "005930", "price": 70000},
+        portfolio_snapshot={"cash": 2_000_000, "open_positions": 0},
+        risk_context={"open_positions": 0},
+    )
+
+
+def test_m32_1_latency_histogram_percentile_and_decay():
+    h = LatencyHistogram(max_samples=100)
+    assert h.percentile(95) is None
+    for _ in range(90):
+        h.record(0.09)
+    for _ in range(10):
+        h.record(3.5)
+    assert h.percentile(50) == 0.1
+    assert h.percentile(95) == 4.0
+
+    h.record(0.09)  # exceeds max_samples -> counts halve
+    assert h.total <= 100
+
+
+def test_m32_1_hedge_policy_uses_histogram_after_min_samples():
+    reset_latency_histograms()
+    policy = HedgePolicy(percentile=90, initial_delay_sec=2.0, min_delay_sec=0.1, max_delay_sec=5.0, min_samples=5)
+    assert policy.delay_for("m-primary") == 2.0
+    for _ in range(10):
+        latency_histogram("m-primary").record(0.4)
+    assert policy.delay_for("m-primary") == 0.4
+    for _ in range(100):
+        latency_histogram("m-primary").record(40.0)
+    assert policy.delay_for("m-primary") == 5.0
+
+
+def test_m32_1_run_hedged_primary_fast_does_not_hedge():
+    calls = []
+
+    def secondary():
+        calls.append("secondary")
+        return "b"
+
+    r = run_hedged(lambda: "a", secondary, hedge_delay_sec=0.5)
+    assert r.value == "a"
+    assert r.winner == "primary"
+    assert r.hedged is False
+    assert calls == []
+
+
+def test_m32_1_run_hedged_slow_primary_secondary_wins():
+    def primary():
+        time.sleep(0.5)
+        return "slow"
+
+    r = run_hedged(primary, lambda: "fast", hedge_delay_sec=0.05)
+    assert r.value == "fast"
+    assert r.winner == "secondary"
+    assert r.hedged is True
+    assert r.elapsed_sec < 0.4
+
+
+def test_m32_1_run_hedged_early_primary_failure_fires_secondary_immediately():
+    def primary():
+        raise ValueError("bad schema")
+
+    r = run_hedged(primary, lambda: "ok", hedge_delay_sec=5.0)
+    assert r.value == "ok"
+    assert r.winner == "secondary"
+    assert r.elapsed_sec < 1.0
+    assert "primary" in r.errors
+
+
+def test_m32_1_strategist_hedge_takes_first_valid_response(monkeypatch):
+    reset_latency_histograms()
+
+    def fake_post_json(url, headers, payload, timeout=15.0):  # type: ignore[no-untyped-def]
+        if payload["model"] == "primary/model":
+            time.sleep(0.5)
+            return {"intent": {"action": "SELL", "symbol": "005930", "qty": 1, "price": 70000}}
+        return {"intent": {"action": "BUY", "symbol": "005930", "qty": 1, "price": 70000}, "rationale": "hedge"}
+
+    monkeypatch.setattr(prov, "_post_json", fake_post_json)
+    s = prov.OpenAIStrategist(
+        api_key="k",
+        endpoint="https://example.invalid/strategist",
+        model="primary/model",
+        hedge_model="secondary/model",
+        hedge_policy=HedgePolicy(initial_delay_sec=0.05, min_delay_sec=0.0, max_delay_sec=1.0),
+    )
+    d = s.decide(_input())
+    assert d.intent["action"] == "BUY"
+    assert d.rationale == "hedge"
+    assert d.meta["model"] == "secondary/model"
+    assert d.meta["hedged"] is True
+    assert d.meta["hedge_winner"] == "secondary"
+    assert d.meta["attempts"] == 1
+
+
+def test_m32_1_strategist_hedge_skips_invalid_secondary(monkeypatch):
+    def fake_post_json(url, headers, payload, timeout=15.0):  # type: ignore[no-untyped-def]
+        if payload["model"] == "primary/model":
+            time.sleep(0.1)
+            return {"intent": {"action": "BUY", "symbol": "005930", "qty": 1, "price": 70000}}
+        return {"intent": "not-an-object"}
+
+    monkeypatch.setattr(prov, "_post_json", fake_post_json)
+    s = prov.OpenAIStrategist(
+        api_key="k",
+        endpoint="https://example.invalid/strategist",
+        model="primary/model",
+        hedge_model="secondary/model",
+        hedge_policy=HedgePolicy(initial_delay_sec=0.0, min_delay_sec=0.0),
+    )
+    d = s.decide(_input())
+    assert d.intent["action"] == "BUY"
+    assert d.meta["hedge_winner"] == "primary"
+    assert d.meta["model"] == "primary/model"
+
+
+def test_m32_1_strategist_from_env_reads_hedge_config(monkeypatch):
+    monkeypatch.setenv("AI_STRATEGIST_API_KEY", "k")
+    monkeypatch.setenv("AI_STRATEGIST_ENDPOINT", "https://example.invalid/strategist")
+    monkeypatch.setenv("AI_STRATEGIST_TIMEOUT_SEC", "8")
+    monkeypatch.setenv("AI_STRATEGIST_HEDGE_MODEL", "secondary/model")
+    monkeypatch.setenv("AI_STRATEGIST_HEDGE_PERCENTILE", "99")
+    monkeypatch.delenv("AI_STRATEGIST_HEDGE_MAX_DELAY_SEC", raising=False)
+
+    s = prov.OpenAIStrategist.from_env()
+    assert s.hedge_model == "secondary/model"
+    assert s.hedge_policy.percentile == 99.0
+    assert s.hedge_policy.max_delay_sec == 8.0
+
+
+def test_m32_1_router_hedges_to_secondary_model(monkeypatch):
+    monkeypatch.setenv("OPENROUTER_HEDGE_MODEL_REPORTER", "fast/model")
+
+    class FakeClient:
+        def chat_completions(self, payload):  # type: ignore[no-untyped-def]
+            if payload["model"] == "slow/model":
+                time.sleep(0.5)
+                return {"choices": [{"message": {"content": "slow"}}]}
+            return {"choices": [{"message": {"content": "fast"}}]}
+
+        @staticmethod
+        def extract_text(resp):  # type: ignore[no-untyped-def]
+            return resp["choices"][0]["message"]["content"]
+
+    router = LLMRouter(
+        client=FakeClient(),  # type: ignore[arg-type]
+        hedge_policy=HedgePolicy(initial_delay_sec=0.05, min_delay_sec=0.0),
+    )
+    out = router.chat("reporter", [{"role": "user", "content": "hi"}], policy={"model": "slow/model"})
+    assert out == "fast"
+    assert router.last_hedge["winner"] == "secondary"
+    assert router.last_hedge["model"] == "fast/model"
+
+
+def test_m32_1_router_without_hedge_model_keeps_single_call(monkeypatch):
+    monkeypatch.delenv("OPENROUTER_HEDGE_MODEL", raising=False)
+    monkeypatch.delenv("OPENROUTER_HEDGE_MODEL_REPORTER", raising=False)
+    seen = []
+
+    class FakeClient:
+        def chat_completions(self, payload):  # type: ignore[no-untyped-def]
+            seen.append(payload["model"])
+            return {"choices": [{"message": {"content": ""}}]}
+
+        @staticmethod
+        def extract_text(resp):  # type: ignore[no-untyped-def]
+            return resp["choices"][0]["message"]["content"]
+
+    router = LLMRouter(client=FakeClient())  # type: ignore[arg-type]
+    assert router.chat("reporter", [], policy={"model": "only/model"}) == ""
+    assert seen == ["only/model"]
+
+
+def test_m32_1_loser_is_cancelled_before_its_next_retry():
+    import threading
+
+    from libs.llm.hedging import HedgeCancelled, hedge_sleep
+
+    attempts = []
+    stopped = threading.Event()
+
+    def primary():
+        try:
+            for i in range(5):
+                attempts.append(i)
+                time.sleep(0.1)  # in-flight call
+                hedge_sleep(0.05)  # retry backoff
+        except HedgeCancelled:
+            stopped.set()
+            raise
+        return "slow"
+
+    r = run_hedged(primary, lambda: "fast", hedge_delay_sec=0.02)
+    assert r.winner == "secondary"
+    assert stopped.wait(2)
+    assert len(attempts) == 1  # the in-flight attempt finished; no retry started
+
+
+def test_m32_1_timeouts_count_toward_the_hedge_delay():
+    from libs.llm.hedging import record_model_outcome
+
+    reset_latency_histograms()
+    record_model_outcome("m", 0.1)
+    record_model_outcome("m", 0.01, ValueError("bad schema"))  # fast failure: not a latency sample
+    record_model_outcome("m", 9.0, TimeoutError("timed out"))
+    assert latency_histogram("m").total == 2
+    assert latency_histogram("m").percentile(100) == 10.0
+
+
+def test_m32_1_breaker_success_goes_to_the_winning_model(monkeypatch):
+    def fake_post_json(url, headers, payload, timeout=15.0):  # type: ignore[no-untyped-def]
+        if payload["model"] == "primary/model":
+            raise ValueError("primary broken")
+        return {"intent": {"action": "BUY", "symbol": "005930", "qty": 1, "price": 70000}}
+
+    monkeypatch.delenv("CIRCUIT_STORE_DB_PATH", raising=False)
+    monkeypatch.setattr(prov, "_post_json", fake_post_json)
+    prov.OpenAIStrategist._CB_STATE.clear()
+    s = prov.OpenAIStrategist(
+        api_key="k",
+        endpoint="https://example.invalid/m32-1-cb",
+        model="primary/model",
+        hedge_model="secondary/model",
+        hedge_policy=HedgePolicy(initial_delay_sec=5.0, min_delay_sec=0.0, max_delay_sec=5.0),
+        retry_max=0,
+        cb_fail_threshold=2,
+        cb_cooldown_sec=60,
+    )
+    for _ in range(2):
+        d = s.decide(_input())
+        assert d.meta["hedge_winner"] == "secondary"
+    # the primary failed both times: its breaker opens even though the hedge kept answering
+    primary = prov.OpenAIStrategist._CB_STATE[s._cb_key("primary/model")]
+    assert primary["fail_count"] == 2.0 and primary["open_until_epoch"] > time.time()
+    assert prov.OpenAIStrategist._CB_STATE[s._cb_key("secondary/model")]["fail_count"] == 0.0
+    # primary circuit open, hedge circuit closed: straight to the hedge model
+    d = s.decide(_input())
+    assert d.intent["action"] == "BUY" and d.meta["circuit_bypassed_model"] == "primary/model"
+    assert "hedge_winner" not in d.meta
+    prov.OpenAIStrategist._CB_STATE[s._cb_key("secondary/model")].update(fail_count=2.0, open_until_epoch=time.time() + 60)
+    assert s.decide(_input()).meta["error"] == "circuit_open"  # both open
+    prov.OpenAIStrategist._CB_STATE.clear()
+
+
+def test_m32_1_cancelled_primary_releases_its_half_open_probe(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_post_json(url, headers, payload, timeout=15.0):  # type: ignore[no-untyped-def]
+        calls.append(payload["model"])
+        if payload["model"] == "primary/model":
+            time.sleep(0.3)
+        return {"intent": {"action": "BUY", "symbol": "005930", "qty": 1, "price": 70000}}
+
+    monkeypatch.setenv("CIRCUIT_STORE_DB_PATH", str(tmp_path / "cb.db"))
+    monkeypatch.setattr(prov, "_post_json", fake_post_json)
+    s = prov.OpenAIStrategist(
+        api_key="k",
+        endpoint="https://example.invalid/m32-1-probe",
+        model="primary/model",
+        hedge_model="secondary/model",
+        hedge_policy=HedgePolicy(initial_delay_sec=0.05, min_delay_sec=0.0, max_delay_sec=0.05),
+        retry_max=0,
+        cb_fail_threshold=1,
+        cb_cooldown_sec=1,
+    )
+    store = prov.shared_circuit_store_from_env()
+    key = s._cb_shared_key(s._cb_key("primary/model"))
+    store.record_failure(key, fail_threshold=1, cooldown_sec=1, now_epoch=time.time() - 10)  # cooled down: next gate probes
+
+    d = s.decide(_input())
+    assert d.meta["hedge_winner"] == "secondary" and calls[0] == "primary/model"
+    rec = store.get(key)
+    assert rec["state"] == "half_open" and rec["probe_owner"] == ""  # released, not held until the TTL
+    assert store.gate(key, owner="another-worker")["allowed"] is True
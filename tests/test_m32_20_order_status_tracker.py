@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import pytest
+
+from graphs.nodes import monitor_node as monitor_mod
+from graphs.nodes.hydrate_skill_results_node import hydrate_skill_results_node
+from graphs.nodes.monitor_node import monitor_node
+from libs.execution.order_status_tracker import OrderStatusTracker, derive_order_lifecycle, rows_from_account_orders
+from libs.skills.dto import AccountOrdersDTO
+
+
+class _Book:
+    """kt00007-style account order rows, mutated between polls; counts upstream calls."""
+
+    def __init__(self) -> None:
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        self.calls = 0
+
+    def set(self, ord_no: str, *, qty: int, filled: int, status: str = "접수", stk_cd: str = "A005930") -> None:
+        self.rows[ord_no] = {"ord_no": ord_no, "stk_cd": stk_cd, "ord_qty": str(qty), "cntr_qty": str(filled), "acpt_tp": status}
+
+    def fetch(self) -> Dict[str, Any]:
+        self.calls += 1
+        return {"acnt_ord_cntr_prps_dtl": list(self.rows.values())}
+
+
+def test_m32_20_one_account_query_diffs_all_open_orders():
+    book = _Book()
+    tr = OrderStatusTracker(book.fetch, min_interval_sec=1.0, max_interval_sec=8.0)
+    for n in ("1", "2", "3"):
+        assert tr.track(n, symbol="005930", order_qty=10, now=0.0) is True
+        book.set(n, qty=10, filled=0)
+    assert tr.track("1", now=0.0) is False and tr.open_count == 3
+
+    book.set("1", qty=10, filled=4)
+    book.set("2", qty=10, filled=10)
+    book.set("9", qty=1, filled=1)  # not tracked: ignored
+    events = {e["ord_no"]: e for e in tr.poll(now=1.0)}
+    assert book.calls == 1  # one upstream call for three open orders
+    assert events["1"]["stage"] == "partial_fill" and events["1"]["fill_delta"] == 4
+    assert events["2"]["stage"] == "filled" and events["2"]["terminal"] is True
+    assert events["3"]["prev_stage"] == "submitted" and events["3"]["stage"] == "working"
+    assert events["1"]["symbol"] == "005930"
+    assert {r["ord_no"] for r in tr.lifecycles()} == {"1", "3"}  # terminal orders leave the set
+
+    assert tr.poll(now=2.0) == [] and book.calls == 2  # quiet poll: no events
+    book.set("1", qty=10, filled=10)
+    book.set("3", qty=10, filled=0, status="취소 CANCELLED")
+    stages = {e["ord_no"]: e["stage"] for e in tr.poll(now=100.0)}
+    assert stages == {"1": "filled", "3": "cancelled"} and tr.open_count == 0
+    assert tr.stats == {"polls": 3, "fetch_errors": 0, "events": 5}
+
+
+def test_m32_20_interval_backs_off_when_quiet_and_tightens_after_submit():
+    book = _Book()
+    tr = OrderStatusTracker(book.fetch, min_interval_sec=1.0, max_interval_sec=8.0, backoff=2.0)
+    assert tr.due(now=1e6) is False  # nothing open: never polls
+
+    tr.track("7", order_qty=5, now=10.0)
+    book.set("7", qty=5, filled=0)
+    assert tr.due(now=10.5) is False and tr.due(now=11.0) is True
+    tr.poll(now=11.0)  # submitted -> working is an event: stay tight
+    assert tr.interval_sec == 1.0
+
+    now, gaps = 12.0, []
+    for _ in range(5):
+        assert tr.poll(now=now) == []
+        gaps.append(tr.interval_sec)
+        now = tr.next_poll_at
+    assert gaps == [2.0, 4.0, 8.0, 8.0, 8.0]
+    assert tr.poll(now=now - 0.1) == [] and tr.stats["polls"] == 6  # not due: no call
+
+    t = now - 7.5  # half a second after the last poll, 8s interval
+    tr.track("8", order_qty=1, now=t)  # a new submission pulls the next poll closer
+    assert tr.next_poll_at == t + 1.0 and tr.interval_sec == 1.0
+
+    def _boom() -> Any:
+        raise RuntimeError("HTTP 429")
+
+    assert tr.poll(now=t + 1.0, fetch_fn=_boom) == []
+    assert tr.stats["fetch_errors"] == 1 and tr.last_error == "HTTP 429" and tr.interval_sec == 2.0
+
+
+def test_m32_20_row_shapes_and_shared_lifecycle():
+    rows = [{"ord_no": "1", "stk_cd": "A1"}]
+    assert rows_from_account_orders(rows) == rows
+    assert rows_from_account_orders(AccountOrdersDTO(rows=rows, raw={})) == rows
+    assert rows_from_account_orders({"result": {"action": "ready", "data": {"rows": rows}}}) == rows
+    assert rows_from_account_orders({"items": rows}) == rows and rows_from_account_orders({"x": 1}) == []
+    with pytest.raises(ValueError, match="account.orders:error:TimeoutError"):
+        rows_from_account_orders({"result": {"action": "error", "meta": {"error_type": "TimeoutError"}}})
+
+    assert monitor_mod._derive_order_lifecycle is derive_order_lifecycle
+    assert derive_order_lifecycle({"status": "PARTIAL", "filled_qty": 1, "order_qty": 2})["progress"] == 0.5
+
+
+class _CountingRunner:
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+        self.rows: List[Dict[str, Any]] = []
+
+    def run(self, *, run_id: str, skill: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        self.calls.append(skill)
+        if skill == "account.orders":
+            return {"result": {"action": "ready", "data": {"rows": list(self.rows)}}}
+        return {"result": {"action": "error", "meta": {"error_type": "unexpected"}}}
+
+
+def test_m32_20_hydration_polls_through_tracker():
+    clock = {"now": 0.0}
+    tr = OrderStatusTracker(min_interval_sec=1.0, max_interval_sec=8.0, clock=lambda: clock["now"])
+    runner = _CountingRunner()
+
+    def _tick(**extra: Any) -> Dict[str, Any]:
+        state = {"skill_runner": runner, "order_tracker": tr, "event_logger": _NullLogger(), **extra}
+        return hydrate_skill_results_node(state)
+
+    _tick()  # bootstrap: one account.orders call so scanners see existing orders
+    _tick()  # idle: no call, last result reused
+    assert runner.calls == ["account.orders"]
+
+    ref = {"ord_no": "55", "symbol": "005930", "ord_dt": "20261019", "order_qty": 2}
+    out = _tick(order_ref=ref)
+    assert runner.calls == ["account.orders"]  # answered by the tracker, no order.status call
+    assert out["skill_results"]["order.status"]["status"] == "submitted"
+    assert out["skill_results"]["account.orders"]["result"]["action"] == "ready"
+
+    clock["now"] = 1.0
+    runner.rows = [{"ord_no": "55", "stk_cd": "A005930", "ord_qty": "2", "cntr_qty": "1", "acpt_tp": "체결"}]
+    out = monitor_node(_tick(order_ref=ref))
+    assert runner.calls == ["account.orders", "account.orders"]
+    assert out["order_events"][0]["stage"] == "partial_fill"
+    assert out["monitor"]["order_lifecycle"]["stage"] == "partial_fill"
+    assert out["monitor"]["order_tracker_loaded"] is True and out["monitor"]["open_order_count"] == 1
+    assert out["monitor"]["order_fill_event_count"] == 1
+
+
+def test_m32_20_filled_order_ref_is_not_reopened_on_the_next_hydrate():
+    clock = {"now": 0.0}
+    tr = OrderStatusTracker(min_interval_sec=1.0, max_interval_sec=8.0, max_closed=2, clock=lambda: clock["now"])
+    runner = _CountingRunner()
+    ref = {"ord_no": "77", "symbol": "005930", "order_qty": 10}
+
+    def _tick() -> Dict[str, Any]:
+        return hydrate_skill_results_node({"skill_runner": runner, "order_tracker": tr, "event_logger": _NullLogger(), "order_ref": ref})
+
+    _tick()  # bootstrap poll: nothing yet, so the next one backs off to t=2
+    clock["now"] = 2.0
+    runner.rows = [{"ord_no": "77", "stk_cd": "A005930", "ord_qty": "10", "cntr_qty": "10", "acpt_tp": "체결"}]
+    out = _tick()
+    assert [(e["stage"], e["fill_delta"]) for e in out["order_events"]] == [("filled", 10)]
+
+    for now in (3.0, 50.0):  # order_ref still in state: no re-registration, no replayed fill
+        clock["now"] = now
+        out = _tick()
+        assert out["order_events"] == [] and tr.open_count == 0
+        assert out["skill_results"]["order.status"]["filled_qty"] == 10
+        assert out["skill_results"]["order.status"]["status"] != "submitted"
+    assert tr.track("77") is False and tr.stats["events"] == 1
+
+    for n in ("a", "b"):  # the closed map is bounded: the oldest terminal order is forgotten
+        tr._open[n] = {"ord_no": n}
+        tr._close(tr._open[n])
+    assert tr.status("77") is None and tr.status("b") == {"ord_no": "b"}
+
+
+class _NullLogger:
+    def log(self, **kw: Any) -> Dict[str, Any]:
+        return {}
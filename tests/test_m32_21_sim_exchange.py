@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from libs.catalog.api_request_builder import PreparedRequest
+from libs.execution.executors.factory import get_executor
+from libs.execution.executors.mock_executor import MockExecutor
+from libs.execution.order_status_tracker import OrderStatusTracker
+from libs.execution import sim_exchange
+from libs.execution.sim_exchange import SimExchange, load_market_events
+from scripts.bench_m32_sim_exchange import run_benchmark
+
+
+def test_m32_21_price_time_priority_between_resting_orders():
+    ex = SimExchange()
+    a = ex.submit(side="BUY", symbol="005930", qty=5, price=100)
+    b = ex.submit(side="BUY", symbol="005930", qty=5, price=100)
+    c = ex.submit(side="BUY", symbol="005930", qty=5, price=101)
+    assert [o.status for o in (a, b, c)] == ["working"] * 3  # no quote yet: all rest
+
+    s = ex.submit(side="SELL", symbol="005930", qty=8, price=99)
+    # best price first (c @101), then time priority (a before b); trades at the resting price
+    assert [(f["ord_no"], f["qty"], f["price"]) for f in ex.fills if f["side"] == "BUY"] == [(c.ord_no, 5, 101.0), (a.ord_no, 3, 100.0)]
+    assert s.status == "filled" and s.avg_price == (5 * 101 + 3 * 100) / 8
+    assert a.status == "partial" and b.filled_qty == 0
+    assert {f["liquidity"] for f in ex.fills} == {"internal"}
+
+
+def test_m32_21_market_orders_walk_quote_size_and_resting_limits_sweep():
+    ex = SimExchange(top_qty=10)
+    ex.on_quote("A005930", 9900, 10100, ts=1000.0, ask_qty=4)
+    m = ex.submit(side="BUY", symbol="005930", qty=6, order_type="market")
+    assert m.status == "partial" and m.filled_qty == 4 and ex.fills[-1]["slippage_bps"] == 100.0
+
+    lim = ex.submit(side="BUY", symbol="005930", qty=3, price=10000)
+    assert lim.status == "working"
+    ex.on_quote("005930", 9800, 10000, ts=1001.0, ask_qty=4)
+    # market FIFO has priority over the limit on new liquidity: 2 to the market order, 2 to the limit
+    assert m.status == "filled" and m.avg_price == (4 * 10100 + 2 * 10000) / 6
+    assert lim.filled_qty == 2 and ex.fills[-1]["ts"] == 1001.0 and ex.fills[-1]["latency_sec"] == 1.0
+
+    ex.on_bar("005930", 9950, 10050, 9900, 10000, 100, ts=1060.0)  # traded through: fills at limit
+    assert lim.status == "filled" and ex.fills[-1]["liquidity"] == "bar"
+
+
+def test_m32_21_latency_injection_and_cancel_before_arrival():
+    ex = SimExchange(latency_ms=50.0)
+    ex.on_quote("005930", 99, 100, ts=10.0)
+    o = ex.submit(side="BUY", symbol="005930", qty=1, order_type="market")
+    assert o.status == "pending" and o.arrive_at == 10.05
+    ex.advance(10.04)
+    assert o.filled_qty == 0
+    ex.advance(10.05)
+    assert o.status == "filled" and ex.fills[-1]["latency_sec"] == 0.05
+
+    late = ex.submit(side="SELL", symbol="005930", qty=1, price=99)
+    assert ex.cancel(late.ord_no).status == "cancelled"
+    ex.advance(11.0)
+    assert late.filled_qty == 0 and ex.submit(side="BUY", symbol="005930", qty=0, price=1).status == "rejected"
+
+
+def test_m32_21_mock_executor_answers_orders_and_status_for_tracker(monkeypatch):
+    ex = SimExchange(top_qty=2)
+    ex.replay(load_market_events("data/eval/m26_fixed_dataset_v1"))
+    assert ex.now > 0 and ex._books["005930"].ask == 70300.0
+
+    executor = MockExecutor(base_url="https://mock", exchange=ex)
+
+    def _req(api_id: str, body: dict) -> PreparedRequest:
+        return PreparedRequest(api_id=api_id, method="POST", path="/api/dostk/x", headers={}, query={}, body=body)
+
+    ack = executor.execute(_req("kt10000", {"stk_cd": "005930", "ord_qty": "5", "ord_uv": "", "trde_tp": "3"}))
+    assert ack.response.ok and ack.meta["exchange"] == "sim" and ack.response.payload["url"] == "https://mock/api/dostk/x"
+    ord_no = ack.response.payload["ord_no"]
+    bad = executor.execute(_req("kt10001", {"stk_cd": "005930", "ord_qty": "0", "ord_uv": "1", "trde_tp": "0"}))
+    assert bad.response.ok is False and bad.response.payload["return_code"] == 1
+    assert executor.execute(_req("ka10001", {})).response.payload["mode"] == "mock"  # not simulated: echo
+
+    tracker = OrderStatusTracker(
+        lambda: executor.execute(_req("kt00007", {})).response.payload, min_interval_sec=0.0
+    )
+    tracker.track(ord_no, now=0.0)
+    assert [e["stage"] for e in tracker.poll(now=1.0)] == ["partial_fill"]  # 2 of 5 at the top of book
+    ex.on_quote("005930", 70200, 70300, ts=ex.now + 1, ask_qty=10)
+    assert [(e["stage"], e["fill_delta"]) for e in tracker.poll(now=2.0)] == [("filled", 3)]
+
+    monkeypatch.setenv("MOCK_EXCHANGE", "sim")
+    assert isinstance(get_executor().exchange, SimExchange)
+    monkeypatch.delenv("MOCK_EXCHANGE")
+    assert get_executor().exchange is None
+
+
+def test_m32_21_executors_share_one_exchange_and_wall_clock_activates_orders(monkeypatch):
+    monkeypatch.setattr(sim_exchange, "_SHARED", {})
+    monkeypatch.setenv("MOCK_EXCHANGE", "sim")
+    monkeypatch.setenv("MOCK_EXCHANGE_LATENCY_MS", "50")
+    a, b = get_executor(), get_executor()
+    assert a.exchange is b.exchange  # orders and status queries hit the same books
+    monkeypatch.setenv("MOCK_EXCHANGE_LATENCY_MS", "0")
+    assert get_executor().exchange is not a.exchange  # other config: other exchange
+
+    wall = {"t": 500.0}
+    ex = SimExchange(latency_ms=50.0, wall_clock=lambda: wall["t"])
+    ex.on_quote("005930", 99, 100, ts=10.0)
+    ack = ex.handle("kt10000", {"stk_cd": "005930", "ord_qty": "1", "ord_uv": "", "trde_tp": "3"})
+    assert ex.orders[ack["ord_no"]].status == "pending"
+    wall["t"] += 0.02
+    assert ex.handle("kt00007", {})["acnt_ord_cntr_prps_dtl"][0]["acpt_tp"] == "접수"
+    wall["t"] += 0.04  # 60ms of wall time since the order: past its 50ms latency
+    assert ex.handle("kt00007", {})["acnt_ord_cntr_prps_dtl"][0]["acpt_tp"] == "체결"
+    assert abs(ex.now - 10.06) < 1e-9
+
+
+def test_m32_21_benchmark_shape():
+    out = run_benchmark(orders=800, symbols=5)
+    assert out["orders"] == 800 and out["fills"] > 0 and out["orders_per_sec"] > 0
+    assert 0.0 < out["filled_ratio"] <= 1.0 and out["fill_latency_ms_p50"] >= 0.0
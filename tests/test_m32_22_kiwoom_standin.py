@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from libs.kiwoom.standin_server import KiwoomStandinServer, LatencyProfile, StandinMarket, parse_latency_map
+from libs.read.kiwoom_price_reader import KiwoomPriceReader
+from libs.read.kiwoom_rank_reader import KiwoomRankReader, RankMode
+from scripts.bench_m32_standin_load import run_benchmark
+
+
+def _auth(server: KiwoomStandinServer) -> dict:
+    tok = server.handle("POST", "/oauth2/token", {}, {"appkey": "k", "secretkey": "s"}).payload
+    return {"Authorization": f"Bearer {tok['token']}"}
+
+
+def test_m32_22_latency_profiles_parse_and_sample_deterministically():
+    assert LatencyProfile.parse("15") == LatencyProfile("fixed", 15.0, 0.0)
+    assert LatencyProfile.parse("uniform:10:40").sample_ms(random.Random(1)) == pytest.approx(
+        LatencyProfile.parse("uniform:10:40").sample_ms(random.Random(1))
+    )
+    assert 10.0 <= LatencyProfile.parse("uniform:40:10").sample_ms(random.Random(2)) <= 40.0
+    assert LatencyProfile.parse("normal:0:0").sample_ms(random.Random(3)) == 0.0
+    assert parse_latency_map("kt10000=fixed:40, ka10030=lognormal:20:0.5,junk") == {
+        "kt10000": LatencyProfile("fixed", 40.0, 0.0),
+        "ka10030": LatencyProfile("lognormal", 20.0, 0.5),
+    }
+    with pytest.raises(ValueError, match="Unknown latency distribution"):
+        LatencyProfile.parse("pareto:1")
+
+
+def test_m32_22_token_auth_and_dataset_payloads():
+    server = KiwoomStandinServer.from_env(latency=LatencyProfile.parse("fixed:5"))
+    assert server.handle("POST", "/api/dostk/stkinfo", {}, {"stk_cd": "005930"}).status == 401
+    assert server.handle("POST", "/oauth2/token", {}, {"appkey": "k"}).status == 400
+    hdr = _auth(server)
+
+    px = server.handle("POST", "/api/dostk/stkinfo", hdr, {"stk_cd": "005930"})
+    assert px.api_id == "ka10001" and px.delay_sec == 0.005
+    assert px.payload["cur_prc"] == "70300" and px.payload["trde_qty"] == "120000"  # M26 dataset bar
+    other = server.handle("POST", "/api/dostk/stkinfo", hdr, {"stk_cd": "123450"}).payload
+    assert other == server.handle("POST", "/api/dostk/stkinfo", hdr, {"stk_cd": "123450"}).payload  # CRC-priced
+
+    order = server.handle("POST", "/api/dostk/ordr", {**hdr, "api-id": "kt10000"}, {"stk_cd": "005930", "ord_qty": "2", "ord_uv": "", "trde_tp": "3"})
+    rows = server.handle("POST", "/api/dostk/acnt", hdr, {}).payload["acnt_ord_cntr_prps_dtl"]
+    assert rows[0]["ord_no"] == order.payload["ord_no"] and rows[0]["cntr_qty"] == "2"
+
+    assert server.handle("POST", "/api/dostk/chart", hdr, {}).status == 400  # several apis share the path
+    assert server.handle("POST", "/api/dostk/nope", hdr, {}).status == 404
+    st = server.stats()
+    assert st["tokens_issued"] == 1 and st["unauthorized"] == 1
+    assert st["by_api"] == {"ka10001": 4, "au10001": 2, "kt10000": 1, "kt00007": 1}
+
+
+def test_m32_22_throttling_every_n_and_rank_pagination_over_http(tmp_path, monkeypatch):
+    market = StandinMarket.from_dataset(universe_size=25)
+    server = KiwoomStandinServer(market=market, page_size=10, throttle_every=3)
+    hdr = _auth(server)
+    codes = [server.handle("POST", "/api/dostk/stkinfo", hdr, {"stk_cd": "005930"}).status for _ in range(6)]
+    assert codes == [200, 200, 429, 200, 200, 429]
+    throttled = server.handle("POST", "/api/dostk/stkinfo", hdr, {"stk_cd": "005930"})
+    assert server.stats()["throttled"] == 2 and throttled.status == 200
+
+    with KiwoomStandinServer(market=market, page_size=10) as live:
+        monkeypatch.setenv("KIWOOM_MODE", "mock")
+        monkeypatch.setenv("KIWOOM_BASE_URL_MOCK", live.base_url)
+        monkeypatch.setenv("KIWOOM_APP_KEY", "k")
+        monkeypatch.setenv("KIWOOM_APP_SECRET", "s")
+        monkeypatch.setenv("KIWOOM_TOKEN_CACHE_PATH", str(tmp_path / "token.json"))
+        rank = KiwoomRankReader.from_env()
+        top = rank.get_top_symbols(mode=RankMode.VOLUME, topk=23)
+        assert len(top) == 23 and len(set(top)) == 23
+        assert live.stats()["by_api"] == {"au10001": 1, "ka10030": 3}  # 10 + 10 + 3 rows: three pages
+        assert rank.get_top_symbols(mode=RankMode.VOLUME, topk=5) == top[:5]  # one page, cached token
+        assert KiwoomPriceReader.from_env().get_market_snapshot("005930").price == 70300.0
+        assert live.stats()["by_api"] == {"au10001": 1, "ka10030": 4, "ka10001": 1}
+
+
+def test_m32_22_load_driver_reports_tick_percentiles_and_counts():
+    out = run_benchmark(ticks=4, topk=3, order_every=2, latency="0")
+    assert out["ticks"] == 4 and out["errors"] == {} and out["orders"] == 2
+    assert out["requests_by_api"] == {"au10001": 1, "ka10030": 4, "ka10001": 12, "kt10000": 2}
+    assert out["tick_ms_p50"] <= out["tick_ms_p95"] <= out["tick_ms_max"] and out["zero_prices"] == 0
+
+    noisy = run_benchmark(ticks=3, topk=2, order_every=0, latency="0", throttle_every=2)
+    assert noisy["throttled"] > 0 and noisy["responses_by_status"]["429"] == noisy["throttled"]
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from graphs.dag_engine import fingerprint
+from graphs.nodes.hydrate_skill_results_node import hydrate_skill_results_node
+from graphs.nodes.scanner_node import scanner_node
+from graphs.nodes.skill_contracts import extract_market_quotes
+from libs.kiwoom.realtime_ws import FrameSocket, KiwoomRealtimeClient, OP_TEXT, encode_frame
+from libs.kiwoom.standin_feed import KiwoomStandinFeed
+from libs.market.quote_table import QuoteTable
+from libs.read.price_reader import MockPriceReader, StreamPriceReader
+from scripts.bench_m32_quote_stream import run_benchmark
+
+
+def test_m32_23_quote_table_bars_freshness_and_watch():
+    clock = {"now": 120.0}
+    table = QuoteTable(bar_sec=60, max_age_sec=2.0, clock=lambda: clock["now"])
+    seen: List[List[str]] = []
+    table.add_watch_listener(seen.append)
+    assert table.watch(["A005930", "000660"]) == ["005930", "000660"]
+    assert table.watch(["005930"]) == [] and seen == [["005930", "000660"]]
+
+    assert table.update("A005930", price=100, cum_volume=10, bid=99, ask=101)
+    clock["now"] = 150.0
+    table.update("005930", price=104, cum_volume=15)  # volume from the cumulative delta
+    table.update("005930", price=98, qty=2)
+    table.update("005930", price=500, qty=9, ts=100.0)  # late print: last quote only
+    clock["now"] = 181.0
+    table.update("005930", price=101, qty=1)
+    assert table.update("", price=1) is False and table.update("005930") is False
+    assert [(b["open"], b["high"], b["low"], b["close"], b["volume"]) for b in table.bars("005930")] == [
+        (100.0, 104.0, 98.0, 98.0, 7.0),
+        (101.0, 101.0, 101.0, 101.0, 1.0),
+    ]
+
+    row = table.snapshot()["005930"]
+    assert row["cur"] == 101.0 and row["best_bid"] == 99.0 and row["age_ms"] == 0.0
+    clock["now"] = 184.0
+    assert table.snapshot() == {} and table.age_sec("005930") == 3.0
+    assert table.ohlcv_by_symbol(min_bars=3) == {} and len(table.ohlcv_by_symbol()["005930"]) == 2
+
+
+def test_m32_23_client_parses_signed_prints_and_echoes_ping():
+    class _Sock:
+        def __init__(self) -> None:
+            self.sent: List[bytes] = []
+
+        def sendall(self, data: bytes) -> None:
+            self.sent.append(data)
+
+    table = QuoteTable()
+    client = KiwoomRealtimeClient("ws://unused", table, token_fn=lambda: "t")
+    vals = {"10": "-70300", "15": "+12", "13": "1200", "27": "+70400", "28": "-70200", "20": "090001"}
+    n = client.handle_message({"trnm": "REAL", "data": [{"type": "0B", "item": "005930", "values": vals}]})
+    n += client.handle_message({"trnm": "REAL", "data": [{"type": "0C", "item": "000660", "values": {"27": "201000", "28": "200500"}}]})
+    assert n == 2 and client.stats["quotes"] == 2
+    row = table.get("005930")
+    assert (row["price"], row["best_ask"], row["best_bid"], row["volume"]) == (70300.0, 70400.0, 70200.0, 1200.0)
+    assert table.get("000660")["price"] is None and table.get("000660")["best_bid"] == 200500.0
+
+    sock = _Sock()
+    client.handle_message({"trnm": "PING"}, FrameSocket(sock, mask=True))  # type: ignore[arg-type]
+    assert client.stats["pings"] == 1 and len(sock.sent) == 1
+    unmasked = encode_frame(OP_TEXT, b'{"trnm": "PING"}', mask=False)
+    assert sock.sent[0][0] == unmasked[0] and sock.sent[0][1] & 0x80  # client frames are masked
+
+    assert table.watch(["035720"]) == ["035720"] and client.subscribed() == ["035720"]  # watch -> subscribe
+
+
+def test_m32_23_live_feed_login_subscribe_and_resubscribe_after_drop():
+    tokens: List[str] = []
+    with KiwoomStandinFeed(token_check=lambda t: tokens.append(t) or t == "tok") as feed:
+        table = QuoteTable()
+        client = KiwoomRealtimeClient(feed.url, table, token_fn=lambda: "tok", reconnect_min_sec=0.01, recv_timeout_sec=0.02)
+        table.watch(["005930"])
+        with client:
+            assert feed.wait_for(lambda: feed.subscriptions() == {"005930"})
+            table.watch(["000660"])  # subscribed on the live connection
+            assert feed.wait_for(lambda: feed.subscriptions() == {"005930", "000660"})
+            feed.publish("005930", 70300, qty=3, bid=70200, ask=70400)
+            assert feed.wait_for(lambda: (table.get("005930") or {}).get("price") == 70300.0)
+            assert table.bars("005930")[-1]["volume"] == 3.0
+
+            feed.drop_connections()
+            assert feed.wait_for(lambda: client.stats["connects"] == 2 and feed.subscriptions() == {"005930", "000660"})
+            feed.publish("000660", 201000)
+            assert feed.wait_for(lambda: (table.get("000660") or {}).get("price") == 201000.0)
+        assert client.stats["logins"] == 2 and client.stats["disconnects"] >= 1 and tokens == ["tok", "tok"]
+        assert feed.wait_for(lambda: feed.connection_count() == 0)
+
+
+class _QuoteRunner:
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    def run(self, *, run_id: str, skill: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        self.calls.append(f"{skill}:{args.get('symbol', '')}".rstrip(":"))
+        if skill == "market.quote":
+            return {"result": {"action": "ready", "data": {"symbol": args["symbol"], "price": 1.0, "cur": 1.0}}}
+        return {"result": {"action": "error", "meta": {"error_type": "unexpected"}}}
+
+
+class _NullLogger:
+    def log(self, **kw: Any) -> Dict[str, Any]:
+        return {}
+
+
+def test_m32_23_hydrate_and_scanner_read_the_quote_table():
+    clock = {"now": 1000.0}
+    table = QuoteTable(bar_sec=1, max_age_sec=5.0, clock=lambda: clock["now"])
+    watched: List[List[str]] = []
+    table.add_watch_listener(watched.append)
+    for i in range(25):
+        table.update("005930", price=70000 + 10 * i, qty=1, ts=975.0 + i)
+    runner = _QuoteRunner()
+    state = {
+        "skill_runner": runner,
+        "event_logger": _NullLogger(),
+        "candidates": [{"symbol": "005930"}, {"symbol": "000660"}],
+        "quote_table": table,
+    }
+    fp = fingerprint(state, ["quote_table"])
+    out = hydrate_skill_results_node(state)
+    assert watched == [["005930", "000660"]]
+    assert [c for c in runner.calls if c.startswith("market.quote")] == ["market.quote:000660"]  # stale/missing only
+    assert out["skill_fetch"]["streamed"] == {"market.quote": 1}
+    assert out["skill_results"]["market.quote"]["005930"]["price"] == 70240.0
+
+    table.update("000660", price=200500, bid=200000, ask=201000)
+    assert fingerprint(state, ["quote_table"]) != fp  # table version invalidates graph memo
+    quotes, meta = extract_market_quotes(out)
+    assert quotes["000660"]["price"] == 200500.0 and quotes["000660"]["best_bid"] == 200000.0 and meta["used"]
+
+    scanned = scanner_node(dict(out))
+    assert scanned["scanner_feature"]["source"] == "state.quote_table.bars"
+    assert scanned["scanner_feature"]["symbol_count"] == 2
+
+    reader = StreamPriceReader(table, fallback=MockPriceReader({"035720": 50.0}))
+    assert reader.get_market_snapshot("005930").price == 70240.0
+    assert reader.get_market_snapshot("035720").price == 50.0 and (reader.hits, reader.misses) == (1, 1)
+
+
+def test_m32_23_book_only_rows_never_replace_a_trade_price():
+    clock = {"now": 1000.0}
+    table = QuoteTable(max_age_sec=5.0, clock=lambda: clock["now"])
+    client = KiwoomRealtimeClient("ws://unused", table, token_fn=lambda: "t")
+    book = {"trnm": "REAL", "data": [{"type": "0C", "item": "005930", "values": {"27": "+70100", "28": "-70000"}}]}
+    assert client.handle_message(book) == 1
+    assert table.snapshot()["005930"]["price"] is None
+
+    runner = _QuoteRunner()
+    state = {"skill_runner": runner, "event_logger": _NullLogger(), "candidates": [{"symbol": "005930"}], "quote_table": table}
+    out = hydrate_skill_results_node(state)
+    assert "market.quote:005930" in runner.calls  # no trade price streamed: REST
+    assert out["skill_results"]["market.quote"]["005930"]["price"] == 1.0
+
+    polled = {"skill_results": {"market.quote": {"005930": {"symbol": "005930", "price": 70050.0, "cur": 70050.0}}}, "quote_table": table}
+    quotes, _ = extract_market_quotes(polled)
+    assert quotes["005930"]["price"] == 70050.0 and quotes["005930"]["cur"] == 70050.0  # not overwritten with None
+
+    table.update("005930", price=70080, ts=1000.0)
+    clock["now"] = 1004.0
+    client.handle_message(book)  # a later book update does not refresh the trade's age
+    clock["now"] = 1006.0
+    assert table.snapshot() == {}
+    quotes, _ = extract_market_quotes(polled)
+    assert quotes["005930"]["price"] == 70050.0
+
+
+def test_m32_23_benchmark_stream_cuts_rest_calls_and_survives_drop():
+    out = run_benchmark(ticks=6, symbols=3, latency="0", drop_at=3)
+    assert out["poll"]["price_requests"] == 18
+    s = out["stream"]
+    assert s["stream_hits"] + s["rest_fallbacks"] == 18 and s["price_requests"] == s["rest_fallbacks"]
+    assert 3 <= s["rest_fallbacks"] < 18 and s["quotes"] > 0  # the tick after the drop reads REST
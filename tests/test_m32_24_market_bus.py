@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import pytest
+
+from graphs.dag_engine import fingerprint
+from graphs.nodes.hydrate_skill_results_node import hydrate_skill_results_node
+from graphs.nodes.scanner_node import scanner_node
+from libs.kiwoom.standin_server import KiwoomStandinServer, StandinMarket
+from libs.market import snapshot_bus
+from libs.market.snapshot_bus import MarketBusReader, MarketBusWriter, attach_market_bus
+from scripts.bench_m32_market_bus import run_benchmark
+from scripts.run_market_bus_ingest import run_ingest
+
+
+def test_m32_24_roundtrip_features_capacity_and_freshness(tmp_path):
+    clock = {"now": 100.0}
+    path = tmp_path / "bus"
+    w = MarketBusWriter(path, capacity=2, clock=lambda: clock["now"])
+    r = MarketBusReader(path, max_age_sec=5.0, clock=lambda: clock["now"])
+    assert r.snapshot() == {} and r.version == 0
+
+    assert w.write("A005930", price=70000, bid=69900, ask=70100, volume=10, features={"rsi14": 55, "regime": "trend"})
+    clock["now"] = 102.0
+    assert w.write("005930", price=70100)  # None fields keep their last value
+    n = w.write_quotes({"000660": {"cur": 200000, "ts": 101.0}, "035720": {"price": 1}})
+    assert n == 1 and w.stats["dropped"] == 1 and r.version == 3  # one version per batch
+
+    row = r.snapshot(symbols=["A005930"])["005930"]
+    assert (row["price"], row["best_bid"], row["best_ask"], row["volume"]) == (70100.0, 69900.0, 70100.0, 10.0)
+    assert row["source"] == "bus" and row["age_ms"] == 0.0
+    assert r.snapshot()["000660"]["best_bid"] is None and r.symbols() == ["005930", "000660"]
+    assert r.features() == {
+        "005930": {
+            "close_last": None, "rsi14": 55.0, "ma20": None, "ma20_gap": None, "atr14": None,
+            "volume_spike20": None, "volatility20": None, "signal_score": None, "regime": "trend",
+        }
+    }
+    clock["now"] = 106.5
+    assert list(r.snapshot()) == ["005930"] and r.snapshot(max_age_sec=60)["000660"]["age_ms"] == 5500.0
+    w.close()
+    r.close()
+
+
+def test_m32_24_torn_record_retries_then_serves_last_consistent_copy(tmp_path):
+    path = tmp_path / "bus"
+    w = MarketBusWriter(path, capacity=4)
+    w.write("005930", price=100, bid=99, ask=101)
+    w.write("000660", price=200)
+    r = MarketBusReader(path, max_retries=3, max_age_sec=60)
+    assert r.snapshot()["005930"]["price"] == 100.0
+
+    w._rec["seq"][0] += 1  # writer "preempted" mid-record: seq stays odd
+    w._rec["price"][0] = 555.0
+    snap = r.snapshot()
+    assert snap["005930"]["price"] == 100.0 and snap["000660"]["price"] == 200.0  # never blocks, never torn
+    assert r.stats["torn"] == 1 and r.stats["retries"] == 3
+
+    cold = MarketBusReader(path, max_retries=2, max_age_sec=60)
+    assert list(cold.snapshot()) == ["000660"]  # no consistent copy yet: left out
+    w._rec["seq"][0] += 1
+    assert r.snapshot()["005930"]["price"] == 555.0 and cold.snapshot()["005930"]["price"] == 555.0
+
+    # a restarted writer re-initialises the file in place; readers remap and re-index
+    w.close()
+    w2 = MarketBusWriter(path, capacity=8)
+    w2.write("035720", price=50)
+    assert list(r.snapshot()) == ["035720"] and r.stats["remaps"] == 1
+    assert r.snapshot(symbols=["005930"]) == {}
+    (tmp_path / "junk").write_bytes(b"x" * 128)
+    with pytest.raises(ValueError, match="not a market bus file"):
+        MarketBusReader(tmp_path / "junk")
+    w2.close()
+
+
+class _QuoteRunner:
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    def run(self, *, run_id: str, skill: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        self.calls.append(skill)
+        if skill == "market.quote":
+            return {"result": {"action": "ready", "data": {"symbol": args["symbol"], "price": 1.0}}}
+        return {"result": {"action": "error", "meta": {"error_type": "unexpected"}}}
+
+
+class _NullLogger:
+    def log(self, **kw: Any) -> Dict[str, Any]:
+        return {}
+
+
+def test_m32_24_ingest_fills_bus_and_graph_workers_read_it(tmp_path, monkeypatch):
+    market = StandinMarket.from_dataset(universe_size=25)
+    path = tmp_path / "bus"
+    with KiwoomStandinServer(market=market) as server:
+        monkeypatch.setenv("KIWOOM_MODE", "mock")
+        monkeypatch.setenv("KIWOOM_BASE_URL_MOCK", server.base_url)
+        monkeypatch.setenv("KIWOOM_APP_KEY", "k")
+        monkeypatch.setenv("KIWOOM_APP_SECRET", "s")
+        monkeypatch.setenv("KIWOOM_TOKEN_CACHE_PATH", str(tmp_path / "token.json"))
+        stats = run_ingest(path=str(path), capacity=16, topk=4, rank_every=10, interval_sec=0, ticks=3)
+        assert stats["errors"] == {} and stats["rank_calls"] == 1 and stats["price_calls"] == 12
+        assert stats["published"] == 12 and stats["bus"]["version"] == 3
+
+    monkeypatch.setattr(snapshot_bus, "_READERS", {})
+    monkeypatch.delenv("MARKET_BUS_PATH", raising=False)
+    assert "quote_table" not in attach_market_bus({})
+    monkeypatch.setenv("MARKET_BUS_PATH", str(tmp_path / "missing"))
+    assert "quote_table" not in attach_market_bus({})  # ingest not up yet
+    monkeypatch.setenv("MARKET_BUS_PATH", str(path))
+    monkeypatch.setenv("MARKET_BUS_MAX_AGE_MS", "60000")
+    state = attach_market_bus({"skill_runner": _QuoteRunner(), "event_logger": _NullLogger()})
+    bus = state["quote_table"]
+    assert isinstance(bus, MarketBusReader) and attach_market_bus({})["quote_table"] is bus  # one per process
+
+    top = bus.symbols()
+    state["candidates"] = [{"symbol": s} for s in top[:3]] + [{"symbol": "999990"}]
+    fp = fingerprint(state, ["quote_table"])
+    out = hydrate_skill_results_node(state)
+    assert state["skill_runner"].calls.count("market.quote") == 1  # only the symbol not on the bus
+    assert out["skill_fetch"]["streamed"] == {"market.quote": 3}
+    assert fingerprint(state, ["quote_table"]) == fp  # no new batch: memo key unchanged
+
+    scanned = scanner_node(dict(out))
+    assert scanned["scanner_feature"]["source"] == "state.quote_table.features"
+    assert scanned["scanner_feature"]["symbol_count"] == 4
+    bus.close()
+
+
+def test_m32_24_cross_process_bus_cuts_upstream_reads_without_torn_rows():
+    out = run_benchmark(workers=2, ticks=2, symbols=3, latency="0", churn=5)
+    assert out["per_process"]["price_requests"] == 12  # 2 workers x 2 ticks x 3 symbols
+    bus = out["bus"]
+    assert bus["price_requests"] == 6 and bus["writes"] == 36 and bus["final_version"] == 12
+    assert bus["reads"] >= 2 and bus["rows_read"] > 0 and bus["violations"] == 0
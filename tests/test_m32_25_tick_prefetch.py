@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import itertools
+import threading
+from typing import Any, Dict, List
+
+from graphs.pipelines.m13_live_loop import run_m13_once
+from libs.read.portfolio_reader import MockPortfolioReader
+from libs.read.price_reader import MockPriceReader
+from libs.runtime.tick_prefetch import PrefetchingReader, TickPrefetcher
+from scripts.bench_m32_tick_prefetch import run_benchmark
+
+
+def _wait_done(pf: TickPrefetcher, key: Any) -> None:
+    pf._staged[key].future.result(timeout=5)
+
+
+def test_m32_25_take_serves_fresh_once_and_discards_stale_or_failed():
+    clock = {"now": 10.0}
+    pf = TickPrefetcher(max_age_sec=2.0, clock=lambda: clock["now"])
+    assert pf.take("k") == (False, None)  # nothing staged
+
+    pf.submit("k", lambda: "v1")
+    _wait_done(pf, "k")
+    clock["now"] = 12.0  # exactly at the bound: still fresh
+    assert pf.take("k") == (True, "v1")
+    assert pf.take("k") == (False, None)  # never served twice
+
+    pf.submit("k", lambda: "v2")
+    _wait_done(pf, "k")
+    clock["now"] = 14.5
+    assert pf.take("k") == (False, None)
+
+    def boom() -> Any:
+        raise RuntimeError("upstream down")
+
+    pf.submit("k", boom)
+    assert pf.take("k") == (False, None)
+    s = pf.summary()
+    assert (s["hits"], s["stale"], s["errors"], s["misses"], s["submitted"]) == (1, 1, 1, 4, 3)
+    pf.close()
+
+
+def test_m32_25_delayed_fetch_is_cancelled_on_take_and_invalidate_refetches():
+    calls: List[str] = []
+    pf = TickPrefetcher(max_age_sec=5.0, delay_sec=30.0)
+    pf.submit("k", lambda: calls.append("k") or "late")
+    assert pf.take("k") == (False, None)  # still inside its delay: cold read instead
+    assert pf.stats["cancelled"] == 1 and calls == []
+
+    gate, started = threading.Event(), threading.Event()
+    serial = itertools.count(1)
+
+    def account() -> int:
+        n = next(serial)
+        started.set()
+        gate.wait(5)
+        return n
+
+    pf.submit(("portfolio", 1), account, group="portfolio", delay_sec=0)
+    pf.submit(("market", 1), lambda: "px", group="market", delay_sec=0)
+    assert started.wait(5)  # the pre-invalidation read is in flight
+    assert pf.invalidate("portfolio") == 1 and pf.stats["invalidated"] == 1
+    gate.set()
+    assert pf.take(("portfolio", 1)) == (True, 2)  # the refetch, not the pre-invalidation read
+    assert pf.take(("market", 1)) == (True, "px")
+    assert pf.invalidate("portfolio", refetch=False) == 0
+    pf.close()
+
+
+def test_m32_25_prefetching_reader_restages_each_call_by_arguments():
+    class Reader:
+        name = "r"
+
+        def __init__(self) -> None:
+            self.calls: List[str] = []
+
+        def get_market_snapshot(self, symbol: str) -> str:
+            self.calls.append(symbol)
+            return f"{symbol}#{len(self.calls)}"
+
+    inner = Reader()
+    pf = TickPrefetcher(max_age_sec=60.0)
+    r = PrefetchingReader(inner, pf, group="market", methods=("get_market_snapshot",))
+    assert r.name == "r"
+    assert r.get_market_snapshot("A") == "A#1"  # cold; "A" is re-staged in the background
+    key = ("market", "get_market_snapshot", ("A",), ())
+    _wait_done(pf, key)
+    assert r.get_market_snapshot("A") == "A#2"  # served from the staged read
+    assert len(inner.calls) >= 2 and pf.stats["hits"] == 1
+    _wait_done(pf, key)
+    assert r.get_market_snapshot("B").startswith("B#")  # other arguments: own key, cold
+    assert pf.stats["hits"] == 1
+    pf.close()
+
+
+def test_m32_25_m13_loop_prefetches_and_invalidates_account_after_order(monkeypatch):
+    class Account(MockPortfolioReader):
+        def get_portfolio_snapshot(self):  # type: ignore[override]
+            snap = super().get_portfolio_snapshot()
+            self.cash -= 100.0  # each read sees the account "after" the previous order
+            return snap
+
+    calls: List[str] = []
+    seen: List[Dict[str, Any]] = []
+    pf = TickPrefetcher(max_age_sec=60.0)
+    state: Dict[str, Any] = {
+        "tick_prefetcher": pf,
+        "price_reader": MockPriceReader({"005930": 70000.0}),
+        "portfolio_reader": Account(cash=1000.0),
+        "symbol": "005930",
+    }
+
+    def tick_fn(s: Dict[str, Any], dt: Any = None) -> Dict[str, Any]:
+        calls.append("tick")
+        for key in pf.staged():
+            _wait_done(pf, key)
+        seen.append({"px": s["price_reader"].get_market_snapshot("005930").price, "cash": s["portfolio_reader"].get_portfolio_snapshot().cash})
+        for key in pf.staged():  # let the next-tick reads land before "execution" ends
+            _wait_done(pf, key)
+        s["tick_skipped"] = False
+        s["execution"] = {"allowed": len(seen) == 1}  # only the first tick places an order
+        return s
+
+    kw = dict(load_state_fn=lambda s: calls.append("load") or s, save_state_fn=lambda s: calls.append("save") or s, eod_fn=lambda s, dt=None: calls.append("eod") or s)
+    for _ in range(3):
+        state = run_m13_once(state, tick_fn=tick_fn, **kw)
+    assert calls[:4] == ["load", "tick", "eod", "save"]
+    assert isinstance(state["price_reader"].inner, MockPriceReader)  # wrapped once, not per tick
+    assert [x["px"] for x in seen] == [70000.0] * 3
+    # tick 1 read 1000 and ordered: the staged 900 was dropped and refetched (800)
+    assert [x["cash"] for x in seen] == [1000.0, 800.0, 700.0]
+    assert state["tick_prefetch"]["hits"] == 4 and state["tick_prefetch"]["invalidated"] == 1
+    pf.close()
+
+    # disabled (default): readers are left as they are
+    monkeypatch.delenv("M13_PREFETCH_ENABLED", raising=False)
+    plain = {"price_reader": MockPriceReader()}
+    out = run_m13_once(plain, tick_fn=lambda s, dt=None: s, **kw)
+    assert isinstance(out["price_reader"], MockPriceReader) and "tick_prefetch" not in out
+
+
+def test_m32_25_bench_prefetch_overlaps_io_and_stale_reads_are_discarded():
+    out = run_benchmark(ticks=4, io_ms=20, compute_ms=20, gap_ms=0, order_every=0, max_age_ms=150)
+    seq, pre, stale = out["sequential"], out["prefetch"], out["stale"]
+    assert seq["reads"] == 8 and pre["prefetch"]["hits"] == 6 and pre["prefetch"]["stale"] == 0
+    assert pre["tick_ms_p50"] < seq["tick_ms_p50"]
+    assert stale["prefetch"]["hits"] == 0 and stale["prefetch"]["stale"] == 6
+    assert stale["consumed_age_ms_max"] < 150
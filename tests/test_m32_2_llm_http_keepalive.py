@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+import libs.ai.providers.openai_provider as prov
+from libs.llm import http_pool
+from libs.llm.http_pool import KeepAliveHTTPClient
+from libs.llm.openrouter_client import OpenRouterClient, OpenRouterConfig, OpenRouterError
+from scripts.bench_m32_llm_http_keepalive import run_benchmark
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    status = 200
+    close_after = False
+    silent_close = False
+    delay = 0.0
+    paths: list = []
+
+    def do_POST(self) -> None:  # noqa: N802
+        type(self).paths.append(self.path)
+        if type(self).delay:
+            time.sleep(type(self).delay)
+        n = int(self.headers.get("Content-Length") or 0)
+        req = json.loads(self.rfile.read(n).decode("utf-8")) if n else {}
+        body = json.dumps({"echo": req, "choices": [{"message": {"content": "ok"}}]}).encode("utf-8")
+        if type(self).silent_close:
+            # server drops the connection after this response without announcing it
+            self.close_connection = True
+        self.send_response(type(self).status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if type(self).close_after:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # type: ignore[no-untyped-def]  # noqa: A002
+        return
+
+
+@pytest.fixture()
+def stub_url():
+    handler = type("H", (_Handler,), {"paths": []})
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{srv.server_address[1]}/api/v1/chat/completions", handler
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+
+def test_m32_2_pool_reuses_one_connection(stub_url):
+    url, _h = stub_url
+    c = KeepAliveHTTPClient(pool_size=2)
+    for i in range(5):
+        out = c.post_json(url, {"Content-Type": "application/json"}, {"i": i}, timeout=5.0)
+        assert out["echo"] == {"i": i}
+    assert c.stats["connects"] == 1
+    assert c.stats["reused"] == 4
+    assert c.idle_count() == 1
+    c.close()
+    assert c.idle_count() == 0
+
+
+def test_m32_2_pool_raises_urllib_http_error_with_body(stub_url):
+    url, h = stub_url
+    h.status = 429
+    c = KeepAliveHTTPClient()
+    with pytest.raises(urllib.error.HTTPError) as ei:
+        c.post_json(url, {}, {"x": 1}, timeout=5.0)
+    assert ei.value.code == 429
+    assert b"echo" in ei.value.read()
+    assert prov.OpenAIStrategist._is_retryable_error(ei.value) is True
+
+
+def test_m32_2_pool_handles_server_close_and_stale_connections(stub_url):
+    url, h = stub_url
+    h.close_after = True
+    c = KeepAliveHTTPClient()
+    c.post_json(url, {}, {"a": 1}, timeout=5.0)
+    assert c.idle_count() == 0  # Connection: close -> not pooled
+
+    h.close_after = False
+    c.post_json(url, {}, {"a": 2}, timeout=5.0)
+    assert c.idle_count() == 1
+    # pooled socket closed locally -> fresh connection
+    c._pools[next(iter(c._pools))][0].sock.close()  # type: ignore[union-attr]
+    out = c.post_json(url, {}, {"a": 3}, timeout=5.0)
+    assert out["echo"] == {"a": 3}
+
+
+def test_m32_2_pool_retries_once_on_server_idle_close(stub_url):
+    url, h = stub_url
+    h.silent_close = True
+    c = KeepAliveHTTPClient()
+    c.post_json(url, {}, {"a": 1}, timeout=5.0)
+    h.silent_close = False
+    out = c.post_json(url, {}, {"a": 2}, timeout=5.0)
+    assert out["echo"] == {"a": 2}
+    assert c.stats["stale_retries"] == 1
+    assert c.stats["connects"] == 2
+
+
+def test_m32_2_connection_refused_maps_to_url_error():
+    c = KeepAliveHTTPClient()
+    with pytest.raises(urllib.error.URLError):
+        c.post_json("http://127.0.0.1:9/none", {}, {}, timeout=1.0)
+
+
+def test_m32_2_connect_timeout_is_url_error_and_read_timeout_is_timeout_error(stub_url, monkeypatch):
+    url, h = stub_url
+    c = KeepAliveHTTPClient()
+    h.delay = 0.5
+    with pytest.raises(TimeoutError):  # response read timeout: bare, like urlopen
+        c.post_json(url, {}, {}, timeout=0.1)
+    h.delay = 0.0
+
+    def slow_connect(self):  # type: ignore[no-untyped-def]
+        raise TimeoutError("timed out")
+
+    monkeypatch.setattr(http_pool._HTTPConnection, "connect", slow_connect)
+    with pytest.raises(urllib.error.URLError) as ei:
+        c.post_json(url, {}, {}, timeout=0.1)
+    assert isinstance(ei.value.reason, TimeoutError)
+
+
+def test_m32_2_proxied_urls_go_through_urlopen(stub_url, monkeypatch):
+    url, h = stub_url
+    proxy = url.split("/api/", 1)[0]
+    target = "http://llm.example.invalid/v1/chat/completions"
+    monkeypatch.delenv("LLM_HTTP_KEEPALIVE", raising=False)
+    monkeypatch.setenv("http_proxy", proxy)
+    monkeypatch.setenv("no_proxy", "127.0.0.1")
+    monkeypatch.setattr(urllib.request, "_opener", None)  # urlopen's opener snapshots proxies once
+    http_pool.reset_shared_http_client()
+    assert http_pool.proxy_for(target) == proxy and http_pool.proxy_for(url) is None
+
+    assert prov._post_json(target, {}, {"via": "proxy"}, timeout=5.0)["echo"] == {"via": "proxy"}
+    assert h.paths == [target]  # the proxy got the absolute URL
+    assert http_pool.shared_http_client().stats["requests"] == 0
+    prov._post_json(url, {}, {"direct": 1}, timeout=5.0)  # NO_PROXY host stays pooled
+    assert http_pool.shared_http_client().stats["requests"] == 1
+    http_pool.reset_shared_http_client()
+
+
+def test_m32_2_openrouter_client_uses_shared_pool(stub_url, monkeypatch):
+    url, h = stub_url
+    monkeypatch.delenv("LLM_HTTP_KEEPALIVE", raising=False)
+    http_pool.reset_shared_http_client()
+    client = OpenRouterClient(OpenRouterConfig(api_key="k", base_url=url.rsplit("/chat/completions", 1)[0]))
+    for _ in range(3):
+        assert client.extract_text(client.chat_completions({"model": "m"})) == "ok"
+    assert http_pool.shared_http_client().stats["reused"] == 2
+
+    h.status = 500
+    with pytest.raises(OpenRouterError, match="HTTPError 500"):
+        client.chat_completions({"model": "m"})
+    http_pool.reset_shared_http_client()
+
+
+def test_m32_2_keepalive_disabled_uses_urlopen(stub_url, monkeypatch):
+    url, _h = stub_url
+    monkeypatch.setenv("LLM_HTTP_KEEPALIVE", "false")
+    http_pool.reset_shared_http_client()
+    out = prov._post_json(url, {"Content-Type": "application/json"}, {"k": "v"}, timeout=5.0)
+    assert out["echo"] == {"k": "v"}
+    assert http_pool.shared_http_client().stats["requests"] == 0
+    http_pool.reset_shared_http_client()
+
+
+def test_m32_2_warm_up_opens_pooled_connection(stub_url, monkeypatch):
+    url, _h = stub_url
+    monkeypatch.setenv("AI_STRATEGIST_PROVIDER", "openai")
+    monkeypatch.setenv("AI_STRATEGIST_ENDPOINT", url)
+    monkeypatch.delenv("OPENROUTER_API_KEY", raising=False)
+    monkeypatch.delenv("LLM_HTTP_KEEPALIVE", raising=False)
+    monkeypatch.delenv("LLM_HTTP_WARMUP", raising=False)
+    http_pool.reset_shared_http_client()
+
+    assert http_pool.warm_up_llm_connections() == {}
+    monkeypatch.setenv("LLM_HTTP_WARMUP", "true")
+    assert http_pool.warm_up_llm_connections() == {url: True}
+    pool = http_pool.shared_http_client()
+    prov._post_json(url, {}, {"q": 1}, timeout=5.0)
+    assert pool.stats["connects"] == 1
+    assert pool.stats["reused"] == 1
+    http_pool.reset_shared_http_client()
+
+
+def test_m32_2_benchmark_reports_keepalive_reuse():
+    out = run_benchmark(calls=20)
+    assert out["urlopen"]["calls"] == 20
+    assert out["keepalive"]["calls"] == 20
+    assert out["keepalive_connects"] == 1
+    assert out["keepalive_reused"] == 19
+
+
+def test_m32_2_benchmark_script_file_entrypoint_resolves_repo_imports():
+    repo_root = Path(__file__).resolve().parents[1]
+    script = repo_root / "scripts" / "bench_m32_llm_http_keepalive.py"
+    cp = subprocess.run(
+        [sys.executable, str(script), "--calls", "5", "--json"],
+        cwd=str(repo_root),
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert cp.returncode == 0, f"stdout={cp.stdout}\nstderr={cp.stderr}"
+    out = json.loads(cp.stdout.strip().splitlines()[-1])
+    assert out["keepalive_reused"] == 4
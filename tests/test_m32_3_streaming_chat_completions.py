@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import libs.ai.providers.openai_provider as prov
+from libs.llm import http_pool
+from libs.llm.http_pool import KeepAliveHTTPClient
+from libs.llm.streaming import JSONObjectScanner, collect_chat_stream, find_first_json_object, iter_sse_data
+
+
+def _sse(text_parts, *, tail_parts=(), usage=None):  # type: ignore[no-untyped-def]
+    lines = []
+    for t in list(text_parts) + list(tail_parts):
+        lines.append(("data: " + json.dumps({"choices": [{"delta": {"content": t}}]}) + "\n").encode("utf-8"))
+        lines.append(b"\n")
+    if usage:
+        lines.append(("data: " + json.dumps({"choices": [], "usage": usage}) + "\n").encode("utf-8"))
+    lines.append(b"data: [DONE]\n")
+    return lines
+
+
+def test_m32_3_scanner_handles_chunk_boundaries_strings_and_prose():
+    sc = JSONObjectScanner()
+    assert sc.feed('Sure! {"intent": {"action": "BU') == []
+    assert sc.feed('Y", "note": "a } brace \\" quote"}, "rationale": "r"') == []
+    objs = sc.feed("} trailing {")
+    assert objs == [{"intent": {"action": "BUY", "note": 'a } brace " quote'}, "rationale": "r"}]
+
+
+def test_m32_3_find_first_json_object_matches_legacy_cases():
+    assert find_first_json_object('x {"a": {"b": 1}} y') == {"a": {"b": 1}}
+    assert find_first_json_object('x { not json {"a":1} }') == {"a": 1}
+    assert find_first_json_object('use {x then {"a":1}') == {"a": 1}
+    assert find_first_json_object('say "{" then {"b":"}"}') == {"b": "}"}
+    assert find_first_json_object("[1, 2]") is None
+    assert find_first_json_object("no json here") is None
+
+
+def test_m32_3_extract_json_object_is_linear_on_chatty_output():
+    chatty = "thinking { about " * 20000 + '{"intent": {"action": "NOOP"}}'
+    t0 = time.perf_counter()
+    obj = prov._extract_json_object(chatty)
+    assert time.perf_counter() - t0 < 2.0
+    assert obj == {"intent": {"action": "NOOP"}}
+
+
+def _first_by_offset(text):  # type: ignore[no-untyped-def]
+    dec = json.JSONDecoder()
+    i = text.find("{")
+    while i != -1:
+        try:
+            obj, _ = dec.raw_decode(text, i)
+            if isinstance(obj, dict):
+                return obj
+        except ValueError:
+            pass
+        i = text.find("{", i + 1)
+    return None
+
+
+def test_m32_3_scanner_matches_per_offset_raw_decode_and_chunking():
+    cases = ['{"[:{}"{"b":{"c":2}}"""{"b":{"c":2}}', 'a {"x": "{"} b', '{ "\\" {"a":1} }', '{"k": {"a": 1}, x}']
+    for text in cases:
+        whole = find_first_json_object(text)
+        assert whole == _first_by_offset(text), text
+        sc = JSONObjectScanner()
+        objs = [o for ch in text for o in sc.feed(ch)]
+        assert (objs[0] if objs else sc.flush()) == whole, text
+
+
+def test_m32_3_scanner_feed_and_flush_stay_linear():
+    sc = JSONObjectScanner()
+    t0 = time.perf_counter()
+    for _ in range(100000):
+        assert sc.feed('{"') == []
+    assert sc.flush() is None
+    deep = '{"a":' * 8000 + "1" + "}" * 7999
+    assert find_first_json_object(deep) is None  # beyond the json recursion limit
+    assert find_first_json_object('{"a":' * 8000) is None
+    assert time.perf_counter() - t0 < 2.0
+
+
+def test_m32_3_failed_spans_cost_stays_linear_in_offset():
+    def best(n):  # type: ignore[no-untyped-def]
+        runs = []
+        for _ in range(3):
+            t0 = time.perf_counter()
+            assert find_first_json_object("{a} " * n) is None
+            runs.append(time.perf_counter() - t0)
+        return min(runs)
+
+    small, large = best(10000), best(40000)
+    assert large < 8 * small  # linear ~4x; a decode error priced by offset is ~16x
+
+
+def test_m32_3_iter_sse_data_stops_at_done():
+    lines = [b": keepalive\n", b"data: {\"a\":1}\n", b"\n", b"data: [DONE]\n", b"data: {\"b\":2}\n"]
+    assert list(iter_sse_data(lines)) == ['{"a":1}']
+
+
+def test_m32_3_collect_chat_stream_stops_early_when_accepted():
+    pulled = []
+
+    def gen():  # type: ignore[no-untyped-def]
+        for line in _sse(['{"intent": {"action": "BUY"', "}}"], tail_parts=[" and more"] * 50):
+            pulled.append(line)
+            yield line
+
+    resp = collect_chat_stream(gen(), accept=lambda o: "intent" in o)
+    assert resp["choices"][0]["finish_reason"] == "early_stop"
+    assert resp["choices"][0]["message"]["parsed"] == {"intent": {"action": "BUY"}}
+    assert resp["stream"]["early_stop"] is True
+    assert len(pulled) < 10
+
+
+def test_m32_3_collect_chat_stream_skips_rejected_objects_and_keeps_usage():
+    lines = _sse(['{"x": 1} then ', '{"action": "SELL"}'], usage={"prompt_tokens": 3, "completion_tokens": 4})
+    resp = collect_chat_stream(lines, accept=lambda o: "action" in o)
+    assert resp["choices"][0]["message"]["parsed"] == {"action": "SELL"}
+
+    full = collect_chat_stream(lines, accept=lambda o: False)
+    assert full["choices"][0]["finish_reason"] == "stop"
+    assert full["choices"][0]["message"]["content"] == '{"x": 1} then {"action": "SELL"}'
+    assert full["usage"]["completion_tokens"] == 4
+
+
+def test_m32_3_strategist_stream_mode_aborts_after_valid_intent(monkeypatch):
+    captured = {}
+    state = {"pulled": 0, "closed": False}
+
+    def fake_stream(url, headers, payload, timeout=15.0):  # type: ignore[no-untyped-def]
+        captured["payload"] = dict(payload)
+        try:
+            for line in _sse(['{"intent": {"action": "BUY", "symbol": "005930", "qty": 2}', ', "rationale": "s"}'],
+                             tail_parts=["ignored"] * 100):
+                state["pulled"] += 1
+                yield line
+        finally:
+            state["closed"] = True
+
+    monkeypatch.setattr(http_pool, "post_json_stream", fake_stream)
+    s = prov.OpenAIStrategist(
+        api_key="k",
+        endpoint="https://openrouter.ai/api/v1/chat/completions",
+        model="openai/gpt-4o-mini",
+        stream=True,
+    )
+    d = s.decide(
+        prov.StrategyInput(
+            symbol="005930",
+            market_snapshot={"symbol": "005930", "price": 70000},
+            portfolio_snapshot={"cash": 2_000_000},
+            risk_context={},
+        )
+    )
+    assert d.intent["action"] == "BUY"
+    assert d.intent["qty"] == 2
+    assert d.rationale == "s"
+    assert d.meta["stream"] is True
+    assert d.meta["stream_early_stop"] is True
+    assert captured["payload"]["stream"] is True
+    assert state["closed"] is True
+    assert state["pulled"] < 10
+
+
+def test_m32_3_strategist_stream_disabled_for_custom_endpoint(monkeypatch):
+    def fake_post_json(url, headers, payload, timeout=15.0):  # type: ignore[no-untyped-def]
+        assert "stream" not in payload
+        return {"intent": {"action": "NOOP"}}
+
+    monkeypatch.setattr(prov, "_post_json", fake_post_json)
+    s = prov.OpenAIStrategist(api_key="k", endpoint="https://example.invalid/strategist", stream=True)
+    d = s.decide(prov.StrategyInput(symbol="005930", market_snapshot={}, portfolio_snapshot={}, risk_context={}))
+    assert d.intent["action"] == "NOOP"
+    assert "stream" not in d.meta
+
+
+def test_m32_3_from_env_reads_stream_flag(monkeypatch):
+    monkeypatch.setenv("AI_STRATEGIST_API_KEY", "k")
+    monkeypatch.setenv("AI_STRATEGIST_ENDPOINT", "https://openrouter.ai/api/v1/chat/completions")
+    monkeypatch.setenv("AI_STRATEGIST_STREAM", "true")
+    assert prov.OpenAIStrategist.from_env().stream is True
+    monkeypatch.delenv("AI_STRATEGIST_STREAM")
+    assert prov.OpenAIStrategist.from_env().stream is False
+
+
+class _SSEHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802
+        n = int(self.headers.get("Content-Length") or 0)
+        if n:
+            self.rfile.read(n)
+        body = b"".join(_sse(['{"action": "BUY"}'], tail_parts=["x"] * 20))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # type: ignore[no-untyped-def]  # noqa: A002
+        return
+
+
+@pytest.fixture()
+def sse_url():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _SSEHandler)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{srv.server_address[1]}/v1/chat/completions"
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+
+def test_m32_3_pool_stream_discards_connection_on_early_close(sse_url):
+    c = KeepAliveHTTPClient()
+    lines = c.stream_post_json(sse_url, {}, {"stream": True}, timeout=5.0)
+    resp = collect_chat_stream(lines, accept=lambda o: True)
+    lines.close()
+    assert resp["choices"][0]["message"]["parsed"] == {"action": "BUY"}
+    assert c.idle_count() == 0
+
+    full = list(c.stream_post_json(sse_url, {}, {"stream": True}, timeout=5.0))
+    assert full[-1].startswith(b"data: [DONE]")
+    assert c.idle_count() == 1
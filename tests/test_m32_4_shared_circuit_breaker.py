@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import libs.ai.providers.openai_provider as prov
+from libs.runtime import shared_circuit_store as scs
+from libs.runtime.circuit_breaker import (
+    RuntimeCircuitPolicy,
+    gate_runtime_circuit,
+    mark_runtime_circuit_failure,
+    mark_runtime_circuit_success,
+)
+from libs.runtime.shared_circuit_store import SQLiteCircuitBreakerStore
+
+
+def _input():  # type: ignore[no-untyped-def]
+    return prov.StrategyInput(symbol="005930", market_snapshot={}, portfolio_snapshot={}, risk_context={})
+
+
+def test_m32_4_store_opens_after_threshold_and_probes_once(tmp_path):
+    a = SQLiteCircuitBreakerStore(str(tmp_path / "cb.db"))
+    b = SQLiteCircuitBreakerStore(str(tmp_path / "cb.db"))
+    key = "strategist_llm|m"
+    a.record_failure(key, error_type="Timeout", fail_threshold=2, cooldown_sec=60, now_epoch=1000)
+    assert b.gate(key, owner="b", now_epoch=1001)["allowed"] is True
+    rec = b.record_failure(key, error_type="Timeout", fail_threshold=2, cooldown_sec=60, now_epoch=1001)
+    assert rec["state"] == "open"
+
+    # another instance (process) sees the open circuit immediately
+    g = a.gate(key, owner="a", now_epoch=1030)
+    assert (g["allowed"], g["reason"]) == (False, "circuit_open")
+
+    # after cooldown exactly one owner gets the half-open probe
+    first = a.gate(key, owner="a", now_epoch=1062)
+    second = b.gate(key, owner="b", now_epoch=1062)
+    assert (first["allowed"], first["reason"]) == (True, "circuit_half_open")
+    assert (second["allowed"], second["reason"]) == (False, "circuit_probe_in_flight")
+
+    a.record_success(key)
+    assert b.gate(key, owner="b", now_epoch=1063)["allowed"] is True
+    assert b.get(key)["state"] == "closed"
+
+
+def test_m32_4_probe_failure_reopens_and_stale_probe_expires(tmp_path):
+    s = SQLiteCircuitBreakerStore(str(tmp_path / "cb.db"), probe_ttl_sec=5)
+    key = "runtime|strategist"
+    s.record_failure(key, fail_threshold=1, cooldown_sec=10, now_epoch=100)
+    assert s.gate(key, owner="a", now_epoch=111)["allowed"] is True
+    rec = s.record_failure(key, fail_threshold=5, cooldown_sec=10, now_epoch=112)
+    assert rec["state"] == "open"
+    assert rec["open_until_epoch"] == 122
+
+    assert s.gate(key, owner="a", now_epoch=123)["allowed"] is True
+    # owner "a" crashed without reporting: the probe claim expires after its TTL
+    assert s.gate(key, owner="b", now_epoch=125)["allowed"] is False
+    assert s.gate(key, owner="b", now_epoch=129)["allowed"] is True
+    assert s.get(key)["probe_owner"] == "b"
+
+
+def test_m32_4_concurrent_processes_claim_single_probe(tmp_path):
+    db = tmp_path / "cb.db"
+    s = SQLiteCircuitBreakerStore(str(db))
+    key = "strategist_llm|m"
+    s.record_failure(key, fail_threshold=1, cooldown_sec=10, now_epoch=100)
+    repo_root = Path(__file__).resolve().parents[1]
+    code = (
+        "import json,sys;"
+        "from libs.runtime.shared_circuit_store import SQLiteCircuitBreakerStore as S;"
+        f"print(json.dumps(S({str(db)!r}).gate({key!r}, now_epoch=200)))"
+    )
+    procs = [
+        subprocess.Popen([sys.executable, "-c", code], cwd=str(repo_root), stdout=subprocess.PIPE, text=True)
+        for _ in range(4)
+    ]
+    results = [json.loads(p.communicate(timeout=60)[0].strip().splitlines()[-1]) for p in procs]
+    assert sum(1 for r in results if r["allowed"]) == 1
+    assert sorted(r["reason"] for r in results if not r["allowed"]) == ["circuit_probe_in_flight"] * 3
+
+
+def test_m32_4_closed_gate_is_read_only_and_threads_probe_separately(tmp_path):
+    import sqlite3
+    import threading
+    import time
+
+    s = SQLiteCircuitBreakerStore(str(tmp_path / "cb.db"))
+    key = "strategist_llm|m"
+    s.gate(key, now_epoch=100)
+    writer = sqlite3.connect(str(tmp_path / "cb.db"), isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")  # another process holds the write lock
+    t0 = time.perf_counter()
+    assert s.gate(key, now_epoch=100)["allowed"] is True  # closed: answered without the lock
+    assert time.perf_counter() - t0 < 1.0
+    writer.execute("ROLLBACK")
+    writer.close()
+
+    s.record_failure(key, fail_threshold=1, cooldown_sec=10, now_epoch=100)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(s.gate(key, now_epoch=200))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(1 for r in results if r["allowed"]) == 1  # threads of one process share no probe
+    assert s.gate(key, now_epoch=200)["reason"] == "circuit_probe_in_flight"
+    s.close()
+
+
+def test_m32_4_runtime_circuit_reads_through_shared_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("CIRCUIT_STORE_DB_PATH", str(tmp_path / "cb.db"))
+    policy = RuntimeCircuitPolicy(fail_threshold=2, cooldown_sec=30)
+    run_a: dict = {}
+    run_b: dict = {}
+    mark_runtime_circuit_failure(run_a, error_type="Timeout", now_epoch=1000, policy=policy)
+    mark_runtime_circuit_failure(run_b, error_type="Timeout", now_epoch=1001, policy=policy)
+    assert run_b["circuit"]["strategist"]["state"] == "open"
+
+    fresh: dict = {}
+    g = gate_runtime_circuit(fresh, now_epoch=1010)
+    assert (g["allowed"], g["reason"]) == (False, "circuit_open")
+    assert fresh["circuit"]["strategist"]["open_until_epoch"] == 1031
+
+    mark_runtime_circuit_success(run_a)
+    assert gate_runtime_circuit({}, now_epoch=1011)["allowed"] is True
+
+
+def test_m32_4_runtime_circuit_without_env_stays_per_run(monkeypatch):
+    monkeypatch.delenv("CIRCUIT_STORE_DB_PATH", raising=False)
+    policy = RuntimeCircuitPolicy(fail_threshold=1, cooldown_sec=30)
+    run_a: dict = {}
+    mark_runtime_circuit_failure(run_a, error_type="Timeout", now_epoch=1000, policy=policy)
+    assert gate_runtime_circuit(run_a, now_epoch=1001)["allowed"] is False
+    assert gate_runtime_circuit({}, now_epoch=1001)["allowed"] is True
+
+
+def test_m32_4_strategist_shares_breaker_across_instances(tmp_path, monkeypatch):
+    monkeypatch.setenv("CIRCUIT_STORE_DB_PATH", str(tmp_path / "cb.db"))
+    calls = {"n": 0}
+
+    def failing_post(url, headers, payload, timeout=15.0):  # type: ignore[no-untyped-def]
+        calls["n"] += 1
+        raise TimeoutError("slow")
+
+    monkeypatch.setattr(prov, "_post_json", failing_post)
+    kw = dict(api_key="k", endpoint="https://example.invalid/m32-4", retry_max=0, cb_fail_threshold=2, cb_cooldown_sec=60)
+    worker_a = prov.OpenAIStrategist(**kw)
+    worker_b = prov.OpenAIStrategist(**kw)
+    worker_a.decide(_input())
+    d = worker_b.decide(_input())
+    assert d.meta["circuit_state"] == "open"
+
+    prov.OpenAIStrategist._CB_STATE.clear()
+    blocked = prov.OpenAIStrategist(**kw).decide(_input())
+    assert blocked.intent["reason"] == "circuit_open"
+    assert blocked.meta["circuit_reason"] == "circuit_open"
+    assert calls["n"] == 2
+
+
+def test_m32_4_store_from_env_is_cached_and_optional(tmp_path, monkeypatch):
+    monkeypatch.delenv("CIRCUIT_STORE_DB_PATH", raising=False)
+    assert scs.shared_circuit_store_from_env() is None
+    monkeypatch.setenv("CIRCUIT_STORE_DB_PATH", str(tmp_path / "x" / "cb.db"))
+    monkeypatch.setenv("CIRCUIT_STORE_PROBE_TTL_SEC", "7")
+    s1 = scs.shared_circuit_store_from_env()
+    assert s1 is not None and s1.probe_ttl_sec == 7.0
+    assert scs.shared_circuit_store_from_env() is s1
+    assert scs.circuit_key("runtime", "strategist") == "runtime|strategist"
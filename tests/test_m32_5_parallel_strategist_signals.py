@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+import graphs.nodes.strategist_node as sn
+
+
+def _slow(delay, value):  # type: ignore[no-untyped-def]
+    def fn(*args, **kwargs):  # type: ignore[no-untyped-def]
+        time.sleep(delay)
+        return value
+
+    return fn
+
+
+def _patch_branches(monkeypatch, *, cand_delay=0.0, gs_delay=0.0, news_delay=0.0, gs=0.3):  # type: ignore[no-untyped-def]
+    monkeypatch.setattr(
+        sn, "_generate_candidates", _slow(cand_delay, [{"symbol": "000660", "why": "top_picks"}, {"symbol": "005930", "why": "top_picks"}])
+    )
+    monkeypatch.setattr(sn, "compute_global_sentiment", _slow(gs_delay, gs))
+
+    def news(symbols, state=None, policy=None):  # type: ignore[no-untyped-def]
+        time.sleep(news_delay)
+        return {s: [{"title": s}] for s in symbols}
+
+    monkeypatch.setattr(sn, "collect_news_items", news)
+    monkeypatch.setattr(sn, "score_news_sentiment", lambda items, symbols, state=None, policy=None: {s: 0.5 for s in symbols})
+
+
+def test_m32_5_branches_overlap_wall_time_tracks_slowest(monkeypatch):
+    _patch_branches(monkeypatch, cand_delay=0.2, gs_delay=0.3, news_delay=0.05)
+    t0 = time.perf_counter()
+    out = sn.strategist_node({"policy": {"use_news_analysis": True, "strategist_parallel": True}})
+    wall = time.perf_counter() - t0
+    assert wall < 0.45  # sequential would be ~0.55s
+    stage = out["strategist_stage"]
+    assert stage["mode"] == "parallel"
+    assert {n: b["status"] for n, b in stage["branches"].items()} == {
+        "candidates": "ok",
+        "news": "ok",
+        "global_sentiment": "ok",
+    }
+    assert stage["branches"]["global_sentiment"]["latency_ms"] >= 250
+    assert out["global_sentiment"] == {"score": 0.3}
+    assert out["news_sentiment"] == {"000660": 0.5, "005930": 0.5}
+
+
+def test_m32_5_branch_timeouts_fall_back_to_safe_defaults(monkeypatch):
+    _patch_branches(monkeypatch, cand_delay=0.5, gs_delay=0.5, gs=-0.9)
+    policy = {
+        "candidate_k": 3,
+        "strategist_parallel": True,
+        "strategist_timeout_candidates_sec": 0.05,
+        "strategist_timeout_global_sentiment_sec": 0.1,
+    }
+    t0 = time.perf_counter()
+    out = sn.strategist_node({"policy": policy})
+    assert time.perf_counter() - t0 < 0.4
+    branches = out["strategist_stage"]["branches"]
+    assert branches["candidates"]["status"] == "timeout"
+    assert branches["global_sentiment"]["status"] == "timeout"
+    assert [c["why"] for c in out["candidates"]] == ["fallback"] * 3
+    assert out["global_sentiment"] == {"score": 0.0}
+    assert out["policy"]["max_risk"] == 0.7
+
+
+def test_m32_5_branch_error_falls_back_and_records_type(monkeypatch):
+    _patch_branches(monkeypatch)
+
+    def boom(*args, **kwargs):  # type: ignore[no-untyped-def]
+        raise RuntimeError("yfinance down")
+
+    monkeypatch.setattr(sn, "compute_global_sentiment", boom)
+    with pytest.raises(RuntimeError):  # default (sequential): errors propagate as before M32-5
+        sn.strategist_node({"universe": ["005930"]})
+    out = sn.strategist_node({"universe": ["005930"], "policy": {"strategist_parallel": True}})
+    gs = out["strategist_stage"]["branches"]["global_sentiment"]
+    assert (gs["status"], gs["error_type"]) == ("error", "RuntimeError")
+    assert out["strategist_stage"]["branches"]["candidates"]["status"] == "injected"
+    assert out["global_sentiment"] == {"score": 0.0}
+
+
+def test_m32_5_parallel_matches_sequential_outputs():
+    base = {
+        "universe": ["005930", "000660", "035420", "051910"],
+        "mock_global_sentiment": -0.6,
+        "mock_news_sentiment": {"005930": -0.9, "000660": 0.4},
+    }
+    par = sn.strategist_node({**base, "policy": {"strategist_parallel": True}})
+    seq = sn.strategist_node({**base, "policy": {}})
+    assert seq["strategist_stage"]["mode"] == "sequential"
+    for key in ("candidates", "news_sentiment", "news_items", "global_sentiment"):
+        assert par[key] == seq[key]
+    assert par["policy"]["max_risk"] == seq["policy"]["max_risk"]
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from graphs.commander_worker import CommanderRuntimeWorker, WarmRuntimeComponents
+from graphs.nodes.execute_from_packet import execute_from_packet
+from scripts.run_commander_runtime_worker import run_worker
+
+
+def _counting_builders(counts):  # type: ignore[no-untyped-def]
+    def make(name):  # type: ignore[no-untyped-def]
+        def build(_c):  # type: ignore[no-untyped-def]
+            counts[name] = counts.get(name, 0) + 1
+            return {"component": name, "build": counts[name]}
+
+        return build
+
+    return {n: make(n) for n in ("settings", "api_catalog", "supervisor", "executor", "skill_runner")}
+
+
+def _write_config(tmp_path):  # type: ignore[no-untyped-def]
+    catalog = tmp_path / "api_catalog.jsonl"
+    catalog.write_text(json.dumps({"api_id": "ka10001"}) + "\n", encoding="utf-8")
+    skills = tmp_path / "skills"
+    skills.mkdir()
+    (skills / "a.yaml").write_text("skill: a\nsteps: [ka10001]\n", encoding="utf-8")
+    return catalog, skills
+
+
+def test_m32_6_worker_builds_once_and_injects_each_tick(tmp_path):
+    catalog, skills = _write_config(tmp_path)
+    counts: dict = {}
+    comps = WarmRuntimeComponents(
+        catalog_path=str(catalog), skills_dir=str(skills), env_path=str(tmp_path / ".env"), builders=_counting_builders(counts)
+    )
+    seen = []
+
+    def runtime(state):  # type: ignore[no-untyped-def]
+        seen.append((state["api_catalog"], state["executor"], state["skill_runner_factory"](state)))
+        state["runtime_status"] = "ok"
+        return state
+
+    worker = CommanderRuntimeWorker(comps, runtime=runtime)
+    outs = worker.run(lambda i: {"run_id": f"r{i}"}, ticks=4)
+    assert counts == {"settings": 1, "api_catalog": 1, "supervisor": 1, "executor": 1, "skill_runner": 1}
+    assert all(s[0] is seen[0][0] and s[2] is seen[0][2] for s in seen)
+    # injected components are removed from the returned per-tick state
+    assert "api_catalog" not in outs[0] and "executor" not in outs[0]
+    assert outs[-1]["runtime_worker"]["tick"] == 4
+    assert outs[-1]["runtime_worker"]["reloaded"] is False
+
+
+def test_m32_6_worker_hot_reloads_on_config_change(tmp_path):
+    catalog, skills = _write_config(tmp_path)
+    counts: dict = {}
+    comps = WarmRuntimeComponents(
+        catalog_path=str(catalog), skills_dir=str(skills), env_path=str(tmp_path / ".env"), builders=_counting_builders(counts)
+    )
+    worker = CommanderRuntimeWorker(comps, runtime=lambda s: s)
+    worker.tick({})
+    (skills / "a.yaml").write_text("skill: a\nsteps: [ka10001, ka10002]\n", encoding="utf-8")
+    out = worker.tick({})
+    assert out["runtime_worker"]["reloaded"] is True
+    assert counts["api_catalog"] == 2
+    assert comps.reload_count == 1
+
+    st = os.stat(catalog)
+    os.utime(catalog, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    assert comps.refresh() is True
+    assert worker.tick({})["runtime_worker"]["reloaded"] is False
+
+
+def test_m32_6_env_edit_reaches_rebuilt_settings_and_executor(tmp_path, monkeypatch):
+    from libs.execution.executors.mock_executor import MockExecutor
+    from libs.execution.executors.real_executor import RealExecutor
+
+    catalog, skills = _write_config(tmp_path)
+    env = tmp_path / ".env"
+    env.write_text("EXECUTION_MODE=mock\nKIWOOM_MODE=mock\nM32_6_DROPPED=1\n", encoding="utf-8")
+    # as if loaded from this .env earlier (setenv also restores the real values after the test)
+    for key, value in (("EXECUTION_MODE", "mock"), ("KIWOOM_MODE", "mock"), ("M32_6_DROPPED", "1")):
+        monkeypatch.setenv(key, value)
+    monkeypatch.setenv("M32_6_PINNED", "process")  # set outside the file: the file never overrides it
+    counting = _counting_builders({})
+    builders = {n: counting[n] for n in ("api_catalog", "supervisor", "skill_runner")}
+    comps = WarmRuntimeComponents(catalog_path=str(catalog), skills_dir=str(skills), env_path=str(env), builders=builders)
+    comps.build()
+    assert isinstance(comps.executor, MockExecutor) and comps.settings.kiwoom_mode == "mock"
+
+    env.write_text("EXECUTION_MODE=real\nKIWOOM_MODE=real\nM32_6_PINNED=file\n", encoding="utf-8")
+    st = os.stat(env)
+    os.utime(env, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    assert comps.refresh() is True
+    assert isinstance(comps.executor, RealExecutor) and comps.settings.kiwoom_mode == "real"
+    assert "M32_6_DROPPED" not in os.environ
+    assert os.environ["M32_6_PINNED"] == "process"
+
+
+def test_m32_6_inject_respects_caller_keys_and_refreshes_issued_ones(tmp_path):
+    catalog, skills = _write_config(tmp_path)
+    comps = WarmRuntimeComponents(
+        catalog_path=str(catalog), skills_dir=str(skills), env_path=str(tmp_path / ".env"), builders=_counting_builders({})
+    )
+    comps.build()
+    own_executor = object()
+    state = {"executor": own_executor}
+    comps.inject(state)
+    assert state["executor"] is own_executor
+    first_catalog = state["api_catalog"]
+    comps.build()
+    comps.inject(state)
+    assert state["api_catalog"] is not first_catalog
+    assert state["api_catalog"] is comps.api_catalog
+
+
+def test_m32_6_execute_from_packet_uses_preloaded_catalog(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVENT_LOG_PATH", str(tmp_path / "events.jsonl"))
+    monkeypatch.setenv("EXECUTION_MODE", "mock")
+    monkeypatch.setenv("KIWOOM_API_CATALOG_PATH", str(tmp_path / "missing.jsonl"))
+    comps = WarmRuntimeComponents(env_path=str(tmp_path / ".env"), catalog_path="./data/specs/api_catalog.jsonl")
+    comps.build()
+    calls = []
+
+    class _Exec:
+        def execute(self, req):  # type: ignore[no-untyped-def]
+            calls.append(req)
+            return {"ok": True}
+
+    state = {
+        "decision_packet": {
+            "intent": {"action": "BUY", "symbol": "005930", "qty": 1, "price": 70000, "order_type": "limit"},
+            "risk": {},
+            "exec_context": {},
+        },
+        "executor": _Exec(),
+    }
+    comps.inject(state)
+    out = execute_from_packet(state)
+    assert out["execution"]["allowed"] is True
+    assert len(calls) == 1
+
+
+def test_m32_6_worker_script_reports_setup_vs_decision(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVENT_LOG_PATH", str(tmp_path / "events.jsonl"))
+    out = run_worker(ticks=3)
+    assert out["ticks"] == 3
+    assert out["cold_setup_ms"] > out["mean_setup_ms"]
+    assert [t["tick"] for t in out["per_tick"]] == [1, 2, 3]
+    assert out["setup_saved_ms"] > 0
+
+    repo_root = Path(__file__).resolve().parents[1]
+    cp = subprocess.run(
+        [sys.executable, str(repo_root / "scripts" / "run_commander_runtime_worker.py"), "--ticks", "2", "--json"],
+        cwd=str(repo_root),
+        capture_output=True,
+        text=True,
+        check=False,
+        env={**os.environ, "EVENT_LOG_PATH": str(tmp_path / "events2.jsonl")},
+    )
+    assert cp.returncode == 0, cp.stderr
+    assert json.loads(cp.stdout.strip().splitlines()[-1])["ticks"] == 2
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from graphs.commander_runtime import run_commander_runtime
+from graphs.trading_graph import run_trading_graph
+from libs.core.event_logger import EventLogger
+from libs.runtime.span_tracer import SpanTracer, begin_trace, end_trace
+from scripts.report_runtime_trace_profile import aggregate_node_latency, folded_stacks
+
+
+def _graph_stubs(retries: int = 1):  # type: ignore[no-untyped-def]
+    calls = {"decide": 0}
+
+    def strategist(s):  # type: ignore[no-untyped-def]
+        s["candidates"] = [{"symbol": "005930"}, {"symbol": "000660"}]
+        return s
+
+    def passthrough(s):  # type: ignore[no-untyped-def]
+        return s
+
+    def scanner(s):  # type: ignore[no-untyped-def]
+        time.sleep(0.002)
+        return s
+
+    def decide(s):  # type: ignore[no-untyped-def]
+        calls["decide"] += 1
+        s["decision"] = "retry_scan" if calls["decide"] <= retries else "approve"
+        return s
+
+    return dict(
+        strategist=strategist,
+        scanner=scanner,
+        monitor=passthrough,
+        portfolio_guard=passthrough,
+        decide=decide,
+        executor=passthrough,
+    )
+
+
+def test_m32_7_tracer_nests_and_records_attrs():
+    t = SpanTracer("root")
+    with t.span("a", k=1):
+        with t.span("b") as attrs:
+            attrs["n"] = 2
+        t.set_attrs(done=True)
+    with pytest.raises(ValueError):
+        with t.span("c"):
+            raise ValueError("x")
+    spans = t.to_payload()["spans"]
+    assert [(s[0], s[1]) for s in spans] == [("a", -1), ("b", 0), ("c", -1)]
+    assert spans[0][4] == {"k": 1, "done": True}
+    assert spans[1][4] == {"n": 2}
+    assert spans[2][4] == {"error_type": "ValueError"}
+    assert spans[0][3] >= spans[1][3]
+
+
+def test_m32_7_trading_graph_emits_one_event_with_retry_attempts(tmp_path):
+    logger = EventLogger(log_path=tmp_path / "events.jsonl")
+    state = {"run_id": "r1", "trace_enabled": True, "event_logger": logger}
+    out = run_trading_graph(state, **_graph_stubs(retries=2))
+    events = [e for e in logger.read_all() if e["stage"] == "runtime_trace"]
+    assert len(events) == 1
+    spans = events[0]["payload"]["spans"]
+    assert spans[0][0] == "run_trading_graph"
+    assert spans[0][4] == {"retry_scan": 2, "decision": "approve"}
+    scans = [s for s in spans if s[0] == "scanner"]
+    assert [s[4]["attempt"] for s in scans] == [0, 1, 2]
+    assert all(s[4]["candidates"] == 2 for s in scans)
+    assert "tracer" not in out
+    assert out["runtime_trace"]["trace"] == "run_trading_graph"
+
+
+def test_m32_7_tracing_disabled_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv("RUNTIME_TRACE_ENABLED", raising=False)
+    logger = EventLogger(log_path=tmp_path / "events.jsonl")
+    out = run_trading_graph({"run_id": "r2", "event_logger": logger}, **_graph_stubs(retries=0))
+    assert logger.read_all() == []
+    assert "runtime_trace" not in out and "tracer" not in out
+
+
+def test_m32_7_commander_runtime_nests_graph_spans(tmp_path, monkeypatch):
+    monkeypatch.setenv("RUNTIME_TRACE_ENABLED", "true")
+    logger = EventLogger(log_path=tmp_path / "events.jsonl")
+    stubs = _graph_stubs(retries=0)
+    out = run_commander_runtime(
+        {"run_id": "r3", "event_logger": logger},
+        mode="graph_spine",
+        graph_runner=lambda s: run_trading_graph(s, **stubs),
+    )
+    traces = [e for e in logger.read_all() if e["stage"] == "runtime_trace"]
+    assert len(traces) == 1
+    names = [s[0] for s in traces[0]["payload"]["spans"]]
+    assert names[:3] == ["commander_runtime", "graph_spine", "run_trading_graph"]
+    assert "tracer" not in out
+
+
+def test_m32_7_trace_ends_on_error(tmp_path):
+    logger = EventLogger(log_path=tmp_path / "events.jsonl")
+
+    def boom(s):  # type: ignore[no-untyped-def]
+        raise RuntimeError("x")
+
+    state = {"run_id": "r4", "trace_enabled": True, "event_logger": logger}
+    with pytest.raises(RuntimeError):
+        run_commander_runtime(state, mode="graph_spine", graph_runner=boom)
+    spans = [e for e in logger.read_all() if e["stage"] == "runtime_trace"][0]["payload"]["spans"]
+    assert spans[0][4]["error_type"] == "RuntimeError"
+    assert "tracer" not in state
+
+
+def test_m32_7_profile_aggregation_and_folded_stacks(tmp_path):
+    payloads = [
+        {"trace": "g", "spans": [["g", -1, 0, 1000], ["scanner", 0, 10, 300], ["scanner", 0, 400, 200], ["decide", 0, 700, 100]]},
+        {"trace": "g", "spans": [["g", -1, 0, 2000], ["scanner", 0, 10, 900], ["decide", 0, 950, 100]]},
+    ]
+    table = {r["node"]: r for r in aggregate_node_latency(payloads)}
+    assert table["scanner"]["runs"] == 2
+    assert table["scanner"]["p50_ms"] == 0.5
+    assert table["scanner"]["p99_ms"] == 0.9
+    assert folded_stacks(payloads) == ["g 1400", "g;decide 200", "g;scanner 1400"]
+
+    log = tmp_path / "events.jsonl"
+    logger = EventLogger(log_path=log)
+    for i, p in enumerate(payloads):
+        logger.log(run_id=f"r{i}", stage="runtime_trace", event="spans", payload=p)
+    repo_root = Path(__file__).resolve().parents[1]
+    script = repo_root / "scripts" / "report_runtime_trace_profile.py"
+    cp = subprocess.run(
+        [sys.executable, str(script), "--path", str(log), "--json"], cwd=str(repo_root), capture_output=True, text=True
+    )
+    assert cp.returncode == 0, cp.stderr
+    assert json.loads(cp.stdout.strip().splitlines()[-1])["runs"] == 2
+    cp = subprocess.run(
+        [sys.executable, str(script), "--path", str(log), "--folded"], cwd=str(repo_root), capture_output=True, text=True
+    )
+    assert cp.stdout.strip().splitlines() == ["g 1400", "g;decide 200", "g;scanner 1400"]
+
+
+def test_m32_7_begin_trace_reuses_enclosing_tracer(tmp_path):
+    state = {"trace_enabled": True, "event_logger": EventLogger(log_path=tmp_path / "e.jsonl")}
+    outer, owned = begin_trace(state, "outer")
+    inner, inner_owned = begin_trace(state, "inner")
+    assert owned is True and inner_owned is False and inner is outer
+    payload = end_trace(state, outer)
+    assert payload["trace"] == "outer"
+    assert "tracer" not in state
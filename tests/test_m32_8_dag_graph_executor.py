@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from graphs.dag_engine import DagGraph, DagNode, repeat_while
+from graphs.nodes.build_snapshots import SNAPSHOTS_DAG, build_snapshots
+from graphs.trading_graph import run_trading_graph, trading_graph_dag
+from libs.read.portfolio_reader import MockPortfolioReader
+from libs.read.price_reader import MockPriceReader
+from libs.runtime.span_tracer import SpanTracer
+
+
+def _setter(key, value, sleep=0.0):  # type: ignore[no-untyped-def]
+    def fn(s):  # type: ignore[no-untyped-def]
+        if sleep:
+            time.sleep(sleep)
+        s[key] = value
+        return s
+
+    return fn
+
+
+def test_m32_8_levels_follow_read_write_conflicts():
+    g = DagGraph(
+        [
+            DagNode("a", _setter("x", 1), writes=("x",)),
+            DagNode("b", _setter("y", 1), writes=("y",)),
+            DagNode("c", _setter("z", 1), reads=("x", "y"), writes=("z",)),
+            DagNode("d", _setter("w", 1), writes=("w",), after=("c",)),
+            DagNode("e", _setter("v", 1), reads=("q",), writes=("v",)),
+        ]
+    )
+    assert g.levels() == [["a", "b", "e"], ["c"], ["d"]]
+    with pytest.raises(ValueError):
+        DagGraph([DagNode("a", _setter("x", 1), after=("missing",))])
+
+
+def test_m32_8_independent_nodes_overlap_and_merge_deterministically():
+    order: list = []
+    lock = threading.Lock()
+
+    def slow(key, value, sleep):  # type: ignore[no-untyped-def]
+        def fn(s):  # type: ignore[no-untyped-def]
+            time.sleep(sleep)
+            with lock:
+                order.append(key)
+            s[key] = value
+            s["shared"] = key
+            return s
+
+        return fn
+
+    fan = DagGraph(
+        [
+            DagNode("a", slow("a", 1, 0.15), writes=("a",)),
+            DagNode("b", slow("b", 2, 0.01), writes=("b",)),
+        ]
+    )
+    t0 = time.perf_counter()
+    out = fan.run({})
+    elapsed = time.perf_counter() - t0
+    assert elapsed < 0.15 + 0.01 + 0.1
+    assert order == ["b", "a"]  # b finished first
+    assert (out["a"], out["b"]) == (1, 2)
+    # undeclared "shared" is merged in declaration order (b last) and reported
+    assert out["shared"] == "b"
+    assert fan.last_report["undeclared_writes"] == ["a:shared", "b:shared"]
+
+
+def test_m32_8_when_skip_and_parallel_spans():
+    tracer = SpanTracer("t")
+    g = DagGraph(
+        [
+            DagNode("a", _setter("a", 1, 0.01), writes=("a",)),
+            DagNode("b", _setter("b", 1, 0.01), writes=("b",)),
+            DagNode("c", _setter("c", 1), reads=("a",), writes=("c",), when=lambda s: s.get("a") == 2),
+        ]
+    )
+    with tracer.span("root"):
+        out = g.run({"tracer": tracer})
+    assert "c" not in out
+    assert g.last_report["skipped"] == ["c"]
+    spans = tracer.to_payload()["spans"]
+    assert [(s[0], s[1], s[4]) for s in spans[1:]] == [("a", 0, {"parallel": 2}), ("b", 0, {"parallel": 2})]
+
+
+def test_m32_8_repeat_while_passes_attempts():
+    tracer = SpanTracer("t")
+    body = DagGraph([DagNode("step", lambda s: {**s, "n": s.get("n", 0) + 1}, reads=("n",), writes=("n",))])
+    loop = repeat_while(body, lambda s: s["n"] < 3)
+    out = loop({"tracer": tracer})
+    assert out["n"] == 3 and loop.last_attempt == 2
+    assert [s[4]["attempt"] for s in tracer.to_payload()["spans"]] == [0, 1, 2]
+
+
+def test_m32_8_trading_graph_preset_is_a_sequential_chain():
+    f = lambda s: s  # noqa: E731
+    graph, loop = trading_graph_dag(
+        strategist=f, hydrate=f, scanner=f, monitor=f, portfolio_guard=f, decide=f, executor=f
+    )
+    assert graph.levels() == [["strategist"], ["scan_loop"], ["executor"]]
+    assert loop.graph.levels() == [["hydrate"], ["scanner"], ["monitor"], ["portfolio_guard"], ["decide"]]
+
+    calls: list = []
+
+    def rec(name, fn=None):  # type: ignore[no-untyped-def]
+        def node(s):  # type: ignore[no-untyped-def]
+            calls.append(name)
+            return fn(s) if fn else s
+
+        return node
+
+    n = {"d": 0}
+
+    def decide(s):  # type: ignore[no-untyped-def]
+        n["d"] += 1
+        s["decision"] = "retry_scan" if n["d"] == 1 else "approve"
+        return s
+
+    out = run_trading_graph(
+        {"use_skill_hydration": True},
+        strategist=rec("strategist"),
+        hydrate=rec("hydrate"),
+        scanner=rec("scanner"),
+        monitor=rec("monitor"),
+        portfolio_guard=rec("portfolio_guard"),
+        decide=rec("decide", decide),
+        executor=rec("executor", _setter("execution_pending", True)),
+    )
+    pass_ = ["hydrate", "scanner", "monitor", "portfolio_guard", "decide"]
+    assert calls == ["strategist"] + pass_ + pass_ + ["executor"]
+    assert out["execution_pending"] is True
+
+
+def test_m32_8_build_snapshots_reads_in_parallel():
+    class SlowPrice(MockPriceReader):
+        def get_market_snapshot(self, symbol):  # type: ignore[no-untyped-def]
+            time.sleep(0.15)
+            return super().get_market_snapshot(symbol)
+
+    class SlowPortfolio(MockPortfolioReader):
+        def get_portfolio_snapshot(self):  # type: ignore[no-untyped-def]
+            time.sleep(0.15)
+            return super().get_portfolio_snapshot()
+
+    state = {
+        "symbol": "005930",
+        "price_reader": SlowPrice(prices={"005930": 71200}),
+        "portfolio_reader": SlowPortfolio(cash=1000, positions=[]),
+    }
+    assert SNAPSHOTS_DAG.levels() == [["market_snapshot", "portfolio_snapshot"], ["snapshots"]]
+    t0 = time.perf_counter()
+    out = build_snapshots(state)
+    assert time.perf_counter() - t0 < 0.28
+    assert out["snapshots"]["market"]["price"] == 71200
+    assert out["snapshots"]["portfolio"]["cash"] == 1000
+    assert SNAPSHOTS_DAG.last_report["undeclared_writes"] == []
+
+
+def test_m32_8_parallel_failure_propagates():
+    def boom(s):  # type: ignore[no-untyped-def]
+        raise RuntimeError("x")
+
+    g = DagGraph([DagNode("a", boom, writes=("a",)), DagNode("b", _setter("b", 1), writes=("b",))])
+    with pytest.raises(RuntimeError):
+        g.run({})
+    with pytest.raises(ValueError):
+        build_snapshots({"price_reader": MockPriceReader(prices={}), "portfolio_reader": MockPortfolioReader()})
+
+
+def test_m32_8_parallel_nodes_get_private_copies_of_declared_reads():
+    def tag(name):  # type: ignore[no-untyped-def]
+        def fn(s):  # type: ignore[no-untyped-def]
+            s["cfg"]["seen"].append(name)  # in-place edit of a nested read
+            s[name] = list(s["cfg"]["seen"])
+            return s
+
+        return fn
+
+    g = DagGraph(
+        [
+            DagNode("a", tag("a"), reads=("cfg",), writes=("a",)),
+            DagNode("b", tag("b"), reads=("cfg",), writes=("b",)),
+        ]
+    )
+    out = g.run({"cfg": {"seen": []}})
+    assert (out["a"], out["b"], out["cfg"]) == (["a"], ["b"], {"seen": []})
+    assert g.last_report["undeclared_writes"] == []
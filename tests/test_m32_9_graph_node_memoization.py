@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from graphs.dag_engine import DagGraph, DagNode, fingerprint
+from graphs.trading_graph import run_trading_graph
+from libs.core.event_logger import EventLogger
+
+
+class _CountingRunner:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def run(self, *, run_id: str, skill: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        self.calls += 1
+        if skill == "market.quote":
+            return {"action": "ready", "data": {"symbol": args["symbol"], "price": 70000}}
+        return {"action": "ready", "data": {"rows": []}}
+
+
+def _passthrough(s):  # type: ignore[no-untyped-def]
+    return s
+
+
+def _state(tmp_path, runner, **extra):  # type: ignore[no-untyped-def]
+    return {
+        "run_id": "m32-9",
+        "candidates": [{"symbol": "005930"}],
+        "mock_scan_results": {"005930": {"score": 0.5, "risk_score": 0.1, "confidence": 0.2}},
+        "policy": {"max_scan_retries": 2, "min_confidence": 0.6, "max_risk": 0.7},
+        "skill_runner": runner,
+        "trace_enabled": True,
+        "event_logger": EventLogger(log_path=tmp_path / "events.jsonl"),
+        **extra,
+    }
+
+
+def test_m32_9_fingerprint_tracks_only_declared_reads():
+    a = {"x": [1, 2], "y": {"k": 1}, "noise": 1}
+    b = {"x": [1, 2], "y": {"k": 1}, "noise": 2}
+    assert fingerprint(a, ("x", "y")) == fingerprint(b, ("x", "y"))
+    assert fingerprint(a, ("x", "noise")) != fingerprint(b, ("x", "noise"))
+    assert fingerprint({}, ("x",)) != fingerprint({"x": None}, ("x",))
+
+
+def test_m32_9_dag_memo_reuses_output_and_isolates_cache():
+    calls = {"n": 0}
+
+    def node(s):  # type: ignore[no-untyped-def]
+        calls["n"] += 1
+        s["out"] = {"items": list(s["inp"])}
+        return s
+
+    g = DagGraph([DagNode("n", node, reads=("inp",), writes=("out",), memo=True)], memo=True)
+    first = g.run({"inp": [1], "graph_memo": True})
+    first["out"]["items"].append(99)  # in-place edit downstream must not leak into the cache
+    second = g.run({"inp": [1], "graph_memo": True})
+    assert calls["n"] == 1
+    assert second["out"] == {"items": [1]}
+    assert g.last_report["cache_hits"] == ["n"]
+    g.run({"inp": [2], "graph_memo": True})
+    assert calls["n"] == 2
+    g.run({"inp": [1], "graph_memo": False})
+    assert calls["n"] == 3
+    g.run({"inp": [1]})  # opt-in: off unless the state or GRAPH_MEMO_ENABLED turns it on
+    assert calls["n"] == 4
+
+
+def test_m32_9_retry_scan_reuses_unchanged_node_outputs(tmp_path):
+    runner = _CountingRunner()
+    out = run_trading_graph(_state(tmp_path, runner, graph_memo=True), strategist=_passthrough)
+    assert out["decision"] == "reject"
+    assert out["retry_count_scan"] == 2
+    assert runner.calls == 6  # hydrate (quote + orders) refetches on every pass
+
+    spans = out["runtime_trace"]["spans"]
+    for name in ("scanner", "monitor", "portfolio_guard"):
+        assert [s[4].get("cache") for s in spans if s[0] == name] == ["miss", "hit", "hit"], name
+    for name in ("hydrate", "decide"):
+        assert all("cache" not in s[4] for s in spans if s[0] == name), name
+    assert [s[4]["attempt"] for s in spans if s[0] == "decide"] == [0, 1, 2]
+
+
+def test_m32_9_memo_matches_uncached_run(tmp_path):
+    cached = run_trading_graph(_state(tmp_path, _CountingRunner(), graph_memo=True), strategist=_passthrough)
+    runner = _CountingRunner()
+    plain = run_trading_graph(_state(tmp_path, runner), strategist=_passthrough)
+    assert runner.calls == 6
+    for key in ("decision", "decision_reason", "selected", "intents", "scan_results", "risk", "skill_results", "portfolio_guard"):
+        assert cached.get(key) == plain.get(key), key
+
+
+def test_m32_9_env_switch_and_injected_nodes_are_not_memoized(tmp_path, monkeypatch):
+    monkeypatch.delenv("GRAPH_MEMO_ENABLED", raising=False)
+    out = run_trading_graph(_state(tmp_path, _CountingRunner()), strategist=_passthrough)
+    assert all("cache" not in s[4] for s in out["runtime_trace"]["spans"])  # off by default
+
+    monkeypatch.setenv("GRAPH_MEMO_ENABLED", "true")
+    out = run_trading_graph(_state(tmp_path, _CountingRunner()), strategist=_passthrough)
+    assert [s[4].get("cache") for s in out["runtime_trace"]["spans"] if s[0] == "scanner"] == ["miss", "hit", "hit"]
+    calls = {"scan": 0}
+
+    def scanner(s):  # type: ignore[no-untyped-def]
+        calls["scan"] += 1
+        s["intents"] = [{"symbol": "005930", "risk_score": 0.1, "confidence": 0.2}]
+        return s
+
+    run_trading_graph(_state(tmp_path, _CountingRunner()), strategist=_passthrough, scanner=scanner, monitor=_passthrough)
+    assert calls["scan"] == 3
+
+
+def test_m32_9_profile_counts_cache_hits(tmp_path):
+    from scripts.report_runtime_trace_profile import aggregate_node_latency
+
+    out = run_trading_graph(_state(tmp_path, _CountingRunner(), graph_memo=True), strategist=_passthrough)
+    rows = {r["node"]: r for r in aggregate_node_latency([out["runtime_trace"]])}
+    assert rows["scanner"]["cache_hits"] == 2
+    assert rows["decide"]["cache_hits"] == 0